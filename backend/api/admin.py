@@ -1,7 +1,43 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Employee, Project
+from .models import Employee, OvertimeStatusJob, PendingSMBUpload, Project
 
 admin.site.register(Project)
 admin.site.register(Employee)
+
+
+@admin.register(PendingSMBUpload)
+class PendingSMBUploadAdmin(admin.ModelAdmin):
+    """Queue of SMB uploads waiting on a retry (mostly files someone has open on the share)."""
+
+    list_display = ("remote_path", "reason", "status", "attempts", "next_attempt_at", "updated_at")
+    list_filter = ("status", "reason")
+    search_fields = ("remote_path",)
+    exclude = ("content",)
+    readonly_fields = ("server", "share_name", "remote_path", "fingerprint", "sheet_fingerprints", "reason", "attempts", "last_error", "next_attempt_at", "created_at", "updated_at")
+    actions = ["retry_now"]
+
+    @admin.action(description="Retry selected uploads now")
+    def retry_now(self, request, queryset):
+        from .services.smb_service import schedule_upload_retry
+
+        count = 0
+        for pending in queryset:
+            if pending.status == "failed":
+                # Give a dead-lettered upload a fresh round of attempts
+                pending.status, pending.attempts = "pending", 1
+            pending.save(update_fields=["status", "attempts", "updated_at"])
+            schedule_upload_retry(pending, countdown=0)
+            count += 1
+        self.message_user(request, f"Scheduled {count} upload(s) for retry.")
+
+
+@admin.register(OvertimeStatusJob)
+class OvertimeStatusJobAdmin(admin.ModelAdmin):
+    """Background bulk status changes of overtime requests and their progress."""
+
+    list_display = ("id", "target_status", "status", "processed", "total", "notified_count", "requested_by_username", "created_at", "finished_at")
+    list_filter = ("status", "target_status")
+    exclude = ("request_ids",)
+    readonly_fields = ("target_status", "requested_by", "requested_by_username", "status", "total", "processed", "updated_count", "notified_count", "error", "started_at", "finished_at", "created_at", "updated_at")
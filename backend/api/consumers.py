@@ -9,6 +9,7 @@
 - Permission updates
 """
 
+import asyncio
 import logging
 import time
 from collections import deque
@@ -109,17 +110,68 @@ def _fetch_employee(self):
         return None
 
 
-# Helper function to send notifications via WebSocket
+# ---------------------------------------------------------------------------
+# Channel-layer fan-out helpers
+# ---------------------------------------------------------------------------
+# group_send calls awaited concurrently per round in group_send_many
+GROUP_SEND_BATCH_SIZE = 100
+
+
+def group_send_many(messages) -> int:
+    """
+    Send many ``(group, message)`` pairs over the channel layer in one async context.
+
+    Every producer goes through here: the sends of one call share a single
+    ``async_to_sync`` hop and are issued concurrently in rounds of
+    ``GROUP_SEND_BATCH_SIZE``, which the Redis channel layer pipelines over its
+    connection pool. A failed send is logged and does not stop the others.
+    Returns the number of messages sent.
+    """
+    messages = list(messages)
+    if not messages:
+        return 0
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        logger.warning("No channel layer configured — %s message(s) were not sent", len(messages))
+        return 0
+
+    async def _send_all():
+        sent = 0
+        for offset in range(0, len(messages), GROUP_SEND_BATCH_SIZE):
+            batch = messages[offset : offset + GROUP_SEND_BATCH_SIZE]
+            results = await asyncio.gather(*(channel_layer.group_send(group, message) for group, message in batch), return_exceptions=True)
+            for (group, _), result in zip(batch, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.warning("group_send to %s failed: %s", group, result)
+                else:
+                    sent += 1
+        return sent
+
+    return async_to_sync(_send_all)()
+
+
+def _group_send(group: str, message: dict):
+    group_send_many([(group, message)])
+
+
+def _notification_message(user_id: int, notification_data: dict):
+    return f"notifications_{user_id}", {"type": "notification_message", **notification_data}
+
+
 def send_notification_to_user(user_id: int, notification_data: dict):
     """
     Send a notification to a specific user via WebSocket.
     Call this from views/signals when creating notifications.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(f"notifications_{user_id}", {"type": "notification_message", **notification_data})
-    else:
-        logger.warning("No channel layer configured — notification to user %s was not sent", user_id)
+    group_send_many([_notification_message(user_id, notification_data)])
+
+
+def send_notifications_to_users(notifications):
+    """
+    Send many ``(user_id, notification_data)`` notifications via WebSocket in one batch.
+    Prefer this over calling send_notification_to_user in a loop.
+    """
+    return group_send_many(_notification_message(user_id, notification_data) for user_id, notification_data in notifications)
 
 
 def send_permission_update_to_user(user_id: int, user_data: dict):
@@ -131,10 +183,8 @@ def send_permission_update_to_user(user_id: int, user_data: dict):
         user_id: The ID of the user whose permissions changed
         user_data: The updated user data including new permissions
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        logger.info("Sending permission update to user %s", user_id)
-        async_to_sync(channel_layer.group_send)(f"notifications_{user_id}", {"type": "permission_update", "user": user_data})
+    logger.info("Sending permission update to user %s", user_id)
+    _group_send(f"notifications_{user_id}", {"type": "permission_update", "user": user_data})
 
 
 def broadcast_task_created(task_data: dict):
@@ -142,16 +192,14 @@ def broadcast_task_created(task_data: dict):
     Broadcast a new task to all task board viewers.
     Call this from views when a task is created.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            "task_board",
-            {
-                "type": "task_created",
-                "task_data": task_data,
-                "created_by": task_data.get("created_by_name", "Unknown"),
-            },
-        )
+    _group_send(
+        "task_board",
+        {
+            "type": "task_created",
+            "task_data": task_data,
+            "created_by": task_data.get("created_by_name", "Unknown"),
+        },
+    )
 
 
 def broadcast_task_updated(task_data: dict, updated_by: str = "Unknown"):
@@ -159,17 +207,15 @@ def broadcast_task_updated(task_data: dict, updated_by: str = "Unknown"):
     Broadcast a task update to all task board viewers.
     Call this from views when a task is updated.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            "task_board",
-            {
-                "type": "task_updated",
-                "task_id": task_data.get("id"),
-                "task_data": task_data,
-                "updated_by": updated_by,
-            },
-        )
+    _group_send(
+        "task_board",
+        {
+            "type": "task_updated",
+            "task_id": task_data.get("id"),
+            "task_data": task_data,
+            "updated_by": updated_by,
+        },
+    )
 
 
 def broadcast_task_deleted(task_id: int, deleted_by: str = "Unknown"):
@@ -177,91 +223,92 @@ def broadcast_task_deleted(task_id: int, deleted_by: str = "Unknown"):
     Broadcast a task deletion to all task board viewers.
     Call this from views when a task is deleted.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            "task_board",
-            {
-                "type": "task_deleted",
-                "task_id": task_id,
-                "deleted_by": deleted_by,
-            },
-        )
+    _group_send(
+        "task_board",
+        {
+            "type": "task_deleted",
+            "task_id": task_id,
+            "deleted_by": deleted_by,
+        },
+    )
 
 
 def broadcast_task_comment_created(task_id: int, comment_data: dict):
     """
     Broadcast a persisted task comment to all viewers of a task detail drawer.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            f"task_{task_id}",
-            {
-                "type": "comment_added",
-                "comment": comment_data,
-                "comment_id": comment_data.get("id"),
-                "timestamp": timezone.now().isoformat(),
-            },
-        )
+    _group_send(
+        f"task_{task_id}",
+        {
+            "type": "comment_added",
+            "comment": comment_data,
+            "comment_id": comment_data.get("id"),
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
 
 
 def broadcast_task_comment_updated(task_id: int, comment_data: dict):
     """
     Broadcast a persisted task comment update to all viewers of a task detail drawer.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            f"task_{task_id}",
-            {
-                "type": "comment_updated",
-                "comment": comment_data,
-                "comment_id": comment_data.get("id"),
-                "new_content": comment_data.get("content"),
-                "timestamp": timezone.now().isoformat(),
-            },
-        )
+    _group_send(
+        f"task_{task_id}",
+        {
+            "type": "comment_updated",
+            "comment": comment_data,
+            "comment_id": comment_data.get("id"),
+            "new_content": comment_data.get("content"),
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
 
 
 def broadcast_task_comment_deleted(task_id: int, comment_id: int, parent_id: int | None = None):
     """
     Broadcast a task comment deletion to all viewers of a task detail drawer.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            f"task_{task_id}",
-            {
-                "type": "comment_deleted",
-                "comment_id": comment_id,
-                "parent_id": parent_id,
-                "timestamp": timezone.now().isoformat(),
-            },
-        )
+    _group_send(
+        f"task_{task_id}",
+        {
+            "type": "comment_deleted",
+            "comment_id": comment_id,
+            "parent_id": parent_id,
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
 
 
 def send_notification_to_ptb_admins(notification_data: dict):
     """
     Send a notification to all PTB admin users via the shared 'role_ptb_admins' group.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)("role_ptb_admins", {"type": "notification_message", **notification_data})
+    _group_send("role_ptb_admins", {"type": "notification_message", **notification_data})
 
 
 def send_notification_to_superadmins(notification_data: dict):
     """
     Send a notification to all super admin users via the shared 'role_superadmins' group.
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)("role_superadmins", {"type": "notification_message", **notification_data})
+    _group_send("role_superadmins", {"type": "notification_message", **notification_data})
 
 
 # ── PTB Calendar broadcast helpers ──────────────────────────────────────────
 
 
+def _calendar_message(action: str, entity_type: str, entity_data: dict):
+    return (
+        "ptb_calendar",
+        {
+            "type": "calendar_update",
+            "action": action,
+            "entity_type": entity_type,
+            "data": entity_data,
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
+
+
 def broadcast_calendar_update(action: str, entity_type: str, entity_data: dict):
     """
     Broadcast a calendar change (holiday or leave) to all connected PTB Calendar viewers.
@@ -271,18 +318,14 @@ def broadcast_calendar_update(action: str, entity_type: str, entity_data: dict):
         entity_type: 'holiday' or 'leave'
         entity_data: Serialized data of the entity (or {'id': <id>} for deletes)
     """
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            "ptb_calendar",
-            {
-                "type": "calendar_update",
-                "action": action,
-                "entity_type": entity_type,
-                "data": entity_data,
-                "timestamp": timezone.now().isoformat(),
-            },
-        )
+    group_send_many([_calendar_message(action, entity_type, entity_data)])
+
+
+def broadcast_calendar_updates(updates):
+    """
+    Broadcast many ``(action, entity_type, entity_data)`` calendar changes in one batch.
+    """
+    return group_send_many(_calendar_message(action, entity_type, entity_data) for action, entity_type, entity_data in updates)
 
 
 class NotificationConsumer(_RateLimitMixin, _TokenAuthMixin, AsyncJsonWebsocketConsumer):
@@ -14,6 +14,8 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .services.cache_metrics import cache_metrics, overall_hit_ratio
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +74,12 @@ def get(self, request):
             health_status["checks"]["cache"] = {"status": "degraded", "message": self._public_failure_message("Cache")}
             # Cache failure is not critical, mark as degraded not unhealthy
 
+        # Aggregate CacheService hit ratio (informational, never affects status)
+        try:
+            health_status["checks"]["cache"]["metrics"] = overall_hit_ratio(cache_metrics.snapshot())
+        except Exception:
+            logger.warning("Cache metrics unavailable for health check", exc_info=True)
+
         # Check Celery (if configured)
         if hasattr(settings, "CELERY_BROKER_URL"):
             try:
@@ -0,0 +1,93 @@
+import json
+import pickle
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.services.cache_codec import MsgpackCodec, PickleCodec, decode
+
+# django-redis compresses every stored value with ZlibCompressor (preset 6)
+BACKEND_ZLIB_LEVEL = 6
+
+
+def _page(rows):
+    """A paginated overtime list page shaped like DRF ``response.data`` (dates, times and decimals already rendered as strings)."""
+    started = timezone.make_aware(datetime(2026, 1, 26, 18, 0))
+    results = []
+    for index in range(rows):
+        results.append(
+            OrderedDict(
+                id=index + 1,
+                employee=index % 120 + 1,
+                employee_name=f"Employee {index % 120:03d}",
+                employee_emp_id=f"E{index % 120:05d}",
+                project=index % 15 + 1,
+                project_name=f"Project {index % 15}",
+                department_code=f"D{index % 8}",
+                department_name=f"Department {index % 8}",
+                request_date=(date(2026, 1, 26) + timedelta(days=index % 30)).isoformat(),
+                time_start="18:00:00",
+                time_end="21:30:00",
+                total_hours="3.50",
+                is_weekend=index % 7 in (5, 6),
+                is_holiday=False,
+                status=("pending", "approved", "rejected")[index % 3],
+                reason="Release preparation and regression testing for the monthly build",
+                approved_by_name="PTB Admin" if index % 3 == 1 else None,
+                approved_at=(started + timedelta(hours=index)).isoformat() if index % 3 == 1 else None,
+                breaks=[OrderedDict(id=index, start_time="19:00:00", end_time="19:30:00", duration_hours="0.50")],
+                created_at=(started + timedelta(minutes=index)).isoformat(),
+                updated_at=(started + timedelta(minutes=index)).isoformat(),
+            )
+        )
+    page = OrderedDict(next_cursor="eyJpZCI6IDUwMH0", previous_cursor=None, results=results)
+    # Round-trip so every value is its own object, as in serializer output (pickle would
+    # otherwise memoize the repeated literals above)
+    return json.loads(json.dumps(page), object_pairs_hook=OrderedDict)
+
+
+class Command(BaseCommand):
+    help = "Benchmark cached list payload encodings: pickle (the django-redis default) against the msgpack/zlib codec."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Rows in the cached page (default: 500).")
+        parser.add_argument("--repeat", type=int, default=20, help="Encode/decode rounds per codec; the fastest is reported (default: 20).")
+
+    def handle(self, *args, **options):
+        rows = max(1, options["rows"])
+        repeat = max(1, options["repeat"])
+        page = _page(rows)
+
+        def store(blob):
+            # What django-redis writes: the value pickled, then zlib-compressed
+            return zlib.compress(pickle.dumps(blob, pickle.HIGHEST_PROTOCOL), BACKEND_ZLIB_LEVEL)
+
+        def load(stored):
+            return pickle.loads(zlib.decompress(stored))
+
+        cases = [
+            ("pickle", lambda: page, lambda value: value),
+            ("pickle codec", PickleCodec().encode, decode),
+            ("msgpack", MsgpackCodec(compress_threshold=0).encode, decode),
+            ("msgpack+zlib", MsgpackCodec().encode, decode),
+        ]
+
+        self.stdout.write(f"{rows} row(s) per page, {repeat} round(s) per codec; sizes as stored by django-redis (pickle + zlib)")
+        self.stdout.write(f"{'codec':<14}{'payload B':>12}{'stored B':>12}{'write ms':>12}{'read ms':>12}")
+        for name, encode_page, decode_blob in cases:
+            writes, reads = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                blob = encode_page(page) if name != "pickle" else page
+                stored = store(blob)
+                writes.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                decode_blob(load(stored))
+                reads.append(time.perf_counter() - started)
+            payload = len(blob) if isinstance(blob, bytes) else len(pickle.dumps(blob, pickle.HIGHEST_PROTOCOL))
+            self.stdout.write(f"{name:<14}{payload:>12}{len(stored):>12}{min(writes) * 1000:>12.2f}{min(reads) * 1000:>12.2f}")
@@ -0,0 +1,71 @@
+import time
+
+from django.core.cache import cache, caches
+from django.core.management.base import BaseCommand
+
+from api.services.cache_service import CacheService
+
+# Benchmark keys live outside the real view namespaces
+VIEW_NAME = "benchmark_cache_view"
+FILLER_PREFIX = "benchmark_cache_filler:"
+WRITE_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-view cache invalidation: delete_pattern keyspace scans against generation-counter bumps."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keys",
+            type=int,
+            default=100_000,
+            help="Unrelated keys written to the cache before timing (default: 100000).",
+        )
+        parser.add_argument(
+            "--view-keys",
+            type=int,
+            default=100,
+            help="Cached list entries of the benchmark view (default: 100).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Invalidations per mode; the fastest is reported (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        keys = max(0, options["keys"])
+        view_keys = max(1, options["view_keys"])
+        repeat = max(1, options["repeat"])
+
+        filler = [f"{FILLER_PREFIX}{index}" for index in range(keys)]
+        for start in range(0, keys, WRITE_CHUNK_SIZE):
+            cache.set_many(dict.fromkeys(filler[start : start + WRITE_CHUNK_SIZE], "x"), timeout=600)
+
+        backend = type(caches["default"]).__name__
+        cases = [("generation bump", lambda: CacheService.invalidate_all_for_view(VIEW_NAME))]
+        if hasattr(cache, "delete_pattern"):
+            prefixes = (CacheService.PREFIX_LIST, CacheService.PREFIX_OBJECT, CacheService.PREFIX_CUSTOM)
+            cases.insert(0, ("delete_pattern", lambda: [cache.delete_pattern(f"*{prefix}:{VIEW_NAME}*") for prefix in prefixes]))
+        else:
+            self.stdout.write(f"{backend} has no delete_pattern; only the generation bump is timed.")
+
+        try:
+            self.stdout.write(f"{backend}: {keys} unrelated key(s), {view_keys} view entr(ies), {repeat} invalidation(s) per mode")
+            self.stdout.write(f"{'mode':<18}{'ms':>12}")
+            for mode, invalidate in cases:
+                timings = []
+                for _ in range(repeat):
+                    for index in range(view_keys):
+                        CacheService.set_list(VIEW_NAME, [index], {"page": index})
+                    started = time.perf_counter()
+                    invalidate()
+                    timings.append(time.perf_counter() - started)
+                    if CacheService.get_list(VIEW_NAME, {"page": 0}) is not None:
+                        self.stderr.write(f"{mode}: entries still readable after invalidation")
+                self.stdout.write(f"{mode:<18}{min(timings) * 1000:>12.3f}")
+        finally:
+            for start in range(0, keys, WRITE_CHUNK_SIZE):
+                cache.delete_many(filler[start : start + WRITE_CHUNK_SIZE])
+            cache.delete(CacheService.GENERATION_KEY.format(view_name=VIEW_NAME))
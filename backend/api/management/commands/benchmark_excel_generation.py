@@ -0,0 +1,116 @@
+import io
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from api.utils.excel_generator import ExcelGenerator
+from api.utils.time_helpers import get_period_boundaries
+
+
+class Command(BaseCommand):
+    help = "Benchmark Excel workbook generation (time and peak memory) on a synthetic overtime period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=2000,
+            help="Total overtime rows in the synthetic period, spread across departments (default: 2000).",
+        )
+        parser.add_argument(
+            "--departments",
+            type=int,
+            default=10,
+            help="Number of departments (one sheet each) (default: 10).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Render each workbook this many times and report the fastest run (default: 1).",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["standard", "streaming", "both"],
+            default="both",
+            help="Rendering engine for the monthly reports (default: both).",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        departments = max(1, options["departments"])
+        repeat = max(1, options["repeat"])
+        engines = ["standard", "streaming"] if options["engine"] == "both" else [options["engine"]]
+
+        request_date = date(2026, 1, 10)
+        period_start, period_end = get_period_boundaries(request_date)
+        monthly = self._synthetic_period(rows, departments, monthly=True)
+        # A single day holds a slice of the period's rows
+        daily = self._synthetic_period(max(departments, rows // 25), departments, monthly=False)
+
+        cases = [
+            ("daily_form", "standard", lambda: ExcelGenerator.create_ot_form_multi_sheet(daily, request_date)),
+            ("daily_summary", "standard", lambda: ExcelGenerator.create_ot_summary_multi_sheet(daily, request_date)),
+        ]
+        for engine in engines:
+            cases.append(("monthly_form", engine, lambda engine=engine: ExcelGenerator.create_monthly_ot_form_multi_sheet(monthly, period_start, period_end, engine=engine)))
+            cases.append(("monthly_summary", engine, lambda engine=engine: ExcelGenerator.create_monthly_ot_summary_multi_sheet(monthly, period_start, period_end, engine=engine)))
+
+        self.stdout.write(f"Synthetic period: {rows} rows across {departments} department(s), {repeat} run(s) per workbook")
+        self.stdout.write(f"{'report':<18}{'engine':<12}{'seconds':>10}{'peak MB':>10}{'size KB':>10}")
+        for report, engine, build in cases:
+            timings = [self._time(build) for _ in range(repeat)]
+            best_seconds = min(seconds for seconds, _ in timings)
+            size = timings[0][1]
+            peak_bytes = self._peak_memory(build)
+            self.stdout.write(f"{report:<18}{engine:<12}{best_seconds:>10.3f}{peak_bytes / 1024 / 1024:>10.1f}{size / 1024:>10.1f}")
+
+    @staticmethod
+    def _render(build):
+        wb = build()
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.tell()
+
+    @classmethod
+    def _time(cls, build):
+        """Render and serialize one workbook, returning (seconds, xlsx size in bytes)."""
+        started = time.perf_counter()
+        size = cls._render(build)
+        return time.perf_counter() - started, size
+
+    @classmethod
+    def _peak_memory(cls, build):
+        """Peak traced allocation while rendering one workbook (measured separately, tracing slows rendering)."""
+        tracemalloc.start()
+        try:
+            cls._render(build)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    @staticmethod
+    def _synthetic_period(rows, departments, monthly):
+        data = {}
+        for index in range(rows):
+            dept_code = f"DEPT{index % departments:03d}"
+            dept = data.setdefault(dept_code, {"dept_code": dept_code, "dept_name": f"Benchmark Department {dept_code}", "data": []})
+            item = {
+                "employee_id": f"E{index:05d}",
+                "employee_name": f"Employee {index}",
+                "project": "Benchmark",
+                "time_start": "18:00",
+                "time_end": "20:30",
+                "total_hours": "2.50",
+                "has_break": index % 2 == 0,
+                "reason": "Release preparation",
+                "detail": f"Synthetic row {index}",
+                "is_weekend": index % 7 in (5, 6),
+                "is_holiday": index % 31 == 0,
+            }
+            if monthly:
+                item["request_date"] = f"2026-01-{index % 25 + 1:02d}"
+            dept["data"].append(item)
+        return data
@@ -0,0 +1,101 @@
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Department, Employee, OvertimeBreak, OvertimeRequest, Project
+from api.serializers import OvertimeListRowSerializer, OvertimeSerializer
+from api.services.overtime_service import get_overtime_queryset
+
+ORDERING = ("-request_date", "-created_at", "-id")
+
+
+class Command(BaseCommand):
+    help = "Benchmark overtime list serialization (rows/second) of OvertimeSerializer against the lean .values() representation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=5000,
+            help="Synthetic overtime requests to create (rolled back afterwards) (default: 5000).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=500,
+            help="Rows per serialized page (default: 500).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Serialize every page this many times and report the fastest run (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        rows = max(1, options["rows"])
+        page_size = max(1, options["page_size"])
+        repeat = max(1, options["repeat"])
+
+        with transaction.atomic():
+            self._create_synthetic_requests(rows)
+            queryset = get_overtime_queryset().order_by(*ORDERING)
+            cases = [
+                ("serializer", lambda offset: OvertimeSerializer(queryset[offset : offset + page_size], many=True).data),
+                ("lean", lambda offset: OvertimeListRowSerializer(OvertimeListRowSerializer.values_queryset(queryset)[offset : offset + page_size]).data),
+            ]
+
+            self.stdout.write(f"{rows} synthetic request(s), {page_size}-row pages, {repeat} run(s) per mode")
+            self.stdout.write(f"{'mode':<12}{'seconds':>10}{'rows/s':>12}{'queries/page':>14}")
+            for mode, serialize_page in cases:
+                best_seconds = min(self._time(serialize_page, rows, page_size) for _ in range(repeat))
+                with CaptureQueriesContext(connection) as queries:
+                    serialize_page(0)
+                self.stdout.write(f"{mode:<12}{best_seconds:>10.3f}{rows / best_seconds:>12.0f}{len(queries.captured_queries):>14}")
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _time(serialize_page, rows, page_size):
+        """Serialize every page (queries included), returning the elapsed seconds."""
+        started = time.perf_counter()
+        for offset in range(0, rows, page_size):
+            serialize_page(offset)
+        return time.perf_counter() - started
+
+    @staticmethod
+    def _create_synthetic_requests(rows):
+        departments = [Department.objects.create(code=f"BENCH{index}", name=f"Benchmark Department {index}") for index in range(5)]
+        employees = [Employee.objects.create(name=f"Benchmark Employee {index}", emp_id=f"BENCH{index:04d}", department=departments[index % len(departments)]) for index in range(50)]
+        projects = [Project.objects.create(name=f"Benchmark {index}") for index in range(20)]
+
+        start = date(2026, 1, 1)
+        requests = []
+        for index in range(rows):
+            employee = employees[index % len(employees)]
+            project = projects[(index // len(employees)) % len(projects)]
+            requests.append(
+                OvertimeRequest(
+                    employee=employee,
+                    employee_name=employee.name,
+                    department=employee.department,
+                    department_code=employee.department.code,
+                    project=project,
+                    project_name=project.name,
+                    # Each (employee, project) pair gets its own run of dates, keeping the unique key intact
+                    request_date=start + timedelta(days=index // (len(employees) * len(projects))),
+                    time_start=datetime(2026, 1, 1, 18, 0).time(),
+                    time_end=datetime(2026, 1, 1, 20, 30).time(),
+                    total_hours="2.50",
+                    has_break=index % 2 == 0,
+                    reason="Release preparation",
+                    detail=f"Synthetic row {index}",
+                    status=("pending", "approved", "rejected")[index % 3],
+                    approved_by=employees[0] if index % 3 == 1 else None,
+                )
+            )
+        created = OvertimeRequest.objects.bulk_create(requests, batch_size=1000)
+        breaks = [OvertimeBreak(overtime_request=request, start_time=datetime(2026, 1, 1, 19, 0).time(), end_time=datetime(2026, 1, 1, 19, 30).time(), duration_hours="0.50") for request in created if request.has_break]
+        OvertimeBreak.objects.bulk_create(breaks, batch_size=1000)
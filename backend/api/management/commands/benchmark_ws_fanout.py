@@ -0,0 +1,79 @@
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand
+
+from api.consumers import group_send_many
+
+# Benchmark groups live outside the real notifications_<user id> namespace
+GROUP_PREFIX = "benchmark_fanout_"
+
+
+class Command(BaseCommand):
+    help = "Benchmark WebSocket notification fan-out: one async_to_sync group_send per message against batched group_send_many."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recipients",
+            type=int,
+            default=1000,
+            help="Recipients (one group with one subscribed channel each) per broadcast (default: 1000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Broadcasts per mode; the fastest is reported (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        recipients = max(1, options["recipients"])
+        repeat = max(1, options["repeat"])
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            self.stderr.write("No channel layer configured.")
+            return
+
+        groups = [f"{GROUP_PREFIX}{index}" for index in range(recipients)]
+        channels = async_to_sync(self._subscribe)(channel_layer, groups)
+        try:
+            message = {"type": "notification_message", "title": "Benchmark", "message": "Fan-out benchmark", "event_type": "benchmark", "is_read": False}
+            cases = [
+                ("per-message", lambda: [async_to_sync(channel_layer.group_send)(group, message) for group in groups]),
+                ("group_send_many", lambda: group_send_many((group, message) for group in groups)),
+            ]
+
+            self.stdout.write(f"{type(channel_layer).__name__}: {recipients} recipient(s), {repeat} broadcast(s) per mode")
+            self.stdout.write(f"{'mode':<18}{'seconds':>10}{'messages/s':>14}")
+            for mode, broadcast in cases:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    broadcast()
+                    timings.append(time.perf_counter() - started)
+                    # Drain so channel capacity never throttles the next round
+                    async_to_sync(self._drain)(channel_layer, channels)
+                best = min(timings)
+                self.stdout.write(f"{mode:<18}{best:>10.3f}{recipients / best:>14.0f}")
+        finally:
+            async_to_sync(self._unsubscribe)(channel_layer, groups, channels)
+
+    @staticmethod
+    async def _subscribe(channel_layer, groups):
+        channels = []
+        for group in groups:
+            channel = await channel_layer.new_channel()
+            await channel_layer.group_add(group, channel)
+            channels.append(channel)
+        return channels
+
+    @staticmethod
+    async def _drain(channel_layer, channels):
+        for channel in channels:
+            await channel_layer.receive(channel)
+
+    @staticmethod
+    async def _unsubscribe(channel_layer, groups, channels):
+        for group, channel in zip(groups, channels, strict=True):
+            await channel_layer.group_discard(group, channel)
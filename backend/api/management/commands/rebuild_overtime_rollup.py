@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.overtime_service import rebuild_overtime_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the overtime daily rollup (stats endpoints) and limit totals from the raw overtime requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            help="First request date to rebuild (YYYY-MM-DD). Defaults to the earliest request.",
+        )
+        parser.add_argument(
+            "--end",
+            help="Last request date to rebuild (YYYY-MM-DD). Defaults to the latest request.",
+        )
+
+    def handle(self, *args, **options):
+        start_date = self._parse_date(options["start"], "--start")
+        end_date = self._parse_date(options["end"], "--end")
+        if start_date and end_date and start_date > end_date:
+            raise CommandError("--start must not be after --end.")
+
+        written = rebuild_overtime_rollup(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt overtime rollup: {written} row(s) written."))
+
+    @staticmethod
+    def _parse_date(value, option):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError as e:
+            raise CommandError(f"{option} must be a date in YYYY-MM-DD format.") from e
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0059_merge_0057_notification_target_data_and_0058"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExcelUploadFingerprint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("server", models.CharField(help_text="SMB server the file was uploaded to", max_length=255)),
+                ("share_name", models.CharField(max_length=255)),
+                ("remote_path", models.CharField(help_text="Path of the file on the SMB share", max_length=500)),
+                ("fingerprint", models.CharField(help_text="Digest of the report payload that produced the file", max_length=64)),
+                ("sheet_fingerprints", models.JSONField(blank=True, default=dict, help_text="Payload digest per department sheet")),
+            ],
+            options={
+                "verbose_name": "Excel Upload Fingerprint",
+                "verbose_name_plural": "Excel Upload Fingerprints",
+                "db_table": "excel_upload_fingerprints",
+                "constraints": [models.UniqueConstraint(fields=("server", "share_name", "remote_path"), name="uniq_excel_upload_fingerprint_path")],
+            },
+        ),
+    ]
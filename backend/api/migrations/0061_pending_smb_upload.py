@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0060_excel_upload_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingSMBUpload",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("server", models.CharField(max_length=255)),
+                ("share_name", models.CharField(max_length=255)),
+                ("remote_path", models.CharField(help_text="Path of the file on the SMB share", max_length=500)),
+                ("content", models.BinaryField(help_text="File content to upload")),
+                ("fingerprint", models.CharField(blank=True, help_text="Excel payload fingerprint recorded once the upload succeeds", max_length=64)),
+                ("sheet_fingerprints", models.JSONField(blank=True, default=dict)),
+                ("reason", models.CharField(choices=[("sharing_violation", "File open by another user"), ("error", "Upload error")], db_index=True, default="error", max_length=20)),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("failed", "Failed")], db_index=True, default="pending", max_length=10)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("next_attempt_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Pending SMB Upload",
+                "verbose_name_plural": "Pending SMB Uploads",
+                "db_table": "pending_smb_uploads",
+                "ordering": ["next_attempt_at"],
+                "constraints": [models.UniqueConstraint(fields=("server", "share_name", "remote_path"), name="uniq_pending_smb_upload_path")],
+                "indexes": [models.Index(fields=["status", "next_attempt_at"], name="pending_smb_status_aff4d8_idx")],
+            },
+        ),
+    ]
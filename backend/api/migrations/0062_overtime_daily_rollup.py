@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rollup(apps, schema_editor):
+    OvertimeRequest = apps.get_model("api", "OvertimeRequest")
+    OvertimeDailyRollup = apps.get_model("api", "OvertimeDailyRollup")
+
+    rows = OvertimeRequest.objects.order_by().values("request_date", "employee_id", "employee_name", "project_id", "project_name", "department_code", "status", "is_weekend", "is_holiday").annotate(request_count=Count("id"), hours=Sum("total_hours"))
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row["total_hours"] = row.pop("hours") or 0
+        batch.append(OvertimeDailyRollup(**row))
+        if len(batch) >= 1000:
+            OvertimeDailyRollup.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        OvertimeDailyRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0061_pending_smb_upload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OvertimeDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("request_date", models.DateField()),
+                ("employee_name", models.CharField(blank=True, max_length=100)),
+                ("project_name", models.CharField(blank=True, max_length=50)),
+                ("department_code", models.CharField(blank=True, max_length=50)),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("approved", "Approved"), ("rejected", "Rejected")], max_length=20)),
+                ("is_weekend", models.BooleanField(default=False)),
+                ("is_holiday", models.BooleanField(default=False)),
+                ("request_count", models.PositiveIntegerField(default=0)),
+                ("total_hours", models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ("employee", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="api.employee")),
+                ("project", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="api.project")),
+            ],
+            options={
+                "verbose_name": "Overtime Daily Rollup",
+                "verbose_name_plural": "Overtime Daily Rollups",
+                "db_table": "overtime_daily_rollups",
+                "indexes": [
+                    models.Index(fields=["request_date", "status"], name="overtime_da_request_8c41db_idx"),
+                    models.Index(fields=["employee", "request_date"], name="overtime_da_employe_af07fa_idx"),
+                    models.Index(fields=["project", "request_date"], name="overtime_da_project_38ce42_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("request_date", "employee", "project", "department_code", "status", "is_weekend", "is_holiday"), name="uniq_overtime_daily_rollup_key"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
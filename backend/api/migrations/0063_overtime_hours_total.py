@@ -0,0 +1,53 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _period_start(date):
+    if date.day >= 26:
+        return date.replace(day=26)
+    return (date.replace(day=1) - timedelta(days=1)).replace(day=26)
+
+
+def backfill_totals(apps, schema_editor):
+    OvertimeRequest = apps.get_model("api", "OvertimeRequest")
+    OvertimeHoursTotal = apps.get_model("api", "OvertimeHoursTotal")
+
+    totals = {}
+    rows = OvertimeRequest.objects.exclude(status="rejected").values_list("employee_id", "request_date", "total_hours")
+    for employee_id, request_date, total_hours in rows.iterator(chunk_size=2000):
+        for window in ((employee_id, "week", request_date - timedelta(days=request_date.weekday())), (employee_id, "period", _period_start(request_date))):
+            totals[window] = totals.get(window, Decimal("0.00")) + (total_hours or 0)
+
+    OvertimeHoursTotal.objects.bulk_create(
+        [OvertimeHoursTotal(employee_id=employee_id, span=span, start_date=start, total_hours=hours) for (employee_id, span, start), hours in totals.items() if hours],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0062_overtime_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OvertimeHoursTotal",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("span", models.CharField(choices=[("week", "Week (Mon-Sun)"), ("period", "Pay period (26th-25th)")], max_length=10)),
+                ("start_date", models.DateField(help_text="Monday of the week or 26th opening the pay period")),
+                ("total_hours", models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ("employee", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="api.employee")),
+            ],
+            options={
+                "verbose_name": "Overtime Hours Total",
+                "verbose_name_plural": "Overtime Hours Totals",
+                "db_table": "overtime_hours_totals",
+                "constraints": [models.UniqueConstraint(fields=("employee", "span", "start_date"), name="uniq_overtime_hours_total_window")],
+            },
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
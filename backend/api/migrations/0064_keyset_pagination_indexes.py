@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0063_overtime_hours_total"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="overtimerequest",
+            index=models.Index(fields=["-request_date", "-created_at", "-id"], name="api_overtim_request_8ce339_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(fields=["-start", "-id"], name="api_calenda_start_59dd7f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["recipient", "is_archived", "-created_at", "-id"], name="api_notific_recipie_487037_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="useractivitylog",
+            index=models.Index(fields=["-timestamp", "-id"], name="user_activi_timesta_298f92_idx"),
+        ),
+    ]
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def _period_start(date):
+    if date.day >= 26:
+        return date.replace(day=26)
+    return (date.replace(day=1) - timedelta(days=1)).replace(day=26)
+
+
+def backfill_pay_period(apps, schema_editor):
+    OvertimeRequest = apps.get_model("api", "OvertimeRequest")
+
+    bounds = OvertimeRequest.objects.aggregate(first=Min("request_date"), last=Max("request_date"))
+    if bounds["first"] is None:
+        return
+    # One UPDATE per pay period
+    period_start = _period_start(bounds["first"])
+    while period_start <= bounds["last"]:
+        next_start = _period_start(period_start + timedelta(days=32))
+        OvertimeRequest.objects.filter(request_date__gte=period_start, request_date__lt=next_start).update(pay_period=period_start)
+        period_start = next_start
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0064_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="overtimerequest",
+            name="pay_period",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_pay_period, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="overtimerequest",
+            name="pay_period",
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="overtimerequest",
+            index=models.Index(fields=["pay_period", "department_code", "status"], name="api_overtim_pay_per_354945_idx"),
+        ),
+    ]
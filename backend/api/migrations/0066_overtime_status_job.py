@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0065_overtime_pay_period"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OvertimeStatusJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("target_status", models.CharField(choices=[("pending", "Pending"), ("approved", "Approved"), ("rejected", "Rejected")], max_length=20)),
+                ("requested_by_username", models.CharField(blank=True, max_length=150)),
+                ("request_ids", models.JSONField(blank=True, default=list)),
+                ("status", models.CharField(choices=[("queued", "Queued"), ("running", "Running"), ("completed", "Completed"), ("failed", "Failed")], db_index=True, default="queued", max_length=10)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("updated_count", models.PositiveIntegerField(default=0)),
+                ("notified_count", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("requested_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="overtime_status_jobs", to="api.externaluser")),
+            ],
+            options={
+                "verbose_name": "Overtime Status Job",
+                "verbose_name_plural": "Overtime Status Jobs",
+                "db_table": "overtime_status_jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -10,6 +10,7 @@
 from django.utils.dateparse import parse_datetime
 
 from .utils.excel_generator import ExcelGenerator
+from .utils.time_helpers import get_period_boundaries, get_period_start
 
 logger = logging.getLogger(__name__)
 
@@ -387,6 +388,8 @@ class Meta:
             models.Index(fields=["event_type", "start"]),
             models.Index(fields=["created_by", "start"]),
             models.Index(fields=["start", "end"]),
+            # Keyset pagination order (CalendarEventPagination)
+            models.Index(fields=["-start", "-id"]),
         ]
 
     def __str__(self):
@@ -477,6 +480,32 @@ def hash_token(token: str) -> str:
         return hashlib.sha256(token.encode()).hexdigest()
 
 
+class OvertimeRequestQuerySet(models.QuerySet):
+    """Overtime queries keyed on the stored pay period instead of request_date ranges."""
+
+    def in_period(self, date):
+        """Requests in the pay period containing ``date``."""
+        return self.filter(pay_period=get_period_start(date))
+
+    def in_periods(self, start_date, end_date):
+        """Requests in every pay period overlapping ``start_date``..``end_date``."""
+        return self.filter(pay_period__gte=get_period_start(start_date), pay_period__lte=get_period_start(end_date))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create() skips save(), so derive the pay period here
+        objs = list(objs)
+        for obj in objs:
+            if obj.request_date:
+                obj.pay_period = get_period_start(obj.request_date)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        # Keep the pay period in step when update() sets a concrete request_date
+        if isinstance(kwargs.get("request_date"), date):
+            kwargs.setdefault("pay_period", get_period_start(kwargs["request_date"]))
+        return super().update(**kwargs)
+
+
 class OvertimeRequest(TimestampedModel):
     STATUS_CHOICES = [
         ("pending", "Pending"),
@@ -492,6 +521,8 @@ class OvertimeRequest(TimestampedModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     project_name = models.CharField(max_length=50, blank=True)
     request_date = models.DateField()
+    # Start (26th) of the pay period containing request_date, derived on save
+    pay_period = models.DateField(editable=False)
     time_start = models.TimeField()
     time_end = models.TimeField()
     total_hours = models.DecimalField(max_digits=4, decimal_places=2)
@@ -513,6 +544,8 @@ class OvertimeRequest(TimestampedModel):
     status_changed_by = models.CharField(max_length=150, blank=True, help_text="Username of the user who last changed the status")
     rejected_at = models.DateTimeField(null=True, blank=True)
 
+    objects = OvertimeRequestQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         constraints = [
@@ -525,57 +558,137 @@ class Meta:
             models.Index(fields=["request_date", "department"]),
             models.Index(fields=["department_code"]),
             models.Index(fields=["employee", "request_date"]),
+            # Keyset pagination order (OvertimeRequestPagination)
+            models.Index(fields=["-request_date", "-created_at", "-id"]),
+            # Period reports and stats (OvertimeRequestQuerySet.in_period)
+            models.Index(fields=["pay_period", "department_code", "status"]),
         ]
 
     def __str__(self):
         return f"{self.employee.name} - {self.request_date}"
 
+    # Columns fetched for report exports; rows are formatted in memory instead of
+    # instantiating models and their related employee/project/department objects.
+    EXPORT_FIELDS = (
+        "id",
+        "employee__emp_id",
+        "employee__name",
+        "project__name",
+        "request_date",
+        "time_start",
+        "time_end",
+        "total_hours",
+        "has_break",
+        "break_start",
+        "break_end",
+        "break_hours",
+        "reason",
+        "detail",
+        "is_weekend",
+        "is_holiday",
+        "created_at",
+        "updated_at",
+        "department__code",
+        "department__name",
+    )
+
+    @classmethod
+    def _export_queryset(cls, **filters):
+        """Requests that appear in reports (rejected requests and excluded employees are left out)."""
+        return cls.objects.filter(**filters).exclude(status="rejected").exclude(employee__exclude_from_reports=True)
+
+    @classmethod
+    def _fetch_export_rows(cls, queryset):
+        """Evaluate ``queryset`` as plain export rows with their breaks attached (two queries)."""
+        rows = list(queryset.values(*cls.EXPORT_FIELDS))
+        if not rows:
+            return []
+
+        breaks_by_request = {}
+        breaks = OvertimeBreak.objects.filter(overtime_request_id__in=[row["id"] for row in rows]).order_by("id").values_list("overtime_request_id", "start_time", "end_time", "duration_hours")
+        for request_id, start_time, end_time, duration_hours in breaks:
+            breaks_by_request.setdefault(request_id, []).append(
+                {
+                    "start_time": start_time.strftime("%H:%M"),
+                    "end_time": end_time.strftime("%H:%M"),
+                    "duration_hours": str(duration_hours),
+                }
+            )
+        for row in rows:
+            row["breaks"] = breaks_by_request.get(row["id"], [])
+        return rows
+
+    @staticmethod
+    def _daily_export_record(row):
+        return {
+            "employee_id": row["employee__emp_id"],
+            "employee_name": row["employee__name"],
+            "project": row["project__name"],
+            "time_start": row["time_start"].strftime("%H:%M"),
+            "time_end": row["time_end"].strftime("%H:%M"),
+            "total_hours": str(row["total_hours"]),
+            "has_break": row["has_break"],
+            "breaks": row["breaks"],
+            "break_start": (row["break_start"].strftime("%H:%M") if row["break_start"] else None),
+            "break_end": (row["break_end"].strftime("%H:%M") if row["break_end"] else None),
+            "break_hours": (str(row["break_hours"]) if row["break_hours"] else None),
+            "reason": row["reason"],
+            "detail": row["detail"],
+            "is_weekend": row["is_weekend"],
+            "is_holiday": row["is_holiday"],
+            "created_at": timezone.localtime(row["created_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "updated_at": timezone.localtime(row["updated_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "department_code": row["department__code"],
+            "department_name": row["department__name"],
+        }
+
+    @staticmethod
+    def _monthly_export_record(row):
+        return {
+            "employee_id": row["employee__emp_id"],
+            "employee_name": row["employee__name"],
+            "project": row["project__name"],
+            "request_date": row["request_date"].strftime("%Y-%m-%d"),
+            "time_start": row["time_start"].strftime("%H:%M"),
+            "time_end": row["time_end"].strftime("%H:%M"),
+            "total_hours": str(row["total_hours"]),
+            "has_break": row["has_break"],
+            "breaks": row["breaks"],
+            "reason": row["reason"],
+            "detail": row["detail"],
+            "is_weekend": row["is_weekend"],
+            "is_holiday": row["is_holiday"],
+            "department_code": row["department__code"],
+            "department_name": row["department__name"],
+        }
+
+    @staticmethod
+    def _group_by_department(records):
+        """Group export records into the mapping the multi-sheet Excel builders expect."""
+        grouped = {}
+        for record in records:
+            dept_key = record.get("department_code") or ExcelGenerator.DEFAULT_DEPT_CODE
+            dept_name = record.get("department_name") or ExcelGenerator.DEFAULT_DEPT_NAME
+
+            if dept_key not in grouped:
+                grouped[dept_key] = {"dept_code": dept_key, "dept_name": dept_name, "data": []}
+
+            grouped[dept_key]["data"].append(record)
+
+        return grouped
+
     @classmethod
     def export_daily_data(cls, date):
         """Export daily overtime data for Excel generation (no JSON file).
         Rejected requests are excluded from all reports."""
         try:
-            # No need for select_for_update — this is a read-only export
-            daily_requests = list(cls.objects.filter(request_date=date).exclude(status="rejected").exclude(employee__exclude_from_reports=True).select_related("employee", "project", "department").prefetch_related("breaks").order_by("time_start"))
+            rows = cls._fetch_export_rows(cls._export_queryset(request_date=date).order_by("time_start", "id"))
 
             # If no data exists, return None
-            if not daily_requests:
+            if not rows:
                 return None
 
-            # Process data outside transaction
-            export_data = [
-                {
-                    "employee_id": request.employee.emp_id,
-                    "employee_name": request.employee.name,
-                    "project": request.project.name,
-                    "time_start": request.time_start.strftime("%H:%M"),
-                    "time_end": request.time_end.strftime("%H:%M"),
-                    "total_hours": str(request.total_hours),
-                    "has_break": request.has_break,
-                    "breaks": [
-                        {
-                            "start_time": break_obj.start_time.strftime("%H:%M"),
-                            "end_time": break_obj.end_time.strftime("%H:%M"),
-                            "duration_hours": str(break_obj.duration_hours),
-                        }
-                        for break_obj in request.breaks.all()
-                    ],
-                    "break_start": (request.break_start.strftime("%H:%M") if request.break_start else None),
-                    "break_end": (request.break_end.strftime("%H:%M") if request.break_end else None),
-                    "break_hours": (str(request.break_hours) if request.break_hours else None),
-                    "reason": request.reason,
-                    "detail": request.detail,
-                    "is_weekend": request.is_weekend,
-                    "is_holiday": request.is_holiday,
-                    "created_at": timezone.localtime(request.created_at).strftime("%Y-%m-%d %H:%M:%S"),
-                    "updated_at": timezone.localtime(request.updated_at).strftime("%Y-%m-%d %H:%M:%S"),
-                    "department_code": request.department.code if request.department else None,
-                    "department_name": request.department.name if request.department else None,
-                }
-                for request in daily_requests
-            ]
-
-            return export_data
+            return [cls._daily_export_record(row) for row in rows]
         except Exception as e:
             logger.error("Error exporting daily data: %s", e)
             raise
@@ -584,62 +697,17 @@ def export_daily_data(cls, date):
     def export_monthly_data(cls, date):
         """Export monthly overtime data for Excel generation"""
         try:
-            # Calculate period dates
-            current_period_start = date.replace(day=26)
-            if date.day < 26:
-                current_period_start = (date.replace(day=1) - timedelta(days=1)).replace(day=26)
-
-            next_period_end = (current_period_start + timedelta(days=32)).replace(day=25)
-
-            logger.debug("Exporting monthly data from %s to %s", current_period_start, next_period_end)
+            period_start, period_end = get_period_boundaries(date)
+            logger.debug("Exporting monthly data from %s to %s", period_start, period_end)
 
             # Get all requests in the period (rejected requests are excluded from reports)
-            monthly_requests = (
-                cls.objects.filter(
-                    request_date__gte=current_period_start,
-                    request_date__lte=next_period_end,
-                )
-                .exclude(status="rejected")
-                .exclude(employee__exclude_from_reports=True)
-                .select_related("employee", "project", "department")
-                .prefetch_related("breaks")
-                .order_by("request_date", "time_start")
-            )
+            rows = cls._fetch_export_rows(cls._export_queryset().in_period(date).order_by("request_date", "time_start", "id"))
 
-            if not monthly_requests.exists():
-                logger.debug("No monthly data found for period %s to %s", current_period_start, next_period_end)
+            if not rows:
+                logger.debug("No monthly data found for period %s to %s", period_start, period_end)
                 return None
 
-            # Process monthly data
-            monthly_data = [
-                {
-                    "employee_id": request.employee.emp_id,
-                    "employee_name": request.employee.name,
-                    "project": request.project.name,
-                    "request_date": request.request_date.strftime("%Y-%m-%d"),
-                    "time_start": request.time_start.strftime("%H:%M"),
-                    "time_end": request.time_end.strftime("%H:%M"),
-                    "total_hours": str(request.total_hours),
-                    "has_break": request.has_break,
-                    "breaks": [
-                        {
-                            "start_time": break_obj.start_time.strftime("%H:%M"),
-                            "end_time": break_obj.end_time.strftime("%H:%M"),
-                            "duration_hours": str(break_obj.duration_hours),
-                        }
-                        for break_obj in request.breaks.all()
-                    ],
-                    "reason": request.reason,
-                    "detail": request.detail,
-                    "is_weekend": request.is_weekend,
-                    "is_holiday": request.is_holiday,
-                    "department_code": request.department.code if request.department else None,
-                    "department_name": request.department.name if request.department else None,
-                }
-                for request in monthly_requests
-            ]
-
-            return monthly_data
+            return [cls._monthly_export_record(row) for row in rows]
         except Exception as e:
             logger.error("Error exporting monthly data: %s", e)
             raise
@@ -650,22 +718,7 @@ def export_daily_data_by_department(cls, date):
 
         Returns a mapping keyed by department code with dept metadata and row data list.
         """
-        data = cls.export_daily_data(date)
-        if not data:
-            return {}
-
-        # Group by department using data already included from export_daily_data
-        grouped = {}
-        for record in data:
-            dept_key = record.get("department_code") or ExcelGenerator.DEFAULT_DEPT_CODE
-            dept_name = record.get("department_name") or ExcelGenerator.DEFAULT_DEPT_NAME
-
-            if dept_key not in grouped:
-                grouped[dept_key] = {"dept_code": dept_key, "dept_name": dept_name, "data": []}
-
-            grouped[dept_key]["data"].append(record)
-
-        return grouped
+        return cls._group_by_department(cls.export_daily_data(date) or [])
 
     @classmethod
     def export_monthly_data_by_department(cls, date):
@@ -673,22 +726,33 @@ def export_monthly_data_by_department(cls, date):
 
         Returns a mapping keyed by department code with dept metadata and row data list.
         """
-        data = cls.export_monthly_data(date)
-        if not data:
-            return {}
+        return cls._group_by_department(cls.export_monthly_data(date) or [])
 
-        # Group by department using data already included from export_monthly_data
-        grouped = {}
-        for record in data:
-            dept_key = record.get("department_code") or ExcelGenerator.DEFAULT_DEPT_CODE
-            dept_name = record.get("department_name") or ExcelGenerator.DEFAULT_DEPT_NAME
-
-            if dept_key not in grouped:
-                grouped[dept_key] = {"dept_code": dept_key, "dept_name": dept_name, "data": []}
+    @classmethod
+    def export_period_data_by_department(cls, date, daily_dates=None):
+        """Export the daily and monthly department-grouped payloads from one period snapshot.
+
+        The whole pay period containing ``date`` is fetched once; the monthly payload
+        and the daily payload of each date in ``daily_dates`` (default: ``[date]``) are
+        derived from it in memory. Returns ``(daily_by_date, monthly)`` where
+        ``daily_by_date`` maps each requested date to its grouped payload (``{}`` when
+        the date has no reportable requests), matching
+        ``export_daily_data_by_department`` / ``export_monthly_data_by_department``.
+        """
+        daily_dates = [date] if daily_dates is None else list(daily_dates)
+        try:
+            rows = cls._fetch_export_rows(cls._export_queryset().in_period(date).order_by("request_date", "time_start", "id"))
+        except Exception as e:
+            logger.error("Error exporting period data: %s", e)
+            raise
 
-            grouped[dept_key]["data"].append(record)
+        rows_by_date = {}
+        for row in rows:
+            rows_by_date.setdefault(row["request_date"], []).append(row)
 
-        return grouped
+        daily_by_date = {day: cls._group_by_department(cls._daily_export_record(row) for row in rows_by_date.get(day, [])) for day in daily_dates}
+        monthly = cls._group_by_department(cls._monthly_export_record(row) for row in rows)
+        return daily_by_date, monthly
 
     @classmethod
     def _delete_files(cls, date):
@@ -721,6 +785,7 @@ def save(self, *args, **kwargs):
         logger.debug("Saving OvertimeRequest for date: %s", self.request_date)
 
         if self.request_date:
+            self.pay_period = get_period_start(self.request_date)
             self.is_weekend = (
                 calendar.weekday(
                     self.request_date.year,
@@ -806,6 +871,46 @@ def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
 
+class OvertimeDailyRollup(models.Model):
+    """
+    Pre-aggregated overtime hours per day, employee, project, department, status and day type.
+    Maintained from the OvertimeRequest save/delete signals and the bulk status endpoint
+    (see ``services.overtime_service``); the stats endpoints aggregate this table instead
+    of the raw requests. ``rebuild_overtime_rollup`` recomputes it from scratch.
+    """
+
+    request_date = models.DateField()
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="+")
+    employee_name = models.CharField(max_length=100, blank=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="+")
+    project_name = models.CharField(max_length=50, blank=True)
+    department_code = models.CharField(max_length=50, blank=True)
+    status = models.CharField(max_length=20, choices=OvertimeRequest.STATUS_CHOICES)
+    is_weekend = models.BooleanField(default=False)
+    is_holiday = models.BooleanField(default=False)
+    request_count = models.PositiveIntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "overtime_daily_rollups"
+        verbose_name = "Overtime Daily Rollup"
+        verbose_name_plural = "Overtime Daily Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["request_date", "employee", "project", "department_code", "status", "is_weekend", "is_holiday"],
+                name="uniq_overtime_daily_rollup_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["request_date", "status"]),
+            models.Index(fields=["employee", "request_date"]),
+            models.Index(fields=["project", "request_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_name} - {self.project_name} - {self.request_date} ({self.status})"
+
+
 class OvertimeRegulation(TimestampedModel):
     """Overtime regulations and rules for admin management (text-based)"""
 
@@ -868,6 +973,76 @@ def get_active(cls):
         return config
 
 
+class OvertimeHoursTotal(models.Model):
+    """
+    Running overtime hours of one employee over one limit window: a Mon-Sun week or a
+    26th-25th pay period. Only non-rejected requests count. Refreshed together with
+    OvertimeDailyRollup (see ``services.overtime_limit_service``); windows without
+    hours have no row.
+    """
+
+    SPAN_CHOICES = [
+        ("week", "Week (Mon-Sun)"),
+        ("period", "Pay period (26th-25th)"),
+    ]
+
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="+")
+    span = models.CharField(max_length=10, choices=SPAN_CHOICES)
+    start_date = models.DateField(help_text="Monday of the week or 26th opening the pay period")
+    total_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "overtime_hours_totals"
+        verbose_name = "Overtime Hours Total"
+        verbose_name_plural = "Overtime Hours Totals"
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "span", "start_date"], name="uniq_overtime_hours_total_window"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.span} from {self.start_date}: {self.total_hours}h"
+
+
+class OvertimeStatusJob(TimestampedModel):
+    """
+    A background bulk status change of overtime requests.
+
+    The selected request ids are stored on the job and processed in chunks by the
+    ``run_overtime_status_job`` task; progress counters are updated after every
+    chunk so the admin UI can poll them.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    target_status = models.CharField(max_length=20, choices=OvertimeRequest.STATUS_CHOICES)
+    requested_by = models.ForeignKey(ExternalUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="overtime_status_jobs")
+    # Username recorded as status_changed_by on the updated requests
+    requested_by_username = models.CharField(max_length=150, blank=True)
+    request_ids = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued", db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    notified_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "overtime_status_jobs"
+        verbose_name = "Overtime Status Job"
+        verbose_name_plural = "Overtime Status Jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.target_status} x{self.total} ({self.get_status_display()}, {self.processed}/{self.total})"
+
+
 class OvertimeRegulationDocument(TimestampedModel):
     """
     PDF document storage for overtime regulations.
@@ -1057,6 +1232,8 @@ class Meta:
             models.Index(fields=["recipient", "is_read", "-created_at"]),
             models.Index(fields=["recipient", "is_archived"]),
             models.Index(fields=["recipient", "is_archived", "-created_at"]),
+            # Keyset pagination order (NotificationPagination)
+            models.Index(fields=["recipient", "is_archived", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -1160,6 +1337,8 @@ class Meta:
             models.Index(fields=["-timestamp"]),
             models.Index(fields=["user", "-timestamp"]),
             models.Index(fields=["action", "-timestamp"]),
+            # Keyset pagination order (UserActivityLogPagination)
+            models.Index(fields=["-timestamp", "-id"]),
             models.Index(fields=["resource"]),
         ]
 
@@ -1859,6 +2038,74 @@ def get_active_config(cls):
     get_config = get_active_config
 
 
+class ExcelUploadFingerprint(TimestampedModel):
+    """
+    Fingerprint of the export payload behind the Excel file last uploaded to an SMB path.
+    ExcelGenerator skips rendering and uploading a report whose fingerprint is unchanged.
+    """
+
+    server = models.CharField(max_length=255, help_text="SMB server the file was uploaded to")
+    share_name = models.CharField(max_length=255)
+    remote_path = models.CharField(max_length=500, help_text="Path of the file on the SMB share")
+    fingerprint = models.CharField(max_length=64, help_text="Digest of the report payload that produced the file")
+    sheet_fingerprints = models.JSONField(default=dict, blank=True, help_text="Payload digest per department sheet")
+
+    class Meta:
+        db_table = "excel_upload_fingerprints"
+        verbose_name = "Excel Upload Fingerprint"
+        verbose_name_plural = "Excel Upload Fingerprints"
+        constraints = [
+            models.UniqueConstraint(fields=["server", "share_name", "remote_path"], name="uniq_excel_upload_fingerprint_path"),
+        ]
+
+    def __str__(self):
+        return f"{self.server}/{self.share_name}/{self.remote_path}"
+
+
+class PendingSMBUpload(TimestampedModel):
+    """
+    An SMB upload that failed (typically because someone has the file open) and waits
+    for a delayed retry. Records that run out of attempts stay as ``failed`` dead letters.
+    """
+
+    REASON_CHOICES = [
+        ("sharing_violation", "File open by another user"),
+        ("error", "Upload error"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("failed", "Failed"),
+    ]
+
+    server = models.CharField(max_length=255)
+    share_name = models.CharField(max_length=255)
+    remote_path = models.CharField(max_length=500, help_text="Path of the file on the SMB share")
+    content = models.BinaryField(help_text="File content to upload")
+    fingerprint = models.CharField(max_length=64, blank=True, help_text="Excel payload fingerprint recorded once the upload succeeds")
+    sheet_fingerprints = models.JSONField(default=dict, blank=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default="error", db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending", db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "pending_smb_uploads"
+        verbose_name = "Pending SMB Upload"
+        verbose_name_plural = "Pending SMB Uploads"
+        ordering = ["next_attempt_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["server", "share_name", "remote_path"], name="uniq_pending_smb_upload_path"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.remote_path} ({self.get_status_display()}, {self.attempts} attempt(s))"
+
+
 # ---------------------------------------------------------------------------
 # User Reports (Bug reports & Feature requests)
 # ---------------------------------------------------------------------------
@@ -6,6 +6,7 @@
 - CursorPagination: Cursor-based (better for large datasets)
 - LimitOffsetPagination: Limit/offset based
 - DynamicPagination: Paginate only if data exceeds threshold
+- KeysetPaginationMixin: Opt-in keyset (seek) mode for page-number paginators
 
 Features:
     - Configurable page size
@@ -15,8 +16,16 @@
     - Performance optimized
 """
 
+import base64
+import binascii
+import json
 import logging
+from functools import reduce
+from operator import or_
 
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
     CursorPagination as DRFCursorPagination,
 )
@@ -24,10 +33,103 @@
     PageNumberPagination as DRFPageNumberPagination,
 )
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 logger = logging.getLogger(__name__)
 
 
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset (seek) pagination for a page-number paginator.
+
+    Requests carrying ``?cursor=...`` (or ``?pagination=cursor`` for the first page)
+    are ordered by ``keyset_ordering`` and filtered to the rows after the last row of
+    the previous page, so deep pages cost the same as the first one: no COUNT query
+    and no OFFSET scan. Other requests keep the regular page-number behaviour.
+
+    ``keyset_ordering`` must end in a unique column (normally ``id``) and should be
+    backed by a composite index in the same order.
+
+    Response format (keyset mode):
+    {
+        "next": "http://api.example.com/items/?cursor=xxx",
+        "next_cursor": "xxx",
+        "previous": null,
+        "results": [...]
+    }
+    """
+
+    keyset_ordering = ("-id",)
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = self.cursor_query_param in request.query_params or request.query_params.get(self.mode_query_param) == "cursor"
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.keyset_ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._seek_filter(self._decode_cursor(cursor, queryset.model)))
+
+        # One extra row tells whether another page exists
+        rows = list(queryset[: page_size + 1])
+        self.next_cursor = self._encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "keyset_mode", False):
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "next_cursor": self.next_cursor, "previous": None, "results": data})
+
+    def get_next_link(self):
+        if not getattr(self, "keyset_mode", False):
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def _fields(self):
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.keyset_ordering]
+
+    def _seek_filter(self, values):
+        """Rows strictly after ``values`` in ``keyset_ordering``: a <= x & ((a < x) | (a = x & b < y) | ...)
+
+        The redundant leading bound is what lets Postgres use the composite index as a range scan;
+        it cannot derive one from the OR chain alone.
+        """
+        fields = self._fields()
+        clauses = []
+        for index, (name, descending) in enumerate(fields):
+            equal_prefix = {previous: values[position] for position, (previous, _) in enumerate(fields[:index])}
+            clauses.append(Q(**equal_prefix, **{f"{name}__{'lt' if descending else 'gt'}": values[index]}))
+        leading_name, leading_descending = fields[0]
+        return Q(**{f"{leading_name}__{'lte' if leading_descending else 'gte'}": values[0]}) & reduce(or_, clauses)
+
+    def _encode_cursor(self, obj):
+        values = []
+        for name, _ in self._fields():
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            # isoformat keeps full microsecond precision, which seeking on timestamps needs
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor, model):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError(cursor)
+            return [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values, strict=True)]
+        except (binascii.Error, ValueError, TypeError, ValidationError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+
 class StandardPageNumberPagination(DRFPageNumberPagination):
     """
     Standard page number pagination for list endpoints.
@@ -80,30 +182,45 @@ class ProjectPagination(DRFPageNumberPagination):
     max_page_size = 500
 
 
-class OvertimeRequestPagination(DRFPageNumberPagination):
+class OvertimeRequestPagination(KeysetPaginationMixin, DRFPageNumberPagination):
     """
     Pagination for overtime request list endpoint.
 
     - Default: 100 requests per page (larger history views)
     - Max: 500 requests per page
+    - ?pagination=cursor / ?cursor=...: keyset mode, newest request date first
     """
 
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 500
+    keyset_ordering = ("-request_date", "-created_at", "-id")
 
 
-class CalendarEventPagination(DRFPageNumberPagination):
+class CalendarEventPagination(KeysetPaginationMixin, DRFPageNumberPagination):
     """
     Pagination for calendar event list endpoint.
 
     - Default: 100 events per page
     - Max: 500 events per page
+    - ?pagination=cursor / ?cursor=...: keyset mode, latest start first
     """
 
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 500
+    keyset_ordering = ("-start", "-id")
+
+
+class UserActivityLogPagination(KeysetPaginationMixin, StandardPageNumberPagination):
+    """
+    Pagination for the activity log list endpoint.
+
+    - Same page sizes as StandardPageNumberPagination
+    - ?pagination=cursor / ?cursor=...: keyset mode, newest first
+    """
+
+    keyset_ordering = ("-timestamp", "-id")
 
 
 class SmallResultSetPagination(DRFPageNumberPagination):
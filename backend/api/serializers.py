@@ -41,6 +41,8 @@
     ALLOWED_LEAVE_NOTIFICATION_TEMPLATE_VARIABLES,
     find_unsupported_template_variables,
 )
+from .services.overtime_limit_service import check_request_limits
+from .services.reference_data_service import get_enabled_departments, get_enabled_employees
 
 
 def normalize_external_leave_agents(value):
@@ -184,7 +186,8 @@ def normalize_unified_leave_agents(value):
 
         raise serializers.ValidationError("Each agent must use type employee, external, or manual.")
 
-    employee_lookup = {employee.id: employee for employee in Employee.objects.filter(id__in=employee_ids, is_enabled=True).select_related("department")}
+    enabled_employees = get_enabled_employees()
+    employee_lookup = {employee_id: enabled_employees[employee_id] for employee_id in employee_ids if employee_id in enabled_employees}
     missing_employee_ids = [employee_id for employee_id in employee_ids if employee_id not in employee_lookup]
     if missing_employee_ids:
         raise serializers.ValidationError(f"Unknown or disabled employee agent ids: {', '.join(str(employee_id) for employee_id in missing_employee_ids)}.")
@@ -816,8 +819,27 @@ def validate(self, data):
         if errors:
             raise serializers.ValidationError(errors)
 
+        limit_errors = self._check_limits(data)
+        if limit_errors:
+            raise serializers.ValidationError({"total_hours": limit_errors})
+
         return data
 
+    def _check_limits(self, data):
+        """Weekly/monthly limit violations of the request as it would be saved.
+
+        Reads the precomputed OvertimeHoursTotal rows, so the check costs the same
+        regardless of how much overtime history the employee has.
+        """
+        instance = self.instance
+        employee = data.get("employee") or getattr(instance, "employee", None)
+        request_date = data.get("request_date") or getattr(instance, "request_date", None)
+        total_hours = data.get("total_hours", getattr(instance, "total_hours", None))
+        status = data.get("status") or getattr(instance, "status", "pending")
+        if not employee or not request_date or total_hours is None or status == "rejected":
+            return []
+        return check_request_limits(employee.pk, request_date, total_hours, instance=instance)
+
     def create(self, validated_data):
         # Note: grouped Excel export is handled in OvertimeRequest.save(); serializer remains thin.
         self._populate_denormalized_fields(validated_data)
@@ -859,6 +881,108 @@ def update(self, instance, validated_data):
         return instance
 
 
+class OvertimeListRowSerializer:
+    """Read-only list representation of overtime requests built from ``.values()`` rows.
+
+    Produces the same output as ``OvertimeSerializer`` for list pages without
+    instantiating models: names and department code come from the denormalized
+    columns on the request, the remaining related columns are fetched as scalars in
+    the same query, and breaks are loaded for the whole page in one extra query.
+    Values are rendered by ``OvertimeSerializer``'s own fields, so formats match.
+    """
+
+    # Output field -> column (``.values()`` lookup) it is read from
+    COLUMNS = {
+        "id": "id",
+        "employee": "employee_id",
+        "employee_name": "employee_name",
+        "employee_id": "employee_id",
+        "employee_emp_id": "employee__emp_id",
+        "department_code": "department_code",
+        "department_name": "department__name",
+        "project": "project_id",
+        "project_name": "project_name",
+        "request_date": "request_date",
+        "time_start": "time_start",
+        "time_end": "time_end",
+        "total_hours": "total_hours",
+        "has_break": "has_break",
+        "break_start": "break_start",
+        "break_end": "break_end",
+        "break_hours": "break_hours",
+        "reason": "reason",
+        "detail": "detail",
+        "is_holiday": "is_holiday",
+        "is_weekend": "is_weekend",
+        "status": "status",
+        "approved_by": "approved_by_id",
+        "approver_name": "approved_by__name",
+        "approved_at": "approved_at",
+        "rejection_reason": "rejection_reason",
+        "status_changed_by": "status_changed_by",
+        "rejected_at": "rejected_at",
+    }
+    # Extra columns the keyset paginator reads from each row
+    ORDERING_COLUMNS = ("created_at",)
+
+    _FORMATTED_FIELDS = (serializers.DateTimeField, serializers.DateField, serializers.TimeField, serializers.DecimalField)
+
+    @classmethod
+    def values_queryset(cls, queryset):
+        """``queryset`` as dict rows holding every column the representation needs."""
+        columns = dict.fromkeys([*cls.COLUMNS.values(), *cls.ORDERING_COLUMNS])
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    @property
+    def data(self):
+        fields = OvertimeSerializer().fields
+        break_fields = OvertimeBreakSerializer().fields
+        # (output key, column, formatter or None when the raw value is already JSON-ready)
+        plan = []
+        for key in OvertimeSerializer.Meta.fields:
+            if key == "breaks":
+                plan.append((key, None, None))
+                continue
+            field = fields[key]
+            plan.append((key, self.COLUMNS[key], field.to_representation if isinstance(field, self._FORMATTED_FIELDS) else None))
+
+        breaks = self._breaks([row["id"] for row in self.rows], break_fields)
+        results = []
+        for row in self.rows:
+            item = {}
+            for key, column, formatter in plan:
+                if column is None:
+                    item[key] = breaks.get(row["id"], [])
+                    continue
+                value = row[column]
+                item[key] = formatter(value) if formatter is not None and value is not None else value
+            results.append(item)
+        return results
+
+    @staticmethod
+    def _breaks(request_ids, break_fields):
+        """``{request_id: [break, ...]}`` for the page, in the order ``OvertimeSerializer`` lists them."""
+        if not request_ids:
+            return {}
+        start_time = break_fields["start_time"].to_representation
+        end_time = break_fields["end_time"].to_representation
+        grouped = {}
+        rows = OvertimeBreak.objects.filter(overtime_request_id__in=request_ids).order_by("overtime_request_id", "id")
+        for request_id, break_id, start, end, duration_hours in rows.values_list("overtime_request_id", "id", "start_time", "end_time", "duration_hours"):
+            grouped.setdefault(request_id, []).append(
+                {
+                    "id": break_id,
+                    "start_time": start_time(start),
+                    "end_time": end_time(end),
+                    "duration_minutes": int(float(duration_hours) * 60) if duration_hours else 0,
+                }
+            )
+        return grouped
+
+
 class OvertimeRegulationSerializer(serializers.ModelSerializer):
     class Meta:
         model = OvertimeRegulation
@@ -1274,7 +1398,7 @@ class Meta:
         read_only_fields = ["updated_at", "version", "build_date", "tab_icon_url", "sidebar_logo_url"]
 
     def _enabled_employee_lookup(self):
-        return {employee.id: employee for employee in Employee.objects.filter(is_enabled=True).select_related("department")}
+        return get_enabled_employees()
 
     def _validate_group_recipient_entry(self, value, *, field_name):
         if not isinstance(value, dict):
@@ -1468,7 +1592,7 @@ def validate_leave_notification_department_recipients(self, value):
         if not isinstance(value, list):
             raise serializers.ValidationError("Department recipients must be a list of department recipient mappings.")
 
-        department_lookup = {department.code.upper(): department for department in Department.objects.filter(is_enabled=True) if department.code}
+        department_lookup = get_enabled_departments()
         normalized = []
         seen_department_codes = set()
 
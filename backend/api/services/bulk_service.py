@@ -5,9 +5,11 @@
 import csv
 import io
 import logging
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from django.db import transaction
+from openpyxl import Workbook
 from rest_framework.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
@@ -53,6 +55,50 @@ def export_to_csv(queryset, fields: list[str], filename: str = "export.csv") ->
         output.seek(0)
         return output
 
+    @staticmethod
+    def stream_csv(headers: list[str], rows: Iterable[Iterable[Any]]) -> Iterator[str]:
+        """
+        Render rows as CSV one line at a time, for a StreamingHttpResponse.
+
+        Args:
+            headers: Header row
+            rows: Iterable of row value sequences (e.g. ``values_list(...).iterator()``)
+
+        Yields:
+            One CSV line per row, header first
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        yield buffer.getvalue()
+
+        for row in rows:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(["" if value is None else value for value in row])
+            yield buffer.getvalue()
+
+    @staticmethod
+    def write_xlsx(headers: list[str], rows: Iterable[Iterable[Any]], file_obj, title: str = "Export") -> None:
+        """
+        Write rows to ``file_obj`` as a single-sheet XLSX workbook.
+
+        Uses an openpyxl write-only workbook, which spools rows to disk as they are
+        appended, so memory stays flat regardless of the number of rows.
+
+        Args:
+            headers: Header row
+            rows: Iterable of row value sequences
+            file_obj: Binary file object the workbook is saved to
+            title: Sheet title
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=title[:31])
+        ws.append(headers)
+        for row in rows:
+            ws.append(list(row))
+        wb.save(file_obj)
+
     @staticmethod
     def import_from_csv(file_obj, serializer_class, max_rows: int = 1000, update_existing: bool = False, lookup_field: str = "id") -> dict[str, Any]:
         """
@@ -0,0 +1,147 @@
+"""
+Compact binary codecs for cached API payloads.
+
+CacheService stores large list responses (DRF ``response.data``: nested
+OrderedDicts, lists, strings, Decimals and dates) through the codec named by
+``settings.CACHE_PAYLOAD_CODEC``. The default ``MsgpackCodec`` writes plain
+msgpack maps instead of pickled OrderedDict objects and zlib-compresses blobs
+larger than ``CACHE_CODEC_COMPRESS_THRESHOLD`` bytes. Every blob starts with a
+one-byte format tag, so decoding never depends on the codec currently
+configured and new formats can be added without invalidating old entries.
+"""
+
+import pickle
+import uuid
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import cache as memoize
+
+import msgpack
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Format tags (first byte of every encoded blob)
+FORMAT_PICKLE = 0x00
+FORMAT_MSGPACK = 0x01
+FORMAT_MSGPACK_ZLIB = 0x02
+
+# msgpack extension types for values without a native msgpack representation
+EXT_DECIMAL = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+EXT_TIME = 4
+EXT_UUID = 5
+EXT_TABLE = 6
+
+_EXT_DECODERS = {
+    EXT_DECIMAL: Decimal,
+    EXT_DATETIME: datetime.fromisoformat,
+    EXT_DATE: date.fromisoformat,
+    EXT_TIME: time.fromisoformat,
+    EXT_UUID: uuid.UUID,
+}
+
+
+class _Table:
+    """A list of dicts sharing one key order, packed as a key row plus value rows."""
+
+    __slots__ = ("keys", "rows")
+
+    def __init__(self, keys, rows):
+        self.keys = keys
+        self.rows = rows
+
+
+def _tabulate(value):
+    """
+    Replace uniform lists of dicts (e.g. serialized result pages) with _Table.
+
+    Searches through containers down to the first such list; values inside a
+    table row are left to msgpack, which packs them natively in C.
+    """
+    if isinstance(value, dict):
+        return {key: _tabulate(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        if len(value) > 1 and isinstance(value[0], dict):
+            keys = tuple(value[0])
+            if all(isinstance(item, dict) and tuple(item) == keys for item in value):
+                return _Table(list(keys), [list(item.values()) for item in value])
+        return [_tabulate(item) for item in value]
+    return value
+
+
+def _default(value):
+    if isinstance(value, _Table):
+        return msgpack.ExtType(EXT_TABLE, msgpack.packb([value.keys, value.rows], default=_default, use_bin_type=True))
+    # datetime before date: a datetime is also a date
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(value).encode())
+    if isinstance(value, datetime):
+        return msgpack.ExtType(EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(EXT_DATE, value.isoformat().encode())
+    if isinstance(value, time):
+        return msgpack.ExtType(EXT_TIME, value.isoformat().encode())
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(EXT_UUID, str(value).encode())
+    raise TypeError(f"Cannot encode {type(value).__name__} for the cache")
+
+
+def _ext_hook(code, data):
+    if code == EXT_TABLE:
+        keys, rows = msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+        return [dict(zip(keys, row, strict=True)) for row in rows]
+    decoder = _EXT_DECODERS.get(code)
+    return decoder(data.decode()) if decoder else msgpack.ExtType(code, data)
+
+
+class PickleCodec:
+    """Pickle passthrough: exact Python types, largest blobs."""
+
+    def encode(self, value) -> bytes:
+        return bytes([FORMAT_PICKLE]) + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+class MsgpackCodec:
+    """
+    msgpack with zlib above a size threshold.
+
+    Lists of dicts with identical keys (result pages) are stored as one key
+    row plus value rows, so field names are not repeated per record.
+    Mappings decode as plain dicts and tuples as lists, which is all a
+    rendered API response needs.
+    """
+
+    def __init__(self, compress_threshold: int | None = None, level: int = 6):
+        self.compress_threshold = getattr(settings, "CACHE_CODEC_COMPRESS_THRESHOLD", 1024) if compress_threshold is None else compress_threshold
+        self.level = level
+
+    def encode(self, value) -> bytes:
+        packed = msgpack.packb(_tabulate(value), default=_default, use_bin_type=True)
+        if 0 < self.compress_threshold < len(packed):
+            return bytes([FORMAT_MSGPACK_ZLIB]) + zlib.compress(packed, self.level)
+        return bytes([FORMAT_MSGPACK]) + packed
+
+
+def decode(blob: bytes):
+    """Decode a blob written by any codec in this module."""
+    tag, body = blob[0], memoryview(blob)[1:]
+    if tag == FORMAT_MSGPACK_ZLIB:
+        return msgpack.unpackb(zlib.decompress(body), ext_hook=_ext_hook, raw=False, strict_map_key=False)
+    if tag == FORMAT_MSGPACK:
+        return msgpack.unpackb(body, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+    if tag == FORMAT_PICKLE:
+        return pickle.loads(body)
+    raise ValueError(f"Unknown cache payload format {tag:#04x}")
+
+
+@memoize
+def get_codec():
+    """The codec instance configured by ``settings.CACHE_PAYLOAD_CODEC``."""
+    return import_string(getattr(settings, "CACHE_PAYLOAD_CODEC", "api.services.cache_codec.MsgpackCodec"))()
+
+
+def encode(value) -> bytes:
+    """Encode ``value`` with the configured codec."""
+    return get_codec().encode(value)
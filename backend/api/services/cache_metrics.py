@@ -0,0 +1,206 @@
+"""
+Hit/miss counters and latency histograms for CacheService.
+
+Every cache operation is recorded per view name and operation (get, set,
+invalidate) in a process-local table. Each process periodically adds its
+table to a shared aggregate in Redis (HINCRBY on two hashes) and resets it,
+so the aggregate covers all web and Celery processes. Backends without a raw
+Redis client (LocMem in tests and local development) fall back to a
+read-modify-write of one cache key, which is only exact for a single process.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000, math.inf)
+
+# Redis hashes (or the cache key of the fallback) holding the aggregate
+COUNTERS_KEY = "cache_metrics:counters"
+LATENCY_KEY = "cache_metrics:latency"
+FALLBACK_KEY = "cache_metrics:aggregate"
+
+# Outcomes counted as a served read when computing hit ratios
+HIT_OUTCOMES = ("hit", "hit_local", "hit_shared", "stale", "waited", "not_modified")
+MISS_OUTCOMES = ("miss",)
+
+
+def _bucket_label(bound) -> str:
+    return "+Inf" if bound == math.inf else f"{bound:g}"
+
+
+def _redis_connection():
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
+
+class CacheMetrics:
+    """Process-local metrics table, flushed into the shared aggregate."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+        self._last_flush = time.monotonic()
+
+    def _reset(self):
+        # "view|operation|outcome" -> count
+        self._counters = defaultdict(int)
+        # "view|operation|bucket" -> count, plus "view|operation|sum_us"
+        self._latency = defaultdict(int)
+
+    def record(self, view_name: str, operation: str, outcome: str, seconds: float) -> None:
+        """Count one ``operation`` on ``view_name`` with ``outcome`` that took ``seconds``."""
+        if not getattr(settings, "CACHE_METRICS_ENABLED", True):
+            return
+        elapsed_ms = seconds * 1000
+        bucket = next(bound for bound in LATENCY_BUCKETS_MS if elapsed_ms <= bound)
+        prefix = f"{view_name}|{operation}"
+        with self._lock:
+            self._counters[f"{prefix}|{outcome}"] += 1
+            self._latency[f"{prefix}|{_bucket_label(bucket)}"] += 1
+            self._latency[f"{prefix}|sum_us"] += round(elapsed_ms * 1000)
+            due = time.monotonic() - self._last_flush >= getattr(settings, "CACHE_METRICS_FLUSH_SECONDS", 10)
+        if due:
+            self.flush()
+
+    def _take(self):
+        with self._lock:
+            counters, latency = self._counters, self._latency
+            self._reset()
+            self._last_flush = time.monotonic()
+        return counters, latency
+
+    def flush(self) -> None:
+        """Add this process's table to the shared aggregate and start a new one."""
+        counters, latency = self._take()
+        if not counters:
+            return
+        try:
+            connection = _redis_connection()
+            if connection is not None:
+                pipeline = connection.pipeline(transaction=False)
+                for field, count in counters.items():
+                    pipeline.hincrby(COUNTERS_KEY, field, count)
+                for field, count in latency.items():
+                    pipeline.hincrby(LATENCY_KEY, field, count)
+                pipeline.execute()
+            else:
+                aggregate = cache.get(FALLBACK_KEY) or {"counters": {}, "latency": {}}
+                for table, values in (("counters", counters), ("latency", latency)):
+                    for field, count in values.items():
+                        aggregate[table][field] = aggregate[table].get(field, 0) + count
+                cache.set(FALLBACK_KEY, aggregate, None)
+        except Exception as e:
+            # Metrics are best-effort: drop this interval rather than fail the request
+            logger.warning("Failed to flush cache metrics: %s", e)
+
+    def local_tables(self):
+        with self._lock:
+            return dict(self._counters), dict(self._latency)
+
+    @staticmethod
+    def shared_tables():
+        connection = _redis_connection()
+        if connection is not None:
+            decode = lambda table: {field.decode(): int(count) for field, count in table.items()}  # noqa: E731
+            return decode(connection.hgetall(COUNTERS_KEY)), decode(connection.hgetall(LATENCY_KEY))
+        aggregate = cache.get(FALLBACK_KEY) or {"counters": {}, "latency": {}}
+        return aggregate["counters"], aggregate["latency"]
+
+    def reset(self) -> None:
+        """Clear this process's table and the shared aggregate."""
+        self._take()
+        connection = _redis_connection()
+        if connection is not None:
+            connection.delete(COUNTERS_KEY, LATENCY_KEY)
+        else:
+            cache.delete(FALLBACK_KEY)
+
+    def snapshot(self, scope: str = "all") -> dict:
+        """
+        Summarise the metrics by view and operation.
+
+        ``scope="all"`` flushes this process first and reads the shared
+        aggregate; ``scope="process"`` reads only this process's unflushed table.
+        """
+        if scope == "process":
+            counters, latency = self.local_tables()
+        else:
+            self.flush()
+            counters, latency = self.shared_tables()
+        return summarise(counters, latency)
+
+
+def _percentile(buckets: dict, count: int, quantile: float):
+    """Upper bound (ms) of the histogram bucket holding the ``quantile`` observation."""
+    if not count:
+        return None
+    target, seen = quantile * count, 0
+    for bound in LATENCY_BUCKETS_MS:
+        seen += buckets.get(_bucket_label(bound), 0)
+        if seen >= target:
+            return None if bound == math.inf else bound
+    return None
+
+
+def summarise(counters: dict, latency: dict) -> dict:
+    """Turn flat ``view|operation|outcome`` tables into per-view summaries."""
+    views = defaultdict(lambda: defaultdict(lambda: {"outcomes": {}, "latency_buckets": {}, "sum_us": 0}))
+    for field, count in counters.items():
+        view_name, operation, outcome = field.rsplit("|", 2)
+        views[view_name][operation]["outcomes"][outcome] = count
+    for field, count in latency.items():
+        view_name, operation, label = field.rsplit("|", 2)
+        if label == "sum_us":
+            views[view_name][operation]["sum_us"] = count
+        else:
+            views[view_name][operation]["latency_buckets"][label] = count
+
+    summary = {}
+    for view_name, operations in sorted(views.items()):
+        summary[view_name] = {}
+        for operation, data in sorted(operations.items()):
+            outcomes = data["outcomes"]
+            count = sum(outcomes.values())
+            entry = {
+                "count": count,
+                "outcomes": outcomes,
+                "latency_ms": {
+                    "avg": round(data["sum_us"] / count / 1000, 3) if count else None,
+                    "p50": _percentile(data["latency_buckets"], count, 0.5),
+                    "p95": _percentile(data["latency_buckets"], count, 0.95),
+                    "p99": _percentile(data["latency_buckets"], count, 0.99),
+                    "buckets": {_bucket_label(bound): data["latency_buckets"].get(_bucket_label(bound), 0) for bound in LATENCY_BUCKETS_MS},
+                },
+            }
+            if operation == "get":
+                hits = sum(outcomes.get(outcome, 0) for outcome in HIT_OUTCOMES)
+                misses = sum(outcomes.get(outcome, 0) for outcome in MISS_OUTCOMES)
+                entry["hit_ratio"] = round(hits / (hits + misses), 4) if hits + misses else None
+            summary[view_name][operation] = entry
+    return summary
+
+
+def overall_hit_ratio(summary: dict) -> dict:
+    """Total hits, misses and hit ratio of all ``get`` operations in a snapshot."""
+    hits = misses = 0
+    for operations in summary.values():
+        outcomes = operations.get("get", {}).get("outcomes", {})
+        hits += sum(outcomes.get(outcome, 0) for outcome in HIT_OUTCOMES)
+        misses += sum(outcomes.get(outcome, 0) for outcome in MISS_OUTCOMES)
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None}
+
+
+cache_metrics = CacheMetrics()
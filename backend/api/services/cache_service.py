@@ -4,11 +4,15 @@
 This service provides:
 - High-level cache operations (set/get/delete/invalidate)
 - Decorator for caching list view responses
+- Two-tier (process-local LRU + Redis) cache for hot reference data, kept
+  coherent across processes through a Redis pub/sub invalidation channel
+- Compact msgpack/zlib encoding of cached list payloads (see cache_codec)
 - Cache statistics and monitoring
 - Graceful handling of cache failures
 
 Features:
 - Automatic cache key generation
+- O(1) per-view invalidation through generation counters embedded in keys
 - TTL (Time To Live) configuration per view
 - Cache hit/miss logging
 - Fail-open behavior (returns data even if cache fails)
@@ -17,14 +21,128 @@
 import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import wraps
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from rest_framework.response import Response
 
+from . import cache_codec
+from .cache_metrics import cache_metrics, overall_hit_ratio
+
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+def _record(view_name: str, operation: str, outcome: str, started: float) -> None:
+    """Record a cache operation that began at ``started`` (perf_counter) in the metrics."""
+    cache_metrics.record(view_name, operation, outcome, time.perf_counter() - started)
+
+
+class LocalLRUCache:
+    """
+    Bounded, thread-safe, per-process LRU with a per-entry TTL.
+
+    Used as the first tier of CacheService.get_reference(): a hit is a dict
+    lookup with no network round trip.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+local_cache = LocalLRUCache(getattr(settings, "REFERENCE_CACHE_MAX_ENTRIES", 256))
+
+# Listener thread state: one subscriber per process, restarted after fork
+_listener_lock = threading.Lock()
+_listener_pid: int | None = None
+
+
+def _redis_connection():
+    """Raw Redis client behind the default cache, or None for non-Redis backends."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
+
+def _listen_for_invalidations():
+    """Evict local reference entries named on the invalidation channel, reconnecting on failure."""
+    backoff = 1
+    while True:
+        try:
+            pubsub = _redis_connection().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CacheService.INVALIDATION_CHANNEL)
+            # Invalidations published while disconnected were missed
+            local_cache.clear()
+            backoff = 1
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                name = message["data"].decode() if isinstance(message["data"], bytes) else str(message["data"])
+                local_cache.delete(name)
+        except Exception as e:
+            logger.warning("Reference cache invalidation listener disconnected: %s (retrying in %ss)", e, backoff)
+            local_cache.clear()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+
+def _ensure_invalidation_listener() -> None:
+    """Start this process's invalidation subscriber on first use (and again in forked children)."""
+    global _listener_pid
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+        if _redis_connection() is not None:
+            threading.Thread(target=_listen_for_invalidations, name="reference-cache-invalidation", daemon=True).start()
+        _listener_pid = pid
+
 
 class CacheService:
     """
@@ -38,6 +156,23 @@ class CacheService:
     PREFIX_LIST = "list"
     PREFIX_OBJECT = "obj"
     PREFIX_CUSTOM = "custom"
+    PREFIX_REFERENCE = "ref"
+    PREFIX_STALE = "stale"
+
+    # Single-flight recomputation of missing list entries (seconds)
+    LIST_LOCK_TIMEOUT = 30
+    LIST_LOCK_WAIT = 5
+    LIST_LOCK_POLL_INTERVAL = 0.05
+    # Stale copies outlive the current entry by this factor of its TTL
+    STALE_TTL_FACTOR = 2
+
+    # Pub/sub channel carrying the names of invalidated reference entries
+    INVALIDATION_CHANNEL = "cache:invalidate"
+
+    # Per-view generation counter. Every key of a view embeds its current value, so
+    # bumping it orphans all of the view's entries at once (they age out by TTL)
+    # instead of scanning the keyspace for them.
+    GENERATION_KEY = "cache_gen:{view_name}"
 
     # Default TTL values (seconds) per endpoint
     DEFAULT_TTLS = {
@@ -45,29 +180,63 @@ class CacheService:
         "projects": 3600,  # 1 hour
         "overtime_requests": 300,  # 5 minutes (changes frequently)
         "calendar_events": 600,  # 10 minutes
+        "departments": 3600,  # 1 hour
         "default": 1800,  # 30 minutes
     }
 
+    @staticmethod
+    def get_generation(view_name: str):
+        """
+        Return the current generation of a view, initialising it if missing.
+
+        A missing counter (never set or evicted) starts from a nanosecond
+        timestamp, so no entry cached under an earlier generation can match.
+        """
+        key = CacheService.GENERATION_KEY.format(view_name=view_name)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), None)
+            generation = cache.get(key)
+        return generation
+
+    @staticmethod
+    def bump_generation(view_name: str) -> None:
+        """Move a view on to a new generation, invalidating every entry cached for it."""
+        key = CacheService.GENERATION_KEY.format(view_name=view_name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing: start from a fresh value that no cached entry can carry
+            cache.set(key, time.time_ns(), None)
+
     @staticmethod
     def generate_cache_key(
         prefix: str,
         view_name: str,
         query_params: dict | None = None,
         user_id: int | None = None,
+        versioned: bool = True,
     ) -> str:
         """
         Generate a unique cache key for a request.
 
+        The key embeds the view's current generation, so it changes whenever
+        the view is invalidated with invalidate_all_for_view().
+
         Args:
             prefix: Type of cache (list, obj, custom)
             view_name: Name of the view/endpoint
             query_params: Query parameters to include in key
             user_id: User ID (if user-specific cache)
+            versioned: Embed the view's generation (False for keys that must
+                survive invalidation, such as stale copies)
 
         Returns:
             Unique cache key string
         """
         key_parts = [prefix, view_name]
+        if versioned:
+            key_parts.append(f"g{CacheService.get_generation(view_name)}")
 
         if user_id:
             key_parts.append(f"user_{user_id}")
@@ -103,6 +272,7 @@ def set_list(
         Returns:
             True if successfully cached, False otherwise
         """
+        started = time.perf_counter()
         try:
             cache_key = CacheService.generate_cache_key(
                 CacheService.PREFIX_LIST,
@@ -112,10 +282,12 @@ def set_list(
             )
 
             ttl = ttl or CacheService.DEFAULT_TTLS.get(view_name, CacheService.DEFAULT_TTLS["default"])
-            cache.set(cache_key, data, timeout=ttl)
+            cache.set(cache_key, cache_codec.encode(data), timeout=ttl)
+            _record(view_name, "set", "ok", started)
             logger.info("Cached list '%s' for %ss (key: %s)", view_name, ttl, cache_key)
             return True
         except Exception as e:
+            _record(view_name, "set", "error", started)
             logger.warning("Failed to cache list '%s': %s", view_name, e)
             return False
 
@@ -136,6 +308,7 @@ def get_list(
         Returns:
             Cached list data or None if not found
         """
+        started = time.perf_counter()
         try:
             cache_key = CacheService.generate_cache_key(
                 CacheService.PREFIX_LIST,
@@ -146,11 +319,14 @@ def get_list(
 
             data = cache.get(cache_key)
             if data is not None:
+                _record(view_name, "get", "hit", started)
                 logger.debug("Cache HIT for list '%s'", view_name)
-                return data
+                return cache_codec.decode(data)
+            _record(view_name, "get", "miss", started)
             logger.debug("Cache MISS for list '%s'", view_name)
             return None
         except Exception as e:
+            _record(view_name, "get", "error", started)
             logger.warning("Failed to retrieve cached list '%s': %s", view_name, e)
             return None
 
@@ -173,6 +349,7 @@ def set_object(
         Returns:
             True if successfully cached
         """
+        started = time.perf_counter()
         try:
             cache_key = CacheService.generate_cache_key(
                 CacheService.PREFIX_OBJECT,
@@ -182,9 +359,11 @@ def set_object(
 
             ttl = ttl or CacheService.DEFAULT_TTLS.get(view_name, CacheService.DEFAULT_TTLS["default"])
             cache.set(cache_key, data, timeout=ttl)
+            _record(view_name, "set", "ok", started)
             logger.debug("Cached object '%s:%s'", view_name, obj_id)
             return True
         except Exception as e:
+            _record(view_name, "set", "error", started)
             logger.warning("Failed to cache object '%s:%s': %s", view_name, obj_id, e)
             return False
 
@@ -200,14 +379,18 @@ def get_object(view_name: str, obj_id: int) -> dict | None:
         Returns:
             Cached object data or None
         """
+        started = time.perf_counter()
         try:
             cache_key = CacheService.generate_cache_key(
                 CacheService.PREFIX_OBJECT,
                 view_name,
             )
             cache_key = f"{cache_key}:{obj_id}"
-            return cache.get(cache_key)
+            data = cache.get(cache_key)
+            _record(view_name, "get", "miss" if data is None else "hit", started)
+            return data
         except Exception as e:
+            _record(view_name, "get", "error", started)
             logger.warning("Failed to retrieve cached object '%s:%s': %s", view_name, obj_id, e)
             return None
 
@@ -230,6 +413,7 @@ def invalidate(
         Returns:
             True if successfully invalidated
         """
+        started = time.perf_counter()
         try:
             cache_key = CacheService.generate_cache_key(
                 cache_type,
@@ -238,9 +422,11 @@ def invalidate(
                 user_id,
             )
             cache.delete(cache_key)
+            _record(view_name, "invalidate", "ok", started)
             logger.info("Invalidated cache for '%s' (key: %s)", view_name, cache_key)
             return True
         except Exception as e:
+            _record(view_name, "invalidate", "error", started)
             logger.warning("Failed to invalidate cache for '%s': %s", view_name, e)
             return False
 
@@ -249,37 +435,115 @@ def invalidate_all_for_view(view_name: str) -> int:
         """
         Invalidate all cache entries for a specific view.
 
-        Uses django-redis's delete_pattern() for wildcard key deletion.
-        Falls back to deleting known prefixed keys if delete_pattern
-        is not available on the cache backend.
+        Bumps the view's generation counter: a single INCR regardless of how
+        many keys the cache holds. Entries written under the old generation
+        are no longer reachable and expire by their TTL. Inside a transaction
+        the counter is bumped again on commit, so an entry a concurrent
+        request built from the pre-commit rows is orphaned as well.
 
         Args:
             view_name: Name of the view
 
         Returns:
-            Number of entries deleted (approximate)
+            1 if the view was invalidated, 0 on failure
         """
-        deleted = 0
+        started = time.perf_counter()
         try:
-            # django-redis supports delete_pattern with glob-style wildcards
-            if hasattr(cache, "delete_pattern"):
-                for prefix in (CacheService.PREFIX_LIST, CacheService.PREFIX_OBJECT, CacheService.PREFIX_CUSTOM):
-                    pattern = f"*{prefix}:{view_name}*"
-                    cache.delete_pattern(pattern)
-                    deleted += 1  # approximate — delete_pattern doesn't return count
-                logger.info("Invalidated all cache for '%s' via delete_pattern", view_name)
-            else:
-                # Fallback: delete the known prefixed keys (no wildcard)
-                for prefix in (CacheService.PREFIX_LIST, CacheService.PREFIX_OBJECT, CacheService.PREFIX_CUSTOM):
-                    key = f"{prefix}:{view_name}"
-                    if cache.delete(key):
-                        deleted += 1
-                logger.info("Invalidated %d cache key(s) for '%s' (no delete_pattern support)", deleted, view_name)
-            return max(deleted, 1)
+            CacheService.bump_generation(view_name)
+            if not transaction.get_autocommit():
+                transaction.on_commit(lambda: CacheService.bump_generation(view_name))
+            _record(view_name, "invalidate", "ok", started)
+            logger.info("Invalidated all cache for '%s'", view_name)
+            return 1
         except Exception as e:
+            _record(view_name, "invalidate", "error", started)
             logger.warning("Failed to invalidate all cache for '%s': %s", view_name, e)
             return 0
 
+    @staticmethod
+    def get_reference(name: str, loader: Callable, shared: bool = True):
+        """
+        Return hot reference data through the process-local LRU and Redis.
+
+        Lookups hit the local LRU first (REFERENCE_CACHE_LOCAL_TTL), then
+        Redis (REFERENCE_CACHE_SHARED_TTL), and call ``loader`` only when both
+        miss. Entries are dropped everywhere by invalidate_reference(). Values
+        are shared between callers and must be treated as read-only.
+
+        Args:
+            name: Reference entry name, also its invalidation key
+            loader: Zero-argument callable building the value from the database
+            shared: Also keep the value in Redis; pass False for values that
+                must not leave the process (e.g. decrypted credentials)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        local_ttl = getattr(settings, "REFERENCE_CACHE_LOCAL_TTL", 30)
+        shared_ttl = getattr(settings, "REFERENCE_CACHE_SHARED_TTL", 600)
+        if local_ttl <= 0:
+            return loader()
+
+        _ensure_invalidation_listener()
+        started = time.perf_counter()
+        value = local_cache.get(name, _MISSING)
+        if value is not _MISSING:
+            _record(name, "get", "hit_local", started)
+            return value
+
+        cache_key = None
+        if shared and shared_ttl > 0:
+            try:
+                cache_key = CacheService.generate_cache_key(CacheService.PREFIX_REFERENCE, name)
+                value = cache.get(cache_key, _MISSING)
+            except Exception as e:
+                logger.warning("Failed to read reference '%s' from cache: %s", name, e)
+                cache_key, value = None, _MISSING
+
+        if value is _MISSING:
+            value = loader()
+            _record(name, "get", "miss", started)
+            if cache_key is not None:
+                started = time.perf_counter()
+                try:
+                    cache.set(cache_key, value, timeout=shared_ttl)
+                    _record(name, "set", "ok", started)
+                except Exception as e:
+                    _record(name, "set", "error", started)
+                    logger.warning("Failed to cache reference '%s': %s", name, e)
+        else:
+            _record(name, "get", "hit_shared", started)
+
+        local_cache.set(name, value, local_ttl)
+        return value
+
+    @staticmethod
+    def invalidate_reference(name: str) -> None:
+        """
+        Drop a reference entry from Redis and from every process's local LRU.
+
+        The local copy is dropped immediately; the shared generation bump and
+        the pub/sub broadcast run once the surrounding transaction commits, so
+        no process reloads the pre-commit value in between.
+        """
+        local_cache.delete(name)
+
+        def _broadcast():
+            local_cache.delete(name)
+            started = time.perf_counter()
+            try:
+                CacheService.bump_generation(name)
+                connection = _redis_connection()
+                if connection is not None:
+                    connection.publish(CacheService.INVALIDATION_CHANNEL, name)
+                _record(name, "invalidate", "ok", started)
+            except Exception as e:
+                _record(name, "invalidate", "error", started)
+                # Other processes converge within REFERENCE_CACHE_LOCAL_TTL
+                logger.warning("Failed to broadcast reference invalidation for '%s': %s", name, e)
+
+        transaction.on_commit(_broadcast)
+
     @staticmethod
     def get_stats() -> dict:
         """
@@ -293,12 +557,37 @@ def get_stats() -> dict:
             return {
                 "status": "ok",
                 "backend": cache.__class__.__name__,
+                "metrics": overall_hit_ratio(cache_metrics.snapshot()),
             }
         except Exception as e:
             logger.error("Failed to get cache stats: %s", e)
             return {"status": "error", "message": str(e)}
 
 
+def _response_etag(data) -> str:
+    """Strong ETag for a cached response body."""
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match", "")
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")) or if_none_match.strip() == "*"
+
+
+def _cached_response(request, entry: dict, view_name: str, outcome: str, started: float) -> Response:
+    """Serve a cached ``{"etag", "data"}`` entry, as a bodiless 304 if the client already has it."""
+    if _etag_matches(request, entry["etag"]):
+        # Nothing to decode or render
+        response = Response(status=304)
+        outcome = "not_modified"
+    else:
+        response = Response(cache_codec.decode(entry["data"]))
+    response["ETag"] = entry["etag"]
+    _record(view_name, "get", outcome, started)
+    return response
+
+
 def cached_list(
     view_name: str,
     ttl: int | None = None,
@@ -307,6 +596,12 @@ def cached_list(
     """
     Decorator for caching list view responses.
 
+    Payloads are stored through the compact codec in cache_codec and decoded
+    only when a body is actually sent. Responses carry an ETag; a request whose If-None-Match matches the cached
+    entry gets a 304 without its body being rendered. Misses are single-flight:
+    one worker recomputes a key under a short lock while concurrent requests
+    serve the previous (stale) copy, or wait for the new one if there is none.
+
     Usage:
         @cached_list('employees', ttl=3600)
         def list(self, request, *args, **kwargs):
@@ -328,30 +623,72 @@ def wrapper(self, request, *args, **kwargs):
                 # Determine cache key components
                 user_id = request.user.id if user_specific and request.user.is_authenticated else None
                 query_params = dict(request.query_params) if request.query_params else None
+                timeout = ttl or CacheService.DEFAULT_TTLS.get(view_name, CacheService.DEFAULT_TTLS["default"])
+
+                # Resolve the key once, before querying: a write landing while the
+                # response is built bumps the generation, so the result is stored
+                # under the old generation instead of being served as current.
+                cache_key = CacheService.generate_cache_key(CacheService.PREFIX_LIST, view_name, query_params, user_id)
+                # Last good copy across generations, served while a miss is recomputed
+                stale_key = CacheService.generate_cache_key(CacheService.PREFIX_STALE, view_name, query_params, user_id, versioned=False)
+                lock_key = f"lock:{cache_key}"
+            except Exception as e:
+                logger.error("Error in cached_list decorator for '%s': %s", view_name, e)
+                return func(self, request, *args, **kwargs)
 
-                # Try to get from cache
-                cached_data = CacheService.get_list(view_name, query_params, user_id)
-                if cached_data is not None:
-                    return Response(cached_data)
+            started = time.perf_counter()
+            try:
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    logger.debug("Cache HIT for list '%s'", view_name)
+                    return _cached_response(request, entry, view_name, "hit", started)
+
+                locked = cache.add(lock_key, 1, timeout=CacheService.LIST_LOCK_TIMEOUT)
+                if not locked:
+                    stale = cache.get(stale_key)
+                    if stale is not None:
+                        logger.debug("Serving stale list '%s' while it is recomputed", view_name)
+                        return _cached_response(request, stale, view_name, "stale", started)
+                    deadline = time.monotonic() + CacheService.LIST_LOCK_WAIT
+                    while time.monotonic() < deadline:
+                        time.sleep(CacheService.LIST_LOCK_POLL_INTERVAL)
+                        entry = cache.get(cache_key)
+                        if entry is not None:
+                            return _cached_response(request, entry, view_name, "waited", started)
+                    # The recomputing worker is slow or gone: compute without caching
+                    logger.debug("Timed out waiting for list '%s' to be recomputed", view_name)
+                _record(view_name, "get", "miss", started)
+            except Exception as e:
+                # Fail-open: return uncached response on any error
+                _record(view_name, "get", "error", started)
+                logger.error("Error in cached_list decorator for '%s': %s", view_name, e)
+                return func(self, request, *args, **kwargs)
 
+            if not locked:
+                return func(self, request, *args, **kwargs)
+
+            try:
                 # Call the original view
                 response = func(self, request, *args, **kwargs)
 
                 # Cache the response data if successful
                 if response.status_code == 200 and response.data:
-                    CacheService.set_list(
-                        view_name,
-                        response.data,
-                        query_params,
-                        user_id,
-                        ttl,
-                    )
-
+                    entry = {"etag": _response_etag(response.data), "data": cache_codec.encode(response.data)}
+                    started = time.perf_counter()
+                    try:
+                        cache.set(cache_key, entry, timeout=timeout)
+                        cache.set(stale_key, entry, timeout=timeout * CacheService.STALE_TTL_FACTOR)
+                        _record(view_name, "set", "ok", started)
+                    except Exception as e:
+                        _record(view_name, "set", "error", started)
+                        logger.warning("Failed to cache list '%s': %s", view_name, e)
+                    response["ETag"] = entry["etag"]
                 return response
-            except Exception as e:
-                # Fail-open: return uncached response on any error
-                logger.error("Error in cached_list decorator for '%s': %s", view_name, e)
-                return func(self, request, *args, **kwargs)
+            finally:
+                try:
+                    cache.delete(lock_key)
+                except Exception as e:
+                    logger.warning("Failed to release list lock for '%s': %s", view_name, e)
 
         return wrapper
 
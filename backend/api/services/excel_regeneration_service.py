@@ -0,0 +1,226 @@
+"""Coalescing scheduler for overtime Excel regeneration.
+
+Saves, deletes and bulk status changes record the affected request dates here
+instead of enqueuing one Celery task each. Dates are grouped by pay period
+(26th-25th): the first request for a period enqueues a single
+``flush_excel_regeneration`` task, and every request that arrives before it runs
+joins the same pending batch. The flush waits until the period has been quiet for
+``EXCEL_REGEN_QUIET_SECONDS`` (but never longer than
+``EXCEL_REGEN_MAX_DELAY_SECONDS`` after the first request), then regenerates each
+pending date's daily workbooks and the period's monthly workbooks once. Only one
+flush per period renders at a time: a flush that finds the period's run lock held
+re-defers itself, so an older snapshot can never overwrite a newer upload.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date as date_type
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.utils.time_helpers import get_period_boundaries
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "excel_regen:pending:{period}"
+SCHEDULED_KEY = "excel_regen:scheduled:{period}"
+LOCK_KEY = "excel_regen:lock:{period}"
+RUN_LOCK_KEY = "excel_regen:run:{period}"
+
+# Used when the cache backend has no distributed lock (LocMem in development/tests)
+_local_lock = threading.Lock()
+
+
+def _quiet_seconds():
+    return getattr(settings, "EXCEL_REGEN_QUIET_SECONDS", 10)
+
+
+def _max_delay_seconds():
+    return getattr(settings, "EXCEL_REGEN_MAX_DELAY_SECONDS", 60)
+
+
+def _run_lock_seconds():
+    # Long enough for any render: a flush cannot outlive the Celery task time limit
+    return getattr(settings, "EXCEL_REGEN_RUN_LOCK_SECONDS", 30 * 60)
+
+
+def _pending_ttl():
+    # Outlive a lost flush task long enough for the next schedule call to pick it up
+    return max(_max_delay_seconds() * 10, 3600)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+@contextmanager
+def _period_lock(period_key):
+    lock_factory = getattr(cache, "lock", None)
+    if lock_factory is None:
+        with _local_lock:
+            yield
+        return
+    with lock_factory(LOCK_KEY.format(period=period_key), timeout=10, blocking_timeout=5):
+        yield
+
+
+@contextmanager
+def period_run_lock(period_key):
+    """Hold the run lock of ``period_key`` for one flush; yields False (without waiting) when another flush holds it."""
+    key = RUN_LOCK_KEY.format(period=period_key)
+    lock_factory = getattr(cache, "lock", None)
+    if lock_factory is not None:
+        lock = lock_factory(key, timeout=_run_lock_seconds())
+        if not lock.acquire(blocking=False):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                lock.release()
+            except Exception as e:
+                logger.warning("Excel regeneration run lock for period %s expired before release: %s", period_key, e)
+        return
+
+    token = uuid.uuid4().hex
+    if not cache.add(key, token, _run_lock_seconds()):
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+def schedule_excel_regeneration(request_dates):
+    """Queue Excel regeneration for ``request_dates``, coalescing with pending work.
+
+    Returns the list of pay-period keys (ISO period start dates) that got a new
+    flush task; periods that already had one pending only gain the new dates.
+    """
+    by_period = {}
+    for value in request_dates:
+        request_date = _as_date(value)
+        period_start, _ = get_period_boundaries(request_date)
+        by_period.setdefault(period_start.isoformat(), set()).add(request_date.isoformat())
+
+    scheduled = []
+    for period_key, date_strs in sorted(by_period.items()):
+        now = time.time()
+        with _period_lock(period_key):
+            pending = cache.get(PENDING_KEY.format(period=period_key)) or {"dates": [], "first": now}
+            pending["dates"] = sorted(set(pending["dates"]) | date_strs)
+            pending["last"] = now
+            cache.set(PENDING_KEY.format(period=period_key), pending, _pending_ttl())
+
+        scheduled_key = SCHEDULED_KEY.format(period=period_key)
+        if not cache.add(scheduled_key, now, timeout=_quiet_seconds() + _max_delay_seconds() + 300):
+            logger.debug("Coalesced Excel regeneration for %s into pending batch for period %s", sorted(date_strs), period_key)
+            continue
+
+        try:
+            from api.tasks import flush_excel_regeneration
+
+            flush_excel_regeneration.apply_async((period_key,), countdown=_quiet_seconds())
+        except Exception:
+            cache.delete(scheduled_key)
+            raise
+        scheduled.append(period_key)
+        logger.info("Scheduled Excel regeneration for period %s", period_key)
+    return scheduled
+
+
+def seconds_until_due(period_key):
+    """Seconds until the pending batch for ``period_key`` should be flushed (0 when due)."""
+    pending = cache.get(PENDING_KEY.format(period=period_key))
+    if not pending:
+        return 0
+    now = time.time()
+    remaining_quiet = pending["last"] + _quiet_seconds() - now
+    remaining_cap = pending["first"] + _max_delay_seconds() - now
+    return max(0, min(remaining_quiet, remaining_cap))
+
+
+def claim_pending_dates(period_key):
+    """Take ownership of the pending dates for ``period_key`` and clear the batch."""
+    with _period_lock(period_key):
+        pending = cache.get(PENDING_KEY.format(period=period_key))
+        cache.delete(PENDING_KEY.format(period=period_key))
+        cache.delete(SCHEDULED_KEY.format(period=period_key))
+    return [_as_date(value) for value in (pending or {}).get("dates", [])]
+
+
+def _delete_remote_files(request_date, filenames):
+    from api.utils.excel_generator import ExcelGenerator
+
+    period_path = ExcelGenerator.get_smb_period_folder(request_date)
+    if not period_path or not filenames:
+        return
+    # A file that is gone must be uploaded again even if its next payload matches the old one
+    ExcelGenerator.forget_uploads(f"{period_path}/{filename}" for filename in filenames)
+    with ExcelGenerator.smb_connection() as conn:
+        if conn is None:
+            return
+        for filename in filenames:
+            try:
+                conn.deleteFiles(ExcelGenerator.SMB_CONFIG["share_name"], f"{period_path}/{filename}")
+                logger.info("Deleted SMB file %s/%s", period_path, filename)
+            except Exception as e:
+                logger.warning("Error deleting SMB file %s/%s: %s", period_path, filename, e)
+
+
+def regenerate_excel_for_dates(request_dates, force=False):
+    """Regenerate the daily workbooks of each date and the monthly workbooks of their period.
+
+    All dates must fall in the same pay period. Dates without reportable requests
+    have their daily files removed from SMB; the monthly files are removed when the
+    whole period is empty. ``seconds`` in the result is the wall-clock time of the run.
+    ``force`` re-uploads files whose payload is unchanged since their last upload.
+    """
+    from api.models import OvertimeRequest
+    from api.utils.excel_generator import ExcelGenerator
+
+    dates = sorted({_as_date(value) for value in request_dates})
+    if not dates:
+        return {"daily": [], "deleted": [], "monthly": False, "seconds": 0.0}
+
+    started = time.perf_counter()
+    # One period query feeds every daily payload and the monthly payload
+    daily_by_date, monthly_data = OvertimeRequest.export_period_data_by_department(dates[0], dates)
+
+    result = {"daily": [], "deleted": [], "monthly": False}
+    stale_files = []
+    # The monthly workbooks ride along with the first daily batch so all four render together
+    pending_monthly = monthly_data or None
+    for request_date in dates:
+        daily_data = daily_by_date[request_date]
+        if daily_data:
+            ExcelGenerator.generate_all_excel_files(daily_data, pending_monthly, request_date, upload=True, temp_only=ExcelGenerator.EXCEL_TEMP_ONLY, force=force)
+            result["daily"].append(request_date.isoformat())
+            pending_monthly = None
+        else:
+            stale_files.extend(ExcelGenerator.daily_filenames(request_date))
+            result["deleted"].append(request_date.isoformat())
+
+    if pending_monthly:
+        ExcelGenerator.generate_all_excel_files(None, pending_monthly, dates[0], upload=True, temp_only=ExcelGenerator.EXCEL_TEMP_ONLY, force=force)
+    if monthly_data:
+        result["monthly"] = True
+    else:
+        stale_files.extend(ExcelGenerator.monthly_filenames(dates[0]))
+
+    _delete_remote_files(dates[0], stale_files)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Excel regeneration for period of %s: %s daily regenerated, %s daily removed, monthly %s in %.2fs", dates[0], len(result["daily"]), len(result["deleted"]), "regenerated" if result["monthly"] else "removed", result["seconds"])
+    return result
@@ -420,13 +420,14 @@ def render_key_value_block(lines):
 
 
 def send_leave_notification_email_message(*, leave_ids, action, actor_username=None):
-    from api.models import EmployeeLeave, SystemConfiguration
+    from api.models import EmployeeLeave
+    from api.services.reference_data_service import get_system_configuration
 
     leaves = list(EmployeeLeave.objects.filter(id__in=leave_ids).select_related("employee", "employee__department", "created_by").prefetch_related("agents").order_by("date"))
     if not leaves:
         return {"status": "skipped", "reason": "no_leaves"}
 
-    config, _ = SystemConfiguration.objects.get_or_create(pk=1)
+    config = get_system_configuration()
     recipients = merge_recipient_lists(
         resolve_leave_notification_recipients(config, leaves[0].employee),
         resolve_leave_agent_notification_recipients(leaves),
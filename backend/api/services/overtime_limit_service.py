@@ -0,0 +1,152 @@
+"""Server-side evaluation of the OvertimeLimitConfig weekly and pay-period limits.
+
+OvertimeHoursTotal keeps each employee's non-rejected hours per Mon-Sun week and per
+26th-25th pay period. The totals are refreshed together with the daily rollup
+(``overtime_service.refresh_overtime_rollup``), so a limit check or headroom lookup
+reads at most two rows per employee instead of summing request history.
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+
+from ..models import OvertimeDailyRollup, OvertimeHoursTotal
+from ..utils.time_helpers import get_period_boundaries
+from .reference_data_service import get_overtime_limit_config
+
+logger = logging.getLogger(__name__)
+
+SPAN_WEEK = "week"
+SPAN_PERIOD = "period"
+
+# (employee, span, start) windows refreshed per select/delete round-trip
+TOTALS_REFRESH_CHUNK = 200
+
+# Longest window (a pay period) in days, used to widen rebuild ranges
+_MAX_SPAN_DAYS = 31
+
+
+def week_boundaries(date):
+    """Return the (Monday, Sunday) of the week containing ``date``."""
+    start = date - timedelta(days=date.weekday())
+    return start, start + timedelta(days=6)
+
+
+def span_boundaries(span, date):
+    """Return the (start, end) of the ``span`` window containing ``date``."""
+    if span == SPAN_WEEK:
+        return week_boundaries(date)
+    return get_period_boundaries(date)
+
+
+def _windows(employee_id, date):
+    return [(employee_id, span, span_boundaries(span, date)[0]) for span in (SPAN_WEEK, SPAN_PERIOD)]
+
+
+def refresh_limit_totals(keys):
+    """Recompute the week and pay-period totals around each ``(request_date, employee_id)`` in ``keys``.
+
+    Reads the (already refreshed) daily rollup, so it must run after the rollup rows of
+    the same keys have been rewritten. Returns the number of total rows written.
+    """
+    windows = sorted({window for request_date, employee_id in keys if request_date and employee_id for window in _windows(employee_id, request_date)})
+    written = 0
+    with transaction.atomic():
+        for offset in range(0, len(windows), TOTALS_REFRESH_CHUNK):
+            chunk = windows[offset : offset + TOTALS_REFRESH_CHUNK]
+            hours = dict.fromkeys(chunk, Decimal("0.00"))
+            covering = reduce(or_, (Q(employee_id=employee_id, request_date__gte=start, request_date__lte=span_boundaries(span, start)[1]) for employee_id, span, start in chunk))
+            rows = OvertimeDailyRollup.objects.filter(covering).exclude(status="rejected").values_list("employee_id", "request_date", "total_hours")
+            for employee_id, request_date, total_hours in rows:
+                for window in _windows(employee_id, request_date):
+                    if window in hours:
+                        hours[window] += total_hours
+
+            OvertimeHoursTotal.objects.filter(reduce(or_, (Q(employee_id=employee_id, span=span, start_date=start) for employee_id, span, start in chunk))).delete()
+            totals = [OvertimeHoursTotal(employee_id=employee_id, span=span, start_date=start, total_hours=value) for (employee_id, span, start), value in hours.items() if value]
+            written += len(OvertimeHoursTotal.objects.bulk_create(totals))
+    return written
+
+
+def rebuild_limit_totals(start_date=None, end_date=None):
+    """Rebuild the totals of every window overlapping ``start_date``..``end_date`` (default: all)."""
+    window_filters = {}
+    row_filters = {}
+    if start_date:
+        window_filters["start_date__gte"] = start_date - timedelta(days=_MAX_SPAN_DAYS)
+        row_filters["request_date__gte"] = start_date - timedelta(days=_MAX_SPAN_DAYS)
+    if end_date:
+        window_filters["start_date__lte"] = end_date
+        row_filters["request_date__lte"] = end_date + timedelta(days=_MAX_SPAN_DAYS)
+
+    with transaction.atomic():
+        OvertimeHoursTotal.objects.filter(**window_filters).delete()
+        keys = OvertimeDailyRollup.objects.filter(**row_filters).order_by().values_list("request_date", "employee_id").distinct()
+        return refresh_limit_totals(keys)
+
+
+def _used_hours(employee_ids, date):
+    """``{(employee_id, span): hours}`` for the week and pay period containing ``date``."""
+    windows = Q(span=SPAN_WEEK, start_date=week_boundaries(date)[0]) | Q(span=SPAN_PERIOD, start_date=get_period_boundaries(date)[0])
+    rows = OvertimeHoursTotal.objects.filter(windows, employee_id__in=employee_ids).values_list("employee_id", "span", "total_hours")
+    return {(employee_id, span): total_hours for employee_id, span, total_hours in rows}
+
+
+def _window_summary(start, end, used, max_hours, advised_hours):
+    return {
+        "start": start,
+        "end": end,
+        "used_hours": used,
+        "max_hours": max_hours,
+        "advised_hours": advised_hours,
+        "remaining_hours": max(Decimal("0.00"), max_hours - used),
+        "advised_reached": used >= advised_hours,
+        "exceeded": used > max_hours,
+    }
+
+
+def get_headroom(employee_ids, date, config=None):
+    """Weekly and monthly usage and remaining hours of each employee on ``date``.
+
+    One query for all employees: ``{employee_id: {"weekly": {...}, "monthly": {...}}}``.
+    """
+    config = config or get_overtime_limit_config()
+    employee_ids = list(employee_ids)
+    used = _used_hours(employee_ids, date)
+    week_start, week_end = week_boundaries(date)
+    period_start, period_end = get_period_boundaries(date)
+    zero = Decimal("0.00")
+    return {
+        employee_id: {
+            "weekly": _window_summary(week_start, week_end, used.get((employee_id, SPAN_WEEK), zero), config.max_weekly_hours, config.advised_weekly_hours),
+            "monthly": _window_summary(period_start, period_end, used.get((employee_id, SPAN_PERIOD), zero), config.max_monthly_hours, config.advised_monthly_hours),
+        }
+        for employee_id in employee_ids
+    }
+
+
+def check_request_limits(employee_id, request_date, total_hours, instance=None, config=None):
+    """Return limit violations (messages) for saving a request of ``total_hours`` on ``request_date``.
+
+    ``instance`` is the request being updated; its stored hours are taken out of the
+    totals first. A window already over its limit only fails when the change adds hours.
+    """
+    config = config or get_overtime_limit_config()
+    used = _used_hours([employee_id], request_date)
+    total_hours = Decimal(str(total_hours))
+    errors = []
+    for span, label, max_hours in ((SPAN_WEEK, "weekly", config.max_weekly_hours), (SPAN_PERIOD, "monthly", config.max_monthly_hours)):
+        start, end = span_boundaries(span, request_date)
+        current = used.get((employee_id, span), Decimal("0.00"))
+        previous = Decimal("0.00")
+        if instance is not None and instance.pk and instance.employee_id == employee_id and instance.status != "rejected" and start <= instance.request_date <= end:
+            previous = instance.total_hours or Decimal("0.00")
+        new_total = current - previous + total_hours
+        if new_total > max_hours and new_total > current:
+            errors.append(f"This request brings {label} overtime to {new_total:.2f}h ({start:%Y-%m-%d} - {end:%Y-%m-%d}), above the {max_hours:.2f}h limit.")
+    return errors
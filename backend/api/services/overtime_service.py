@@ -1,8 +1,225 @@
 """Service helpers for overtime request operations."""
 
-from ..models import OvertimeRequest
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+
+from ..models import Employee, OvertimeDailyRollup, OvertimeRequest
+from ..utils.time_helpers import get_period_boundaries, get_period_start
+from .overtime_limit_service import rebuild_limit_totals, refresh_limit_totals
+
+logger = logging.getLogger(__name__)
+
+# Columns of OvertimeRequest that make up one OvertimeDailyRollup row
+ROLLUP_DIMENSIONS = ("request_date", "employee_id", "employee_name", "project_id", "project_name", "department_code", "status", "is_weekend", "is_holiday")
+
+# (request_date, employee) keys refreshed per delete/select round-trip
+ROLLUP_REFRESH_CHUNK = 200
+
+# Stats cache generations: one counter per pay period (keyed by its start date), an
+# "all" counter bumped by every write (for open-ended ranges) and an "epoch" counter
+# bumped by full rollup rebuilds. Stats cache keys embed the counters they depend on,
+# so a write only orphans the entries whose periods it touched.
+STATS_GENERATION_KEY = "ot_stats:gen:{period}"
+# Entries are invalidated by generation bumps; the TTL only bounds memory
+STATS_CACHE_TTL = 3600
+# Ranges spanning more periods than this are keyed on the "all" counter instead
+STATS_MAX_KEYED_PERIODS = 120
 
 
 def get_overtime_queryset():
     """Return overtime queryset with related fields for efficient access."""
     return OvertimeRequest.objects.select_related("employee", "employee__department", "project", "department", "approved_by").prefetch_related("breaks").all()
+
+
+def _rollup_rows(queryset):
+    """Aggregate ``queryset`` into unsaved OvertimeDailyRollup rows."""
+    rows = queryset.order_by().values(*ROLLUP_DIMENSIONS).annotate(request_count=Count("id"), hours=Sum("total_hours"))
+    for row in rows.iterator(chunk_size=2000):
+        row["total_hours"] = row.pop("hours") or 0
+        yield OvertimeDailyRollup(**row)
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    if hasattr(value, "year"):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _periods_between(start_date, end_date):
+    """Pay-period keys overlapping ``start_date``..``end_date``, or None when the range is open or too wide."""
+    start_date, end_date = _parse_date(start_date), _parse_date(end_date)
+    if start_date is None or end_date is None:
+        return None
+    periods = set()
+    period_start, period_end = get_period_boundaries(start_date)
+    while period_start <= end_date:
+        if len(periods) >= STATS_MAX_KEYED_PERIODS:
+            return None
+        periods.add(period_start.isoformat())
+        period_start, period_end = get_period_boundaries(period_end + timedelta(days=1))
+    return periods
+
+
+def _bump_generations(periods):
+    for period in periods:
+        key = STATS_GENERATION_KEY.format(period=period)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing (never set or evicted): start from a fresh value that no cached entry can carry
+            cache.set(key, time.time_ns(), None)
+
+
+def bump_stats_generations(request_dates):
+    """Invalidate the cached stats of the pay periods containing ``request_dates``."""
+    periods = {get_period_start(_parse_date(value)).isoformat() for value in request_dates if _parse_date(value)}
+    try:
+        _bump_generations(periods | {"all"})
+    except Exception as e:
+        logger.warning("Failed to bump overtime stats generations for %s: %s", sorted(periods), e)
+
+
+def stats_cache_key(action, scope, params, date_ranges):
+    """Cache key for a stats response.
+
+    ``scope`` is the caller's permission scope ("all" or their own employee), ``params``
+    the remaining query parameters, and ``date_ranges`` the ``(start, end)`` ranges the
+    response aggregates. The key embeds the generation of every pay period in those
+    ranges, so any write to one of them moves readers on to a new entry.
+    """
+    periods = set()
+    for start_date, end_date in date_ranges:
+        range_periods = _periods_between(start_date, end_date)
+        if range_periods is None:
+            periods = {"all"}
+            break
+        periods |= range_periods
+
+    keys = [STATS_GENERATION_KEY.format(period=period) for period in ["epoch", *sorted(periods)]]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+
+    digest = hashlib.sha256(json.dumps([params, [generations[key] for key in keys]], default=str).encode()).hexdigest()[:24]
+    return f"ot_stats:{action}:{scope}:{digest}"
+
+
+def refresh_overtime_rollup(keys):
+    """Recompute the rollup rows of each ``(request_date, employee_id)`` in ``keys``.
+
+    Called with the keys touched by a save, delete or bulk status change. Each key's
+    rows are replaced by a fresh aggregate of its raw requests, so the rollup matches
+    the requests table after the surrounding transaction commits. The weekly and
+    pay-period limit totals around the keys are refreshed along with it. Returns the
+    number of rollup rows written.
+    """
+    keys = sorted({(request_date, employee_id) for request_date, employee_id in keys if request_date and employee_id})
+    written = 0
+    with transaction.atomic():
+        # Lock the employees first so concurrent refreshes of the same keys run one after
+        # another: each deletes and re-inserts rows under the rollup's unique constraint,
+        # and the one that waited re-reads the requests as committed by the other
+        list(Employee.objects.select_for_update().filter(pk__in={employee_id for _, employee_id in keys}).order_by("pk").values_list("pk", flat=True))
+        for offset in range(0, len(keys), ROLLUP_REFRESH_CHUNK):
+            match = reduce(or_, (Q(request_date=request_date, employee_id=employee_id) for request_date, employee_id in keys[offset : offset + ROLLUP_REFRESH_CHUNK]))
+            OvertimeDailyRollup.objects.filter(match).delete()
+            written += len(OvertimeDailyRollup.objects.bulk_create(list(_rollup_rows(OvertimeRequest.objects.filter(match)))))
+        refresh_limit_totals(keys)
+    if keys:
+        # Bump now and again after commit: an entry cached in between (from either the
+        # old or the new totals) is orphaned by the second bump, so none outlives the write
+        dates = [request_date for request_date, _ in keys]
+        bump_stats_generations(dates)
+        transaction.on_commit(lambda: bump_stats_generations(dates))
+    return written
+
+
+def queue_rollup_refresh(keys):
+    """Retry a failed ``refresh_overtime_rollup`` of ``keys`` from a task once the current transaction commits."""
+    payload = sorted({(str(request_date), employee_id) for request_date, employee_id in keys if request_date and employee_id})
+    if not payload:
+        return
+
+    def _enqueue():
+        try:
+            from ..tasks import refresh_overtime_rollup_keys
+
+            refresh_overtime_rollup_keys.delay(payload)
+        except Exception as e:
+            logger.error("Failed to queue overtime rollup refresh for %s (repair with rebuild_overtime_rollup): %s", payload, e)
+
+    transaction.on_commit(_enqueue)
+
+
+def rebuild_overtime_rollup(start_date=None, end_date=None, batch_size=1000):
+    """Rebuild the rollup from the raw requests, optionally limited to a date range.
+
+    Used for the initial backfill and to repair drift (e.g. rows changed with
+    ``QuerySet.update()`` outside the maintained paths). The limit totals of the
+    weeks and pay periods overlapping the range are rebuilt too. Returns the number
+    of rollup rows written.
+    """
+    filters = {}
+    if start_date:
+        filters["request_date__gte"] = start_date
+    if end_date:
+        filters["request_date__lte"] = end_date
+
+    written = 0
+    with transaction.atomic():
+        OvertimeDailyRollup.objects.filter(**filters).delete()
+        batch = []
+        for row in _rollup_rows(OvertimeRequest.objects.filter(**filters)):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                written += len(OvertimeDailyRollup.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            written += len(OvertimeDailyRollup.objects.bulk_create(batch))
+        rebuild_limit_totals(start_date, end_date)
+    transaction.on_commit(lambda: _bump_generations(["epoch"]))
+    logger.info("Rebuilt overtime rollup (%s -> %s): %s rows", start_date or "start", end_date or "end", written)
+    return written
+
+
+def sync_pay_periods(start_date=None, end_date=None):
+    """Set ``OvertimeRequest.pay_period`` on rows where it is missing or stale.
+
+    ``save()`` and ``bulk_create()`` derive the pay period themselves; this repairs
+    rows written around them (raw SQL, ``update()`` with expressions). Runs one
+    UPDATE per pay period in the range (default: all requests) and returns the
+    number of rows fixed.
+    """
+    queryset = OvertimeRequest.objects.all()
+    if start_date:
+        queryset = queryset.filter(request_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(request_date__lte=end_date)
+    bounds = queryset.aggregate(first=Min("request_date"), last=Max("request_date"))
+    if bounds["first"] is None:
+        return 0
+
+    fixed = 0
+    period_start, period_end = get_period_boundaries(bounds["first"])
+    while period_start <= bounds["last"]:
+        fixed += queryset.filter(request_date__gte=period_start, request_date__lte=period_end).exclude(pay_period=period_start).update(pay_period=period_start)
+        period_start, period_end = get_period_boundaries(period_end + timedelta(days=1))
+    if fixed:
+        logger.info("Fixed the pay period of %s overtime request(s)", fixed)
+    return fixed
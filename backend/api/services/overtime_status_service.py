@@ -0,0 +1,175 @@
+"""Bulk overtime status changes: chunked updates, background jobs and notification fan-out."""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import ExternalUser, Notification, OvertimeRequest, OvertimeStatusJob
+from .cache_service import CacheService
+from .overtime_service import refresh_overtime_rollup
+
+logger = logging.getLogger(__name__)
+
+STATUS_VALUES = ("approved", "rejected", "pending")
+
+# Requests updated per transaction (and per notification task)
+STATUS_CHUNK_SIZE = 500
+
+# Selection filters accepted by resolve_status_selection
+SELECTION_FILTERS = ("pay_period", "start_date", "end_date", "status", "department_code")
+
+
+def status_update_fields(new_status, username):
+    """Column values written by a status change to ``new_status``."""
+    fields = {"status": new_status, "status_changed_by": username or ""}
+    now = timezone.now()
+    fields["approved_at"] = now if new_status == "approved" else None
+    fields["rejected_at"] = now if new_status == "rejected" else None
+    return fields
+
+
+def resolve_status_selection(ids=None, filters=None):
+    """Ids of the requests selected by explicit ``ids`` and/or ``filters``, in id order.
+
+    ``filters`` may hold ``pay_period`` (any date in the period), ``start_date`` /
+    ``end_date``, the current ``status`` and ``department_code`` (comma-separated
+    lists for the last two).
+    """
+    queryset = OvertimeRequest.objects.all()
+    if ids:
+        queryset = queryset.filter(id__in=ids)
+    filters = filters or {}
+    if filters.get("pay_period"):
+        queryset = queryset.in_period(filters["pay_period"])
+    if filters.get("start_date"):
+        queryset = queryset.filter(request_date__gte=filters["start_date"])
+    if filters.get("end_date"):
+        queryset = queryset.filter(request_date__lte=filters["end_date"])
+    if filters.get("status"):
+        queryset = queryset.filter(status__in=[value.strip() for value in filters["status"].split(",") if value.strip()])
+    if filters.get("department_code"):
+        queryset = queryset.filter(department_code__in=[value.strip() for value in filters["department_code"].split(",") if value.strip()])
+    return list(queryset.order_by("id").values_list("id", flat=True))
+
+
+def apply_status_chunk(ids, new_status, username):
+    """Set ``new_status`` on the requests in ``ids`` in one transaction.
+
+    Refreshes the stats rollup (``update()`` sends no signals) and queues Excel
+    regeneration of the affected dates after commit. Returns the number of rows
+    updated.
+    """
+    with transaction.atomic():
+        affected = list(OvertimeRequest.objects.filter(id__in=ids).values_list("request_date", "employee_id"))
+        updated = OvertimeRequest.objects.filter(id__in=ids).update(**status_update_fields(new_status, username))
+        refresh_overtime_rollup(affected)
+
+        affected_dates = sorted({request_date for request_date, _ in affected})
+        if updated and affected_dates:
+
+            def _queue_regeneration():
+                try:
+                    from .excel_regeneration_service import schedule_excel_regeneration
+
+                    schedule_excel_regeneration(affected_dates)
+                except Exception as e:
+                    logger.warning("Failed to queue Excel regeneration after bulk status update: %s", e)
+
+            transaction.on_commit(_queue_regeneration)
+    return updated
+
+
+def queue_status_notifications(ids, new_status, admin_name, job_id=None):
+    """Send the approval/rejection notifications of ``ids`` from a background task after commit."""
+    if new_status not in ("approved", "rejected") or not ids:
+        return
+
+    def _enqueue():
+        from api.tasks import send_overtime_status_notifications
+
+        for offset in range(0, len(ids), STATUS_CHUNK_SIZE):
+            send_overtime_status_notifications.delay(list(ids[offset : offset + STATUS_CHUNK_SIZE]), new_status, admin_name, job_id)
+
+    transaction.on_commit(_enqueue)
+
+
+def send_status_notifications(ids, new_status, admin_name):
+    """Create and push the status notifications of the requests in ``ids``.
+
+    One query for the requests, one for their users, one bulk insert, and all
+    WebSocket sends in a single async context. Returns the number of notifications.
+    """
+    from ..consumers import send_notifications_to_users
+
+    requests = list(OvertimeRequest.objects.filter(id__in=ids, status=new_status).values("id", "request_date", "employee__emp_id"))
+    emp_ids = {row["employee__emp_id"] for row in requests if row["employee__emp_id"]}
+    users = {user.worker_id.lower(): user for user in ExternalUser.objects.filter(worker_id__in=emp_ids, is_active=True)} if emp_ids else {}
+
+    title = f"Overtime Request {new_status.title()}"
+    notifications = []
+    for row in requests:
+        user = users.get((row["employee__emp_id"] or "").lower())
+        if not user:
+            continue
+        message = f"Your overtime request for {row['request_date']:%B %d, %Y} has been {new_status} by {admin_name}."
+        target_data = {"route": "/ot/history", "query": {"requestId": row["id"]}}
+        notifications.append(Notification(recipient=user, title=title, message=message, event_type=f"overtime_{new_status}", target_data=target_data))
+
+    if not notifications:
+        return 0
+    created = Notification.objects.bulk_create(notifications)
+    send_notifications_to_users(
+        (
+            notification.recipient_id,
+            {
+                "id": notification.id,
+                "title": notification.title,
+                "message": notification.message,
+                "event_type": notification.event_type,
+                "event_id": None,
+                "target_data": notification.target_data,
+                "is_read": False,
+                "created_at": notification.created_at.isoformat(),
+            },
+        )
+        for notification in created
+    )
+    logger.info("Sent %s overtime %s notification(s)", len(created), new_status)
+    return len(created)
+
+
+def run_status_job(job_id):
+    """Process an OvertimeStatusJob chunk by chunk, recording progress after each chunk."""
+    job = OvertimeStatusJob.objects.get(pk=job_id)
+    if job.status not in ("queued", "running"):
+        return job
+
+    job.status = "running"
+    job.started_at = job.started_at or timezone.now()
+    job.save(update_fields=["status", "started_at", "updated_at"])
+    admin_name = job.requested_by_username or "Admin"
+
+    try:
+        # Resume after the chunks a previous (interrupted) run already finished
+        for offset in range(job.processed, len(job.request_ids), STATUS_CHUNK_SIZE):
+            chunk = job.request_ids[offset : offset + STATUS_CHUNK_SIZE]
+            with transaction.atomic():
+                job.updated_count += apply_status_chunk(chunk, job.target_status, job.requested_by_username)
+                job.processed = offset + len(chunk)
+                job.save(update_fields=["processed", "updated_count", "updated_at"])
+                queue_status_notifications(chunk, job.target_status, admin_name, job_id=job.pk)
+            CacheService.invalidate_all_for_view("overtime_requests")
+    except Exception as e:
+        logger.error("Overtime status job %s failed after %s/%s requests: %s", job.pk, job.processed, job.total, e)
+        job.status = "failed"
+        job.error = str(e)[:1000]
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        raise
+
+    job.status = "completed"
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "updated_at"])
+    logger.info("Overtime status job %s: %s/%s requests set to '%s'", job.pk, job.updated_count, job.total, job.target_status)
+    return job
@@ -0,0 +1,64 @@
+"""Cached lookups of hot reference data.
+
+Each getter goes through ``CacheService.get_reference`` (process-local LRU, then
+Redis, then the database). ``REFERENCE_INVALIDATIONS`` maps the models behind
+them to the entries a save or delete must drop; ``signals.py`` wires it up.
+Returned objects are shared between callers: read them, never modify or save them.
+"""
+
+from ..models import Department, Employee, OvertimeLimitConfig, SMBConfiguration, SystemConfiguration
+from .cache_service import CacheService
+
+SYSTEM_CONFIGURATION = "system_configuration"
+OVERTIME_LIMIT_CONFIG = "overtime_limit_config"
+SMB_CONFIG = "smb_config"
+ENABLED_DEPARTMENTS = "enabled_departments"
+ENABLED_EMPLOYEES = "enabled_employees"
+
+REFERENCE_INVALIDATIONS = {
+    SystemConfiguration: (SYSTEM_CONFIGURATION,),
+    OvertimeLimitConfig: (OVERTIME_LIMIT_CONFIG,),
+    SMBConfiguration: (SMB_CONFIG,),
+    # Enabled employees carry their department
+    Department: (ENABLED_DEPARTMENTS, ENABLED_EMPLOYEES),
+    Employee: (ENABLED_EMPLOYEES,),
+}
+
+
+def _load_system_configuration():
+    config, _ = SystemConfiguration.objects.get_or_create(pk=1)
+    return config
+
+
+def get_system_configuration():
+    """The SystemConfiguration singleton, created with defaults if missing."""
+    return CacheService.get_reference(SYSTEM_CONFIGURATION, _load_system_configuration)
+
+
+def get_overtime_limit_config():
+    """The active OvertimeLimitConfig (see ``OvertimeLimitConfig.get_active``)."""
+    return CacheService.get_reference(OVERTIME_LIMIT_CONFIG, OvertimeLimitConfig.get_active)
+
+
+def get_smb_config():
+    """The active SMB connection settings dict (see ``SMBConfiguration.get_active_config``).
+
+    The dict holds the decrypted password, so it stays in the local tier only.
+    """
+    return CacheService.get_reference(SMB_CONFIG, SMBConfiguration.get_active_config, shared=False)
+
+
+def get_enabled_departments():
+    """Enabled departments keyed by upper-cased code, in code order."""
+    return CacheService.get_reference(ENABLED_DEPARTMENTS, lambda: {department.code.upper(): department for department in Department.objects.filter(is_enabled=True).order_by("code") if department.code})
+
+
+def get_enabled_employees():
+    """Enabled employees (with their department) keyed by ID."""
+    return CacheService.get_reference(ENABLED_EMPLOYEES, lambda: {employee.id: employee for employee in Employee.objects.filter(is_enabled=True).select_related("department")})
+
+
+def invalidate_references_for(model) -> None:
+    """Drop every reference entry built from ``model``."""
+    for name in REFERENCE_INVALIDATIONS.get(model, ()):
+        CacheService.invalidate_reference(name)
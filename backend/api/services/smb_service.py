@@ -1,9 +1,16 @@
+import io
 import logging
 import os
+import random
+import socket
 import time
-from threading import Lock
+from contextlib import contextmanager
+from datetime import timedelta
+from threading import Condition, Lock
 
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +21,27 @@ class FileSharingViolation(Exception):
     pass
 
 
+class SMBPoolUnavailable(Exception):
+    """Raised when the pool cannot hand out a connection (exhausted, disabled or server unreachable).
+
+    Deliberately not a ``ConnectionError``: the pool has already waited or timed out,
+    so retrying at once would only multiply the wait.
+    """
+
+    pass
+
+
 class SMBConnectionPool:
-    """Thread-safe SMB connection pool for reusing connections"""
+    """Thread-safe checkout/checkin pool of SMB connections.
+
+    A connection belongs to exactly one caller between ``acquire()`` and ``release()``
+    (use ``connection()`` as a context manager). Idle connections are kept open for
+    ``idle_timeout`` seconds and are only probed with an SMB echo once they have been idle
+    for ``keepalive_interval`` seconds; connections that fail a probe or raise a
+    connection-level error are discarded instead of being returned to the pool.
+    """
 
-    def __init__(self, server, username, password, share_name, domain="WORKGROUP", port=445, timeout=30, min_size=2, max_size=5):
+    def __init__(self, server, username, password, share_name, domain="WORKGROUP", port=445, timeout=30, min_size=2, max_size=5, idle_timeout=300, keepalive_interval=60, enabled=None):
         self.server = server
         self.username = username
         self.password = password
@@ -26,97 +50,196 @@ def __init__(self, server, username, password, share_name, domain="WORKGROUP", p
         self.port = port
         self.timeout = timeout
         self.min_size = min_size
-        self.max_size = max_size
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+
+        self.pid = os.getpid()
+        self.last_sweep = time.monotonic()
+        self.idle = []  # [(conn, last_used)] most recently used last
+        self.in_use = 0
+        self.condition = Condition(Lock())
+        self.metrics = {"created": 0, "reused": 0, "discarded": 0, "probes": 0, "waits": 0, "timeouts": 0}
+        self.enabled = settings.SMB_CONFIG.get("enabled", False) if enabled is None else enabled
+
+        if self.enabled and self.min_size:
+            self._initialize_pool()
 
-        self.connections = []
-        self.lock = Lock()
-        self.enabled = settings.SMB_CONFIG.get("enabled", False)
+    @staticmethod
+    def config_key(config):
+        return (config["host"], int(config.get("port") or 445), config.get("domain") or "WORKGROUP", config["username"], config["password"], config["share_name"])
 
-        if self.enabled:
-            self._initialize_pool()
+    @property
+    def key(self):
+        return (self.server, self.port, self.domain, self.username, self.password, self.share_name)
 
     def _initialize_pool(self):
-        """Initialize minimum connections in the pool"""
+        """Open the minimum number of idle connections"""
         try:
             for _ in range(self.min_size):
                 conn = self._create_connection()
-                if conn:
-                    self.connections.append(conn)
-            logger.info("SMB pool initialized with %s connections to %s", len(self.connections), self.server)
+                with self.condition:
+                    self.idle.append((conn, time.monotonic()))
+            logger.info("SMB pool initialized with %s connections to %s", len(self.idle), self.server)
         except Exception as e:
             logger.error("Failed to initialize SMB pool: %s", e)
-            self.enabled = False
 
     def _create_connection(self):
-        """Create new SMB connection"""
-        if not self.enabled:
-            return None
+        """Create new SMB connection (raises SMBPoolUnavailable when the server is unreachable)"""
+        from smb.SMBConnection import SMBConnection
 
+        conn = SMBConnection(username=self.username, password=self.password, my_name=socket.gethostname(), remote_name=self.server, domain=self.domain, use_ntlm_v2=True, is_direct_tcp=True)
         try:
-            from smb.SMBConnection import SMBConnection
-
-            conn = SMBConnection(username=self.username, password=self.password, my_name="OvertimeApp", remote_name=self.server, domain=self.domain, use_ntlm_v2=True, is_direct_tcp=True)
-            conn.connect((self.server, self.port), timeout=self.timeout)
-            logger.debug("Created new SMB connection to %s:%s", self.server, self.port)
-            return conn
+            connected = conn.connect(self.server, self.port, timeout=self.timeout)
         except Exception as e:
-            logger.error("Failed to create SMB connection to %s: %s", self.server, e)
-            return None
-
-    def get_connection(self):
-        """Get available connection from pool"""
+            self._close(conn)
+            raise SMBPoolUnavailable(f"Cannot connect to SMB server {self.server}:{self.port}: {e}") from e
+        if not connected:
+            self._close(conn)
+            raise SMBPoolUnavailable(f"SMB authentication failed for {self.server}:{self.port}")
+        with self.condition:
+            self.metrics["created"] += 1
+        logger.debug("Created new SMB connection to %s:%s", self.server, self.port)
+        return conn
+
+    def acquire(self, timeout=None):
+        """Check out a connection for exclusive use, waiting up to ``timeout`` seconds when the pool is exhausted"""
         if not self.enabled:
-            return None
-
-        with self.lock:
-            # Try existing connections first
-            for conn in self.connections[:]:
-                if self._is_alive(conn):
-                    logger.debug("Using existing SMB connection from pool")
-                    return conn
+            raise SMBPoolUnavailable("SMB is disabled")
+
+        if time.monotonic() - self.last_sweep >= self.keepalive_interval:
+            self.keepalive()
+
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            with self.condition:
+                candidate = None
+                if self.idle:
+                    candidate = self.idle.pop()
+                    self.in_use += 1
+                elif self.in_use < self.max_size:
+                    self.in_use += 1
                 else:
-                    logger.debug("Removing dead connection from pool")
-                    self.connections.remove(conn)
-
-            # Create new connection if pool not full
-            if len(self.connections) < self.max_size:
-                conn = self._create_connection()
-                if conn:
-                    self.connections.append(conn)
-                    logger.debug("Created new connection. Pool size: %s", len(self.connections))
-                    return conn
-
-            # Return first alive connection if all are busy
-            if self.connections:
-                logger.debug("Reusing connection from busy pool")
-                return self.connections[0]
-
-        logger.warning("No SMB connections available")
-        return None
+                    self.metrics["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self.condition.wait(remaining):
+                        self.metrics["timeouts"] += 1
+                        raise SMBPoolUnavailable(f"No SMB connection available ({self.max_size} in use)")
+                    continue
+
+            if candidate is None:
+                try:
+                    return self._create_connection()
+                except Exception:
+                    self._forget_slot()
+                    raise
+
+            conn, last_used = candidate
+            idle_for = time.monotonic() - last_used
+            if idle_for < self.idle_timeout and (idle_for < self.keepalive_interval or self._is_alive(conn)):
+                with self.condition:
+                    self.metrics["reused"] += 1
+                return conn
+            logger.debug("Dropping stale SMB connection (idle %.0fs)", idle_for)
+            self._discard(conn)
+
+    def release(self, conn, broken=False):
+        """Return a checked-out connection; ``broken`` connections are closed instead of reused"""
+        if broken or not self.enabled or os.getpid() != self.pid:
+            self._discard(conn)
+            return
+        with self.condition:
+            self.in_use = max(0, self.in_use - 1)
+            self.idle.append((conn, time.monotonic()))
+            self.condition.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager around ``acquire``/``release``"""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception as e:
+            broken = self.is_connection_error(e)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    @staticmethod
+    def is_connection_error(exc):
+        """True when ``exc`` means the socket is unusable (as opposed to a failed SMB operation)"""
+        from smb.base import NotConnectedError, NotReadyError, SMBTimeout
+
+        return isinstance(exc, (NotConnectedError, NotReadyError, SMBTimeout, ConnectionError, OSError))
+
+    def _forget_slot(self):
+        with self.condition:
+            self.in_use = max(0, self.in_use - 1)
+            self.condition.notify()
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self.condition:
+            self.metrics["discarded"] += 1
+        self._forget_slot()
+
+    def _close(self, conn):
+        # A connection inherited from a parent process shares its socket; just drop it
+        if os.getpid() != self.pid:
+            return
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug("Error closing SMB connection: %s", e)
 
     def _is_alive(self, conn):
-        """Check if connection is still alive"""
+        """Cheap liveness probe (SMB echo, no directory listing)"""
+        with self.condition:
+            self.metrics["probes"] += 1
         try:
-            conn.listPath(self.share_name, "/", timeout=5)
+            conn.echo(b"ping", timeout=5)
             return True
         except Exception as e:
             logger.debug("Connection check failed: %s", e)
             return False
 
+    def keepalive(self):
+        """Close idle connections past ``idle_timeout`` and probe the ones idle past ``keepalive_interval``"""
+        now = time.monotonic()
+        with self.condition:
+            self.last_sweep = now
+            due = [entry for entry in self.idle if now - entry[1] >= self.keepalive_interval]
+            self.idle = [entry for entry in self.idle if now - entry[1] < self.keepalive_interval]
+            # Probed connections count as checked out so acquire() cannot hand them out meanwhile
+            self.in_use += len(due)
+        for conn, last_used in due:
+            if now - last_used >= self.idle_timeout or not self._is_alive(conn):
+                self._discard(conn)
+                continue
+            with self.condition:
+                self.in_use -= 1
+                self.idle.insert(0, (conn, last_used))
+                self.condition.notify()
+
+    def stats(self):
+        """Pool counters and current occupancy"""
+        with self.condition:
+            return {**self.metrics, "in_use": self.in_use, "idle": len(self.idle), "max_size": self.max_size}
+
     def cleanup(self):
-        """Close all connections in pool"""
-        with self.lock:
-            for conn in self.connections:
-                try:
-                    conn.close()
-                except Exception as e:
-                    logger.debug("Error closing SMB connection: %s", e)
-            self.connections.clear()
-            logger.info("SMB connection pool cleaned up")
+        """Close all idle connections in pool (checked-out ones are closed on release)"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.enabled = False
+            self.condition.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+        logger.info("SMB connection pool cleaned up")
 
 
 class SMBService:
-    """SMB file operations with retry logic"""
+    """SMB file operations; uploads that keep failing are deferred to a delayed retry job"""
 
     def __init__(self, pool=None):
         self.pool = pool
@@ -124,37 +247,44 @@ def __init__(self, pool=None):
         self.max_retries = 3
 
     def upload_file(self, local_path, remote_path):
-        """Upload file to SMB share with retry logic"""
-        return self._retry_operation(lambda: self._upload_file_impl(local_path, remote_path), operation_name=f"upload {os.path.basename(local_path)} to {remote_path}")
-
-    def _upload_file_impl(self, local_path, remote_path):
-        """Actual file upload implementation"""
+        """Upload a local file to the SMB share (returns None when the upload was deferred)"""
         if not os.path.exists(local_path):
             raise FileNotFoundError(f"Local file not found: {local_path}")
+        with open(local_path, "rb") as f:
+            return self.upload_bytes(f.read(), remote_path)
 
+    def upload_bytes(self, content, remote_path, fingerprint="", sheet_fingerprints=None):
+        """Upload ``content`` to ``remote_path``.
+
+        Returns ``remote_path`` once stored. If the file is open by another user or the
+        upload keeps failing, it is recorded as a ``PendingSMBUpload`` and retried by a
+        delayed Celery task instead of blocking this worker, and None is returned.
+        """
         if self.pool is None or not self.pool.enabled:
             self.logger.info("SMB disabled. File would be uploaded to: %s", remote_path)
             return remote_path
 
-        conn = self.pool.get_connection()
-        if not conn:
-            raise ConnectionError("No SMB connection available")
+        try:
+            self._retry_operation(lambda: self._upload_bytes_impl(content, remote_path), operation_name=f"upload {remote_path}")
+        except Exception as e:
+            defer_upload(self.pool.server, self.pool.share_name, remote_path, content, e, fingerprint, sheet_fingerprints)
+            return None
+        return remote_path
 
+    def _upload_bytes_impl(self, content, remote_path):
+        """Actual upload implementation"""
         try:
-            file_size = os.path.getsize(local_path)
-            with open(local_path, "rb") as f:
-                conn.storeFile(self.pool.share_name, remote_path, f, timeout=60)
+            with self.pool.connection() as conn:
+                conn.storeFile(self.pool.share_name, remote_path, io.BytesIO(content), timeout=60)
 
-            self.logger.info("Successfully uploaded %s to SMB (%s bytes)", os.path.basename(local_path), file_size)
+            self.logger.info("Successfully uploaded %s to SMB (%s bytes)", os.path.basename(remote_path), len(content))
             return remote_path
 
         except Exception as e:
-            error_str = str(e)
-            # Check for file sharing violation (0xC0000043 = STATUS_SHARING_VIOLATION)
-            if "0xC0000043" in error_str or "Unable to open file" in error_str:
+            if is_sharing_violation(e):
                 self.logger.warning("File sharing violation for %s. The file may be open by another user. Error: %s", remote_path, e)
                 raise FileSharingViolation(f"Cannot upload to {remote_path}: The file is currently open by another user. Please ask them to close the file and try again.") from e
-            self.logger.error("Failed to upload %s to %s: %s", local_path, remote_path, e)
+            self.logger.error("Failed to upload to %s: %s", remote_path, e)
             raise
 
     def file_exists(self, remote_path):
@@ -166,15 +296,12 @@ def _file_exists_impl(self, remote_path):
         if self.pool is None or not self.pool.enabled:
             return False
 
-        conn = self.pool.get_connection()
-        if not conn:
-            return False
-
         try:
             remote_dir = "/".join(remote_path.split("/")[:-1]) or "/"
             filename = remote_path.split("/")[-1]
 
-            file_list = conn.listPath(self.pool.share_name, remote_dir, timeout=10)
+            with self.pool.connection() as conn:
+                file_list = conn.listPath(self.pool.share_name, remote_dir, timeout=10)
 
             exists = any(f.filename == filename for f in file_list)
             self.logger.debug("File %s exists: %s", remote_path, exists)
@@ -193,12 +320,9 @@ def _delete_file_impl(self, remote_path):
             self.logger.info("SMB disabled. File would be deleted: %s", remote_path)
             return True
 
-        conn = self.pool.get_connection()
-        if not conn:
-            raise ConnectionError("No SMB connection available")
-
         try:
-            conn.deleteFile(self.pool.share_name, remote_path, timeout=10)
+            with self.pool.connection() as conn:
+                conn.deleteFiles(self.pool.share_name, remote_path, timeout=10)
             self.logger.info("Deleted %s from SMB share", remote_path)
             return True
         except Exception as e:
@@ -206,34 +330,129 @@ def _delete_file_impl(self, remote_path):
             raise
 
     def _retry_operation(self, operation, operation_name, max_retries=None):
-        """Execute operation with exponential backoff retry logic"""
+        """Execute operation, retrying at once (on a fresh pooled connection) after connection-level errors.
+
+        Nothing sleeps here; other errors propagate to the caller, which defers uploads.
+        """
         if max_retries is None:
             max_retries = self.max_retries
 
-        last_error = None
         for attempt in range(max_retries):
             try:
                 self.logger.debug("Executing: %s (attempt %s/%s)", operation_name, attempt + 1, max_retries)
                 return operation()
-            except FileSharingViolation as e:
-                # For sharing violations, use shorter retry intervals
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = 30 * (attempt + 1)  # 30s, 60s, 90s
-                    self.logger.warning("File sharing violation for '%s' (attempt %s/%s). File is open by another user. Retrying in %ss...", operation_name, attempt + 1, max_retries, wait_time)
-                    time.sleep(wait_time)
-                else:
-                    self.logger.error("File sharing violation for '%s' persists after %s attempts. Please ensure no one has the file open.", operation_name, max_retries)
             except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = 60 * (attempt + 1)
-                    self.logger.warning("Operation '%s' failed (attempt %s/%s). Retrying in %ss. Error: %s", operation_name, attempt + 1, max_retries, wait_time, e)
-                    time.sleep(wait_time)
-                else:
-                    self.logger.error("Operation '%s' failed after %s attempts. Final error: %s", operation_name, max_retries, e)
+                if attempt == max_retries - 1 or not SMBConnectionPool.is_connection_error(e):
+                    self.logger.error("Operation '%s' failed after %s attempt(s). Final error: %s", operation_name, attempt + 1, e)
+                    raise
+                self.logger.warning("Operation '%s' lost its SMB connection (attempt %s/%s), retrying: %s", operation_name, attempt + 1, max_retries, e)
+
+
+# ============================================================================
+# Deferred uploads
+# ============================================================================
+
+
+def is_sharing_violation(exc):
+    """True when ``exc`` means the remote file is open by someone else"""
+    # 0xC0000043 = STATUS_SHARING_VIOLATION
+    error_str = str(exc)
+    return isinstance(exc, FileSharingViolation) or "0xC0000043" in error_str or "Unable to open file" in error_str
+
+
+def upload_retry_delay(attempts, sharing_violation):
+    """Backoff in seconds before retry number ``attempts`` (1-based), with up to 20% jitter"""
+    base = 30 if sharing_violation else 60
+    delay = min(base * 2 ** max(0, attempts - 1), getattr(settings, "SMB_UPLOAD_RETRY_MAX_DELAY", 1800))
+    return round(delay + random.uniform(0, delay * 0.2), 1)
+
+
+def schedule_upload_retry(pending, countdown=None):
+    """Set the next attempt of ``pending`` and enqueue its delayed retry task"""
+    from api.tasks import retry_smb_upload
+
+    if countdown is None:
+        countdown = upload_retry_delay(pending.attempts, pending.reason == "sharing_violation")
+    pending.next_attempt_at = timezone.now() + timedelta(seconds=countdown)
+    pending.save(update_fields=["next_attempt_at", "updated_at"])
+
+    if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+        # An eager retry would run right now; leave it to the periodic sweep
+        logger.info("Upload of %s will be retried by the pending upload sweep", pending.remote_path)
+        return countdown
+    transaction.on_commit(lambda: retry_smb_upload.apply_async((pending.pk,), countdown=countdown))
+    return countdown
+
+
+def defer_upload(server, share_name, remote_path, content, error, fingerprint="", sheet_fingerprints=None):
+    """Record a failed upload as a ``PendingSMBUpload`` (replacing an older pending copy) and schedule its retry"""
+    from api.models import PendingSMBUpload
+
+    pending, _ = PendingSMBUpload.objects.update_or_create(
+        server=server,
+        share_name=share_name,
+        remote_path=remote_path,
+        defaults={
+            "content": bytes(content),
+            "fingerprint": fingerprint or "",
+            "sheet_fingerprints": sheet_fingerprints or {},
+            "reason": "sharing_violation" if is_sharing_violation(error) else "error",
+            "status": "pending",
+            "attempts": 1,
+            "last_error": str(error)[:2000],
+        },
+    )
+    countdown = schedule_upload_retry(pending)
+    logger.warning("Deferred upload of %s (%s), retrying in %ss: %s", remote_path, pending.get_reason_display(), countdown, error)
+    return pending
+
+
+def retry_pending_upload(pending_id):
+    """Try one ``PendingSMBUpload`` again; reschedules it or marks it failed after the last attempt"""
+    from api.models import PendingSMBUpload
+    from api.utils.excel_generator import ExcelGenerator
+
+    pending = PendingSMBUpload.objects.filter(pk=pending_id, status="pending").first()
+    if pending is None:
+        return {"status": "skipped", "reason": "not_pending"}
+    # A newer copy of the file replaced this record and carries its own retry
+    if pending.next_attempt_at and pending.next_attempt_at > timezone.now() + timedelta(seconds=5):
+        return {"status": "skipped", "reason": "rescheduled"}
+
+    ExcelGenerator._load_smb_config()
+    config_changed = (ExcelGenerator.SMB_CONFIG.get("host"), ExcelGenerator.SMB_CONFIG.get("share_name")) != (pending.server, pending.share_name)
+    if config_changed:
+        error = ConnectionError("SMB configuration changed since the upload was queued")
+    else:
+        error = None
+        try:
+            with ExcelGenerator.smb_connection() as conn:
+                if conn is None:
+                    raise ConnectionError("No SMB connection available")
+                ExcelGenerator.ensure_folder_exists(os.path.dirname(pending.remote_path), conn)
+                conn.storeFile(pending.share_name, pending.remote_path, io.BytesIO(bytes(pending.content)))
+        except Exception as e:
+            error = e
+
+    if error is None:
+        if pending.fingerprint:
+            ExcelGenerator._record_upload(pending.remote_path, pending.fingerprint, pending.sheet_fingerprints)
+        pending.delete()
+        logger.info("Deferred upload of %s succeeded after %s failed attempt(s)", pending.remote_path, pending.attempts)
+        return {"status": "uploaded", "remote_path": pending.remote_path}
 
-        raise last_error
+    pending.attempts += 1
+    pending.reason = "sharing_violation" if is_sharing_violation(error) else "error"
+    pending.last_error = str(error)[:2000]
+    if config_changed or pending.attempts > getattr(settings, "SMB_UPLOAD_RETRY_MAX_ATTEMPTS", 12):
+        pending.status = "failed"
+        pending.save(update_fields=["attempts", "reason", "last_error", "status", "updated_at"])
+        logger.error("Giving up on upload of %s after %s attempts: %s", pending.remote_path, pending.attempts, error)
+        return {"status": "failed", "remote_path": pending.remote_path}
+
+    pending.save(update_fields=["attempts", "reason", "last_error", "updated_at"])
+    countdown = schedule_upload_retry(pending)
+    return {"status": "deferred", "remote_path": pending.remote_path, "countdown": countdown}
 
 
 # ============================================================================
@@ -241,33 +460,72 @@ def _retry_operation(self, operation, operation_name, max_retries=None):
 # ============================================================================
 _smb_pool = None
 _smb_service = None
+_registry_lock = Lock()
+
+
+def get_smb_pool(config):
+    """Get the process-wide pool for ``config`` (``ExcelGenerator.SMB_CONFIG`` format).
+
+    Every SMB user in the process shares this pool. When the configuration changes
+    (e.g. another SMBConfiguration is activated) a new pool replaces the old one, whose
+    idle connections are closed.
+    """
+    global _smb_pool
+
+    key = SMBConnectionPool.config_key(config)
+    with _registry_lock:
+        pool = _smb_pool
+        if pool is not None and pool.pid == os.getpid() and pool.key == key:
+            return pool
+
+    # Built outside the registry lock: opening the initial connections can take up to the
+    # connect timeout, and other SMB callers must not wait on an unreachable server meanwhile
+    candidate = SMBConnectionPool(
+        server=config["host"],
+        username=config["username"],
+        password=config["password"],
+        share_name=config["share_name"],
+        domain=config.get("domain") or "WORKGROUP",
+        port=int(config.get("port") or 445),
+        timeout=settings.SMB_CONFIG.get("timeout", 30),
+        min_size=settings.SMB_POOL_SIZE.get("min", 2),
+        max_size=settings.SMB_POOL_SIZE.get("max", 5),
+        idle_timeout=getattr(settings, "SMB_POOL_IDLE_TIMEOUT", 300),
+        keepalive_interval=getattr(settings, "SMB_POOL_KEEPALIVE_INTERVAL", 60),
+        enabled=True,
+    )
+    with _registry_lock:
+        pool = _smb_pool
+        if pool is not None and pool.pid == os.getpid() and pool.key == key:
+            # Another thread installed a pool for this configuration first
+            replaced, pool = candidate, pool
+        else:
+            replaced, _smb_pool = pool, candidate
+            pool = candidate
+    # A pool inherited from a parent process is dropped without touching its sockets
+    if replaced is not None and replaced.pid == os.getpid():
+        replaced.cleanup()
+    return pool
 
 
 def get_smb_service():
-    """Get or create SMB service singleton"""
-    global _smb_pool, _smb_service
-
-    if _smb_service is not None:
-        return _smb_service
+    """Get the SMB service bound to the shared pool (None when SMB is disabled or not configured)"""
+    global _smb_service
 
-    config = settings.SMB_CONFIG
-    if not config.get("enabled", False):
+    if not settings.SMB_CONFIG.get("enabled", False):
         logger.debug("SMB is disabled in configuration")
         return None
 
+    from api.utils.excel_generator import ExcelGenerator
+
+    if not ExcelGenerator._smb_configured():
+        logger.debug("SMB is not configured")
+        return None
+
     try:
-        _smb_pool = SMBConnectionPool(
-            server=config["server"],
-            username=config["username"],
-            password=config["password"],
-            share_name=config["share"],
-            domain=config.get("domain", "WORKGROUP"),
-            port=config.get("port", 445),
-            timeout=config.get("timeout", 30),
-            min_size=settings.SMB_POOL_SIZE.get("min", 2),
-            max_size=settings.SMB_POOL_SIZE.get("max", 5),
-        )
-        _smb_service = SMBService(_smb_pool)
+        pool = get_smb_pool(ExcelGenerator.SMB_CONFIG)
+        if _smb_service is None or _smb_service.pool is not pool:
+            _smb_service = SMBService(pool)
         return _smb_service
     except Exception as e:
         logger.error("Failed to initialize SMB service: %s", e)
@@ -277,7 +535,8 @@ def get_smb_service():
 def cleanup_smb_service():
     """Clean up SMB connections"""
     global _smb_pool, _smb_service
-    if _smb_pool:
-        _smb_pool.cleanup()
-    _smb_service = None
-    _smb_pool = None
+    with _registry_lock:
+        pool, _smb_pool = _smb_pool, None
+        _smb_service = None
+    if pool is not None and pool.pid == os.getpid():
+        pool.cleanup()
@@ -7,6 +7,7 @@
 Signals handled:
 - post_save: Invalidates caches when Employee, Project, or OvertimeRequest is saved
 - post_delete: Invalidates caches when objects are deleted
+- pre_save/post_save/post_delete on OvertimeRequest: keeps OvertimeDailyRollup in step
 """
 
 import logging
@@ -16,11 +17,13 @@
 from concurrent.futures import ThreadPoolExecutor
 
 from django.db import transaction
-from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import CalendarEvent, Employee, ExternalUser, Notification, OvertimeRequest, Project, PurchaseRequest
+from .models import CalendarEvent, Department, Employee, ExternalUser, Notification, OvertimeRequest, Project, PurchaseRequest
 from .services.cache_service import CacheService
+from .services.overtime_service import queue_rollup_refresh, refresh_overtime_rollup
+from .services.reference_data_service import REFERENCE_INVALIDATIONS, invalidate_references_for
 
 logger = logging.getLogger(__name__)
 
@@ -28,25 +31,14 @@
 
 
 def _trigger_excel_fallback(ot_id, request_date):
-    """Generate Excel files in a background thread when Celery is not available."""
+    """Regenerate Excel files in a background thread when Celery is not available."""
 
     def _generate_sync(ot_id_inner, date_inner):
         try:
-            from api.utils.excel_generator import ExcelGenerator
-
-            export_data_grouped = OvertimeRequest.export_daily_data_by_department(date_inner)
-            monthly_data_grouped = OvertimeRequest.export_monthly_data_by_department(date_inner)
-            if export_data_grouped or monthly_data_grouped:
-                ExcelGenerator.generate_all_excel_files(
-                    export_data_grouped,
-                    monthly_data_grouped,
-                    date_inner,
-                    upload=True,
-                    temp_only=ExcelGenerator.EXCEL_TEMP_ONLY,
-                )
-                logger.info("Background thread Excel generation completed for OT %s (date: %s)", ot_id_inner, date_inner)
-            else:
-                logger.warning("No data to export for OT %s (date: %s)", ot_id_inner, date_inner)
+            from .services.excel_regeneration_service import regenerate_excel_for_dates
+
+            regenerate_excel_for_dates([date_inner])
+            logger.info("Background thread Excel generation completed for OT %s (date: %s)", ot_id_inner, date_inner)
         except Exception as sync_err:
             logger.error("Background thread Excel generation failed for OT %s: %s", ot_id_inner, sync_err, exc_info=True)
 
@@ -67,10 +59,18 @@ def send_websocket_notification(user_id: int, notification_data: dict):
     - is_read: Boolean (usually False for new notifications)
     - event_id: Optional linked event ID
     """
+    send_websocket_notifications([(user_id, notification_data)])
+
+
+def send_websocket_notifications(notifications):
+    """
+    Send many ``(user_id, notification_data)`` WebSocket notifications in one batch.
+    Falls back silently if WebSocket is not available.
+    """
     try:
-        from .consumers import send_notification_to_user
+        from .consumers import send_notifications_to_users
 
-        send_notification_to_user(user_id, notification_data)
+        send_notifications_to_users(notifications)
     except Exception as e:
         logger.debug("WebSocket notification failed (non-critical): %s", e)
 
@@ -154,10 +154,10 @@ def notify_leave_event_participants(event, is_update=False):
         if notifs_to_create:
             created = Notification.objects.bulk_create(notifs_to_create)
             notifications_created.extend(created)
-            for notif, (uid, payload) in zip(created, ws_payloads, strict=True):
+            for notif, (_uid, payload) in zip(created, ws_payloads, strict=True):
                 payload["id"] = notif.id
                 payload["created_at"] = notif.created_at.isoformat()
-                send_websocket_notification(uid, payload)
+            send_websocket_notifications(ws_payloads)
 
         logger.info("Notified %s PTB admins about leave for %s", len(notifs_to_create), employee_name)
     except Exception as e:
@@ -257,8 +257,8 @@ def notify_ptb_admins_new_purchase_request(purchase_request):
 
         if notifs_to_create:
             created = Notification.objects.bulk_create(notifs_to_create)
-            for notif, admin_user in zip(created, ptb_admins, strict=True):
-                send_websocket_notification(
+            send_websocket_notifications(
+                (
                     admin_user.id,
                     {
                         "id": notif.id,
@@ -271,6 +271,8 @@ def notify_ptb_admins_new_purchase_request(purchase_request):
                         "created_at": notif.created_at.isoformat(),
                     },
                 )
+                for notif, admin_user in zip(created, ptb_admins, strict=True)
+            )
 
         logger.info("Notified %s PTB admins about new purchase request", len(ptb_admins))
         return created if notifs_to_create else []
@@ -372,10 +374,10 @@ def notify_assigned_employees(sender, instance, action, reverse, model, pk_set,
                 logger.info("Bulk created %s notifications for event assignment", len(created_notifications))
 
                 # Send WebSocket notifications with the created IDs
-                for notification, (user_id, payload) in zip(created_notifications, ws_payloads, strict=True):
+                for notification, (_user_id, payload) in zip(created_notifications, ws_payloads, strict=True):
                     payload["id"] = notification.id
                     payload["created_at"] = notification.created_at.isoformat()
-                    send_websocket_notification(user_id, payload)
+                send_websocket_notifications(ws_payloads)
 
         except Exception as e:
             logger.error("Error creating notifications: %s", e)
@@ -481,6 +483,48 @@ def invalidate_project_cache_on_delete(sender, instance, **kwargs):
         logger.error("Error invalidating project cache on delete: %s", e)
 
 
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_department_cache(sender, instance, **kwargs):
+    """
+    Invalidate department caches when a Department is saved or deleted.
+
+    Employee lists embed the department name, so they are invalidated too.
+
+    Args:
+        sender: The model class (Department)
+        instance: The instance being saved or deleted
+        **kwargs: Additional signal arguments
+    """
+    try:
+        logger.debug("Department changed: %s (ID: %s)", instance.code, instance.id)
+
+        CacheService.invalidate_all_for_view("departments")
+        CacheService.invalidate_all_for_view("employees")
+
+        logger.debug("Invalidated department cache for %s", instance.code)
+    except Exception as e:
+        logger.error("Error invalidating department cache: %s", e)
+
+
+def _refresh_rollup(keys):
+    """Refresh the overtime rollup for ``keys`` without failing the surrounding save/delete."""
+    try:
+        refresh_overtime_rollup(keys)
+    except Exception as e:
+        # The refresh ran in its own savepoint, so the save stands; redo it after commit
+        logger.warning("Error refreshing overtime rollup for %s, queued a retry: %s", keys, e)
+        queue_rollup_refresh(keys)
+
+
+@receiver(pre_save, sender=OvertimeRequest)
+def remember_overtime_rollup_key(sender, instance, **kwargs):
+    """Remember the stored (date, employee) of an updated request so its old rollup rows get refreshed too."""
+    instance._previous_rollup_key = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_rollup_key = OvertimeRequest.objects.filter(pk=instance.pk).values_list("request_date", "employee_id").first()
+
+
 @receiver(post_save, sender=OvertimeRequest)
 def invalidate_overtime_cache(sender, instance, created, **kwargs):
     """
@@ -504,8 +548,14 @@ def invalidate_overtime_cache(sender, instance, created, **kwargs):
     except Exception as e:
         logger.error("Error invalidating overtime cache: %s", e)
 
-    # Offload Excel generation to Celery (or bounded thread-pool fallback)
-    # so the HTTP response is never blocked.
+    rollup_keys = [(instance.request_date, instance.employee_id)]
+    if getattr(instance, "_previous_rollup_key", None):
+        rollup_keys.append(instance._previous_rollup_key)
+    _refresh_rollup(rollup_keys)
+
+    # Offload Excel generation to the coalescing scheduler (or bounded thread-pool
+    # fallback) so the HTTP response is never blocked and bursts of saves for the
+    # same period collapse into one job.
     # Use on_commit to ensure the OT record is committed before the task reads it.
     if instance.request_date:
         ot_id = instance.id
@@ -513,9 +563,9 @@ def invalidate_overtime_cache(sender, instance, created, **kwargs):
 
         def _queue_excel():
             try:
-                from api.tasks import generate_excel_files_async
+                from .services.excel_regeneration_service import schedule_excel_regeneration
 
-                generate_excel_files_async.delay(ot_id)
+                schedule_excel_regeneration([ot_date])
                 logger.info("Queued async Excel generation for OvertimeRequest %s (date: %s)", ot_id, ot_date)
             except Exception as e:
                 logger.warning("Failed to queue async Excel generation for OT %s: %s. Falling back to background thread pool.", ot_id, e)
@@ -545,7 +595,9 @@ def invalidate_overtime_cache_on_delete(sender, instance, **kwargs):
     except Exception as e:
         logger.error("Error invalidating overtime cache on delete: %s", e)
 
-    # Offload Excel regeneration to Celery (or bounded thread-pool fallback)
+    _refresh_rollup([(instance.request_date, instance.employee_id)])
+
+    # Offload Excel regeneration to the coalescing scheduler (or bounded thread-pool fallback)
     # Use on_commit to ensure the deletion is committed before the task runs.
     if instance.request_date:
         ot_id = instance.id
@@ -553,9 +605,9 @@ def invalidate_overtime_cache_on_delete(sender, instance, **kwargs):
 
         def _queue_regen():
             try:
-                from api.tasks import regenerate_excel_after_delete
+                from .services.excel_regeneration_service import schedule_excel_regeneration
 
-                regenerate_excel_after_delete.delay(ot_date.isoformat())
+                schedule_excel_regeneration([ot_date])
                 logger.info("Queued async Excel regeneration after OT deletion (date: %s)", ot_date)
             except Exception as e:
                 logger.warning("Failed to queue async Excel regeneration after delete for %s: %s. Falling back to background thread pool.", ot_date, e)
@@ -608,6 +660,24 @@ def invalidate_calendar_cache_on_delete(sender, instance, **kwargs):
         logger.error("Error invalidating calendar cache on delete: %s", e)
 
 
+def invalidate_reference_data(sender, **kwargs):
+    """
+    Drop the cached reference data built from ``sender`` in every process.
+
+    Connected to post_save and post_delete of each model in
+    reference_data_service.REFERENCE_INVALIDATIONS.
+    """
+    try:
+        invalidate_references_for(sender)
+    except Exception as e:
+        logger.error("Error invalidating reference data for %s: %s", sender.__name__, e)
+
+
+for _reference_model in REFERENCE_INVALIDATIONS:
+    post_save.connect(invalidate_reference_data, sender=_reference_model, dispatch_uid=f"invalidate_reference_data_save_{_reference_model.__name__}")
+    post_delete.connect(invalidate_reference_data, sender=_reference_model, dispatch_uid=f"invalidate_reference_data_delete_{_reference_model.__name__}")
+
+
 @receiver(post_save, sender=PurchaseRequest)
 def handle_purchase_request_save(sender, instance, created, **kwargs):
     """
@@ -20,9 +20,9 @@
 
 
 def should_run_user_activity_logs_cleanup(*, now=None):
-    from api.models import SystemConfiguration
+    from api.services.reference_data_service import get_system_configuration
 
-    config, _ = SystemConfiguration.objects.get_or_create(pk=1)
+    config = get_system_configuration()
     retention_days = config.user_activity_log_retention_days
     if not retention_days:
         return False, {"status": "skipped", "reason": "retention_disabled"}
@@ -84,65 +84,35 @@ def send_leave_notification_email(self, leave_ids, action, actor_username=None):
 @shared_task(bind=True, max_retries=3)
 def generate_excel_files_async(self, overtime_id):
     """
-    Generate Excel files for overtime request and upload to SMB.
+    Generate Excel files for the date and pay period of an overtime request and upload to SMB.
 
-    Uses ExcelGenerator's built-in SMB upload which writes files to the correct
-    period folder path (e.g. Management/PTB/AST_Portal_Overtime/2026-01-26_2026-02-25/).
-    When EXCEL_TEMP_ONLY=True, files are created in a temp directory, uploaded to SMB,
-    then cleaned up automatically.
+    Runs immediately, without coalescing; saves go through
+    ``schedule_excel_regeneration`` instead so bursts collapse into one job.
 
     Args:
         overtime_id: ID of OvertimeRequest
 
     Returns:
-        dict: Task result with file paths or error
+        dict: Task result with regenerated dates or error
     """
     try:
         from api.models import OvertimeRequest
-        from api.utils.excel_generator import ExcelGenerator
+        from api.services.excel_regeneration_service import regenerate_excel_for_dates
 
-        # Update progress
         self.update_state(state="PROGRESS", meta={"progress": 10, "status": "Fetching data"})
 
-        overtime = OvertimeRequest.objects.select_related("employee", "project", "department").get(id=overtime_id)
-
-        logger.info("Generating Excel files for overtime request %s (date: %s)", overtime_id, overtime.request_date)
-
-        # Export data grouped by department (multi-sheet support)
-        export_data_grouped = OvertimeRequest.export_daily_data_by_department(overtime.request_date)
-        monthly_data_grouped = OvertimeRequest.export_monthly_data_by_department(overtime.request_date)
+        request_date = OvertimeRequest.objects.values_list("request_date", flat=True).get(id=overtime_id)
+        logger.info("Generating Excel files for overtime request %s (date: %s)", overtime_id, request_date)
 
         self.update_state(state="PROGRESS", meta={"progress": 30, "status": "Generating Excel and uploading"})
-
-        # Generate files and upload to SMB in one step.
-        # ExcelGenerator.generate_all_excel_files with upload=True will:
-        #   1. Create Excel workbooks (multi-sheet, one per department)
-        #   2. Save locally (temp dir if temp_only=True, else data/excel/{period}/)
-        #   3. Upload to correct SMB period folder via pysmb
-        #   4. Clean up temp files if temp_only=True
-        file_paths = {}
-        if export_data_grouped or monthly_data_grouped:
-            file_paths = ExcelGenerator.generate_all_excel_files(
-                export_data_grouped,
-                monthly_data_grouped,
-                overtime.request_date,
-                upload=True,
-                temp_only=ExcelGenerator.EXCEL_TEMP_ONLY,
-            )
-            dept_count = len(export_data_grouped or {})
-            logger.info("Excel files generated and uploaded for date %s (multi-sheet with %s departments)", overtime.request_date, dept_count)
-        else:
-            logger.warning("No data to export for overtime request %s (date: %s)", overtime_id, overtime.request_date)
-
-        self.update_state(state="PROGRESS", meta={"progress": 95, "status": "Finalizing"})
+        result = regenerate_excel_for_dates([request_date])
 
         logger.info("Task completed for overtime request %s", overtime_id)
-
         return {
             "status": "success",
-            "message": f"Excel files generated for {overtime.request_date}",
+            "message": f"Excel files generated for {request_date}",
             "overtime_id": overtime_id,
-            "file_paths": {k: str(v) for k, v in file_paths.items()},
+            **result,
         }
     except Exception as exc:
         logger.error("Error generating Excel files for OT %s: %s", overtime_id, exc, exc_info=True)
@@ -156,76 +126,160 @@ def regenerate_excel_after_delete(self, request_date_str):
     Regenerate Excel files after an OvertimeRequest is deleted.
     Handles both regeneration of remaining data and cleanup of empty files.
 
+    Kept for messages already in the queue; new callers use ``schedule_excel_regeneration``.
+
     Args:
         request_date_str: ISO date string (YYYY-MM-DD) of the deleted request
     """
     try:
-        from datetime import datetime
+        from api.services.excel_regeneration_service import regenerate_excel_for_dates
 
-        from api.models import OvertimeRequest
-        from api.utils.excel_generator import ExcelGenerator
-
-        date = datetime.strptime(request_date_str, "%Y-%m-%d").date()
-        daily_requests = OvertimeRequest.objects.filter(request_date=date).exclude(status="rejected")
-
-        if daily_requests.exists():
-            # Remaining requests exist for this date — regenerate all files with SMB upload
-            export_data_grouped = OvertimeRequest.export_daily_data_by_department(date)
-            monthly_data_grouped = OvertimeRequest.export_monthly_data_by_department(date)
-            ExcelGenerator.generate_all_excel_files(
-                export_data_grouped,
-                monthly_data_grouped,
-                date,
-                upload=True,
-                temp_only=getattr(ExcelGenerator, "EXCEL_TEMP_ONLY", False),
-            )
-            logger.info("Excel files regenerated and uploaded after deletion for date %s", date)
-        else:
-            # No remaining requests for this date — delete daily files from SMB, handle monthly
-            monthly_data = OvertimeRequest.export_monthly_data(date)
-            conn = ExcelGenerator.get_smb_connection()
-            if conn:
-                try:
-                    period_path = ExcelGenerator.get_smb_period_folder(date)
-                    if period_path:
-                        date_str = date.strftime("%Y%m%d")
-                        try:
-                            conn.deleteFiles(ExcelGenerator.SMB_CONFIG["share_name"], f"{period_path}/{date_str}OT.xlsx")
-                            conn.deleteFiles(ExcelGenerator.SMB_CONFIG["share_name"], f"{period_path}/{date_str}OTSummary.xlsx")
-                            logger.info("Deleted daily SMB files for %s", date)
-                        except Exception as e:
-                            logger.warning("Error deleting daily files for %s: %s", date, e)
-
-                        if monthly_data:
-                            conn.close()
-                            conn = None  # Prevent double-close in finally
-                            ExcelGenerator.generate_monthly_excel_files(monthly_data, date)
-                            logger.info("Monthly files regenerated after deletion for %s", date)
-                        else:
-                            from api.utils.time_helpers import get_period_boundaries
-
-                            current_period_start, next_period_end = get_period_boundaries(date)
-                            monthly_fn = f"~{current_period_start.strftime('%Y_%m_%d')}-{next_period_end.strftime('%Y_%m_%d')}OT.xlsx"
-                            monthly_sum_fn = f"~{current_period_start.strftime('%Y_%m_%d')}-{next_period_end.strftime('%Y_%m_%d')}OTSummary.xlsx"
-                            try:
-                                conn.deleteFiles(ExcelGenerator.SMB_CONFIG["share_name"], f"{period_path}/{monthly_fn}")
-                                conn.deleteFiles(ExcelGenerator.SMB_CONFIG["share_name"], f"{period_path}/{monthly_sum_fn}")
-                                logger.info("Deleted monthly SMB files for period containing %s", date)
-                            except Exception as e:
-                                logger.warning("Error deleting monthly files: %s", e)
-                finally:
-                    if conn:
-                        try:
-                            conn.close()
-                        except Exception:
-                            pass
-
-        return {"status": "success", "date": request_date_str}
+        result = regenerate_excel_for_dates([request_date_str])
+        return {"status": "success", "date": request_date_str, **result}
     except Exception as exc:
         logger.error("Error regenerating Excel after delete: %s", exc, exc_info=True)
         raise self.retry(exc=exc, countdown=60 * (self.request.retries + 1)) from exc
 
 
+@shared_task(bind=True, max_retries=3)
+def flush_excel_regeneration(self, period_start_str, dates=None):
+    """
+    Run the coalesced Excel regeneration for one pay period.
+
+    Enqueued once per period by ``schedule_excel_regeneration``. If more requests
+    arrived during the quiet window the task re-enqueues itself until the period
+    settles or the max-delay cap is reached, then regenerates every pending date.
+    While another flush of the same period is still running it re-enqueues itself
+    instead, leaving the pending dates for the next run.
+
+    Args:
+        period_start_str: ISO date of the pay period start (26th)
+        dates: Dates carried over from a failed attempt (set on retry only)
+    """
+    from django.conf import settings
+
+    from api.services.excel_regeneration_service import claim_pending_dates, period_run_lock, regenerate_excel_for_dates, seconds_until_due
+
+    delay = seconds_until_due(period_start_str)
+    if delay > 0 and not self.request.is_eager and not dates:
+        self.apply_async((period_start_str,), countdown=delay)
+        return {"status": "deferred", "period": period_start_str, "countdown": delay}
+
+    with period_run_lock(period_start_str) as acquired:
+        if not acquired:
+            if self.request.is_eager:
+                # Cannot be re-enqueued: the pending dates stay for the next flush of the period
+                return {"status": "skipped", "period": period_start_str, "reason": "running"}
+            countdown = max(delay, settings.EXCEL_REGEN_QUIET_SECONDS, 1)
+            self.apply_async((period_start_str, dates), countdown=countdown)
+            return {"status": "deferred", "period": period_start_str, "countdown": countdown, "reason": "running"}
+
+        pending_dates = [*claim_pending_dates(period_start_str), *(dates or [])]
+        if not pending_dates:
+            return {"status": "skipped", "period": period_start_str, "reason": "nothing_pending"}
+
+        try:
+            result = regenerate_excel_for_dates(pending_dates)
+        except Exception as exc:
+            logger.error("Error regenerating Excel for period %s: %s", period_start_str, exc, exc_info=True)
+            retry_dates = [str(value) for value in pending_dates]
+            raise self.retry(exc=exc, args=(period_start_str, retry_dates), countdown=60 * (self.request.retries + 1)) from exc
+    return {"status": "success", "period": period_start_str, **result}
+
+
+@shared_task(bind=True, max_retries=5)
+def refresh_overtime_rollup_keys(self, keys):
+    """
+    Re-run an overtime rollup refresh that failed inside a save or delete.
+
+    Queued by ``queue_rollup_refresh`` after the write commits, so the refresh
+    aggregates the committed requests.
+
+    Args:
+        keys: ``[request_date ISO string, employee_id]`` pairs to refresh
+    """
+    from datetime import date
+
+    from api.services.overtime_service import refresh_overtime_rollup
+
+    try:
+        written = refresh_overtime_rollup([(date.fromisoformat(request_date), employee_id) for request_date, employee_id in keys])
+    except Exception as exc:
+        logger.error("Error refreshing overtime rollup for %s: %s", keys, exc, exc_info=True)
+        raise self.retry(exc=exc, countdown=10 * (self.request.retries + 1)) from exc
+    return {"status": "success", "keys": len(keys), "written": written}
+
+
+@shared_task
+def retry_smb_upload(pending_id):
+    """
+    Retry one deferred SMB upload (scheduled with a backoff delay by ``defer_upload``).
+
+    Args:
+        pending_id: ID of PendingSMBUpload
+    """
+    from api.services.smb_service import retry_pending_upload
+
+    return retry_pending_upload(pending_id)
+
+
+@shared_task
+def retry_overdue_smb_uploads():
+    """
+    Re-dispatch deferred SMB uploads whose retry is overdue (e.g. the delayed task was lost).
+    Scheduled to run periodically
+    """
+    from datetime import timedelta
+
+    from api.models import PendingSMBUpload
+
+    overdue = list(PendingSMBUpload.objects.filter(status="pending", next_attempt_at__lt=timezone.now() - timedelta(minutes=5)).values_list("id", flat=True))
+    for pending_id in overdue:
+        retry_smb_upload.delay(pending_id)
+    return {"status": "success", "dispatched": len(overdue)}
+
+
+@shared_task
+def run_overtime_status_job(job_id):
+    """
+    Apply a bulk overtime status change (OvertimeStatusJob) chunk by chunk.
+
+    Args:
+        job_id: ID of OvertimeStatusJob
+    """
+    from api.services.overtime_status_service import run_status_job
+
+    job = run_status_job(job_id)
+    return {"status": job.status, "job_id": job.pk, "updated_count": job.updated_count}
+
+
+@shared_task
+def send_overtime_status_notifications(request_ids, new_status, admin_name, job_id=None):
+    """
+    Notify the employees of one chunk of bulk-updated overtime requests.
+
+    Args:
+        request_ids: IDs of the updated OvertimeRequests
+        new_status: "approved" or "rejected"
+        admin_name: Username shown as the approver
+        job_id: OvertimeStatusJob whose notified_count is increased (optional)
+    """
+    from django.db.models import F
+
+    from api.models import OvertimeStatusJob
+    from api.services.overtime_status_service import send_status_notifications
+
+    try:
+        sent = send_status_notifications(request_ids, new_status, admin_name)
+    except Exception as e:
+        # Not retried: notifications already inserted would be duplicated
+        logger.error("Error sending overtime status notifications: %s", e, exc_info=True)
+        return {"status": "error", "message": str(e)}
+    if job_id and sent:
+        OvertimeStatusJob.objects.filter(pk=job_id).update(notified_count=F("notified_count") + sent)
+    return {"status": "success", "sent": sent}
+
+
 @shared_task
 def cleanup_expired_sessions():
     """
@@ -1,24 +1,69 @@
-from datetime import datetime, time
+import csv
+import io
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from django.contrib.auth import get_user_model
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from openpyxl import Workbook, load_workbook
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.test import APIClient
-from openpyxl import Workbook
-
-from django.db import IntegrityError
-
-from api.models import BoardPresence, CalendarEvent, Department, Employee, EmployeeLeave, ExternalUser, OvertimeRequest, Project, PurchaseRequest, SystemConfiguration, TaskAttachment, TaskGroup, TaskSubtask, TaskTimeLog, UserActivityLog, UserSession
+from smb.base import OperationFailure
+
+from api.consumers import group_send_many, send_notifications_to_users
+from api.models import (
+    BoardPresence,
+    CalendarEvent,
+    Department,
+    Employee,
+    EmployeeLeave,
+    ExternalUser,
+    Notification,
+    OvertimeBreak,
+    OvertimeDailyRollup,
+    OvertimeHoursTotal,
+    OvertimeLimitConfig,
+    OvertimeRequest,
+    PendingSMBUpload,
+    Project,
+    PurchaseRequest,
+    SystemConfiguration,
+    TaskAttachment,
+    TaskGroup,
+    TaskSubtask,
+    TaskTimeLog,
+    UserActivityLog,
+    UserSession,
+)
+from api.pagination import OvertimeRequestPagination
+from api.services import cache_codec, excel_regeneration_service, overtime_service
 from api.services.activity_log_service import purge_user_activity_logs_older_than
+from api.services.cache_metrics import cache_metrics
+from api.services.cache_service import CacheService, LocalLRUCache, local_cache
 from api.services.leave_notification_service import ensure_leave_preview_token, resolve_leave_agent_notification_recipients, resolve_leave_notification_recipients
+from api.services.overtime_limit_service import get_headroom, rebuild_limit_totals
+from api.services.overtime_service import rebuild_overtime_rollup, sync_pay_periods
+from api.services.overtime_status_service import apply_status_chunk
+from api.services.reference_data_service import SMB_CONFIG, get_enabled_departments, get_smb_config, get_system_configuration
+from api.services.smb_service import SMBConnectionPool, SMBPoolUnavailable, SMBService, retry_pending_upload, upload_retry_delay
 from api.tasks import cleanup_user_activity_logs, should_run_user_activity_logs_cleanup
-
+from api.utils.excel_generator import ExcelGenerator
+from api.utils.excel_styles import register_styles
+from api.views.overtime import OvertimeRequestViewSet
 
 TEST_MEDIA_ROOT = Path(settings.BASE_DIR) / "test_media"
 User = get_user_model()
@@ -28,6 +73,15 @@ def aware_dt(year, month, day, hour=0, minute=0):
     return timezone.make_aware(datetime(year, month, day, hour, minute))
 
 
+def isolate_excel_output(test):
+    # Eager Celery renders workbooks when on_commit callbacks run; keep them out of BASE_DIR/data/excel.
+    output_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(output_dir.cleanup)
+    for patcher in (patch.object(ExcelGenerator, "OUTPUT_PATH", Path(output_dir.name)), patch.object(ExcelGenerator, "EXCEL_TEMP_ONLY", True)):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
 @override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
 class TaskAttachmentAuthorizationTests(TestCase):
     def setUp(self):
@@ -1448,3 +1502,1351 @@ def test_member_can_leave_group(self):
 
         self.assertEqual(response.status_code, 200)
         self.assertFalse(self.group.members.filter(id=self.member_employee.id).exists())
+
+
+class ExcelIncrementalRegenerationTests(TestCase):
+    PERIOD_START = date(2025, 12, 26)
+    PERIOD_END = date(2026, 1, 25)
+
+    def setUp(self):
+        cache.clear()
+        self.data = {code: self._dept(code, rows) for code, rows in (("D01", 3), ("D02", 4), ("D03", 2))}
+
+    def _dept(self, code, rows):
+        return {
+            "dept_code": code,
+            "dept_name": f"Department {code}",
+            "data": [
+                {
+                    "employee_id": f"{code}-{index}",
+                    "employee_name": f"Employee {index}",
+                    "request_date": f"2026-01-{index + 1:02d}",
+                    "time_start": "18:00",
+                    "time_end": "20:00",
+                    "total_hours": "2.00",
+                    "has_break": False,
+                    "reason": "Release",
+                    "detail": "",
+                    "is_weekend": False,
+                    "is_holiday": False,
+                }
+                for index in range(rows)
+            ],
+        }
+
+    def _render(self, data):
+        ((_job, content),) = ExcelGenerator._render_jobs([("~test-periodOT.xlsx", "monthly_form", data, (self.PERIOD_START, self.PERIOD_END), True)])
+        return content
+
+    @staticmethod
+    def _cells(content):
+        wb = load_workbook(io.BytesIO(content))
+        return [(ws.title, sorted(str(rng) for rng in ws.merged_cells.ranges), [[cell.value for cell in row] for row in ws.iter_rows()]) for ws in wb.worksheets]
+
+    def test_only_changed_department_sheet_is_rerendered(self):
+        self._render(self.data)
+        self.data["D02"] = self._dept("D02", 6)
+
+        with patch.object(ExcelGenerator, "_render_monthly_ot_form_sheet", wraps=ExcelGenerator._render_monthly_ot_form_sheet) as render_sheet:
+            self._render(self.data)
+
+        self.assertEqual([call.args[1] for call in render_sheet.call_args_list], ["D02"])
+
+    def test_patched_workbook_matches_full_rebuild(self):
+        self._render(self.data)
+        self.data["D01"] = self._dept("D01", 1)
+        del self.data["D02"]
+        self.data["C00"] = self._dept("C00", 2)
+
+        incremental = self._render(self.data)
+        full = ExcelGenerator.create_monthly_ot_form_multi_sheet(self.data, self.PERIOD_START, self.PERIOD_END)
+        buffer = io.BytesIO()
+        full.save(buffer)
+
+        self.assertEqual(load_workbook(io.BytesIO(incremental)).sheetnames, ["C00", "D01", "D03"])
+        self.assertEqual(self._cells(incremental), self._cells(buffer.getvalue()))
+
+    def test_unchanged_data_reuses_cached_workbook(self):
+        first = self._render(self.data)
+
+        with patch.object(ExcelGenerator, "_render_monthly_ot_form_sheet") as render_sheet:
+            second = self._render(self.data)
+
+        render_sheet.assert_not_called()
+        self.assertEqual(first, second)
+
+
+@override_settings(EXCEL_REGEN_QUIET_SECONDS=10, EXCEL_REGEN_MAX_DELAY_SECONDS=60)
+class ExcelRegenerationSchedulerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_for_same_period_enqueues_single_flush(self):
+        with patch("api.tasks.flush_excel_regeneration.apply_async") as apply_async:
+            for _ in range(300):
+                excel_regeneration_service.schedule_excel_regeneration([date(2026, 1, 5)])
+            excel_regeneration_service.schedule_excel_regeneration([date(2026, 1, 6), date(2026, 1, 27)])
+
+        self.assertEqual(sorted(call.args[0] for call in apply_async.call_args_list), [("2025-12-26",), ("2026-01-26",)])
+        self.assertEqual(excel_regeneration_service.claim_pending_dates("2025-12-26"), [date(2026, 1, 5), date(2026, 1, 6)])
+        self.assertEqual(excel_regeneration_service.claim_pending_dates("2025-12-26"), [])
+
+    def test_flush_waits_for_quiet_window_but_respects_max_delay(self):
+        key = excel_regeneration_service.PENDING_KEY.format(period="2025-12-26")
+        now = timezone.now().timestamp()
+
+        cache.set(key, {"dates": ["2026-01-05"], "first": now - 4, "last": now - 4})
+        self.assertAlmostEqual(excel_regeneration_service.seconds_until_due("2025-12-26"), 6, delta=1)
+
+        # Changes keep arriving, but the batch is flushed once the max-delay cap is hit
+        cache.set(key, {"dates": ["2026-01-05"], "first": now - 58, "last": now})
+        self.assertAlmostEqual(excel_regeneration_service.seconds_until_due("2025-12-26"), 2, delta=1)
+
+        cache.set(key, {"dates": ["2026-01-05"], "first": now - 90, "last": now})
+        self.assertEqual(excel_regeneration_service.seconds_until_due("2025-12-26"), 0)
+
+    @override_settings(EXCEL_REGEN_QUIET_SECONDS=0, EXCEL_REGEN_MAX_DELAY_SECONDS=0)
+    def test_schedule_arriving_mid_flush_waits_for_running_flush(self):
+        from api.tasks import flush_excel_regeneration
+
+        overlapping = []
+
+        def render(dates):
+            # A write lands while the first flush renders; its flush must not run alongside
+            with patch("api.tasks.flush_excel_regeneration.apply_async") as apply_async:
+                excel_regeneration_service.schedule_excel_regeneration([date(2026, 1, 6)])
+                overlapping.append(flush_excel_regeneration.run("2025-12-26"))
+            overlapping.append([call.args[0] for call in apply_async.call_args_list])
+            return {"daily": [value.isoformat() for value in dates]}
+
+        with patch("api.tasks.flush_excel_regeneration.apply_async"):
+            excel_regeneration_service.schedule_excel_regeneration([date(2026, 1, 5)])
+        with patch("api.services.excel_regeneration_service.regenerate_excel_for_dates", side_effect=render) as regenerate:
+            self.assertEqual(flush_excel_regeneration.run("2025-12-26")["daily"], ["2026-01-05"])
+            self.assertEqual(regenerate.call_count, 1)
+
+            deferred, enqueued = overlapping
+            self.assertEqual((deferred["status"], deferred["reason"]), ("deferred", "running"))
+            # The flush scheduled by the write, then its re-deferral on finding the run lock held
+            self.assertEqual(enqueued, [("2025-12-26",), ("2025-12-26", None)])
+
+            # The re-deferred flush picks up the date once the first one has finished
+            regenerate.side_effect = lambda dates: {"daily": [value.isoformat() for value in dates]}
+            self.assertEqual(flush_excel_regeneration.run("2025-12-26")["daily"], ["2026-01-06"])
+            self.assertEqual(regenerate.call_count, 2)
+
+    def test_empty_dates_remove_daily_and_monthly_files(self):
+        conn = Mock()
+        with (
+            patch.object(ExcelGenerator, "get_smb_period_folder", return_value="reports/2025-12-26_2026-01-25"),
+            patch.object(ExcelGenerator, "smb_connection", return_value=nullcontext(conn)),
+        ):
+            result = excel_regeneration_service.regenerate_excel_for_dates(["2026-01-05"])
+
+        self.assertEqual(result["deleted"], ["2026-01-05"])
+        removed = [call.args[1] for call in conn.deleteFiles.call_args_list]
+        self.assertEqual(
+            removed,
+            [
+                "reports/2025-12-26_2026-01-25/20260105OT.xlsx",
+                "reports/2025-12-26_2026-01-25/20260105OTSummary.xlsx",
+                "reports/2025-12-26_2026-01-25/~2025_12_26-2026_01_25OT.xlsx",
+                "reports/2025-12-26_2026-01-25/~2025_12_26-2026_01_25OTSummary.xlsx",
+            ],
+        )
+
+
+class ExcelStreamingEngineParityTests(TestCase):
+    PERIOD_START = date(2025, 12, 26)
+    PERIOD_END = date(2026, 1, 25)
+
+    def _data(self, rows):
+        return {
+            code: {
+                "dept_code": code,
+                "dept_name": f"Department {code}",
+                "data": [
+                    {
+                        "employee_id": f"{code}-{index}",
+                        "employee_name": f"Employee {index}",
+                        "request_date": f"2026-01-{index % 25 + 1:02d}",
+                        "time_start": "18:00",
+                        "time_end": "20:30",
+                        "total_hours": "2.50",
+                        "has_break": index % 2 == 0,
+                        "reason": "Release",
+                        "detail": f"detail {index}",
+                        "is_weekend": index % 3 == 0,
+                        "is_holiday": index % 5 == 0,
+                    }
+                    for index in range(rows)
+                ],
+            }
+            for code in ("D01", "D02")
+        }
+
+    @staticmethod
+    def _layout(wb):
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        loaded = load_workbook(io.BytesIO(buffer.getvalue()))
+        layout = []
+        for ws in loaded.worksheets:
+            layout.append(
+                (
+                    ws.title,
+                    sorted(str(rng) for rng in ws.merged_cells.ranges),
+                    {col: dim.width for col, dim in ws.column_dimensions.items()},
+                    {row: dim.height for row, dim in ws.row_dimensions.items() if dim.height},
+                )
+            )
+            for row in ws.iter_rows():
+                for cell in row:
+                    layout.append((cell.coordinate, cell.value, repr(cell.font), repr(cell.alignment), repr(cell.border), cell.number_format))
+        return layout
+
+    def test_monthly_form_streaming_matches_standard_layout(self):
+        # Below and above the 30-row padding of the printed form
+        for rows in (3, 42):
+            data = self._data(rows)
+            with self.subTest(rows=rows):
+                self.assertEqual(
+                    self._layout(ExcelGenerator.create_monthly_ot_form_multi_sheet(data, self.PERIOD_START, self.PERIOD_END, engine="streaming")),
+                    self._layout(ExcelGenerator.create_monthly_ot_form_multi_sheet(data, self.PERIOD_START, self.PERIOD_END, engine="standard")),
+                )
+
+    def test_monthly_summary_streaming_matches_standard_layout(self):
+        data = self._data(12)
+
+        self.assertEqual(
+            self._layout(ExcelGenerator.create_monthly_ot_summary_multi_sheet(data, self.PERIOD_START, self.PERIOD_END, engine="streaming")),
+            self._layout(ExcelGenerator.create_monthly_ot_summary_multi_sheet(data, self.PERIOD_START, self.PERIOD_END, engine="standard")),
+        )
+
+    def test_engine_is_selected_per_report_type(self):
+        data = self._data(2)
+
+        with patch.object(ExcelGenerator, "EXCEL_STREAMING_REPORTS", {"monthly_form"}):
+            form = ExcelGenerator.create_monthly_ot_form_multi_sheet(data, self.PERIOD_START, self.PERIOD_END)
+            summary = ExcelGenerator.create_monthly_ot_summary_multi_sheet(data, self.PERIOD_START, self.PERIOD_END)
+
+        self.assertTrue(form.write_only)
+        self.assertFalse(summary.write_only)
+        # A write-only workbook holds open temp files until it is saved
+        form.save(io.BytesIO())
+
+
+class ExcelStyleRegistryTests(TestCase):
+    def test_builders_reference_shared_named_styles(self):
+        data = {"D01": {"dept_code": "D01", "dept_name": "Department", "data": []}}
+
+        wb = ExcelGenerator.create_ot_form_multi_sheet(data, date(2026, 1, 10))
+        register_styles(wb)
+
+        ws = wb["D01"]
+        self.assertEqual(ws["A1"].style, "ot_title")
+        self.assertEqual({ws[f"D{row}"].style for row in range(4, 34)}, {"ot_grid"})
+        self.assertEqual(len(wb.named_styles), len(set(wb.named_styles)))
+
+
+class ExcelGenerateAllFilesTests(TestCase):
+    REMOTE = "reports/2025-12-26_2026-01-25"
+
+    def setUp(self):
+        cache.clear()
+        self.data = {
+            code: {
+                "dept_code": code,
+                "dept_name": f"Department {code}",
+                "data": [
+                    {
+                        "employee_id": f"{code}-{index}",
+                        "employee_name": f"Employee {index}",
+                        "request_date": f"2026-01-{index + 1:02d}",
+                        "time_start": "18:00",
+                        "time_end": "20:00",
+                        "total_hours": "2.00",
+                        "has_break": False,
+                        "reason": "Release",
+                        "detail": "",
+                        "is_weekend": False,
+                        "is_holiday": False,
+                    }
+                    for index in range(rows)
+                ],
+            }
+            for code, rows in (("D01", 3), ("D02", 5))
+        }
+
+    def _generate(self, pool, locked=(), daily=None, monthly=None, error=None, **kwargs):
+        stored = {}
+        conn = Mock()
+
+        def store_file(share, path, file_obj):
+            if path in locked:
+                raise error or OperationFailure("Failed to store file: Unable to open file", [])
+            stored[path] = file_obj.read()
+
+        conn.storeFile.side_effect = store_file
+        with (
+            patch.object(ExcelGenerator, "EXCEL_RENDER_POOL", pool),
+            patch.object(ExcelGenerator, "EXCEL_INCREMENTAL", False),
+            patch.object(ExcelGenerator, "_smb_configured", return_value=True),
+            patch.object(ExcelGenerator, "get_smb_period_folder", return_value=self.REMOTE),
+            patch.object(ExcelGenerator, "smb_connection", return_value=nullcontext(conn)),
+            patch.object(ExcelGenerator, "ensure_folder_exists"),
+        ):
+            paths = ExcelGenerator.generate_all_excel_files(daily or self.data, monthly or self.data, date(2026, 1, 5), upload=True, temp_only=True, **kwargs)
+        self.assertEqual(len(paths), len(stored) + len(locked))
+        return {path: [(ws.title, [[cell.value for cell in row] for row in ws.iter_rows()]) for ws in load_workbook(io.BytesIO(content)).worksheets] for path, content in stored.items()}
+
+    def test_pooled_rendering_uploads_same_workbooks_as_sequential(self):
+        sequential = self._generate("")
+        self.assertEqual(
+            sorted(sequential),
+            sorted(f"{self.REMOTE}/{name}" for name in ("20260105OT.xlsx", "20260105OTSummary.xlsx", "~2025_12_26-2026_01_25OT.xlsx", "~2025_12_26-2026_01_25OTSummary.xlsx")),
+        )
+        for pool in ("thread", "process"):
+            with self.subTest(pool=pool):
+                self.assertEqual(self._generate(pool, force=True), sequential)
+
+    def test_failed_process_pool_falls_back_to_threads(self):
+        with patch("api.utils.excel_generator.ProcessPoolExecutor", side_effect=OSError("no processes")):
+            self.assertEqual(len(self._generate("process", force=True)), 4)
+
+    def test_daemonic_worker_renders_process_pool_jobs_on_threads(self):
+        with (
+            patch("api.utils.excel_generator.multiprocessing.current_process", return_value=Mock(daemon=True)),
+            patch("api.utils.excel_generator.ProcessPoolExecutor") as process_pool,
+            patch.object(ExcelGenerator, "EXCEL_RENDER_POOL", "process"),
+        ):
+            executor = ExcelGenerator._render_executor(4)
+            self.assertIsInstance(executor, ThreadPoolExecutor)
+            executor.shutdown()
+            self.assertEqual(len(self._generate("process", force=True)), 4)
+        process_pool.assert_not_called()
+
+    def test_temp_only_upload_streams_from_memory(self):
+        with (
+            patch("api.utils.excel_generator.tempfile.mkdtemp") as mkdtemp,
+            patch.object(ExcelGenerator, "_write_workbook") as write_workbook,
+        ):
+            stored = self._generate("")
+
+        mkdtemp.assert_not_called()
+        write_workbook.assert_not_called()
+        self.assertEqual(len(stored), 4)
+
+    def test_unchanged_payload_is_not_rendered_or_uploaded_again(self):
+        department = Department.objects.create(code="FP", name="Fingerprint")
+        project = Project.objects.create(name="Theta")
+        requests = [
+            OvertimeRequest.objects.create(
+                employee=Employee.objects.create(name=f"Fingerprint User {index}", emp_id=f"FP00{index}", department=department),
+                department=department,
+                project=project,
+                request_date=date(2026, 1, 5),
+                time_start=datetime(2026, 1, 5, 18, 0).time(),
+                time_end=datetime(2026, 1, 5, 20, 0).time(),
+                total_hours="2.00",
+                reason="Fingerprint",
+            )
+            for index in range(2)
+        ]
+
+        def export():
+            daily_by_date, monthly = OvertimeRequest.export_period_data_by_department(date(2026, 1, 5))
+            return daily_by_date[date(2026, 1, 5)], monthly
+
+        daily, monthly = export()
+        self.assertEqual(len(self._generate("", daily=daily, monthly=monthly)), 4)
+
+        # Approving a request only bumps fields that are never written to a cell
+        requests[0].status = "approved"
+        with patch("django.utils.timezone.now", return_value=timezone.now() + timedelta(hours=1)):
+            requests[0].save()
+        approved_daily, approved_monthly = export()
+        self.assertNotEqual(approved_daily["FP"]["data"][0]["updated_at"], daily["FP"]["data"][0]["updated_at"])
+        with patch("api.utils.excel_generator._render_report") as render_report:
+            self.assertEqual(self._generate("", daily=approved_daily, monthly=approved_monthly), {})
+        render_report.assert_not_called()
+
+        requests[1].time_end = datetime(2026, 1, 5, 21, 0).time()
+        requests[1].save()
+        daily, monthly = export()
+        self.assertEqual(len(self._generate("", daily=daily, monthly=monthly)), 4)
+        self.assertEqual(len(self._generate("", daily=daily, monthly=monthly, force=True)), 4)
+
+        ExcelGenerator.forget_uploads([f"{self.REMOTE}/20260105OT.xlsx"])
+        self.assertEqual(list(self._generate("", daily=daily, monthly=monthly)), [f"{self.REMOTE}/20260105OT.xlsx"])
+
+    def test_locked_file_is_deferred_and_uploaded_by_retry(self):
+        locked = f"{self.REMOTE}/~2025_12_26-2026_01_25OT.xlsx"
+        self.assertEqual(len(self._generate("", locked=(locked,))), 3)
+
+        pending = PendingSMBUpload.objects.get(remote_path=locked)
+        self.assertEqual((pending.reason, pending.status, pending.attempts), ("sharing_violation", "pending", 1))
+        self.assertGreater(pending.next_attempt_at, timezone.now())
+        self.assertTrue(bytes(pending.content).startswith(b"PK"))
+
+        # The file is still open: the retry is rescheduled rather than waited for
+        conn = Mock()
+        conn.storeFile.side_effect = OperationFailure("Unable to open file", [])
+        PendingSMBUpload.objects.filter(pk=pending.pk).update(next_attempt_at=timezone.now())
+        with patch.object(ExcelGenerator, "_load_smb_config"), patch.object(ExcelGenerator, "smb_connection", return_value=nullcontext(conn)):
+            self.assertEqual(retry_pending_upload(pending.pk)["status"], "deferred")
+        self.assertEqual(PendingSMBUpload.objects.get(pk=pending.pk).attempts, 2)
+
+        conn.storeFile.side_effect = None
+        PendingSMBUpload.objects.filter(pk=pending.pk).update(next_attempt_at=timezone.now())
+        with patch.object(ExcelGenerator, "_load_smb_config"), patch.object(ExcelGenerator, "smb_connection", return_value=nullcontext(conn)):
+            self.assertEqual(retry_pending_upload(pending.pk)["status"], "uploaded")
+        self.assertFalse(PendingSMBUpload.objects.exists())
+        self.assertEqual(ExcelGenerator._uploaded_fingerprints([locked]).keys(), {locked})
+
+    def test_other_store_failures_are_deferred_but_connection_errors_abort(self):
+        failed = f"{self.REMOTE}/20260105OTSummary.xlsx"
+        self.assertEqual(len(self._generate("", locked=(failed,), error=OperationFailure("Failed to store file: disk full", []))), 3)
+        pending = PendingSMBUpload.objects.get(remote_path=failed)
+        self.assertEqual((pending.reason, pending.status), ("error", "pending"))
+
+        with self.assertRaises(ConnectionResetError):
+            self._generate("", locked=(failed,), error=ConnectionResetError("connection reset"), force=True)
+
+    def test_upload_retry_delay_backs_off_with_bounded_jitter(self):
+        for attempts, base in ((1, 30), (2, 60), (3, 120)):
+            delay = upload_retry_delay(attempts, sharing_violation=True)
+            self.assertTrue(base <= delay <= base * 1.2, delay)
+        self.assertLessEqual(upload_retry_delay(30, sharing_violation=False), settings.SMB_UPLOAD_RETRY_MAX_DELAY * 1.2)
+
+
+class SMBConnectionPoolTests(TestCase):
+    def _pool(self, **kwargs):
+        options = {"max_size": 2, "min_size": 0, "enabled": True, "timeout": 1, **kwargs}
+        pool = SMBConnectionPool("smb.local", "user", "secret", "Reports", **options)
+        pool._create_connection = Mock(side_effect=lambda: Mock(name=f"conn{pool.metrics['created']}"))
+        return pool
+
+    def test_connections_are_exclusive_until_released(self):
+        pool = self._pool()
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+
+        with self.assertRaises(SMBPoolUnavailable):
+            pool.acquire(timeout=0)
+
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(pool.stats()["in_use"], 2)
+
+    def test_unavailable_pool_is_not_retried_and_upload_is_deferred(self):
+        pool = self._pool(max_size=1)
+        pool._create_connection.side_effect = SMBPoolUnavailable("Cannot connect to SMB server smb.local:445")
+
+        with patch("api.services.smb_service.defer_upload") as defer:
+            self.assertIsNone(SMBService(pool).upload_bytes(b"PK", "reports/a.xlsx"))
+        self.assertEqual(pool._create_connection.call_count, 1)
+        defer.assert_called_once()
+        self.assertFalse(SMBConnectionPool.is_connection_error(SMBPoolUnavailable("No SMB connection available")))
+
+    def test_new_pool_connects_outside_the_registry_lock(self):
+        from api.services import smb_service
+
+        config = {"host": "smb.local", "username": "user", "password": "secret", "share_name": "Reports"}
+        held = []
+        with patch.object(SMBConnectionPool, "_initialize_pool", autospec=True, side_effect=lambda pool: held.append(smb_service._registry_lock.locked())):
+            pool = smb_service.get_smb_pool(config)
+            self.assertIs(smb_service.get_smb_pool(config), pool)
+        smb_service.cleanup_smb_service()
+        self.assertEqual(held, [False])
+
+    def test_idle_connection_is_reused_without_probe_and_probed_after_keepalive(self):
+        pool = self._pool(keepalive_interval=60)
+        with pool.connection() as conn:
+            pass
+        with pool.connection() as again:
+            self.assertIs(again, conn)
+        conn.echo.assert_not_called()
+
+        pool.idle = [(conn, pool.idle[0][1] - 120)]
+        conn.echo.side_effect = OSError("connection reset")
+        with pool.connection() as fresh:
+            self.assertIsNot(fresh, conn)
+        conn.close.assert_called_once()
+
+    def test_broken_connection_is_discarded_but_operation_failure_is_not(self):
+        from smb.base import NotConnectedError, OperationFailure
+
+        pool = self._pool()
+        with self.assertRaises(OperationFailure), pool.connection() as conn:
+            raise OperationFailure("missing file", [])
+        self.assertEqual([entry[0] for entry in pool.idle], [conn])
+
+        with self.assertRaises(NotConnectedError), pool.connection() as conn:
+            raise NotConnectedError()
+        self.assertEqual(pool.idle, [])
+        self.assertEqual(pool.stats()["in_use"], 0)
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+
+class OvertimePeriodSnapshotExportTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(code="PS", name="Period Snapshot")
+        self.project = Project.objects.create(name="Delta")
+        self.employees = [Employee.objects.create(name=f"Snapshot User {index}", emp_id=f"PS00{index}", department=self.department if index < 2 else None) for index in range(3)]
+        self.excluded = Employee.objects.create(name="Excluded User", emp_id="PS099", department=self.department, exclude_from_reports=True)
+
+        self._create_request(self.employees[0], date(2026, 1, 5), 19)
+        first = self._create_request(self.employees[1], date(2026, 1, 5), 18, has_break=True)
+        OvertimeBreak.objects.create(overtime_request=first, start_time=datetime(2026, 1, 5, 19, 0).time(), end_time=datetime(2026, 1, 5, 19, 30).time(), duration_hours="0.50")
+        self._create_request(self.employees[2], date(2026, 1, 5), 18)
+        self._create_request(self.employees[0], date(2026, 1, 6), 18)
+        self._create_request(self.employees[0], date(2025, 12, 28), 18, status="rejected")
+        self._create_request(self.excluded, date(2026, 1, 6), 18)
+        # Outside the 2025-12-26 -> 2026-01-25 period
+        self._create_request(self.employees[1], date(2026, 1, 26), 18)
+
+    def _create_request(self, employee, request_date, start_hour, **extra):
+        department = employee.department
+        return OvertimeRequest.objects.create(
+            employee=employee,
+            employee_name=employee.name,
+            department=department,
+            department_code=department.code if department else "",
+            project=self.project,
+            project_name=self.project.name,
+            request_date=request_date,
+            time_start=datetime(2026, 1, 1, start_hour, 0).time(),
+            time_end=datetime(2026, 1, 1, start_hour + 2, 0).time(),
+            total_hours="2.00",
+            reason="Period close",
+            **extra,
+        )
+
+    def test_period_snapshot_matches_separate_daily_and_monthly_exports(self):
+        days = [date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7)]
+        expected_daily = {day: OvertimeRequest.export_daily_data_by_department(day) for day in days}
+        expected_monthly = OvertimeRequest.export_monthly_data_by_department(days[0])
+
+        # One query for the period rows, one for their breaks
+        with self.assertNumQueries(2):
+            daily_by_date, monthly = OvertimeRequest.export_period_data_by_department(days[0], days)
+
+        self.assertEqual(daily_by_date, expected_daily)
+        self.assertEqual(monthly, expected_monthly)
+        self.assertEqual(daily_by_date[date(2026, 1, 7)], {})
+        self.assertEqual([row["employee_id"] for row in daily_by_date[date(2026, 1, 5)]["PS"]["data"]], ["PS001", "PS000"])
+        self.assertEqual(daily_by_date[date(2026, 1, 5)]["PS"]["data"][0]["breaks"], [{"start_time": "19:00", "end_time": "19:30", "duration_hours": "0.50"}])
+        self.assertEqual(daily_by_date[date(2026, 1, 5)][ExcelGenerator.DEFAULT_DEPT_CODE]["data"][0]["employee_id"], "PS002")
+        self.assertEqual([row["request_date"] for row in monthly["PS"]["data"]], ["2026-01-05", "2026-01-05", "2026-01-06"])
+
+
+class OvertimeDailyRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        isolate_excel_output(self)
+        self.client = APIClient()
+        self.department = Department.objects.create(code="RU", name="Rollup")
+        self.projects = [Project.objects.create(name="Epsilon"), Project.objects.create(name="Zeta")]
+        self.employees = [Employee.objects.create(name=f"Rollup User {index}", emp_id=f"RU00{index}", department=self.department) for index in range(2)]
+        self.admin_user = ExternalUser.objects.create(external_id=801, username="rollup-admin", email="rollup-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.worker_user = ExternalUser.objects.create(external_id=802, username="rollup-worker", email="rollup-worker@example.com", worker_id="RU001", is_active=True, date_joined=aware_dt(2026, 1, 1))
+
+        self.requests = [
+            self._create_request(self.employees[0], self.projects[0], date(2026, 1, 2), "2.00"),
+            # Saturday
+            self._create_request(self.employees[0], self.projects[1], date(2026, 1, 3), "3.50", status="approved"),
+            self._create_request(self.employees[1], self.projects[0], date(2026, 1, 5), "1.50", is_holiday=True),
+            self._create_request(self.employees[1], self.projects[1], date(2026, 1, 6), "4.00", status="rejected"),
+            # Previous period
+            self._create_request(self.employees[1], self.projects[0], date(2025, 12, 10), "2.50", status="approved"),
+        ]
+
+    def _create_request(self, employee, project, request_date, hours, **extra):
+        return OvertimeRequest.objects.create(
+            employee=employee,
+            employee_name=employee.name,
+            department=self.department,
+            department_code=self.department.code,
+            project=project,
+            project_name=project.name,
+            request_date=request_date,
+            time_start=datetime(2026, 1, 1, 18, 0).time(),
+            time_end=datetime(2026, 1, 1, 22, 0).time(),
+            total_hours=hours,
+            reason="Rollup check",
+            **extra,
+        )
+
+    def _snapshot(self):
+        return sorted(OvertimeDailyRollup.objects.values_list("request_date", "employee_id", "project_id", "department_code", "status", "is_weekend", "is_holiday", "request_count", "total_hours"))
+
+    def _get(self, action, user=None, **params):
+        self.client.force_authenticate(user or self.admin_user)
+        response = self.client.get(reverse(f"overtime-request-{action}"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_incremental_maintenance_matches_full_rebuild(self):
+        moved = self.requests[0]
+        moved.request_date = date(2026, 1, 7)
+        moved.employee = self.employees[1]
+        moved.save()
+        self.requests[2].delete()
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.post(reverse("overtime-request-bulk-update-status"), {"ids": [self.requests[1].id, self.requests[3].id], "status": "pending"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        incremental = self._snapshot()
+        rebuild_overtime_rollup()
+
+        self.assertEqual(incremental, self._snapshot())
+        self.assertEqual(len(incremental), 4)
+        self.assertFalse(OvertimeDailyRollup.objects.filter(request_date=date(2026, 1, 2)).exists())
+        self.assertEqual(set(OvertimeDailyRollup.objects.filter(request_date__gte=date(2026, 1, 1)).values_list("status", flat=True)), {"pending"})
+
+    def test_conflicting_refresh_is_retried_after_commit(self):
+        rollup_rows = overtime_service._rollup_rows
+        raced = []
+
+        def racing_rows(queryset):
+            # A concurrent refresh of the same key inserts its rows between our delete and insert
+            if not raced:
+                raced.append(True)
+                OvertimeDailyRollup.objects.bulk_create(list(rollup_rows(queryset)))
+            yield from rollup_rows(queryset)
+
+        approved = self.requests[0]
+        approved.status = "approved"
+        with (
+            patch("api.services.overtime_service._rollup_rows", side_effect=racing_rows),
+            self.assertLogs("api.signals", "WARNING"),
+            self.captureOnCommitCallbacks(execute=True) as callbacks,
+        ):
+            approved.save()
+
+        self.assertTrue(raced)
+        self.assertTrue(callbacks)
+        self.assertEqual(OvertimeDailyRollup.objects.get(request_date=date(2026, 1, 2)).status, "approved")
+        incremental = (self._snapshot(), sorted(OvertimeHoursTotal.objects.values_list("employee_id", "span", "start_date", "total_hours")))
+        rebuild_overtime_rollup()
+        self.assertEqual(incremental, (self._snapshot(), sorted(OvertimeHoursTotal.objects.values_list("employee_id", "span", "start_date", "total_hours"))))
+
+    def test_stats_endpoints_answer_from_rollup(self):
+        summary = self._get("summary-stats", start_date="2026-01-01", end_date="2026-01-25", prev_start_date="2025-12-01", prev_end_date="2025-12-25")
+
+        self.assertEqual(summary["total_requests"], 3)
+        self.assertEqual(summary["total_hours"], Decimal("7.00"))
+        self.assertEqual(summary["weekday_hours"], Decimal("2.00"))
+        self.assertEqual(summary["weekend_hours"], Decimal("3.50"))
+        self.assertEqual(summary["holiday_hours"], Decimal("1.50"))
+        self.assertEqual(summary["approved_hours"], Decimal("3.50"))
+        self.assertEqual(summary["pending_hours"], Decimal("3.50"))
+        self.assertEqual((summary["unique_employees"], summary["unique_projects"]), (2, 2))
+        self.assertEqual((summary["previous"]["total_requests"], summary["previous"]["total_hours"]), (1, Decimal("2.50")))
+
+        employees = self._get("employee-stats", start_date="2026-01-01", end_date="2026-01-25")
+        self.assertEqual([(row["employee_name"], row["total_hours"], row["total_requests"]) for row in employees], [("Rollup User 0", Decimal("5.50"), 2), ("Rollup User 1", Decimal("1.50"), 1)])
+
+        projects = self._get("project-stats", start_date="2026-01-01", end_date="2026-01-25", status="rejected")
+        self.assertEqual([(row["project_name"], row["total_hours"], row["total_requests"], row["unique_employees"]) for row in projects], [("Zeta", Decimal("4.00"), 1, 1)])
+
+        own = self._get("summary-stats", user=self.worker_user, start_date="2026-01-01", end_date="2026-01-25")
+        self.assertEqual((own["total_requests"], own["total_hours"], own["unique_employees"]), (1, Decimal("1.50"), 1))
+
+    def test_stats_cache_is_shared_per_scope_and_invalidated_per_period(self):
+        other_admin = ExternalUser.objects.create(external_id=803, username="rollup-admin-2", email="rollup-admin-2@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        params = {"start_date": "2026-01-01", "end_date": "2026-01-25"}
+        self.assertEqual(self._get("summary-stats", **params)["total_hours"], Decimal("7.00"))
+        self.assertEqual(self._get("summary-stats", user=self.worker_user, **params)["total_hours"], Decimal("1.50"))
+
+        # Not a maintained write path, so no generation bump: both admins read the shared entry
+        OvertimeDailyRollup.objects.update(total_hours=Decimal("9.00"))
+        self.assertEqual(self._get("summary-stats", user=other_admin, **params)["total_hours"], Decimal("7.00"))
+
+        # A write in another pay period leaves this period's entry alone
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_request(self.employees[0], self.projects[0], date(2026, 2, 10), "1.00")
+        self.assertEqual(self._get("summary-stats", user=other_admin, **params)["total_hours"], Decimal("7.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_request(self.employees[0], self.projects[0], date(2026, 1, 20), "1.00")
+        self.assertEqual(self._get("summary-stats", user=other_admin, **params)["total_hours"], Decimal("28.00"))
+        self.assertEqual(self._get("summary-stats", user=self.worker_user, **params)["total_hours"], Decimal("9.00"))
+
+    def test_dashboard_matches_individual_stats_endpoints(self):
+        cases = [
+            {"start_date": "2026-01-01", "end_date": "2026-01-25", "prev_start_date": "2025-12-01", "prev_end_date": "2025-12-25"},
+            {"start_date": "2025-12-01", "end_date": "2026-01-25", "status": "rejected"},
+            {"employee": str(self.employees[1].id), "project": str(self.projects[0].id)},
+        ]
+        for params in cases:
+            for user in (self.admin_user, self.worker_user):
+                with self.subTest(params=params, user=user.username):
+                    dashboard = self._get("dashboard", user=user, **params)
+                    summary_params = {key: value for key, value in params.items() if key in ("start_date", "end_date", "prev_start_date", "prev_end_date")}
+                    employee_params = {key: value for key, value in params.items() if key in ("start_date", "end_date", "status", "employee")}
+                    project_params = {key: value for key, value in params.items() if key in ("start_date", "end_date", "status", "project")}
+
+                    self.assertEqual(dashboard["summary_stats"], self._get("summary-stats", user=user, **summary_params))
+                    self.assertEqual(sorted(map(dict, dashboard["employee_stats"]), key=lambda row: row["employee"]), sorted(map(dict, self._get("employee-stats", user=user, **employee_params)), key=lambda row: row["employee"]))
+                    self.assertEqual(sorted(map(dict, dashboard["project_stats"]), key=lambda row: row["project"]), sorted(map(dict, self._get("project-stats", user=user, **project_params)), key=lambda row: row["project"]))
+                    self.assertEqual(dashboard["available_years"], self._get("available-years", user=user))
+                    self.assertFalse(dashboard["cached"])
+                    self.assertEqual(set(dashboard["timings"]), {"available_years", "scan", "employee_stats", "project_stats", "summary_stats", "total"})
+
+        self.assertTrue(self._get("dashboard", **cases[0])["cached"])
+
+
+class OvertimeLimitEngineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        OvertimeLimitConfig.objects.create(max_weekly_hours=10, max_monthly_hours=20, advised_weekly_hours=8, advised_monthly_hours=12)
+        self.department = Department.objects.create(code="LM", name="Limits")
+        self.projects = [Project.objects.create(name=f"Limit Project {index}") for index in range(3)]
+        self.employee = Employee.objects.create(name="Limit User", emp_id="LM001", department=self.department)
+        self.other = Employee.objects.create(name="Other Limit User", emp_id="LM002", department=self.department)
+        self.admin_user = ExternalUser.objects.create(external_id=901, username="limit-admin", email="limit-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.worker_user = ExternalUser.objects.create(external_id=902, username="limit-worker", email="limit-worker@example.com", worker_id="LM001", is_active=True, date_joined=aware_dt(2026, 1, 1))
+
+        # Week of Mon 2026-01-19; 2026-01-26 opens the next pay period
+        self._create_request(self.employee, self.projects[0], date(2026, 1, 19), "4.00")
+        self._create_request(self.employee, self.projects[1], date(2026, 1, 20), "3.00")
+        self._create_request(self.employee, self.projects[2], date(2026, 1, 21), "5.00", status="rejected")
+        self._create_request(self.employee, self.projects[0], date(2026, 1, 12), "6.00")
+        self._create_request(self.employee, self.projects[1], date(2026, 1, 26), "2.00")
+
+    def _create_request(self, employee, project, request_date, hours, **extra):
+        return OvertimeRequest.objects.create(
+            employee=employee,
+            project=project,
+            request_date=request_date,
+            time_start=datetime(2026, 1, 1, 18, 0).time(),
+            time_end=datetime(2026, 1, 1, 22, 0).time(),
+            total_hours=hours,
+            reason="Limit check",
+            **extra,
+        )
+
+    def _totals(self):
+        return sorted(OvertimeHoursTotal.objects.values_list("employee_id", "span", "start_date", "total_hours"))
+
+    def test_totals_follow_writes_and_match_rebuild(self):
+        headroom = get_headroom([self.employee.id, self.other.id], date(2026, 1, 20))
+        self.assertEqual(headroom[self.employee.id]["weekly"]["used_hours"], Decimal("7.00"))
+        self.assertEqual(headroom[self.employee.id]["weekly"]["remaining_hours"], Decimal("3.00"))
+        self.assertEqual(headroom[self.employee.id]["monthly"]["used_hours"], Decimal("13.00"))
+        self.assertEqual((headroom[self.employee.id]["monthly"]["start"], headroom[self.employee.id]["monthly"]["end"]), (date(2025, 12, 26), date(2026, 1, 25)))
+        self.assertEqual(headroom[self.other.id]["weekly"]["used_hours"], Decimal("0.00"))
+
+        OvertimeRequest.objects.get(request_date=date(2026, 1, 12)).delete()
+        moved = OvertimeRequest.objects.get(request_date=date(2026, 1, 20))
+        moved.employee = self.other
+        moved.employee_name = ""
+        moved.save()
+
+        maintained = self._totals()
+        rebuild_limit_totals()
+        self.assertEqual(maintained, self._totals())
+        self.assertEqual(get_headroom([self.employee.id], date(2026, 1, 20))[self.employee.id]["monthly"]["used_hours"], Decimal("4.00"))
+
+    def test_serializer_rejects_requests_over_the_limits(self):
+        self.client.force_authenticate(self.admin_user)
+        payload = {"employee": self.employee.id, "project": self.projects[2].id, "request_date": "2026-01-22", "time_start": "18:00", "time_end": "22:00", "reason": "Limit check"}
+
+        response = self.client.post(reverse("overtime-request-list"), {**payload, "total_hours": "3.50"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("weekly", response.data["details"]["total_hours"][0])
+
+        response = self.client.post(reverse("overtime-request-list"), {**payload, "total_hours": "3.00"}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        # Editing a request without adding hours passes even with the week at its limit
+        response = self.client.put(reverse("overtime-request-detail", args=[response.data["id"]]), {**payload, "total_hours": "3.00", "reason": "Updated reason"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_headroom_endpoint_scopes_non_admins_to_themselves(self):
+        url = reverse("overtime-limit-headroom")
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get(url, {"employees": f"{self.employee.id},{self.other.id}", "date": "2026-01-20"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["employee"] for row in response.data["results"]], [self.employee.id, self.other.id])
+        self.assertTrue(response.data["results"][0]["monthly"]["advised_reached"])
+
+        self.client.force_authenticate(self.worker_user)
+        response = self.client.get(url, {"employees": f"{self.employee.id},{self.other.id}", "date": "2026-01-20"})
+        self.assertEqual([row["employee"] for row in response.data["results"]], [self.employee.id])
+        self.assertEqual(self.client.get(url, {"employees": "x"}).status_code, 400)
+
+        # Users linked only through employee_id are scoped the same way as the other endpoints
+        linked_user = ExternalUser.objects.create(external_id=904, username="limit-linked", email="limit-linked@example.com", is_active=True, date_joined=aware_dt(2026, 1, 1))
+        linked_user.employee_id = self.other.id
+        self.client.force_authenticate(linked_user)
+        response = self.client.get(url, {"employees": f"{self.employee.id},{self.other.id}", "date": "2026-01-20"})
+        self.assertEqual([row["employee"] for row in response.data["results"]], [self.other.id])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.department = Department.objects.create(code="KS", name="Keyset")
+        self.employee = Employee.objects.create(name="Keyset User", emp_id="KS001", department=self.department)
+        self.admin_user = ExternalUser.objects.create(external_id=951, username="keyset-admin", email="keyset-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        # Several requests share a date so the seek has to fall through to created_at / id
+        for index in range(7):
+            OvertimeRequest.objects.create(
+                employee=self.employee,
+                project=Project.objects.create(name=f"Keyset {index}"),
+                request_date=date(2026, 1, 5 + index // 3),
+                time_start=datetime(2026, 1, 1, 18, 0).time(),
+                time_end=datetime(2026, 1, 1, 19, 0).time(),
+                total_hours="1.00",
+                reason="Keyset",
+            )
+
+    def test_cursor_pages_walk_the_full_history_without_counting(self):
+        self.client.force_authenticate(self.admin_user)
+        expected = list(OvertimeRequest.objects.order_by("-request_date", "-created_at", "-id").values_list("id", flat=True))
+
+        seen = []
+        url = reverse("overtime-request-list")
+        params = {"pagination": "cursor", "page_size": 3}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries.captured_queries))
+            seen.extend(row["id"] for row in response.data["results"])
+            if not response.data["next_cursor"]:
+                break
+            params = {"cursor": response.data["next_cursor"], "page_size": 3}
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(self.client.get(url, {"cursor": "not-a-cursor"}).status_code, 404)
+        # Without the opt-in the endpoint stays page-number based
+        self.assertEqual(self.client.get(url, {"page_size": 3}).data["count"], 7)
+
+    def test_seek_filter_adds_a_leading_range_bound(self):
+        self.client.force_authenticate(self.admin_user)
+        url = reverse("overtime-request-list")
+        cursor = self.client.get(url, {"pagination": "cursor", "page_size": 3}).data["next_cursor"]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, {"cursor": cursor, "page_size": 3}).status_code, 200)
+        page_sql = next(query["sql"] for query in queries.captured_queries if "ORDER BY" in query["sql"] and '"api_overtimerequest"."request_date"' in query["sql"])
+        # The bound is ANDed in front of the OR chain so the composite index gets a range scan
+        self.assertIn('"api_overtimerequest"."request_date" <= ', page_sql)
+
+        ascending = OvertimeRequestPagination()
+        ascending.keyset_ordering = ("request_date", "id")
+        seek_sql = str(OvertimeRequest.objects.filter(ascending._seek_filter([date(2026, 1, 6), 1])).query)
+        self.assertIn('"api_overtimerequest"."request_date" >= 2026-01-06 AND', seek_sql)
+
+
+class OvertimeLeanListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.department = Department.objects.create(code="LN", name="Lean")
+        self.employee = Employee.objects.create(name="Lean User", emp_id="LN001", department=self.department)
+        self.approver = Employee.objects.create(name="Lean Approver", emp_id="LN002", department=self.department)
+        self.admin_user = ExternalUser.objects.create(external_id=961, username="lean-admin", email="lean-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        for index in range(4):
+            project = Project.objects.create(name=f"Lean {index}")
+            overtime = OvertimeRequest.objects.create(
+                employee=self.employee,
+                employee_name=self.employee.name,
+                department=self.department,
+                department_code=self.department.code,
+                project=project,
+                project_name=project.name,
+                request_date=date(2026, 1, 5 + index // 2),
+                time_start=datetime(2026, 1, 1, 18, 0).time(),
+                time_end=datetime(2026, 1, 1, 20, 30).time(),
+                total_hours="2.50",
+                has_break=index % 2 == 0,
+                reason="Lean",
+                status="approved" if index == 1 else "pending",
+                approved_by=self.approver if index == 1 else None,
+                approved_at=aware_dt(2026, 1, 6) if index == 1 else None,
+            )
+            if overtime.has_break:
+                OvertimeBreak.objects.create(overtime_request=overtime, start_time=datetime(2026, 1, 1, 19, 0).time(), end_time=datetime(2026, 1, 1, 19, 30).time())
+
+    def test_lean_list_matches_serializer_output(self):
+        self.client.force_authenticate(self.admin_user)
+        url = reverse("overtime-request-list")
+
+        regular = self.client.get(url, {"page_size": 3})
+        with CaptureQueriesContext(connection) as queries:
+            lean = self.client.get(url, {"page_size": 3, "lean": "true"})
+
+        self.assertEqual(lean.status_code, 200)
+        self.assertEqual(lean.data["count"], 4)
+        self.assertEqual(lean.data["results"], regular.data["results"])
+        # COUNT, one page of rows, one breaks lookup
+        self.assertEqual(len([query for query in queries.captured_queries if query["sql"].startswith("SELECT")]), 3)
+
+    def test_lean_list_supports_keyset_pagination(self):
+        self.client.force_authenticate(self.admin_user)
+        url = reverse("overtime-request-list")
+
+        first = self.client.get(url, {"pagination": "cursor", "page_size": 3, "lean": "true"})
+        second = self.client.get(url, {"cursor": first.data["next_cursor"], "page_size": 3, "lean": "true"})
+
+        ids = [row["id"] for row in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, list(OvertimeRequest.objects.order_by("-request_date", "-created_at", "-id").values_list("id", flat=True)))
+        self.assertIsNone(second.data["next_cursor"])
+
+
+class OvertimeExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.department = Department.objects.create(code="EX", name="Export")
+        self.employee = Employee.objects.create(name="Export User", emp_id="EX001", department=self.department)
+        self.other = Employee.objects.create(name="Other Export User", emp_id="EX002", department=self.department)
+        self.project = Project.objects.create(name="Export")
+        self.admin_user = ExternalUser.objects.create(external_id=971, username="export-admin", email="export-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.regular_user = ExternalUser.objects.create(external_id=972, username="export-user", email="export-user@example.com", worker_id="EX001", is_active=True, date_joined=aware_dt(2026, 1, 1))
+        for employee, day, status_value in ((self.employee, 5, "approved"), (self.employee, 6, "pending"), (self.other, 5, "approved"), (self.employee, 20, "approved")):
+            OvertimeRequest.objects.create(
+                employee=employee,
+                employee_name=employee.name,
+                department_code=self.department.code,
+                project=self.project,
+                project_name=self.project.name,
+                request_date=date(2026, 1, day),
+                time_start=datetime(2026, 1, 1, 18, 0).time(),
+                time_end=datetime(2026, 1, 1, 20, 0).time(),
+                total_hours="2.00",
+                reason="Export, with comma",
+                status=status_value,
+                approved_by=self.other if status_value == "approved" else None,
+                approved_at=aware_dt(2026, 1, day, 21) if status_value == "approved" else None,
+            )
+
+    def test_csv_export_streams_filtered_rows(self):
+        self.client.force_authenticate(self.admin_user)
+
+        response = self.client.get(reverse("overtime-request-export"), {"start_date": "2026-01-01", "end_date": "2026-01-10", "status": "approved"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:4], ["Request ID", "Date", "Employee ID", "Employee"])
+        self.assertEqual(sorted(row[2] for row in rows[1:]), ["EX001", "EX002"])
+        self.assertEqual(rows[1][15], "Export, with comma")
+
+    def test_xlsx_export_is_scoped_to_own_requests(self):
+        self.client.force_authenticate(self.regular_user)
+
+        response = self.client.get(reverse("overtime-request-export"), {"file_format": "xlsx"})
+
+        self.assertEqual(response.status_code, 200)
+        ws = load_workbook(io.BytesIO(b"".join(response.streaming_content))).active
+        rows = list(ws.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row[2] for row in rows[1:]}, {"EX001"})
+        self.assertEqual(rows[1][1].date(), date(2026, 1, 20))
+        self.assertEqual(self.client.get(reverse("overtime-request-export"), {"file_format": "pdf"}).status_code, 400)
+
+    def test_export_uses_export_throttle_scope(self):
+        self.assertEqual(OvertimeRequestViewSet.export.kwargs["throttle_scope"], "export")
+
+
+class OvertimePayPeriodTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(code="PP", name="Pay Period")
+        self.employee = Employee.objects.create(name="Period User", emp_id="PP001", department=self.department)
+
+    def _request(self, request_date, project_name, **kwargs):
+        return OvertimeRequest.objects.create(
+            employee=self.employee,
+            project=Project.objects.create(name=project_name),
+            request_date=request_date,
+            time_start=datetime(2026, 1, 1, 18, 0).time(),
+            time_end=datetime(2026, 1, 1, 19, 0).time(),
+            total_hours="1.00",
+            reason="Period",
+            **kwargs,
+        )
+
+    def test_pay_period_follows_request_date(self):
+        overtime = self._request(date(2026, 1, 25), "Period A")
+        self.assertEqual(overtime.pay_period, date(2025, 12, 26))
+
+        overtime.request_date = date(2026, 1, 26)
+        overtime.save()
+        self.assertEqual(OvertimeRequest.objects.get(pk=overtime.pk).pay_period, date(2026, 1, 26))
+
+        OvertimeRequest.objects.filter(pk=overtime.pk).update(request_date=date(2026, 3, 1))
+        self.assertEqual(OvertimeRequest.objects.get(pk=overtime.pk).pay_period, date(2026, 2, 26))
+
+    def test_period_helpers_and_monthly_export_use_pay_period(self):
+        inside = self._request(date(2025, 12, 26), "Period B")
+        self._request(date(2026, 1, 25), "Period C", status="rejected")
+        self._request(date(2026, 1, 26), "Period D")
+
+        self.assertEqual(list(OvertimeRequest.objects.in_period(date(2026, 1, 10)).values_list("project__name", flat=True).order_by("request_date")), ["Period B", "Period C"])
+        self.assertEqual(OvertimeRequest.objects.in_periods(date(2026, 1, 10), date(2026, 2, 1)).count(), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = OvertimeRequest.export_monthly_data(date(2026, 1, 10))
+        self.assertEqual([row["project"] for row in rows], ["Period B"])
+        self.assertIn('"pay_period" =', queries.captured_queries[0]["sql"])
+        self.assertEqual(inside.pay_period, date(2025, 12, 26))
+
+    def test_sync_pay_periods_repairs_stale_rows(self):
+        overtime = self._request(date(2026, 2, 10), "Period E")
+        # A raw write that bypasses save() and the queryset helpers
+        OvertimeRequest.objects.filter(pk=overtime.pk).update(pay_period=date(2020, 1, 26))
+
+        self.assertEqual(sync_pay_periods(), 1)
+        self.assertEqual(OvertimeRequest.objects.get(pk=overtime.pk).pay_period, date(2026, 1, 26))
+        self.assertEqual(sync_pay_periods(), 0)
+
+
+class OvertimeStatusJobTests(TestCase):
+    def setUp(self):
+        isolate_excel_output(self)
+        self.client = APIClient()
+        self.department = Department.objects.create(code="SJ", name="Status Jobs")
+        self.admin_user = ExternalUser.objects.create(external_id=981, username="jobs-admin", email="jobs-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.regular_user = ExternalUser.objects.create(external_id=982, username="jobs-user", email="jobs-user@example.com", worker_id="SJ000", is_active=True, date_joined=aware_dt(2026, 1, 1))
+        self.project = Project.objects.create(name="Status Jobs")
+        self.requests = []
+        for index in range(5):
+            employee = Employee.objects.create(name=f"Job User {index}", emp_id=f"SJ{index:03d}", department=self.department)
+            self.requests.append(
+                OvertimeRequest.objects.create(
+                    employee=employee,
+                    project=self.project,
+                    # The last request falls in the next pay period
+                    request_date=date(2026, 1, 26) if index == 4 else date(2026, 1, 5 + index),
+                    time_start=datetime(2026, 1, 1, 18, 0).time(),
+                    time_end=datetime(2026, 1, 1, 19, 0).time(),
+                    total_hours="1.00",
+                    reason="Status job",
+                )
+            )
+
+    def test_job_approves_a_pay_period_in_chunks(self):
+        self.client.force_authenticate(self.admin_user)
+
+        with patch("api.services.overtime_status_service.STATUS_CHUNK_SIZE", 2), patch("api.services.overtime_status_service.apply_status_chunk", wraps=apply_status_chunk) as chunk_spy, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("overtime-request-bulk-status-jobs"), {"filters": {"pay_period": "2026-01-10", "status": "pending"}, "status": "approved"}, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(chunk_spy.call_count, 2)
+
+        progress = self.client.get(reverse("overtime-request-bulk-status-job-detail", kwargs={"job_id": response.data["job_id"]}))
+        self.assertEqual(progress.data["status"], "completed")
+        self.assertEqual((progress.data["processed"], progress.data["updated_count"], progress.data["progress"]), (4, 4, 100.0))
+        # Only employee SJ000 has an account to notify
+        self.assertEqual(progress.data["notified_count"], 1)
+        self.assertEqual(Notification.objects.filter(recipient=self.regular_user, event_type="overtime_approved").count(), 1)
+
+        self.assertEqual(set(OvertimeRequest.objects.filter(status="approved").values_list("id", flat=True)), {overtime.id for overtime in self.requests[:4]})
+        self.assertEqual(OvertimeRequest.objects.get(pk=self.requests[4].pk).status, "pending")
+        self.assertEqual(OvertimeRequest.objects.get(pk=self.requests[0].pk).status_changed_by, "jobs-admin")
+
+    def test_jobs_are_admin_only_and_validate_selection(self):
+        self.client.force_authenticate(self.regular_user)
+        self.assertEqual(self.client.post(reverse("overtime-request-bulk-status-jobs"), {"ids": [self.requests[0].id], "status": "approved"}, format="json").status_code, 403)
+
+        self.client.force_authenticate(self.admin_user)
+        self.assertEqual(self.client.post(reverse("overtime-request-bulk-status-jobs"), {"status": "approved"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(reverse("overtime-request-bulk-status-jobs"), {"filters": {"employee": "1"}, "status": "approved"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(reverse("overtime-request-bulk-status-jobs"), {"filters": {"start_date": "soon"}, "status": "approved"}, format="json").status_code, 400)
+        self.assertEqual(self.client.get(reverse("overtime-request-bulk-status-job-detail", kwargs={"job_id": 999999})).status_code, 404)
+
+    def test_sync_bulk_update_sends_notifications_after_commit(self):
+        self.client.force_authenticate(self.admin_user)
+
+        with patch("api.consumers.send_notifications_to_users") as send_mock, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("overtime-request-bulk-update-status"), {"ids": [self.requests[0].id, self.requests[1].id], "status": "rejected"}, format="json")
+
+        self.assertEqual(response.data["updated_count"], 2)
+        self.assertEqual(send_mock.call_count, 1)
+        self.assertEqual([user_id for user_id, _ in send_mock.call_args.args[0]], [self.regular_user.id])
+
+
+class WebSocketFanoutTests(TestCase):
+    def setUp(self):
+        self.channel_layer = get_channel_layer()
+        async_to_sync(self.channel_layer.flush)()
+
+    def _subscribe(self, group):
+        channel = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(group, channel)
+        return channel
+
+    def test_batched_notifications_reach_every_user(self):
+        channels = {user_id: self._subscribe(f"notifications_{user_id}") for user_id in (1, 2, 3)}
+
+        with patch("api.consumers.GROUP_SEND_BATCH_SIZE", 2):
+            sent = send_notifications_to_users((user_id, {"id": user_id, "title": "Hello"}) for user_id in channels)
+
+        self.assertEqual(sent, 3)
+        for user_id, channel in channels.items():
+            message = async_to_sync(self.channel_layer.receive)(channel)
+            self.assertEqual((message["type"], message["id"]), ("notification_message", user_id))
+
+    def test_failed_send_does_not_stop_the_batch(self):
+        original = self.channel_layer.group_send
+
+        async def flaky_group_send(group, message):
+            if group == "broken":
+                raise RuntimeError("boom")
+            await original(group, message)
+
+        channel = self._subscribe("ok")
+        with patch.object(self.channel_layer, "group_send", flaky_group_send):
+            sent = group_send_many([("broken", {"type": "x"}), ("ok", {"type": "y"})])
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(async_to_sync(self.channel_layer.receive)(channel)["type"], "y")
+
+
+class CacheServiceGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = ExternalUser.objects.create(external_id=991, username="cache-admin", email="cache-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_invalidate_all_for_view_orphans_only_that_view(self):
+        CacheService.set_list("projects", [1], {"page": 1})
+        CacheService.set_object("projects", 7, {"id": 7})
+        CacheService.set_list("employees", [2])
+
+        self.assertEqual(CacheService.invalidate_all_for_view("projects"), 1)
+
+        self.assertIsNone(CacheService.get_list("projects", {"page": 1}))
+        self.assertIsNone(CacheService.get_object("projects", 7))
+        self.assertEqual(CacheService.get_list("employees"), [2])
+
+    def test_evicted_generation_does_not_revive_old_entries(self):
+        CacheService.set_list("projects", [1])
+        cache.delete(CacheService.GENERATION_KEY.format(view_name="projects"))
+
+        self.assertIsNone(CacheService.get_list("projects"))
+
+    def test_cached_list_is_refreshed_after_write(self):
+        url = "/api/v1/overtime-regulations/"
+        self.client.post(url, {"title": "Before", "description": "Rule", "category": "general"}, format="json")
+        first = self.client.get(url).data
+        self.client.post(url, {"title": "After", "description": "Rule", "category": "general"}, format="json")
+        second = self.client.get(url).data
+
+        self.assertNotIn("After", str(first))
+        self.assertIn("After", str(second))
+
+
+@override_settings(REFERENCE_CACHE_LOCAL_TTL=30, REFERENCE_CACHE_SHARED_TTL=600)
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+
+    def test_repeat_lookups_are_served_without_queries(self):
+        get_system_configuration()
+
+        with self.assertNumQueries(0):
+            config = get_system_configuration()
+        local_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_system_configuration().pk, config.pk)
+
+    def test_save_invalidates_both_tiers(self):
+        get_system_configuration()
+        config = SystemConfiguration.objects.get(pk=1)
+        config.app_name = "Renamed"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.save()
+
+        self.assertEqual(get_system_configuration().app_name, "Renamed")
+
+    def test_department_changes_refresh_the_enabled_lookup(self):
+        Department.objects.create(code="qa", name="QA")
+        self.assertEqual(list(get_enabled_departments()), ["QA"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(code="ops", name="Ops")
+
+        self.assertEqual(list(get_enabled_departments()), ["OPS", "QA"])
+
+    def test_smb_config_stays_out_of_the_shared_tier(self):
+        get_smb_config()
+
+        self.assertIsNone(cache.get(CacheService.generate_cache_key(CacheService.PREFIX_REFERENCE, SMB_CONFIG)))
+        self.assertIsNotNone(local_cache.get(SMB_CONFIG))
+
+    def test_local_lru_evicts_least_recently_used(self):
+        lru = LocalLRUCache(max_entries=2)
+        lru.set("a", 1, 30)
+        lru.set("b", 2, 30)
+        lru.get("a")
+        lru.set("c", 3, 30)
+
+        self.assertEqual((lru.get("a"), lru.get("b"), lru.get("c")), (1, None, 3))
+
+
+class CachedListEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = ExternalUser.objects.create(external_id=992, username="list-admin", email="list-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.department = Department.objects.create(code="QA", name="Quality")
+        Employee.objects.create(name="Cached Worker", emp_id="CL001", department=self.department)
+
+    def _department_codes(self, response):
+        data = response.data["results"] if isinstance(response.data, dict) else response.data
+        return [row["code"] for row in data]
+
+    def test_repeat_list_skips_the_database(self):
+        self.client.get("/api/v1/employees/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/employees/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries.captured_queries if "api_employee" in query["sql"]])
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get("/api/v1/departments/")["ETag"]
+
+        response = self.client.get("/api/v1/departments/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+
+    def test_write_invalidates_list_and_etag(self):
+        etag = self.client.get("/api/v1/departments/")["ETag"]
+        Department.objects.create(code="OPS", name="Operations")
+
+        response = self.client.get("/api/v1/departments/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("OPS", self._department_codes(response))
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_concurrent_miss_serves_stale_copy_while_locked(self):
+        self.client.get("/api/v1/departments/")
+        Department.objects.create(code="OPS", name="Operations")
+        lock_key = "lock:" + CacheService.generate_cache_key(CacheService.PREFIX_LIST, "departments")
+        cache.add(lock_key, 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            stale = self.client.get("/api/v1/departments/")
+        cache.delete(lock_key)
+        fresh = self.client.get("/api/v1/departments/")
+
+        self.assertEqual(self._department_codes(stale), ["QA"])
+        self.assertFalse([query for query in queries.captured_queries if "api_department" in query["sql"]])
+        self.assertEqual(sorted(self._department_codes(fresh)), ["OPS", "QA"])
+
+
+@override_settings(CACHE_METRICS_FLUSH_SECONDS=3600)
+class CacheMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache_metrics.reset()
+        self.addCleanup(cache_metrics.reset)
+        self.superadmin = ExternalUser.objects.create(external_id=993, username="metrics-admin", email="metrics-admin@example.com", role=ExternalUser.Role.SUPERADMIN, is_active=True, date_joined=aware_dt(2026, 1, 1))
+        self.user = ExternalUser.objects.create(external_id=994, username="metrics-user", email="metrics-user@example.com", is_active=True, date_joined=aware_dt(2026, 1, 1))
+        self.client = APIClient()
+
+    def test_snapshot_summarises_outcomes_and_latency(self):
+        cache_metrics.record("projects", "get", "hit", 0.0004)
+        cache_metrics.record("projects", "get", "hit", 0.003)
+        cache_metrics.record("projects", "get", "miss", 0.02)
+        cache_metrics.record("projects", "invalidate", "ok", 0.001)
+
+        summary = cache_metrics.snapshot()
+
+        get = summary["projects"]["get"]
+        self.assertEqual((get["count"], get["outcomes"], get["hit_ratio"]), (3, {"hit": 2, "miss": 1}, 0.6667))
+        self.assertEqual((get["latency_ms"]["p50"], get["latency_ms"]["p99"]), (5, 25))
+        self.assertEqual(summary["projects"]["invalidate"]["outcomes"], {"ok": 1})
+        # The local table was flushed into the shared aggregate
+        self.assertEqual(cache_metrics.snapshot("process"), {})
+
+    def test_admin_endpoint_reports_list_cache_hits(self):
+        self.client.force_authenticate(self.superadmin)
+        self.client.get("/api/v1/projects/")
+        self.client.get("/api/v1/projects/")
+
+        response = self.client.get("/api/v1/system/cache-stats/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["views"]["projects"]["get"]["outcomes"], {"hit": 1, "miss": 1})
+        self.assertEqual(response.data["ttls"]["projects"], 3600)
+
+        self.assertEqual(self.client.delete("/api/v1/system/cache-stats/").status_code, 204)
+        self.assertEqual(self.client.get("/api/v1/system/cache-stats/").data["views"], {})
+
+    def test_endpoint_requires_superadmin(self):
+        self.client.force_authenticate(self.user)
+
+        self.assertEqual(self.client.get("/api/v1/system/cache-stats/").status_code, 403)
+
+    def test_detailed_health_check_includes_hit_ratio(self):
+        cache_metrics.record("employees", "get", "hit", 0.001)
+
+        response = self.client.get("/api/health/detailed/")
+
+        self.assertEqual(response.data["checks"]["cache"]["metrics"], {"hits": 1, "misses": 0, "hit_ratio": 1.0})
+
+
+class CacheCodecTests(TestCase):
+    def test_round_trip_keeps_values_and_flattens_pages(self):
+        page = {
+            "next": None,
+            "results": [
+                {"id": 1, "hours": Decimal("3.50"), "day": date(2026, 1, 26), "at": aware_dt(2026, 1, 26, 18, 0), "breaks": [{"start": time(19, 0)}]},
+                {"id": 2, "hours": Decimal("1.25"), "day": date(2026, 1, 27), "at": None, "breaks": []},
+            ],
+        }
+
+        self.assertEqual(cache_codec.decode(cache_codec.MsgpackCodec().encode(page)), page)
+
+    def test_large_payloads_are_compressed(self):
+        rows = [{"id": index, "reason": "Release preparation"} for index in range(200)]
+        codec = cache_codec.MsgpackCodec(compress_threshold=256)
+
+        blob = codec.encode(rows)
+
+        self.assertEqual(blob[0], cache_codec.FORMAT_MSGPACK_ZLIB)
+        self.assertEqual(cache_codec.decode(blob), rows)
+        self.assertEqual(codec.encode([1])[0], cache_codec.FORMAT_MSGPACK)
+
+    def test_blobs_decode_regardless_of_configured_codec(self):
+        blob = cache_codec.PickleCodec().encode({"id": 1})
+
+        self.assertEqual(cache_codec.decode(blob), {"id": 1})
+        with self.assertRaises(ValueError):
+            cache_codec.decode(b"\x7f")
+
+    def test_cached_list_stores_encoded_payload(self):
+        cache.clear()
+        admin = ExternalUser.objects.create(external_id=995, username="codec-admin", email="codec-admin@example.com", is_ptb_admin=True, is_active=True, is_staff=True, date_joined=aware_dt(2026, 1, 1))
+        client = APIClient()
+        client.force_authenticate(admin)
+        Department.objects.create(code="QA", name="Quality")
+
+        first = client.get("/api/v1/departments/")
+        second = client.get("/api/v1/departments/")
+
+        entry = cache.get(CacheService.generate_cache_key(CacheService.PREFIX_LIST, "departments"))
+        self.assertIsInstance(entry["data"], bytes)
+        self.assertEqual(second.json(), first.json())
@@ -14,6 +14,7 @@
 )
 from .views.calendar import CalendarEventViewSet
 from .views.config import (
+    CacheStatsView,
     ReleaseNoteViewSet,
     SMBConfigurationViewSet,
     SystemConfigurationView,
@@ -89,6 +90,7 @@
     # API v1 endpoints (main routes)
     path("v1/", include(v1_router.urls)),
     path("v1/system/config/", SystemConfigurationView.as_view(), name="system-config-v1"),
+    path("v1/system/cache-stats/", CacheStatsView.as_view(), name="cache-stats-v1"),
     # Authentication endpoints (version-independent)
     path("auth/login/local/", LocalLoginView.as_view(), name="login-local"),
     path("auth/login/external/", ExternalLoginView.as_view(), name="login-external"),
@@ -1,14 +1,21 @@
 import calendar
+import hashlib
+import io
+import json
+import multiprocessing
 import os
-import socket
 import tempfile
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
 from pathlib import Path
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, Side
-from smb.SMBConnection import SMBConnection
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+
+from .excel_styles import register_styles
+from .time_helpers import get_period_boundaries
 
 
 class ExcelGenerator:
@@ -22,6 +29,123 @@ class ExcelGenerator:
     EXCEL_TEMP_ONLY = (
         os.getenv("EXCEL_TEMP_ONLY", "false").lower() == "true"
     )  # Set true to keep files temp-only (e.g., SMB-only uploads)
+    # Temp-only uploads hand each serialized workbook straight to SMB from memory instead
+    # of saving it into a temp directory first
+    EXCEL_IN_MEMORY_UPLOAD = os.getenv("EXCEL_IN_MEMORY_UPLOAD", "true").lower() == "true"
+
+    # Incremental regeneration: keep the last rendered copy of every workbook in the
+    # Django cache and only re-render the department sheets whose data changed.
+    EXCEL_INCREMENTAL = os.getenv("EXCEL_INCREMENTAL", "true").lower() == "true"
+    EXCEL_WORKBOOK_CACHE_TTL = int(os.getenv("EXCEL_WORKBOOK_CACHE_TTL", str(60 * 60 * 24 * 35)))
+    # Bump whenever a sheet renderer changes so stale cached sheets are never reused
+    WORKBOOK_CACHE_VERSION = 1
+
+    # Report types rendered with the streaming (write-only) engine instead of the standard
+    # one, e.g. EXCEL_STREAMING_REPORTS=monthly_form,monthly_summary
+    STREAMING_REPORT_TYPES = ("monthly_form", "monthly_summary")
+    EXCEL_STREAMING_REPORTS = {
+        name.strip() for name in os.getenv("EXCEL_STREAMING_REPORTS", "").split(",") if name.strip()
+    }
+
+    # Render the workbooks of one generate_all_excel_files call concurrently: "process" uses a
+    # process pool (threads inside daemonic processes such as prefork Celery workers, which may
+    # not start children), "thread" a thread pool; anything else renders them one after another.
+    EXCEL_RENDER_POOL = os.getenv("EXCEL_RENDER_POOL", "").strip().lower()
+    EXCEL_RENDER_WORKERS = int(os.getenv("EXCEL_RENDER_WORKERS", "4"))
+
+    # Multi-sheet builder of each report type, called as builder(data_by_dept, *report_args, ...)
+    REPORT_BUILDERS = {
+        "daily_form": "create_ot_form_multi_sheet",
+        "daily_summary": "create_ot_summary_multi_sheet",
+        "monthly_form": "create_monthly_ot_form_multi_sheet",
+        "monthly_summary": "create_monthly_ot_summary_multi_sheet",
+    }
+
+    # Export record fields read by any report renderer; the sheet digest covers only these
+    RENDERED_FIELDS = (
+        "employee_id",
+        "employee_name",
+        "request_date",
+        "time_start",
+        "time_end",
+        "total_hours",
+        "has_break",
+        "reason",
+        "detail",
+        "is_weekend",
+        "is_holiday",
+    )
+
+    # Layout of the ~{YYYY_MM_DD-YYYY_MM_DD}OT.xlsx monthly form (A-P), shared by both rendering engines
+    MONTHLY_FORM_TITLE = "Form Lembur Bulanan (月度加班申請單)"
+    MONTHLY_FORM_COLUMNS = {
+        "A": 6.25,      # No
+        "B": 13.88,     # Tanggal Lembur
+        "C": 13.93,     # No Karyawan
+        "D": 21.14,     # Nama
+        "E": 22.29,     # Alasan Lembur
+        "F": 15.22,     # Jenis Lembur
+        "G": 16.55,     # Jam Lembur (Waktu)
+        "H": 14.55,     # Durasi Lembur
+        "I": 15.14,     # Jam istirahat saat lembur
+        "J": 13.57,     # Tanda Tangan Karyawan
+        "K": 15.71,     # Tanda Tangan Supervisor
+        "L": 1.00,      # Placeholder
+        "M": 16.55,     # Konfirmasi Jam Lembur (Waktu)
+        "N": 14.55,     # Konfirmasi Durasi Lembur
+        "O": 15.43,     # Jam Istirahat (Jika ada, gunakan V)
+        "P": 18.57,     # Tanda Tangan Karyawan
+    }
+    MONTHLY_FORM_HEADERS = {
+        "A": "No\n(序號)",
+        "B": "Tanggal Lembur\n(加班日期)",
+        "C": "No Karyawan\n(工號)",
+        "D": "Nama\n(姓名)",
+        "E": "Alasan Lembur\n(申請加班事由)",
+        "F": "Jenis Lembur\n(加班類别)",
+        "G": "Jam Lembur (Waktu)\n(預計加班\n起止時間)",
+        "H": "Durasi Lembur\n(預計加班時數)",
+        "I": "Jam istirahat saat lembur (jika perlu, gunakan V)\n(預計休息或用餐打V)",
+        "J": "Tanda Tangan Karyawan\n(員工簽名)",
+        "K": "Tanda Tangan Supervisor\n(課級主管簽名)",
+        "M": "Konfirmasi Jam Lembur (Waktu)\n(實際加班\n起止時間)",
+        "N": "Konfirmasi Durasi Lembur\n(實際加班時數)",
+        "O": "Jam Istirahat (Jika ada, gunakan V)\n(實際休息或用餐打V)",
+        "P": "Tanda Tangan Karyawan\n(員工簽名)",
+    }
+    MONTHLY_FORM_NOTES = (
+        "1. Informasi diatas harus dilaporkan dengan benar, pelanggaran akan dikenakan sesuai dengan hukuman yang ada dari managemen perusahaan (以上資料請據實申報，違者按獎懲管理辦法處理)。",
+        "2. Karyawan harus menandatangani aplikasi lembur. Jika tidak ada tanda tangan maka akan di anggap tidak sah (實際加班時數，以員工簽名確認為準)。",
+        "3. Tidak ada aplikasi lembur tidak akan di hitung untuk upah lembur (無加班申請單不計發加班費)。",
+    )
+    MONTHLY_FORM_NUMBER = "Form No.:PH2-TB004-001 Rev.02(CI)"
+    MONTHLY_FORM_MIN_ROWS = 30  # Printed form always shows at least 30 numbered rows
+    EMPLOYEE_CLASSIFICATION_LABEL = "Klasifikasi Karyawan\n(人員分類):"
+    EMPLOYEE_CLASSIFICATION_VALUE = "☐ Level0(11-12職等)\n☑ Level1(13-23職等)"
+
+    # Layout of the multi-sheet ~{YYYY_MM_DD-YYYY_MM_DD}OTSummary.xlsx monthly summary (A-I)
+    MONTHLY_SUMMARY_COLUMNS = {
+        "A": 11.75,     # Work ID
+        "B": 13.0,      # Overtime Type
+        "C": 15.0,      # Overtime Start Date
+        "D": 9.75,      # Start Time
+        "E": 9.75,      # End Time
+        "F": 9.75,      # Meal/Rest
+        "G": 6.0,       # Hours
+        "H": 25.0,      # Reason
+        "I": 25.0,      # Detail
+    }
+    MONTHLY_SUMMARY_HEADERS = {
+        "A": "Work ID",
+        "B": "Overtime Type",
+        "C": "Overtime Start Date",
+        "D": "Start Time",
+        "E": "End Time",
+        "F": "Meal/Rest",
+        "G": "Hours",
+        "H": "Reason",
+        "I": "Detail",
+    }
 
     # Use SMB_* environment variables (consistent with Django settings)
     SMB_CONFIG = {
@@ -38,39 +162,29 @@ class ExcelGenerator:
         ),  # Will be set from SMB_PATH_PREFIX env var if provided
     }
 
-    _connection_cache = None
-    _connection_cache_time = None
-    _connection_cache_timeout = 300
-
     # Cache for DB-loaded SMB config (avoid DB query on every call)
-    _smb_config_cache_time: float | None = None
-    _smb_config_cache_ttl = 60  # reload from DB every 60 seconds
-
     @classmethod
     def _load_smb_config(cls):
         """
         Load SMB config from the database (SMBConfiguration model) first,
         falling back to environment variables if no DB record exists.
-        Cached for 60 seconds to avoid DB queries on every call.
+        Served from the process-local reference cache, which SMBConfiguration
+        saves invalidate in every process.
         """
-        now = time.monotonic()
-        if (
-            cls._smb_config_cache_time
-            and (now - cls._smb_config_cache_time) < cls._smb_config_cache_ttl
-        ):
-            return  # Use cached config
         try:
-            from ..models import SMBConfiguration
+            from ..services.reference_data_service import get_smb_config
 
-            cls.SMB_CONFIG = SMBConfiguration.get_active_config()
-            cls._smb_config_cache_time = now
+            cls.SMB_CONFIG = get_smb_config()
         except Exception:
             pass  # Keep env-based defaults
 
     @classmethod
     def invalidate_smb_cache(cls):
         """Force next _load_smb_config() to reload from DB."""
-        cls._smb_config_cache_time = None
+        from ..services.cache_service import CacheService
+        from ..services.reference_data_service import SMB_CONFIG
+
+        CacheService.invalidate_reference(SMB_CONFIG)
 
     @classmethod
     def _smb_configured(cls) -> bool:
@@ -81,6 +195,19 @@ def _smb_configured(cls) -> bool:
             for key in ("host", "username", "password", "share_name")
         )
 
+    @classmethod
+    def daily_filenames(cls, date) -> tuple[str, str]:
+        """Return the (form, summary) workbook filenames for a daily report."""
+        date_str = date.strftime("%Y%m%d")
+        return f"{date_str}OT.xlsx", f"{date_str}OTSummary.xlsx"
+
+    @classmethod
+    def monthly_filenames(cls, date) -> tuple[str, str]:
+        """Return the (form, summary) workbook filenames for the pay period containing ``date``."""
+        current_period_start, next_period_end = get_period_boundaries(date)
+        prefix = f"~{current_period_start.strftime('%Y_%m_%d')}-{next_period_end.strftime('%Y_%m_%d')}"
+        return f"{prefix}OT.xlsx", f"{prefix}OTSummary.xlsx"
+
     @classmethod
     def get_period_folder(cls, date: datetime | None = None) -> str:
         return cls.get_local_period_folder(date)
@@ -90,13 +217,7 @@ def get_local_period_folder(cls, date: datetime | None = None) -> str:
         if date is None:
             date = datetime.now()
 
-        current_period_start = date.replace(day=26)
-        if date.day < 26:
-            current_period_start = (date.replace(day=1) - timedelta(days=1)).replace(
-                day=26
-            )
-
-        next_period_end = (current_period_start + timedelta(days=32)).replace(day=25)
+        current_period_start, next_period_end = get_period_boundaries(date)
         folder_name = f"{current_period_start.strftime('%Y-%m-%d')}_{next_period_end.strftime('%Y-%m-%d')}"
 
         period_path = cls.OUTPUT_PATH / folder_name
@@ -111,13 +232,7 @@ def get_smb_period_folder(cls, date: datetime | None = None) -> str | None:
         if date is None:
             date = datetime.now()
 
-        current_period_start = date.replace(day=26)
-        if date.day < 26:
-            current_period_start = (date.replace(day=1) - timedelta(days=1)).replace(
-                day=26
-            )
-
-        next_period_end = (current_period_start + timedelta(days=32)).replace(day=25)
+        current_period_start, next_period_end = get_period_boundaries(date)
         folder_name = f"{current_period_start.strftime('%Y-%m-%d')}_{next_period_end.strftime('%Y-%m-%d')}"
 
         base_path = cls.SMB_CONFIG["path"].rstrip("/")
@@ -126,82 +241,59 @@ def get_smb_period_folder(cls, date: datetime | None = None) -> str | None:
         return folder_name
 
     @classmethod
-    def get_smb_connection(cls, use_cache: bool = True):
-        if not cls._smb_configured():
-            return None
+    @contextmanager
+    def smb_connection(cls):
+        """Check out a connection from the shared SMB pool for the duration of the block.
 
-        current_time = time.time()
-        if (
-            use_cache
-            and cls._connection_cache
-            and cls._connection_cache_time
-            and (current_time - cls._connection_cache_time)
-            < cls._connection_cache_timeout
-        ):
-            try:
-                cls._connection_cache.listShares()
-                return cls._connection_cache
-            except Exception:
-                cls._connection_cache = None
-                cls._connection_cache_time = None
-
-        client_name = socket.gethostname()
-        conn = SMBConnection(
-            username=cls.SMB_CONFIG["username"],
-            password=cls.SMB_CONFIG["password"],
-            my_name=client_name,
-            remote_name=cls.SMB_CONFIG["host"],
-            use_ntlm_v2=True,
-            is_direct_tcp=True,
-        )
+        Yields ``None`` when SMB is not configured or no connection can be made. The
+        connection goes back to the pool afterwards (or is dropped if it broke) and must
+        not be closed by the caller.
+        """
+        if not cls._smb_configured():
+            yield None
+            return
 
-        if conn.connect(cls.SMB_CONFIG["host"], 445, timeout=15):
-            if use_cache:
-                cls._connection_cache = conn
-                cls._connection_cache_time = current_time
-            return conn
+        from ..services.smb_service import get_smb_pool
 
-        conn.close()
-        return None
+        pool = get_smb_pool(cls.SMB_CONFIG)
+        try:
+            conn = pool.acquire()
+        except Exception as exc:
+            print(f"Warning: no SMB connection available: {exc}")
+            yield None
+            return
 
-    @classmethod
-    def clear_connection_cache(cls):
-        if cls._connection_cache:
-            try:
-                cls._connection_cache.close()
-            except Exception:
-                pass
-        cls._connection_cache = None
-        cls._connection_cache_time = None
+        broken = False
+        try:
+            yield conn
+        except Exception as exc:
+            broken = pool.is_connection_error(exc)
+            raise
+        finally:
+            pool.release(conn, broken=broken)
 
     @classmethod
     def ensure_folder_exists(cls, relative_path: str, conn=None):
         if not relative_path:
             return
 
-        should_close = False
-        if conn is None:
-            conn = cls.get_smb_connection()
-            should_close = conn is not None
-
         if conn is None:
+            with cls.smb_connection() as pooled:
+                if pooled is not None:
+                    cls.ensure_folder_exists(relative_path, pooled)
             return
 
         try:
+            conn.listPath(cls.SMB_CONFIG["share_name"], relative_path)
+        except Exception:
             try:
-                conn.listPath(cls.SMB_CONFIG["share_name"], relative_path)
-            except Exception:
-                try:
-                    conn.createDirectory(cls.SMB_CONFIG["share_name"], relative_path)
-                except Exception as dir_error:
-                    msg = str(dir_error).lower()
-                    if "already exists" not in msg and "file exists" not in msg:
-                        print(
-                            f"Warning: could not create SMB directory {relative_path}: {dir_error}"
-                        )
-        finally:
-            if should_close:
-                conn.close()
+                conn.createDirectory(cls.SMB_CONFIG["share_name"], relative_path)
+            except Exception as dir_error:
+                msg = str(dir_error).lower()
+                if "already exists" not in msg and "file exists" not in msg:
+                    print(
+                        f"Warning: could not create SMB directory {relative_path}: {dir_error}"
+                    )
 
     @classmethod
     def _format_hours(cls, value):
@@ -222,24 +314,126 @@ def create_ot_form(cls, data, date_info, dept_code=None, dept_name=None):
         dept_name = dept_name or cls.DEFAULT_DEPT_NAME
 
         wb = Workbook()
-        ws = wb.active
+        cls._render_ot_form_sheet(wb.active, dept_code, {"dept_code": dept_code, "dept_name": dept_name, "data": data}, date_info)
+        # The single-department form has always used a narrower duration column
+        wb.active.column_dimensions["F"].width = 14.14
+        return wb
+
+    @classmethod
+    def create_ot_summary(cls, data, date_info, dept_code=None, dept_name=None):
+        """Create overtime summary workbook (original format)"""
+        wb = Workbook()
+        cls._render_ot_summary_sheet(wb.active, {"data": data}, date_info)
+        return wb
 
-        # Column widths for ~{YYYY_MM_DD-YYYY_MM_DD}OT.xlsx monthly form format (A-P) - adjust as needed for actual form content
+    @classmethod
+    def create_monthly_ot_form(
+        cls, monthly_data, period_start, period_end, dept_code=None, dept_name=None, engine=None
+    ):
+        # Use provided dept info or fallback to defaults
+        dept_code = dept_code or cls.DEFAULT_DEPT_CODE
+        dept_name = dept_name or cls.DEFAULT_DEPT_NAME
+        dept_info = {"dept_code": dept_code, "dept_name": dept_name, "data": monthly_data}
+
+        if cls._use_streaming("monthly_form", engine):
+            wb = Workbook(write_only=True)
+            register_styles(wb)
+            cls._stream_monthly_ot_form_sheet(wb.create_sheet(title="Sheet"), dept_code, dept_info, period_start, period_end)
+            return wb
+
+        wb = Workbook()
+        cls._render_monthly_ot_form_sheet(wb.active, dept_code, dept_info, period_start, period_end)
+        return wb
+
+    @classmethod
+    def create_monthly_ot_summary(
+        cls, monthly_data, period_start, period_end, dept_code=None, dept_name=None
+    ):
+        wb = Workbook()
+        cls._render_monthly_ot_summary_sheet(wb.active, {"data": monthly_data})
+        # The single-department summary keeps its wider type/date columns
+        wb.active.column_dimensions["B"].width = 13.75
+        wb.active.column_dimensions["C"].width = 18.25
+        return wb
+
+    @classmethod
+    def _build_multi_sheet_workbook(cls, data_by_department, render_sheet, base_workbook=None, changed_departments=None):
+        """Build a workbook with one sheet per department, rendered by ``render_sheet(ws, dept_code, dept_info)``.
+
+        When ``base_workbook`` (a previously rendered copy of the same file) and
+        ``changed_departments`` are given, only the sheets of changed departments are
+        re-rendered; sheets for departments that no longer have data are dropped and
+        every other sheet is reused as-is.
+        """
+        sheets = {dept_code[:31]: (dept_code, dept_info) for dept_code, dept_info in sorted(data_by_department.items())}  # Excel sheet name limit is 31 chars
+
+        if base_workbook is None or changed_departments is None:
+            wb = Workbook()
+            # Remove default empty sheet
+            if "Sheet" in wb.sheetnames:
+                wb.remove(wb["Sheet"])
+            for title, (dept_code, dept_info) in sheets.items():
+                render_sheet(wb.create_sheet(title=title), dept_code, dept_info)
+            return wb
+
+        wb = base_workbook
+        changed_titles = {str(code)[:31] for code in changed_departments}
+        for ws in list(wb.worksheets):
+            if ws.title not in sheets or ws.title in changed_titles:
+                wb.remove(ws)
+
+        # Kept sheets are already in sorted order, so inserting missing ones at their
+        # sorted position keeps the sheet order identical to a full rebuild.
+        for index, (title, (dept_code, dept_info)) in enumerate(sheets.items()):
+            if title not in wb.sheetnames:
+                render_sheet(wb.create_sheet(title=title, index=index), dept_code, dept_info)
+        wb.active = 0
+        return wb
+
+    @classmethod
+    def create_ot_form_multi_sheet(cls, data_by_department, date_info, base_workbook=None, changed_departments=None):
+        """
+        Create daily OT form with multiple sheets (one per department)
+
+        Args:
+            data_by_department: Dict like {dept_code: {dept_code, dept_name, data: [...]}}
+            date_info: Date object
+            base_workbook: Previously rendered workbook to patch incrementally (optional)
+            changed_departments: Department codes whose sheets must be re-rendered (optional)
+
+        Returns:
+            Workbook with one sheet per department
+        """
+        return cls._build_multi_sheet_workbook(
+            data_by_department,
+            lambda ws, dept_code, dept_info: cls._render_ot_form_sheet(ws, dept_code, dept_info, date_info),
+            base_workbook=base_workbook,
+            changed_departments=changed_departments,
+        )
+
+    @classmethod
+    def _render_ot_form_sheet(cls, ws, dept_code, dept_info, date_info):
+        """Render one department's daily OT form onto ``ws``."""
+        data = dept_info["data"]
+        dept_name = dept_info["dept_name"]
+        register_styles(ws.parent)
+
+        # Column widths for ~{YYYY_MM_DD}OT_{DEPT_CODE}.xlsx daily form format (A-N) - adjust as needed for actual form content
         columns = {
-            "A": 6.25,
-            "B": 13.43,
-            "C": 21.14,
-            "D": 22.29,
-            "E": 18.25,
-            "F": 14.14,
-            "G": 15.14,
-            "H": 13.57,
-            "I": 15.71,
-            "J": 1.00,
-            "K": 17.14,
-            "L": 14.43,
-            "M": 15.43,
-            "N": 16.57,
+            "A": 6.25,      # No
+            "B": 13.43,     # No Karyawan
+            "C": 21.14,     # Nama
+            "D": 22.29,     # Alasan Lembur
+            "E": 18.25,     # Jam Lembur (Waktu)
+            "F": 14.43,     # Durasi Lembur
+            "G": 15.14,     # Jam istirahat saat lembur
+            "H": 13.57,     # Tanda Tangan Karyawan
+            "I": 15.71,     # Tanda Tangan Supervisor
+            "J": 1.00,      # (empty column for spacing)
+            "K": 17.14,     # Konfirmasi Jam Lembur (Waktu)
+            "L": 14.43,     # Konfirmasi Durasi Lembur
+            "M": 15.43,     # Jam Istirahat (Jika ada, gunakan V)
+            "N": 16.57,     # Tanda Tangan Karyawan
         }
         for col, width in columns.items():
             ws.column_dimensions[col].width = width
@@ -248,30 +442,29 @@ def create_ot_form(cls, data, date_info, dept_code=None, dept_name=None):
         ws.row_dimensions[2].height = 80
         ws.row_dimensions[3].height = 92
 
+        # Title and department header
         ws.merge_cells("A1:N1")
         ws["A1"] = "Form Lembur (加 班 申 請 單)"
-        ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["A1"].font = Font(name="Arial", size=20)
+        ws["A1"].style = "ot_title"
 
         ws.merge_cells("A2:C2")
         ws["A2"] = f"Departemen\n(部門代碼)：\n{dept_code}\n{dept_name}"
-        ws["A2"].alignment = Alignment(vertical="center", wrap_text=True)
-        ws["A2"].font = Font(name="Arial", size=11)
+        ws["A2"].style = "ot_dept_info"
 
         ws["D2"] = "Klasifikasi Karyawan\n(人員分類):"
-        ws["D2"].alignment = Alignment(
-            vertical="center", horizontal="right", wrap_text=True
-        )
+        ws["D2"].style = "ot_label_right"
         ws["E2"] = "☐ Level0(11-12職等)\n☑ Level1(13-23職等)"
-        ws["E2"].alignment = Alignment(vertical="center", wrap_text=True)
+        ws["E2"].style = "ot_text_wrap"
 
-        ch_date = f"{date_info.year} 年 {date_info.month:02d} 月 {date_info.day:02d} 日"
+        ch_date = (
+            f"{date_info.year} 年 {date_info.month:02d} 月 {date_info.day:02d} 日"
+        )
         weekday = calendar.day_name[date_info.weekday()].upper()
         ws.merge_cells("F2:H2")
         ws["F2"] = (
             f"Tanggal Lembur （加班日期）：\n                           {ch_date}\nHari （星期）: {weekday}"
         )
-        ws["F2"].alignment = Alignment(vertical="center", wrap_text=True)
+        ws["F2"].style = "ot_text_wrap"
 
         overtime_type = "Jenis Lembur （加班類别） :\n"
         if data and len(data) > 0:
@@ -288,8 +481,9 @@ def create_ot_form(cls, data, date_info, dept_code=None, dept_name=None):
 
         ws.merge_cells("I2:N2")
         ws["I2"] = overtime_type
-        ws["I2"].alignment = Alignment(vertical="center", wrap_text=True)
+        ws["I2"].style = "ot_text_wrap"
 
+        # Headers
         headers = [
             ("A3", "No\n(序號)"),
             ("B3", "No Karyawan\n(工號)"),
@@ -309,82 +503,53 @@ def create_ot_form(cls, data, date_info, dept_code=None, dept_name=None):
             ("N3", "Tanda Tangan Karyawan\n(員工簽名)"),
         ]
 
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-        header_style = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        header_font = Font(name="Arial", size=11)
-
         for cell, text in headers:
             ws[cell] = text
-            ws[cell].alignment = header_style
-            ws[cell].font = header_font
-            ws[cell].border = thin_border
+            ws[cell].style = "ot_header"
 
+        # Data rows
         for row in range(4, 34):
             for col in "ABCDEFGHIKLMN":
                 cell = f"{col}{row}"
                 ws[cell] = ""
-                ws[cell].border = thin_border
-                ws[cell].font = Font(name="Arial", size=11)
-                if col in "ABC":
-                    ws[cell].alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                else:
-                    ws[cell].alignment = Alignment(vertical="center")
+                ws[cell].style = "ot_grid_center" if col in "ABC" else "ot_grid"
             ws[f"A{row}"] = row - 3
 
+        # Fill data
         current_row = 4
         for item in data or []:
             ws[f"B{current_row}"] = item.get("employee_id")
             ws[f"C{current_row}"] = item.get("employee_name")
-
             ws[f"D{current_row}"] = item.get("reason")
-            ws[f"D{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
+            ws[f"D{current_row}"].style = "ot_grid_center"
+            ws[f"E{current_row}"] = (
+                f"{item.get('time_start')} - {item.get('time_end')}"
             )
-
-            ws[f"E{current_row}"] = f"{item.get('time_start')} - {item.get('time_end')}"
-            ws[f"E{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
+            ws[f"E{current_row}"].style = "ot_grid_center"
             ws[f"F{current_row}"] = f"{item.get('total_hours')} hour(s)"
-            ws[f"F{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws[f"F{current_row}"].style = "ot_grid_center"
 
             # Show 'V' if employee takes break time (original format)
             ws[f"G{current_row}"] = "V" if item.get("has_break") else "-"
-            ws[f"G{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws[f"G{current_row}"].style = "ot_grid_center"
 
-            ws[f"K{current_row}"] = f"{item.get('time_start')} - {item.get('time_end')}"
-            ws[f"K{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
+            ws[f"K{current_row}"] = (
+                f"{item.get('time_start')} - {item.get('time_end')}"
             )
-
+            ws[f"K{current_row}"].style = "ot_grid_center"
             ws[f"L{current_row}"] = f"{item.get('total_hours')} hour(s)"
-            ws[f"L{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws[f"L{current_row}"].style = "ot_grid_center"
 
             # Show 'V' if employee takes break time (original format)
             ws[f"M{current_row}"] = "V" if item.get("has_break") else "-"
-            ws[f"M{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws[f"M{current_row}"].style = "ot_grid_center"
 
             current_row += 1
 
+        # Notes
         ws.merge_cells("A34:N34")
         ws["A34"] = "Keterangan："
-        ws["A34"].font = Font(name="Arial", size=12)
+        ws["A34"].style = "ot_note_heading"
 
         notes = [
             (
@@ -405,23 +570,29 @@ def create_ot_form(cls, data, date_info, dept_code=None, dept_name=None):
             ws.merge_cells(cells)
             anchor = cells.split(":")[0]
             ws[anchor] = text
-            ws[anchor].font = Font(name="Arial", size=12)
-            ws[anchor].alignment = Alignment(vertical="center", wrap_text=True)
+            ws[anchor].style = "ot_note"
 
         ws["M38"] = "Form No.:PH2-TB004-001 Rev.02(CI)"
-        ws["M38"].font = Font(name="Arial", size=10)
-
-        return wb
+        ws["M38"].style = "ot_form_number"
 
     @classmethod
-    def create_ot_summary(cls, data, date_info, dept_code=None, dept_name=None):
-        """Create overtime summary workbook (original format)"""
-        # Use provided dept info or fallback to defaults (not used in summary but kept for consistency)
-        dept_code = dept_code or cls.DEFAULT_DEPT_CODE
-        dept_name = dept_name or cls.DEFAULT_DEPT_NAME
+    def create_ot_summary_multi_sheet(cls, data_by_department, date_info, base_workbook=None, changed_departments=None):
+        """Create daily OT summary workbook with one sheet per department (original format).
 
-        wb = Workbook()
-        ws = wb.active
+        Expects grouped data structure from export_daily_data_by_department.
+        """
+        return cls._build_multi_sheet_workbook(
+            data_by_department,
+            lambda ws, dept_code, dept_info: cls._render_ot_summary_sheet(ws, dept_info, date_info),
+            base_workbook=base_workbook,
+            changed_departments=changed_departments,
+        )
+
+    @classmethod
+    def _render_ot_summary_sheet(cls, ws, dept_info, date_info):
+        """Render one department's daily OT summary onto ``ws``."""
+        data = dept_info["data"]
+        register_styles(ws.parent)
 
         # Column widths for {YYYYMMDD}OTSummary.xlsx form format file (A-H) - adjust as needed for actual summary content
         columns = {
@@ -449,13 +620,9 @@ def create_ot_summary(cls, data, date_info, dept_code=None, dept_name=None):
             ("H1", "Reason"),
         ]
 
-        header_style = Alignment(horizontal="center", vertical="center")
-        header_font = Font(name="Arial", size=11)
-
         for cell, text in headers:
             ws[cell] = text
-            ws[cell].alignment = header_style
-            ws[cell].font = header_font
+            ws[cell].style = "ot_cell_center"
 
         current_row = 2
         for item in data or []:
@@ -478,945 +645,517 @@ def create_ot_summary(cls, data, date_info, dept_code=None, dept_name=None):
             ws[f"G{current_row}"] = cls._format_hours(item.get("total_hours"))
             ws[f"H{current_row}"] = item.get("reason")
 
-            # Apply formatting
             for col in "ABCDEFGH":
-                cell = f"{col}{current_row}"
-                ws[cell].font = Font(name="Arial", size=11)
-                ws[cell].alignment = Alignment(vertical="center")
-                if col in "ABCDEFG":
-                    ws[cell].alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
+                ws[f"{col}{current_row}"].style = "ot_cell_center" if col in "ABCDEFG" else "ot_cell"
 
             current_row += 1
 
-        return wb
-
     @classmethod
-    def create_monthly_ot_form(
-        cls, monthly_data, period_start, period_end, dept_code=None, dept_name=None
+    def create_monthly_ot_form_multi_sheet(
+        cls, data_by_department, period_start, period_end, base_workbook=None, changed_departments=None, engine=None
     ):
-        # Use provided dept info or fallback to defaults
-        dept_code = dept_code or cls.DEFAULT_DEPT_CODE
-        dept_name = dept_name or cls.DEFAULT_DEPT_NAME
+        """Create monthly OT form workbook with one sheet per department (original format).
 
-        wb = Workbook()
-        ws = wb.active
+        Expects grouped data from export_monthly_data_by_department. The streaming engine
+        always writes every sheet (write-only workbooks cannot be patched).
+        """
+        if cls._use_streaming("monthly_form", engine):
+            return cls._build_streaming_workbook(
+                data_by_department,
+                lambda ws, dept_code, dept_info: cls._stream_monthly_ot_form_sheet(ws, dept_code, dept_info, period_start, period_end),
+            )
+        return cls._build_multi_sheet_workbook(
+            data_by_department,
+            lambda ws, dept_code, dept_info: cls._render_monthly_ot_form_sheet(ws, dept_code, dept_info, period_start, period_end),
+            base_workbook=base_workbook,
+            changed_departments=changed_departments,
+        )
 
-        # Column widths for ~{YYYY_MM_DD-YYYY_MM_DD}OT.xlsx monthly form format (A-P) - adjust as needed for actual form content
-        columns = {
-            "A": 6.25,      # No
-            "B": 13.88,     # Tanggal Lembur
-            "C": 13.93,     # No Karyawan
-            "D": 21.14,     # Nama
-            "E": 22.29,     # Alasan Lembur
-            "F": 15.22,     # Jenis Lembur
-            "G": 16.55,     # Jam Lembur (Waktu)
-            "H": 14.55,     # Durasi Lembur
-            "I": 15.14,     # Jam istirahat saat lembur
-            "J": 13.57,     # Tanda Tangan Karyawan
-            "K": 15.71,     # Tanda Tangan Supervisor
-            "L": 1.00,      # Placeholder
-            "M": 16.55,     # Konfirmasi Jam Lembur (Waktu)
-            "N": 14.55,     # Konfirmasi Durasi Lembur
-            "O": 15.43,     # Jam Istirahat (Jika ada, gunakan V)
-            "P": 18.57,     # Tanda Tangan Karyawan
-        }
-        for col, width in columns.items():
+    @classmethod
+    def _render_monthly_ot_form_sheet(cls, ws, dept_code, dept_info, period_start, period_end):
+        """Render one department's monthly OT form onto ``ws``."""
+        data = dept_info["data"]
+        dept_name = dept_info["dept_name"]
+        register_styles(ws.parent)
+
+        for col, width in cls.MONTHLY_FORM_COLUMNS.items():
             ws.column_dimensions[col].width = width
 
         ws.row_dimensions[1].height = 30
         ws.row_dimensions[2].height = 80
         ws.row_dimensions[3].height = 92
 
+        # Title
         ws.merge_cells("A1:P1")
-        ws["A1"] = "Form Lembur Bulanan (月度加班申請單)"
-        ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["A1"].font = Font(name="Arial", size=20, bold=True)
+        ws["A1"] = cls.MONTHLY_FORM_TITLE
+        ws["A1"].style = "ot_title_bold"
 
+        # Department info
         ws.merge_cells("A2:C2")
         ws["A2"] = f"Departemen\n(部門代碼)：\n{dept_code}\n{dept_name}"
-        ws["A2"].alignment = Alignment(vertical="center", wrap_text=True)
-        ws["A2"].font = Font(name="Arial", size=11)
+        ws["A2"].style = "ot_dept_info"
 
-        ws["D2"] = "Klasifikasi Karyawan\n(人員分類):"
-        ws["D2"].alignment = Alignment(
-            vertical="center", horizontal="right", wrap_text=True
-        )
-        ws["E2"] = "☐ Level0(11-12職等)\n☑ Level1(13-23職等)"
-        ws["E2"].alignment = Alignment(vertical="center", wrap_text=True)
+        # Employee classification
+        ws["D2"] = cls.EMPLOYEE_CLASSIFICATION_LABEL
+        ws["D2"].style = "ot_label_right"
+        ws["E2"] = cls.EMPLOYEE_CLASSIFICATION_VALUE
+        ws["E2"].style = "ot_text_wrap"
 
-        period_str = (
-            f"{period_start.strftime('%Y-%m-%d')} ~ {period_end.strftime('%Y-%m-%d')}"
-        )
+        # Period information
+        period_str = f"{period_start.strftime('%Y-%m-%d')} ~ {period_end.strftime('%Y-%m-%d')}"
         ws.merge_cells("F2:H2")
         ws["F2"] = f"Periode Lembur (加班期间):\n{period_str}"
-        ws["F2"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
+        ws["F2"].style = "ot_text_center_wrap"
 
+        # Empty right section
         ws.merge_cells("I2:P2")
         ws["I2"] = ""
 
-        headers = [
-            ("A3", "No\n(序號)"),
-            ("B3", "Tanggal Lembur\n(加班日期)"),
-            ("C3", "No Karyawan\n(工號)"),
-            ("D3", "Nama\n(姓名)"),
-            ("E3", "Alasan Lembur\n(申請加班事由)"),
-            ("F3", "Jenis Lembur\n(加班類别)"),
-            ("G3", "Jam Lembur (Waktu)\n(預計加班\n起止時間)"),
-            ("H3", "Durasi Lembur\n(預計加班時數)"),
-            (
-                "I3",
-                "Jam istirahat saat lembur (jika perlu, gunakan V)\n(預計休息或用餐打V)",
-            ),
-            ("J3", "Tanda Tangan Karyawan\n(員工簽名)"),
-            ("K3", "Tanda Tangan Supervisor\n(課級主管簽名)"),
-            ("M3", "Konfirmasi Jam Lembur (Waktu)\n(實際加班\n起止時間)"),
-            ("N3", "Konfirmasi Durasi Lembur\n(實際加班時數)"),
-            ("O3", "Jam Istirahat (Jika ada, gunakan V)\n(實際休息或用餐打V)"),
-            ("P3", "Tanda Tangan Karyawan\n(員工簽名)"),
-        ]
-
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-        header_style = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        header_font = Font(name="Arial", size=11)
-
-        for cell, text in headers:
-            ws[cell] = text
-            ws[cell].alignment = header_style
-            ws[cell].font = header_font
-            ws[cell].border = thin_border
+        # Column headers (original format)
+        for col, text in cls.MONTHLY_FORM_HEADERS.items():
+            ws[f"{col}3"] = text
+            ws[f"{col}3"].style = "ot_header"
 
-        data_row_count = len(monthly_data) if monthly_data else 0
-        required_rows = max(30, data_row_count)
+        # Calculate required rows
+        data_row_count = len(data) if data else 0
+        required_rows = max(cls.MONTHLY_FORM_MIN_ROWS, data_row_count)
         last_data_row = 4 + required_rows - 1
 
+        # Create empty rows with formatting
         for row in range(4, last_data_row + 1):
             for col in "ABCDEFGHIJKLMNOP":
                 cell = f"{col}{row}"
                 ws[cell] = ""
-                ws[cell].border = thin_border
-                ws[cell].font = Font(name="Arial", size=11)
-                if col in "ABCD":
-                    ws[cell].alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                else:
-                    ws[cell].alignment = Alignment(vertical="center")
+                ws[cell].style = "ot_grid_center" if col in "ABCD" else "ot_grid"
             ws[f"A{row}"] = row - 3
 
+        # Fill in monthly data
         current_row = 4
-        for item in monthly_data or []:
-            ws[f"B{current_row}"] = item.get("request_date")
-            ws[f"B{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"C{current_row}"] = item.get("employee_id")
-            ws[f"C{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"D{current_row}"] = item.get("employee_name")
-            ws[f"D{current_row}"].alignment = Alignment(vertical="center")
-
-            ws[f"E{current_row}"] = item.get("reason")
-            ws[f"E{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            if item.get("is_holiday", False):
-                overtime_type = "Holiday"
-            elif item.get("is_weekend", False):
-                overtime_type = "Weekend"
-            else:
-                overtime_type = "Weekday"
-
-            ws[f"F{current_row}"] = overtime_type
-            ws[f"F{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"G{current_row}"] = f"{item.get('time_start')} - {item.get('time_end')}"
-            ws[f"G{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"H{current_row}"] = f"{item.get('total_hours')} hour(s)"
-            ws[f"H{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"I{current_row}"] = "V" if item.get("has_break") else "-"
-            ws[f"I{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"M{current_row}"] = f"{item.get('time_start')} - {item.get('time_end')}"
-            ws[f"M{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"N{current_row}"] = f"{item.get('total_hours')} hour(s)"
-            ws[f"N{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
-
-            ws[f"O{current_row}"] = "V" if item.get("has_break") else "-"
-            ws[f"O{current_row}"].alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+        for item in data or []:
+            for col, value in cls._monthly_form_row_values(item).items():
+                ws[f"{col}{current_row}"] = value
+                ws[f"{col}{current_row}"].style = "ot_grid" if col == "D" else "ot_grid_center"
 
             current_row += 1
 
+        # Dynamic footer positioning
         footer_row = last_data_row + 1
         notes_start_row = footer_row + 1
         form_number_row = notes_start_row + 3
 
         ws.merge_cells(f"A{footer_row}:P{footer_row}")
         ws[f"A{footer_row}"] = "Keterangan:"
-        ws[f"A{footer_row}"].font = Font(name="Arial", size=12)
+        ws[f"A{footer_row}"].style = "ot_note_heading"
 
-        notes = [
-            (
-                f"A{notes_start_row}:P{notes_start_row}",
-                "1. Informasi diatas harus dilaporkan dengan benar, pelanggaran akan dikenakan sesuai dengan hukuman yang ada dari managemen perusahaan (以上資料請據實申報，違者按獎懲管理辦法處理)。",
-            ),
-            (
-                f"A{notes_start_row + 1}:P{notes_start_row + 1}",
-                "2. Karyawan harus menandatangani aplikasi lembur. Jika tidak ada tanda tangan maka akan di anggap tidak sah (實際加班時數，以員工簽名確認為準)。",
-            ),
-            (
-                f"A{notes_start_row + 2}:P{notes_start_row + 2}",
-                "3. Tidak ada aplikasi lembur tidak akan di hitung untuk upah lembur (無加班申請單不計發加班費)。",
-            ),
-        ]
+        for offset, text in enumerate(cls.MONTHLY_FORM_NOTES):
+            row = notes_start_row + offset
+            ws.merge_cells(f"A{row}:P{row}")
+            ws[f"A{row}"] = text
+            ws[f"A{row}"].style = "ot_note"
 
-        for cells, text in notes:
-            ws.merge_cells(cells)
-            anchor = cells.split(":")[0]
-            ws[anchor] = text
-            ws[anchor].font = Font(name="Arial", size=12)
-            ws[anchor].alignment = Alignment(vertical="center", wrap_text=True)
-
-        ws[f"O{form_number_row}"] = "Form No.:PH2-TB004-001 Rev.02(CI)"
-        ws[f"O{form_number_row}"].font = Font(name="Arial", size=10)
+        ws[f"O{form_number_row}"] = cls.MONTHLY_FORM_NUMBER
+        ws[f"O{form_number_row}"].style = "ot_form_number"
 
-        return wb
+    @classmethod
+    def _monthly_form_row_values(cls, item):
+        """Return the ``{column: value}`` cells filled in for one monthly form data row."""
+        # Overtime type based on weekend/holiday status
+        if item.get("is_holiday", False):
+            overtime_type = "Holiday"
+        elif item.get("is_weekend", False):
+            overtime_type = "Weekend"
+        else:
+            overtime_type = "Weekday"
+
+        time_range = f"{item.get('time_start')} - {item.get('time_end')}"
+        duration = f"{item.get('total_hours')} hour(s)"
+        # Show 'V' if employee takes break time (original format)
+        break_mark = "V" if item.get("has_break") else "-"
+        return {
+            "B": item.get("request_date"),
+            "C": item.get("employee_id"),
+            "D": item.get("employee_name"),
+            "E": item.get("reason"),
+            "F": overtime_type,
+            "G": time_range,
+            "H": duration,
+            "I": break_mark,
+            # Actual time, duration and break status
+            "M": time_range,
+            "N": duration,
+            "O": break_mark,
+        }
 
     @classmethod
-    def create_monthly_ot_summary(
-        cls, monthly_data, period_start, period_end, dept_code=None, dept_name=None
+    def create_monthly_ot_summary_multi_sheet(
+        cls, data_by_department, period_start, period_end, base_workbook=None, changed_departments=None, engine=None
     ):
-        # Use provided dept info or fallback to defaults (not used in summary but kept for consistency)
-        dept_code = dept_code or cls.DEFAULT_DEPT_CODE
-        dept_name = dept_name or cls.DEFAULT_DEPT_NAME
-
-        wb = Workbook()
-        ws = wb.active
+        """Create monthly OT summary workbook with one sheet per department.
 
-        # Column widths for ~{YYYY_MM_DD-YYYY_MM_DD}OTSummary.xlsx monthly summary format (A-I) - adjust as needed for actual summary content
-        columns = {
-            "A": 11.75,     # Work ID
-            "B": 13.75,     # Overtime Type
-            "C": 18.25,     # Overtime Start Date
-            "D": 9.75,      # Start Time
-            "E": 9.75,      # End Time
-            "F": 9.75,      # Break
-            "G": 6.0,       # Hours
-            "H": 25.0,      # Reason
-            "I": 25.0,      # Detail
-        }
-        for col, width in columns.items():
-            ws.column_dimensions[col].width = width
+        Expects grouped data from export_monthly_data_by_department. The streaming engine
+        always writes every sheet (write-only workbooks cannot be patched).
+        """
+        if cls._use_streaming("monthly_summary", engine):
+            return cls._build_streaming_workbook(
+                data_by_department,
+                lambda ws, dept_code, dept_info: cls._stream_monthly_ot_summary_sheet(ws, dept_info),
+            )
+        return cls._build_multi_sheet_workbook(
+            data_by_department,
+            lambda ws, dept_code, dept_info: cls._render_monthly_ot_summary_sheet(ws, dept_info),
+            base_workbook=base_workbook,
+            changed_departments=changed_departments,
+        )
 
-        headers = [
-            ("A1", "Work ID"),
-            ("B1", "Overtime Type"),
-            ("C1", "Overtime Start Date"),
-            ("D1", "Start Time"),
-            ("E1", "End Time"),
-            ("F1", "Meal/Rest"),
-            ("G1", "Hours"),
-            ("H1", "Reason"),
-            ("I1", "Detail"),
-        ]
+    @classmethod
+    def _render_monthly_ot_summary_sheet(cls, ws, dept_info):
+        """Render one department's monthly OT summary onto ``ws``."""
+        data = dept_info["data"]
+        register_styles(ws.parent)
 
-        header_style = Alignment(horizontal="center", vertical="center")
-        header_font = Font(name="Arial", size=11)
+        for col, width in cls.MONTHLY_SUMMARY_COLUMNS.items():
+            ws.column_dimensions[col].width = width
 
-        for cell, text in headers:
-            ws[cell] = text
-            ws[cell].alignment = header_style
-            ws[cell].font = header_font
+        for col, text in cls.MONTHLY_SUMMARY_HEADERS.items():
+            ws[f"{col}1"] = text
+            ws[f"{col}1"].style = "ot_cell_center"
 
         current_row = 2
-        for item in monthly_data or []:
-            ot_type = 1
-            if item.get("is_holiday", False):
-                ot_type = 3
-            elif item.get("is_weekend", False):
-                ot_type = 2
-
-            ws[f"A{current_row}"] = item.get("employee_id")
-            ws[f"B{current_row}"] = ot_type
-            ws[f"C{current_row}"] = item.get("request_date")
-            ws[f"D{current_row}"] = item.get("time_start")
-            ws[f"E{current_row}"] = item.get("time_end")
-            ws[f"F{current_row}"] = "Y" if item.get("has_break") else "N"
-            ws[f"G{current_row}"] = cls._format_hours(item.get("total_hours"))
-            ws[f"H{current_row}"] = item.get("reason")
-            ws[f"I{current_row}"] = item.get("detail", "")
-
-            for col in "ABCDEFGHI":
+        for item in data or []:
+            for col, value in cls._monthly_summary_row_values(item).items():
                 cell = f"{col}{current_row}"
-                ws[cell].font = Font(name="Arial", size=11)
-                ws[cell].alignment = Alignment(vertical="center")
-                if col in "ABCDEFG":
-                    ws[cell].alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
+                ws[cell] = value
+                ws[cell].style = "ot_cell_center" if col in "ABCDEFG" else "ot_cell"
 
             current_row += 1
 
-        return wb
+    @classmethod
+    def _monthly_summary_row_values(cls, item):
+        """Return the ``{column: value}`` cells of one monthly summary data row."""
+        ot_type = 1
+        if item.get("is_holiday", False):
+            ot_type = 3
+        elif item.get("is_weekend", False):
+            ot_type = 2
+
+        return {
+            "A": item.get("employee_id"),
+            "B": ot_type,
+            "C": item.get("request_date"),
+            "D": item.get("time_start"),
+            "E": item.get("time_end"),
+            "F": "Y" if item.get("has_break") else "N",
+            "G": cls._format_hours(item.get("total_hours")),
+            "H": item.get("reason"),
+            "I": item.get("detail", ""),
+        }
 
     @classmethod
-    def create_ot_form_multi_sheet(cls, data_by_department, date_info):
+    def _use_streaming(cls, report_type, engine=None) -> bool:
+        """Return True when ``report_type`` should be rendered with the streaming engine.
+
+        ``engine`` ("standard" or "streaming") overrides the EXCEL_STREAMING_REPORTS setting.
         """
-        Create daily OT form with multiple sheets (one per department)
+        if engine is None:
+            return report_type in cls.EXCEL_STREAMING_REPORTS
+        if engine not in ("standard", "streaming"):
+            raise ValueError(f"Unknown Excel engine: {engine}")
+        return engine == "streaming"
 
-        Args:
-            data_by_department: Dict like {dept_code: {dept_code, dept_name, data: [...]}}
-            date_info: Date object
+    @classmethod
+    def _build_streaming_workbook(cls, data_by_department, stream_sheet):
+        """Build a write-only workbook with one sheet per department, written by ``stream_sheet``."""
+        wb = Workbook(write_only=True)
+        register_styles(wb)
+        for dept_code, dept_info in sorted(data_by_department.items()):
+            stream_sheet(wb.create_sheet(title=dept_code[:31]), dept_code, dept_info)  # Excel sheet name limit is 31 chars
+        return wb
 
-        Returns:
-            Workbook with one sheet per department
+    @classmethod
+    def _stream_monthly_ot_form_sheet(cls, ws, dept_code, dept_info, period_start, period_end):
+        """Write one department's monthly OT form to a write-only ``ws``, row by row.
+
+        Produces the same layout as ``_render_monthly_ot_form_sheet`` using the shared
+        named styles, so no per-cell style objects are allocated and rows are flushed
+        to disk as they are written.
         """
-        wb = Workbook()
-        # Remove default empty sheet
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+        data = dept_info["data"] or []
+        dept_name = dept_info["dept_name"]
 
-        # Create a sheet for each department
-        for dept_code, dept_info in sorted(data_by_department.items()):
-            ws = wb.create_sheet(
-                title=dept_code[:31]
-            )  # Excel sheet name limit is 31 chars
-            data = dept_info["data"]
-            dept_name = dept_info["dept_name"]
-
-            # Column widths for ~{YYYY_MM_DD}OT_{DEPT_CODE}.xlsx daily form format (A-N) - adjust as needed for actual form content
-            columns = {
-                "A": 6.25,      # No
-                "B": 13.43,     # No Karyawan
-                "C": 21.14,     # Nama
-                "D": 22.29,     # Alasan Lembur
-                "E": 18.25,     # Jam Lembur (Waktu)
-                "F": 14.43,     # Durasi Lembur
-                "G": 15.14,     # Jam istirahat saat lembur
-                "H": 13.57,     # Tanda Tangan Karyawan
-                "I": 15.71,     # Tanda Tangan Supervisor
-                "J": 1.00,      # (empty column for spacing)
-                "K": 17.14,     # Konfirmasi Jam Lembur (Waktu)
-                "L": 14.43,     # Konfirmasi Durasi Lembur
-                "M": 15.43,     # Jam Istirahat (Jika ada, gunakan V)
-                "N": 16.57,     # Tanda Tangan Karyawan
-            }
-            for col, width in columns.items():
-                ws.column_dimensions[col].width = width
-
-            ws.row_dimensions[1].height = 30
-            ws.row_dimensions[2].height = 80
-            ws.row_dimensions[3].height = 92
-
-            # Title and department header
-            ws.merge_cells("A1:N1")
-            ws["A1"] = "Form Lembur (加 班 申 請 單)"
-            ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-            ws["A1"].font = Font(name="Arial", size=20)
-
-            ws.merge_cells("A2:C2")
-            ws["A2"] = f"Departemen\n(部門代碼)：\n{dept_code}\n{dept_name}"
-            ws["A2"].alignment = Alignment(vertical="center", wrap_text=True)
-            ws["A2"].font = Font(name="Arial", size=11)
-
-            ws["D2"] = "Klasifikasi Karyawan\n(人員分類):"
-            ws["D2"].alignment = Alignment(
-                vertical="center", horizontal="right", wrap_text=True
-            )
-            ws["E2"] = "☐ Level0(11-12職等)\n☑ Level1(13-23職等)"
-            ws["E2"].alignment = Alignment(vertical="center", wrap_text=True)
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
 
-            ch_date = (
-                f"{date_info.year} 年 {date_info.month:02d} 月 {date_info.day:02d} 日"
-            )
-            weekday = calendar.day_name[date_info.weekday()].upper()
-            ws.merge_cells("F2:H2")
-            ws["F2"] = (
-                f"Tanggal Lembur （加班日期）：\n                           {ch_date}\nHari （星期）: {weekday}"
-            )
-            ws["F2"].alignment = Alignment(vertical="center", wrap_text=True)
-
-            overtime_type = "Jenis Lembur （加班類别） :\n"
-            if data and len(data) > 0:
-                first_request = data[0]
-                is_weekend = first_request.get("is_weekend", False)
-                is_holiday = first_request.get("is_holiday", False)
-
-                if is_holiday:
-                    overtime_type += "☐ Saat Hari Kerja (工作日延長加班)\n☐ Saat Hari Libur (休息日加班)\n☑ Saat Tanggal Merah (法定假日加班)"
-                elif is_weekend:
-                    overtime_type += "☐ Saat Hari Kerja (工作日延長加班)\n☑ Saat Hari Libur (休息日加班)\n☐ Saat Tanggal Merah (法定假日加班)"
-                else:
-                    overtime_type += "☑ Saat Hari Kerja (工作日延長加班)\n☐ Saat Hari Libur (休息日加班)\n☐ Saat Tanggal Merah (法定假日加班)"
-
-            ws.merge_cells("I2:N2")
-            ws["I2"] = overtime_type
-            ws["I2"].alignment = Alignment(vertical="center", wrap_text=True)
-
-            # Headers
-            headers = [
-                ("A3", "No\n(序號)"),
-                ("B3", "No Karyawan\n(工號)"),
-                ("C3", "Nama\n(姓名)"),
-                ("D3", "Alasan Lembur\n(申請加班事由)"),
-                ("E3", "Jam Lembur (Waktu)\n(預計加班\n起止時間)"),
-                ("F3", "Durasi Lembur\n(預計加班時數)"),
-                (
-                    "G3",
-                    "Jam istirahat saat lembur (jika perlu, gunakan V)\n(預計休息或用餐打V)",
-                ),
-                ("H3", "Tanda Tangan Karyawan\n(員工簽名)"),
-                ("I3", "Tanda Tangan Supervisor\n(課級主管簽名)"),
-                ("K3", "Konfirmasi Jam Lembur (Waktu)\n(實際加班\n起止時間)"),
-                ("L3", "Konfirmasi Durasi Lembur\n(實際加班時數)"),
-                ("M3", "Jam Istirahat (Jika ada, gunakan V)\n(實際休息或用餐打V)"),
-                ("N3", "Tanda Tangan Karyawan\n(員工簽名)"),
-            ]
+        # Dimensions and merges must be set before the first row is written
+        for col, width in cls.MONTHLY_FORM_COLUMNS.items():
+            ws.column_dimensions[col].width = width
+        ws.row_dimensions[1].height = 30
+        ws.row_dimensions[2].height = 80
+        ws.row_dimensions[3].height = 92
 
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin"),
-            )
-            header_style = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
-            )
-            header_font = Font(name="Arial", size=11)
-
-            for cell, text in headers:
-                ws[cell] = text
-                ws[cell].alignment = header_style
-                ws[cell].font = header_font
-                ws[cell].border = thin_border
-
-            # Data rows
-            for row in range(4, 34):
-                for col in "ABCDEFGHIKLMN":
-                    cell = f"{col}{row}"
-                    ws[cell] = ""
-                    ws[cell].border = thin_border
-                    ws[cell].font = Font(name="Arial", size=11)
-                    if col in "ABC":
-                        ws[cell].alignment = Alignment(
-                            horizontal="center", vertical="center"
-                        )
-                    else:
-                        ws[cell].alignment = Alignment(vertical="center")
-                ws[f"A{row}"] = row - 3
-
-            # Fill data
-            current_row = 4
-            for item in data or []:
-                ws[f"B{current_row}"] = item.get("employee_id")
-                ws[f"C{current_row}"] = item.get("employee_name")
-                ws[f"D{current_row}"] = item.get("reason")
-                ws[f"D{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-                ws[f"E{current_row}"] = (
-                    f"{item.get('time_start')} - {item.get('time_end')}"
-                )
-                ws[f"E{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-                ws[f"F{current_row}"] = f"{item.get('total_hours')} hour(s)"
-                ws[f"F{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Show 'V' if employee takes break time (original format)
-                ws[f"G{current_row}"] = "V" if item.get("has_break") else "-"
-                ws[f"G{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"K{current_row}"] = (
-                    f"{item.get('time_start')} - {item.get('time_end')}"
-                )
-                ws[f"K{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-                ws[f"L{current_row}"] = f"{item.get('total_hours')} hour(s)"
-                ws[f"L{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Show 'V' if employee takes break time (original format)
-                ws[f"M{current_row}"] = "V" if item.get("has_break") else "-"
-                ws[f"M{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                current_row += 1
-
-            # Notes
-            ws.merge_cells("A34:N34")
-            ws["A34"] = "Keterangan："
-            ws["A34"].font = Font(name="Arial", size=12)
-
-            notes = [
-                (
-                    "A35:N35",
-                    "1. Informasi diatas harus dilaporkan dengan benar, pelanggaran akan dikenakan sesuai dengan hukuman yang ada dari managemen perusahaan (以上資料請據實申報，違者按獎懲管理辦法處理)。",
-                ),
-                (
-                    "A36:N36",
-                    "2. Karyawan harus menandatangani aplikasi lembur. Jika tidak ada tanda tangan maka akan di anggap tidak sah (實際加班時數，以員工簽名確認為準)。",
-                ),
-                (
-                    "A37:N37",
-                    "3. Tidak ada aplikasi lembur tidak akan di hitung untuk upah lembur (無加班申請單不計發加班費)。",
-                ),
+        required_rows = max(cls.MONTHLY_FORM_MIN_ROWS, len(data))
+        footer_row = 4 + required_rows
+        for merged in ("A1:P1", "A2:C2", "F2:H2", "I2:P2"):
+            ws.merged_cells.add(merged)
+        for row in range(footer_row, footer_row + 1 + len(cls.MONTHLY_FORM_NOTES)):
+            ws.merged_cells.add(f"A{row}:P{row}")
+
+        ws.append([styled(cls.MONTHLY_FORM_TITLE, "ot_title_bold")])
+
+        period_str = f"{period_start.strftime('%Y-%m-%d')} ~ {period_end.strftime('%Y-%m-%d')}"
+        ws.append(
+            [
+                styled(f"Departemen\n(部門代碼)：\n{dept_code}\n{dept_name}", "ot_dept_info"),
+                None,
+                None,
+                styled(cls.EMPLOYEE_CLASSIFICATION_LABEL, "ot_label_right"),
+                styled(cls.EMPLOYEE_CLASSIFICATION_VALUE, "ot_text_wrap"),
+                styled(f"Periode Lembur (加班期间):\n{period_str}", "ot_text_center_wrap"),
+                None,
+                None,
+                "",
             ]
+        )
 
-            for cells, text in notes:
-                ws.merge_cells(cells)
-                anchor = cells.split(":")[0]
-                ws[anchor] = text
-                ws[anchor].font = Font(name="Arial", size=12)
-                ws[anchor].alignment = Alignment(vertical="center", wrap_text=True)
+        columns = list(cls.MONTHLY_FORM_COLUMNS)
+        ws.append([styled(cls.MONTHLY_FORM_HEADERS[col], "ot_header") if col in cls.MONTHLY_FORM_HEADERS else None for col in columns])
+
+        for index in range(required_rows):
+            values = cls._monthly_form_row_values(data[index]) if index < len(data) else {}
+            row = []
+            for col in columns:
+                if col == "A":
+                    row.append(styled(index + 1, "ot_grid_center"))
+                elif col in values:
+                    row.append(styled(values[col], "ot_grid" if col == "D" else "ot_grid_center"))
+                else:
+                    row.append(styled("", "ot_grid_center" if col in "BCD" else "ot_grid"))
+            ws.append(row)
 
-            ws["M38"] = "Form No.:PH2-TB004-001 Rev.02(CI)"
-            ws["M38"].font = Font(name="Arial", size=10)
+        ws.append([styled("Keterangan:", "ot_note_heading")])
+        for text in cls.MONTHLY_FORM_NOTES:
+            ws.append([styled(text, "ot_note")])
+        ws.append([None] * columns.index("O") + [styled(cls.MONTHLY_FORM_NUMBER, "ot_form_number")])
 
-        return wb
+    @classmethod
+    def _stream_monthly_ot_summary_sheet(cls, ws, dept_info):
+        """Write one department's monthly OT summary to a write-only ``ws``, row by row."""
+        for col, width in cls.MONTHLY_SUMMARY_COLUMNS.items():
+            ws.column_dimensions[col].width = width
+
+        def styled(value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+
+        ws.append([styled(text, "ot_cell_center") for text in cls.MONTHLY_SUMMARY_HEADERS.values()])
+        for item in dept_info["data"] or []:
+            ws.append(
+                [
+                    styled(value, "ot_cell_center" if col in "ABCDEFG" else "ot_cell")
+                    for col, value in cls._monthly_summary_row_values(item).items()
+                ]
+            )
 
     @classmethod
-    def create_ot_summary_multi_sheet(cls, data_by_department, date_info):
-        """Create daily OT summary workbook with one sheet per department (original format).
+    def _sheet_digest(cls, dept_info) -> str:
+        """Stable digest of one department's sheet payload, used to detect changed sheets.
 
-        Expects grouped data structure from export_daily_data_by_department.
+        Only the values some report writes to a cell are hashed, so bookkeeping fields of the
+        export records (``created_at``, ``updated_at``, ...) do not mark a sheet as changed.
         """
-        wb = Workbook()
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+        rendered = {
+            "dept_code": dept_info.get("dept_code"),
+            "dept_name": dept_info.get("dept_name"),
+            "data": [{field: item.get(field) for field in cls.RENDERED_FIELDS} for item in dept_info.get("data") or []],
+        }
+        payload = json.dumps(rendered, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-        for dept_code, dept_info in sorted(data_by_department.items()):
-            ws = wb.create_sheet(title=dept_code[:31])
-            data = dept_info["data"]
-
-            # Column widths for {YYYYMMDD}OTSummary.xlsx form format file (A-H) - adjust as needed for actual summary content
-            columns = {
-                "A": 11.75,     # Work ID
-                "B": 13.75,     # Overtime Type
-                "C": 18.25,     # Overtime Start Date
-                "D": 9.75,      # Start Time
-                "E": 9.75,      # End Time
-                "F": 9.75,      # Break
-                "G": 6.0,       # Hours
-                "H": 25.0,      # Reason
-            }
-            for col, width in columns.items():
-                ws.column_dimensions[col].width = width
-
-            # Original headers
-            headers = [
-                ("A1", "Work ID"),
-                ("B1", "Overtime Type"),
-                ("C1", "Overtime Start Date"),
-                ("D1", "Start Time"),
-                ("E1", "End Time"),
-                ("F1", "Meal/Rest"),
-                ("G1", "Hours"),
-                ("H1", "Reason"),
-            ]
+    @classmethod
+    def _workbook_cache_key(cls, filename: str) -> str:
+        return f"excel_wb:v{cls.WORKBOOK_CACHE_VERSION}:{filename}"
 
-            header_style = Alignment(horizontal="center", vertical="center")
-            header_font = Font(name="Arial", size=11)
-
-            for cell, text in headers:
-                ws[cell] = text
-                ws[cell].alignment = header_style
-                ws[cell].font = header_font
-
-            current_row = 2
-            for item in data or []:
-                # Determine overtime type based on weekend/holiday (1=weekday, 2=weekend, 3=holiday)
-                ot_type = 1  # Default: weekday
-                if item.get("is_holiday", False):
-                    ot_type = 3  # Holiday
-                elif item.get("is_weekend", False):
-                    ot_type = 2  # Weekend
-
-                # Format date from date_info
-                formatted_date = date_info.strftime("%Y-%m-%d")
-
-                ws[f"A{current_row}"] = item.get("employee_id")
-                ws[f"B{current_row}"] = ot_type
-                ws[f"C{current_row}"] = formatted_date
-                ws[f"D{current_row}"] = item.get("time_start")
-                ws[f"E{current_row}"] = item.get("time_end")
-                ws[f"F{current_row}"] = "Y" if item.get("has_break") else "N"
-                ws[f"G{current_row}"] = cls._format_hours(item.get("total_hours"))
-                ws[f"H{current_row}"] = item.get("reason")
-
-                for col in "ABCDEFGH":
-                    cell = f"{col}{current_row}"
-                    ws[cell].font = Font(name="Arial", size=11)
-                    ws[cell].alignment = Alignment(vertical="center")
-                    if col in "ABCDEFG":
-                        ws[cell].alignment = Alignment(
-                            horizontal="center", vertical="center"
-                        )
-
-                current_row += 1
+    @classmethod
+    def _render_plan(cls, filename, data_by_dept, patchable=True):
+        """Work out how ``filename`` has to be rendered for ``data_by_dept``.
 
-        return wb
+        Returns ``(digests, cached_bytes, base_bytes, stale)``: ``cached_bytes`` is set when
+        the cached copy can be reused as is, otherwise ``base_bytes``/``stale`` describe the
+        cached workbook to patch and its departments to re-render (``None`` for a full build).
+        """
+        digests = {code: cls._sheet_digest(info) for code, info in data_by_dept.items()}
+        if not cls.EXCEL_INCREMENTAL:
+            return digests, None, None, None
+
+        from django.core.cache import cache
+
+        try:
+            cached = cache.get(cls._workbook_cache_key(filename))
+        except Exception:
+            cached = None
+        if not cached:
+            return digests, None, None, None
+        try:
+            cached_digests, cached_bytes = cached
+            stale = {code for code, digest in digests.items() if cached_digests.get(code) != digest}
+            if not stale and set(cached_digests) == set(digests):
+                return digests, cached_bytes, None, None
+            if patchable:
+                return digests, None, cached_bytes, stale
+        except Exception as exc:
+            print(f"Warning: discarding cached workbook {filename}: {exc}")
+        return digests, None, None, None
 
     @classmethod
-    def create_monthly_ot_form_multi_sheet(
-        cls, data_by_department, period_start, period_end
-    ):
-        """Create monthly OT form workbook with one sheet per department (original format).
+    def _render_bytes(cls, build, base_bytes=None, stale=None):
+        """Run ``build`` (patching the workbook in ``base_bytes`` when given) and return xlsx bytes."""
+        base_workbook = load_workbook(io.BytesIO(base_bytes)) if base_bytes else None
+        wb = build(base_workbook=base_workbook, changed_departments=stale if base_workbook else None)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
 
-        Expects grouped data from export_monthly_data_by_department.
-        """
-        wb = Workbook()
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+    @classmethod
+    def _store_rendered(cls, filename, digests, content):
+        if not cls.EXCEL_INCREMENTAL:
+            return
+        from django.core.cache import cache
 
-        for dept_code, dept_info in sorted(data_by_department.items()):
-            ws = wb.create_sheet(title=dept_code[:31])
-            data = dept_info["data"]
-            dept_name = dept_info["dept_name"]
-
-            # Column widths for ~{YYYY_MM_DD-YYYY_MM_DD}OT.xlsx monthly form format (A-P) - adjust as needed for actual form content
-            columns = {
-                "A": 6.25,      # No
-                "B": 13.88,     # No Karyawan
-                "C": 13.93,     # Nama
-                "D": 21.14,     # Alasan Lembur
-                "E": 22.29,     # Jam Lembur (Waktu)
-                "F": 15.22,     # Durasi Lembur
-                "G": 16.55,     # Jam istirahat saat lembur
-                "H": 14.55,     # Tanda Tangan Karyawan
-                "I": 15.14,     # Tanda Tangan Supervisor
-                "J": 13.57,     # (empty column for spacing)
-                "K": 15.71,     # Konfirmasi Jam Lembur (Waktu)
-                "L": 1.00,      # Konfirmasi Durasi Lembur
-                "M": 16.55,     # Jam Istirahat (Jika ada, gunakan V)
-                "N": 14.55,     # Tanda Tangan Karyawan
-                "O": 15.43,     # (empty column for spacing)
-                "P": 18.57,     # (empty column for spacing)
-            }
-            for col, width in columns.items():
-                ws.column_dimensions[col].width = width
-
-            ws.row_dimensions[1].height = 30
-            ws.row_dimensions[2].height = 80
-            ws.row_dimensions[3].height = 92
-
-            # Title
-            ws.merge_cells("A1:P1")
-            ws["A1"] = "Form Lembur Bulanan (月度加班申請單)"
-            ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-            ws["A1"].font = Font(name="Arial", size=20, bold=True)
-
-            # Department info
-            ws.merge_cells("A2:C2")
-            ws["A2"] = f"Departemen\n(部門代碼)：\n{dept_code}\n{dept_name}"
-            ws["A2"].alignment = Alignment(vertical="center", wrap_text=True)
-            ws["A2"].font = Font(name="Arial", size=11)
-
-            # Employee classification
-            ws["D2"] = "Klasifikasi Karyawan\n(人員分類):"
-            ws["D2"].alignment = Alignment(
-                vertical="center", horizontal="right", wrap_text=True
-            )
-            ws["E2"] = "☐ Level0(11-12職等)\n☑ Level1(13-23職等)"
-            ws["E2"].alignment = Alignment(vertical="center", wrap_text=True)
-
-            # Period information
-            period_str = f"{period_start.strftime('%Y-%m-%d')} ~ {period_end.strftime('%Y-%m-%d')}"
-            ws.merge_cells("F2:H2")
-            ws["F2"] = f"Periode Lembur (加班期间):\n{period_str}"
-            ws["F2"].alignment = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
-            )
+        try:
+            cache.set(cls._workbook_cache_key(filename), (digests, content), cls.EXCEL_WORKBOOK_CACHE_TTL)
+        except Exception as exc:
+            print(f"Warning: could not cache workbook {filename}: {exc}")
 
-            # Empty right section
-            ws.merge_cells("I2:P2")
-            ws["I2"] = ""
-
-            # Column headers (original format)
-            headers = [
-                ("A3", "No\n(序號)"),
-                ("B3", "Tanggal Lembur\n(加班日期)"),
-                ("C3", "No Karyawan\n(工號)"),
-                ("D3", "Nama\n(姓名)"),
-                ("E3", "Alasan Lembur\n(申請加班事由)"),
-                ("F3", "Jenis Lembur\n(加班類别)"),
-                ("G3", "Jam Lembur (Waktu)\n(預計加班\n起止時間)"),
-                ("H3", "Durasi Lembur\n(預計加班時數)"),
-                (
-                    "I3",
-                    "Jam istirahat saat lembur (jika perlu, gunakan V)\n(預計休息或用餐打V)",
-                ),
-                ("J3", "Tanda Tangan Karyawan\n(員工簽名)"),
-                ("K3", "Tanda Tangan Supervisor\n(課級主管簽名)"),
-                ("M3", "Konfirmasi Jam Lembur (Waktu)\n(實際加班\n起止時間)"),
-                ("N3", "Konfirmasi Durasi Lembur\n(實際加班時數)"),
-                ("O3", "Jam Istirahat (Jika ada, gunakan V)\n(實際休息或用餐打V)"),
-                ("P3", "Tanda Tangan Karyawan\n(員工簽名)"),
-            ]
+    @classmethod
+    def _file_fingerprint(cls, report, report_args, digests) -> str:
+        """Digest of everything that determines a report file's content (its sheet digests and layout)."""
+        payload = json.dumps(
+            {"version": cls.WORKBOOK_CACHE_VERSION, "report": report, "args": report_args, "sheets": digests},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin"),
+    @classmethod
+    def _uploaded_fingerprints(cls, remote_paths):
+        """Return ``{remote_path: fingerprint}`` recorded for the last upload of each path to the active share."""
+        try:
+            from ..models import ExcelUploadFingerprint
+
+            return dict(
+                ExcelUploadFingerprint.objects.filter(
+                    server=cls.SMB_CONFIG.get("host", ""),
+                    share_name=cls.SMB_CONFIG.get("share_name", ""),
+                    remote_path__in=list(remote_paths),
+                ).values_list("remote_path", "fingerprint")
             )
-            header_style = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
+        except Exception as exc:
+            print(f"Warning: could not load Excel upload fingerprints: {exc}")
+            return {}
+
+    @classmethod
+    def _record_upload(cls, remote_path, fingerprint, digests):
+        """Remember a successful upload of ``remote_path`` (superseding any deferred upload of it)."""
+        try:
+            from ..models import ExcelUploadFingerprint, PendingSMBUpload
+
+            PendingSMBUpload.objects.filter(
+                server=cls.SMB_CONFIG.get("host", ""),
+                share_name=cls.SMB_CONFIG.get("share_name", ""),
+                remote_path=remote_path,
+            ).delete()
+            ExcelUploadFingerprint.objects.update_or_create(
+                server=cls.SMB_CONFIG.get("host", ""),
+                share_name=cls.SMB_CONFIG.get("share_name", ""),
+                remote_path=remote_path,
+                defaults={"fingerprint": fingerprint, "sheet_fingerprints": digests},
             )
-            header_font = Font(name="Arial", size=11)
-
-            for cell, text in headers:
-                ws[cell] = text
-                ws[cell].alignment = header_style
-                ws[cell].font = header_font
-                ws[cell].border = thin_border
-
-            # Calculate required rows
-            data_row_count = len(data) if data else 0
-            required_rows = max(30, data_row_count)
-            last_data_row = 4 + required_rows - 1
-
-            # Create empty rows with formatting
-            for row in range(4, last_data_row + 1):
-                for col in "ABCDEFGHIJKLMNOP":
-                    cell = f"{col}{row}"
-                    ws[cell] = ""
-                    ws[cell].border = thin_border
-                    ws[cell].font = Font(name="Arial", size=11)
-                    if col in "ABCD":
-                        ws[cell].alignment = Alignment(
-                            horizontal="center", vertical="center"
-                        )
-                    else:
-                        ws[cell].alignment = Alignment(vertical="center")
-                ws[f"A{row}"] = row - 3
-
-            # Fill in monthly data
-            current_row = 4
-            for item in data or []:
-                ws[f"B{current_row}"] = item.get("request_date")
-                ws[f"B{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"C{current_row}"] = item.get("employee_id")
-                ws[f"C{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"D{current_row}"] = item.get("employee_name")
-                ws[f"D{current_row}"].alignment = Alignment(vertical="center")
-
-                ws[f"E{current_row}"] = item.get("reason")
-                ws[f"E{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Overtime type based on weekend/holiday status
-                if item.get("is_holiday", False):
-                    overtime_type = "Holiday"
-                elif item.get("is_weekend", False):
-                    overtime_type = "Weekend"
-                else:
-                    overtime_type = "Weekday"
-
-                ws[f"F{current_row}"] = overtime_type
-                ws[f"F{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"G{current_row}"] = (
-                    f"{item.get('time_start')} - {item.get('time_end')}"
-                )
-                ws[f"G{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"H{current_row}"] = f"{item.get('total_hours')} hour(s)"
-                ws[f"H{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Show 'V' if employee takes break time (original format)
-                ws[f"I{current_row}"] = "V" if item.get("has_break") else "-"
-                ws[f"I{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Actual time, duration and break status
-                ws[f"M{current_row}"] = (
-                    f"{item.get('time_start')} - {item.get('time_end')}"
-                )
-                ws[f"M{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                ws[f"N{current_row}"] = f"{item.get('total_hours')} hour(s)"
-                ws[f"N{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                # Show 'V' if employee takes break time (original format)
-                ws[f"O{current_row}"] = "V" if item.get("has_break") else "-"
-                ws[f"O{current_row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-                current_row += 1
-
-            # Dynamic footer positioning
-            footer_row = last_data_row + 1
-            notes_start_row = footer_row + 1
-            form_number_row = notes_start_row + 3
-
-            ws.merge_cells(f"A{footer_row}:P{footer_row}")
-            ws[f"A{footer_row}"] = "Keterangan:"
-            ws[f"A{footer_row}"].font = Font(name="Arial", size=12)
-
-            notes = [
-                (
-                    f"A{notes_start_row}:P{notes_start_row}",
-                    "1. Informasi diatas harus dilaporkan dengan benar, pelanggaran akan dikenakan sesuai dengan hukuman yang ada dari managemen perusahaan (以上資料請據實申報，違者按獎懲管理辦法處理)。",
-                ),
-                (
-                    f"A{notes_start_row + 1}:P{notes_start_row + 1}",
-                    "2. Karyawan harus menandatangani aplikasi lembur. Jika tidak ada tanda tangan maka akan di anggap tidak sah (實際加班時數，以員工簽名確認為準)。",
-                ),
-                (
-                    f"A{notes_start_row + 2}:P{notes_start_row + 2}",
-                    "3. Tidak ada aplikasi lembur tidak akan di hitung untuk upah lembur (無加班申請單不計發加班費)。",
-                ),
-            ]
+        except Exception as exc:
+            print(f"Warning: could not record Excel upload fingerprint for {remote_path}: {exc}")
 
-            for cells, text in notes:
-                ws.merge_cells(cells)
-                anchor = cells.split(":")[0]
-                ws[anchor] = text
-                ws[anchor].font = Font(name="Arial", size=12)
-                ws[anchor].alignment = Alignment(vertical="center", wrap_text=True)
+    @classmethod
+    def forget_uploads(cls, remote_paths):
+        """Drop the upload fingerprints of ``remote_paths`` (e.g. after deleting the files)."""
+        if not remote_paths:
+            return
+        try:
+            from ..models import ExcelUploadFingerprint
 
-            ws[f"O{form_number_row}"] = "Form No.:PH2-TB004-001 Rev.02(CI)"
-            ws[f"O{form_number_row}"].font = Font(name="Arial", size=10)
+            ExcelUploadFingerprint.objects.filter(
+                server=cls.SMB_CONFIG.get("host", ""),
+                share_name=cls.SMB_CONFIG.get("share_name", ""),
+                remote_path__in=list(remote_paths),
+            ).delete()
+        except Exception as exc:
+            print(f"Warning: could not clear Excel upload fingerprints: {exc}")
 
-        return wb
+    @classmethod
+    def _render_executor(cls, job_count):
+        """Executor for rendering ``job_count`` workbooks per ``EXCEL_RENDER_POOL`` (None: render inline)."""
+        workers = max(1, min(cls.EXCEL_RENDER_WORKERS, job_count))
+        if job_count < 2 or workers < 2 or cls.EXCEL_RENDER_POOL not in ("process", "thread"):
+            return None
+        if cls.EXCEL_RENDER_POOL == "process" and not multiprocessing.current_process().daemon:
+            try:
+                return ProcessPoolExecutor(max_workers=workers)
+            except Exception as exc:
+                print(f"Warning: process pool unavailable for Excel rendering, using threads: {exc}")
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-render")
 
     @classmethod
-    def create_monthly_ot_summary_multi_sheet(
-        cls, data_by_department, period_start, period_end
-    ):
-        """Create monthly OT summary workbook with one sheet per department.
+    def _render_jobs(cls, jobs):
+        """Render ``jobs`` and yield ``(job, content)`` in completion order.
 
-        Expects grouped data from export_monthly_data_by_department.
+        Each job is ``(filename, report, data_by_dept, report_args, patchable)``. Cache
+        lookups and stores stay in the calling process; only the openpyxl work is handed to
+        the executor, so the caller can upload a finished workbook while others still render.
         """
-        wb = Workbook()
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
-
-        for dept_code, dept_info in sorted(data_by_department.items()):
-            ws = wb.create_sheet(title=dept_code[:31])
-            data = dept_info["data"]
-
-            # Column widths for ~{YYYY_MM_DD-YYYY_MM_DD}OTSummary.xlsx monthly summary format (A-I) - adjust as needed for actual summary content
-            columns = {
-                "A": 11.75,     # Work ID
-                "B": 13.0,      # Overtime Type
-                "C": 15.0,      # Overtime Start Date
-                "D": 9.75,      # Start Time
-                "E": 9.75,      # End Time
-                "F": 9.75,      # Meal/Rest
-                "G": 6.0,       # Hours
-                "H": 25.0,      # Reason
-                "I": 25.0,      # Detail
-            }
-            for col, width in columns.items():
-                ws.column_dimensions[col].width = width
-
-            headers = [
-                ("A1", "Work ID"),
-                ("B1", "Overtime Type"),
-                ("C1", "Overtime Start Date"),
-                ("D1", "Start Time"),
-                ("E1", "End Time"),
-                ("F1", "Meal/Rest"),
-                ("G1", "Hours"),
-                ("H1", "Reason"),
-                ("I1", "Detail"),
-            ]
+        pending = []
+        for job in jobs:
+            filename, _report, data_by_dept, _report_args, patchable = job
+            digests, cached_bytes, base_bytes, stale = cls._render_plan(filename, data_by_dept, patchable)
+            if cached_bytes is not None:
+                yield job, cached_bytes
+            else:
+                pending.append((job, digests, base_bytes, stale))
+
+        executor = cls._render_executor(len(pending))
+        if executor is None:
+            for job, digests, base_bytes, stale in pending:
+                content = _render_report(*job[1:4], base_bytes, stale)
+                cls._store_rendered(job[0], digests, content)
+                yield job, content
+            return
 
-            header_style = Alignment(horizontal="center", vertical="center")
-            header_font = Font(name="Arial", size=11)
-
-            for cell, text in headers:
-                ws[cell] = text
-                ws[cell].alignment = header_style
-                ws[cell].font = header_font
-
-            current_row = 2
-            for item in data or []:
-                ot_type = 1
-                if item.get("is_holiday", False):
-                    ot_type = 3
-                elif item.get("is_weekend", False):
-                    ot_type = 2
-
-                ws[f"A{current_row}"] = item.get("employee_id")
-                ws[f"B{current_row}"] = ot_type
-                ws[f"C{current_row}"] = item.get("request_date")
-                ws[f"D{current_row}"] = item.get("time_start")
-                ws[f"E{current_row}"] = item.get("time_end")
-                ws[f"F{current_row}"] = "Y" if item.get("has_break") else "N"
-                ws[f"G{current_row}"] = cls._format_hours(item.get("total_hours"))
-                ws[f"H{current_row}"] = item.get("reason")
-                ws[f"I{current_row}"] = item.get("detail", "")
-
-                for col in "ABCDEFGHI":
-                    cell = f"{col}{current_row}"
-                    ws[cell].font = Font(name="Arial", size=11)
-                    ws[cell].alignment = Alignment(vertical="center")
-                    if col in "ABCDEFG":
-                        ws[cell].alignment = Alignment(
-                            horizontal="center", vertical="center"
-                        )
-
-                current_row += 1
+        with executor:
+            futures = {}
+            inline = []
+            for job, digests, base_bytes, stale in pending:
+                try:
+                    futures[executor.submit(_render_report, *job[1:4], base_bytes, stale)] = (job, digests, base_bytes, stale)
+                except Exception as exc:
+                    print(f"Warning: could not submit {job[0]} for rendering, rendering inline: {exc}")
+                    inline.append((job, digests, base_bytes, stale))
+            for future in as_completed(futures):
+                job, digests, base_bytes, stale = futures[future]
+                try:
+                    content = future.result()
+                except BrokenExecutor as exc:
+                    print(f"Warning: render pool failed for {job[0]}, rendering inline: {exc}")
+                    content = _render_report(*job[1:4], base_bytes, stale)
+                cls._store_rendered(job[0], digests, content)
+                yield job, content
+            for job, digests, base_bytes, stale in inline:
+                content = _render_report(*job[1:4], base_bytes, stale)
+                cls._store_rendered(job[0], digests, content)
+                yield job, content
 
-        return wb
+    @classmethod
+    def _write_workbook(cls, path, content: bytes):
+        with open(path, "wb") as file_obj:
+            file_obj.write(content)
 
     @classmethod
     def generate_excel_files(
@@ -1446,6 +1185,25 @@ def generate_monthly_excel_files(
         )
         return local_paths.get("monthly_form"), local_paths.get("monthly_summary")
 
+    @classmethod
+    def _group_payload(cls, payload, dept_code=None, dept_name=None):
+        """Return ``payload`` keyed by department, wrapping single-department or ungrouped data."""
+        # Multi-dept data has structure: {dept_code: {dept_code, dept_name, data: [...]}}
+        if isinstance(payload, dict) and "data" not in payload and dept_code is None:
+            return payload
+        return {
+            dept_code
+            or cls.DEFAULT_DEPT_CODE: {
+                "dept_code": dept_code or cls.DEFAULT_DEPT_CODE,
+                "dept_name": dept_name or cls.DEFAULT_DEPT_NAME,
+                "data": (
+                    payload
+                    if isinstance(payload, list)
+                    else (payload.get("data") if isinstance(payload, dict) else [])
+                ),
+            }
+        }
+
     @classmethod
     def generate_all_excel_files(
         cls,
@@ -1456,172 +1214,112 @@ def generate_all_excel_files(
         temp_only: bool = False,
         dept_code=None,
         dept_name=None,
+        force: bool = False,
     ):
         """Generate Excel files with multi-department sheet support and auto-detection.
 
         Accepts grouped inputs (preferred) or single-department data; ungrouped payloads are wrapped
         to maintain backward compatibility. When grouped, one workbook is produced with a sheet per
         department for each report type.
+
+        With ``EXCEL_INCREMENTAL`` enabled, unchanged department sheets are reused from the
+        last rendered copy of each workbook so an edit only re-renders its own department.
+        With ``EXCEL_RENDER_POOL`` set, the workbooks render concurrently and each one is
+        uploaded as soon as it is finished.
+
+        Reports whose payload fingerprint matches the one recorded for their last upload
+        are neither rendered nor uploaded again unless ``force`` is set.
+
+        Returns the local path of each generated report. Temp-only uploads with
+        ``EXCEL_IN_MEMORY_UPLOAD`` never touch the filesystem and return the remote paths instead.
         """
         if not daily_data and not monthly_data:
             return {}
 
+        started = time.perf_counter()
         date_obj = date_obj or datetime.now()
         date_str = date_obj.strftime("%Y%m%d")
 
         temp_only = temp_only or cls.EXCEL_TEMP_ONLY
+        remote_period_path = cls.get_smb_period_folder(date_obj) if upload else None
+        in_memory = bool(temp_only and remote_period_path and cls.EXCEL_IN_MEMORY_UPLOAD)
 
-        if temp_only:
+        if in_memory:
+            local_period_path = None
+        elif temp_only:
             local_period_path = tempfile.mkdtemp(prefix="excel_tmp_")
         else:
             local_period_path = cls.get_local_period_folder(date_obj)
 
-        remote_period_path = cls.get_smb_period_folder(date_obj) if upload else None
-
-        local_paths = {}
-        files_to_upload = []
-
-        # Determine if we have multi-department data or single-department
-        # Multi-dept data has structure: {dept_code: {dept_code, dept_name, data: [...]}}
-
+        # (filename, report, data_by_dept, report_args, patchable)
+        jobs = []
         if daily_data:
-            # Check if this is already grouped by department
-            if (
-                daily_data
-                and isinstance(daily_data, dict)
-                and "data" not in daily_data
-                and dept_code is None
-            ):
-                # It's grouped by department
-                data_by_dept = daily_data
-            else:
-                # Single department or ungrouped - wrap it
-                data_by_dept = {
-                    dept_code
-                    or cls.DEFAULT_DEPT_CODE: {
-                        "dept_code": dept_code or cls.DEFAULT_DEPT_CODE,
-                        "dept_name": dept_name or cls.DEFAULT_DEPT_NAME,
-                        "data": (
-                            daily_data
-                            if isinstance(daily_data, list)
-                            else (
-                                daily_data.get("data")
-                                if isinstance(daily_data, dict)
-                                else []
-                            )
-                        ),
-                    }
-                }
-
-            daily_form_path = os.path.join(local_period_path, f"{date_str}OT.xlsx")
-            daily_summary_path = os.path.join(
-                local_period_path, f"{date_str}OTSummary.xlsx"
-            )
-
-            wb_form = cls.create_ot_form_multi_sheet(data_by_dept, date_obj)
-            wb_summary = cls.create_ot_summary_multi_sheet(data_by_dept, date_obj)
-
-            wb_form.save(daily_form_path)
-            wb_summary.save(daily_summary_path)
-
-            local_paths["daily_form"] = daily_form_path
-            local_paths["daily_summary"] = daily_summary_path
-
-            if remote_period_path:
-                files_to_upload.append(
-                    (daily_form_path, f"{remote_period_path}/{date_str}OT.xlsx")
-                )
-                files_to_upload.append(
-                    (
-                        daily_summary_path,
-                        f"{remote_period_path}/{date_str}OTSummary.xlsx",
-                    )
-                )
+            data_by_dept = cls._group_payload(daily_data, dept_code, dept_name)
+            jobs.append((f"{date_str}OT.xlsx", "daily_form", data_by_dept, (date_obj,), True))
+            jobs.append((f"{date_str}OTSummary.xlsx", "daily_summary", data_by_dept, (date_obj,), True))
 
         if monthly_data:
-            # Check if this is already grouped by department
-            if (
-                monthly_data
-                and isinstance(monthly_data, dict)
-                and "data" not in monthly_data
-                and dept_code is None
-            ):
-                # It's grouped by department
-                data_by_dept = monthly_data
-            else:
-                # Single department or ungrouped - wrap it
-                data_by_dept = {
-                    dept_code
-                    or cls.DEFAULT_DEPT_CODE: {
-                        "dept_code": dept_code or cls.DEFAULT_DEPT_CODE,
-                        "dept_name": dept_name or cls.DEFAULT_DEPT_NAME,
-                        "data": (
-                            monthly_data
-                            if isinstance(monthly_data, list)
-                            else (
-                                monthly_data.get("data")
-                                if isinstance(monthly_data, dict)
-                                else []
-                            )
-                        ),
-                    }
-                }
+            data_by_dept = cls._group_payload(monthly_data, dept_code, dept_name)
 
-            current_period_start = date_obj.replace(day=26)
-            if date_obj.day < 26:
-                current_period_start = (
-                    date_obj.replace(day=1) - timedelta(days=1)
-                ).replace(day=26)
-            next_period_end = (current_period_start + timedelta(days=32)).replace(
-                day=25
-            )
-
-            monthly_filename = f"~{current_period_start.strftime('%Y_%m_%d')}-{next_period_end.strftime('%Y_%m_%d')}OT.xlsx"
-            monthly_summary_filename = f"~{current_period_start.strftime('%Y_%m_%d')}-{next_period_end.strftime('%Y_%m_%d')}OTSummary.xlsx"
+            current_period_start, next_period_end = get_period_boundaries(date_obj)
 
-            monthly_form_path = os.path.join(local_period_path, monthly_filename)
-            monthly_summary_path = os.path.join(
-                local_period_path, monthly_summary_filename
-            )
+            monthly_filename, monthly_summary_filename = cls.monthly_filenames(date_obj)
+            period_args = (current_period_start, next_period_end)
+            jobs.append((monthly_filename, "monthly_form", data_by_dept, period_args, not cls._use_streaming("monthly_form")))
+            jobs.append((monthly_summary_filename, "monthly_summary", data_by_dept, period_args, not cls._use_streaming("monthly_summary")))
 
-            wb_monthly_form = cls.create_monthly_ot_form_multi_sheet(
-                data_by_dept, current_period_start, next_period_end
-            )
-            wb_monthly_summary = cls.create_monthly_ot_summary_multi_sheet(
-                data_by_dept, current_period_start, next_period_end
-            )
-
-            wb_monthly_form.save(monthly_form_path)
-            wb_monthly_summary.save(monthly_summary_path)
+        local_paths = {}
+        conn = None
+        upload_ready = bool(upload and remote_period_path and cls._smb_configured())
+
+        fingerprints = {}
+        if upload_ready:
+            for filename, report, data_by_dept, report_args, _patchable in jobs:
+                digests = {code: cls._sheet_digest(info) for code, info in data_by_dept.items()}
+                fingerprints[filename] = (cls._file_fingerprint(report, report_args, digests), digests)
+            if not force:
+                uploaded = cls._uploaded_fingerprints(f"{remote_period_path}/{filename}" for filename in fingerprints)
+                unchanged = {
+                    filename
+                    for filename, (fingerprint, _digests) in fingerprints.items()
+                    if uploaded.get(f"{remote_period_path}/{filename}") == fingerprint
+                    and (temp_only or os.path.exists(os.path.join(local_period_path, filename)))
+                }
+                if unchanged:
+                    print(f"Skipping unchanged Excel file(s): {', '.join(sorted(unchanged))}")
+                    jobs = [job for job in jobs if job[0] not in unchanged]
 
-            local_paths["monthly_form"] = monthly_form_path
-            local_paths["monthly_summary"] = monthly_summary_path
+        from ..services.smb_service import SMBConnectionPool, defer_upload
 
-            if remote_period_path:
-                files_to_upload.append(
-                    (monthly_form_path, f"{remote_period_path}/{monthly_filename}")
-                )
-                files_to_upload.append(
-                    (
-                        monthly_summary_path,
-                        f"{remote_period_path}/{monthly_summary_filename}",
-                    )
-                )
-
-        if upload and files_to_upload and cls._smb_configured():
-            conn = cls.get_smb_connection()
-            if conn:
-                try:
+        with ExitStack() as stack:
+            for (filename, report, _data, _args, _patchable), content in cls._render_jobs(jobs):
+                remote_path = f"{remote_period_path}/{filename}"
+                if in_memory:
+                    local_paths[report] = remote_path
+                else:
+                    local_paths[report] = os.path.join(local_period_path, filename)
+                    cls._write_workbook(local_paths[report], content)
+
+                if not upload_ready:
+                    continue
+                if conn is None:
+                    conn = stack.enter_context(cls.smb_connection())
+                    if conn is None:
+                        upload_ready = False
+                        continue
                     cls.ensure_folder_exists(remote_period_path, conn)
-                    for local_path, remote_path in files_to_upload:
-                        with open(local_path, "rb") as file_obj:
-                            conn.storeFile(
-                                cls.SMB_CONFIG["share_name"], remote_path, file_obj
-                            )
-                finally:
-                    conn.close()
-
-        if upload and temp_only:
+                try:
+                    conn.storeFile(cls.SMB_CONFIG["share_name"], remote_path, io.BytesIO(content))
+                except Exception as exc:
+                    if SMBConnectionPool.is_connection_error(exc):
+                        raise
+                    # File open by someone or the write failed: retry it later without holding up this export
+                    defer_upload(cls.SMB_CONFIG["host"], cls.SMB_CONFIG["share_name"], remote_path, content, exc, *fingerprints[filename])
+                    cls.forget_uploads([remote_path])
+                    continue
+                cls._record_upload(remote_path, *fingerprints[filename])
+
+        if upload and temp_only and not in_memory:
             for path in local_paths.values():
                 try:
                     if path and os.path.exists(path):
@@ -1643,6 +1341,7 @@ def generate_all_excel_files(
             except Exception as exc:
                 print(f"Error cleaning temp directory {local_period_path}: {exc}")
 
+        print(f"Generated {len(local_paths)} Excel file(s) for {date_str} in {time.perf_counter() - started:.2f}s")
         return local_paths
 
     @classmethod
@@ -1664,15 +1363,21 @@ def delete_files_batch(cls, files_to_delete):
         if not remote_candidates or not cls._smb_configured():
             return
 
-        conn = cls.get_smb_connection()
-        if conn is None:
-            return
-        try:
-            for remote_path in remote_candidates:
-                try:
-                    conn.deleteFiles(cls.SMB_CONFIG["share_name"], remote_path)
-                    print(f"Deleted remote file: {remote_path}")
-                except Exception as exc:
-                    print(f"Error deleting remote file {remote_path}: {exc}")
-        finally:
-            conn.close()
+        with cls.smb_connection() as conn:
+            if conn is None:
+                return
+            try:
+                for remote_path in remote_candidates:
+                    try:
+                        conn.deleteFiles(cls.SMB_CONFIG["share_name"], remote_path)
+                        print(f"Deleted remote file: {remote_path}")
+                    except Exception as exc:
+                        print(f"Error deleting remote file {remote_path}: {exc}")
+            finally:
+                cls.forget_uploads(remote_candidates)
+
+
+def _render_report(report, data_by_dept, report_args, base_bytes=None, stale=None):
+    """Render one report workbook to xlsx bytes (module level so a process pool can run it)."""
+    build = getattr(ExcelGenerator, ExcelGenerator.REPORT_BUILDERS[report])
+    return ExcelGenerator._render_bytes(lambda **kwargs: build(data_by_dept, *report_args, **kwargs), base_bytes, stale)
@@ -0,0 +1,60 @@
+"""Named cell styles shared by the Excel report generators.
+
+Each style is registered once per workbook as an openpyxl ``NamedStyle`` and
+assigned to cells by name, so every cell using it points at the same style
+record instead of allocating its own Font/Alignment/Border objects.
+"""
+
+from copy import copy
+
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+THIN_SIDE = Side(style="thin")
+THIN_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+
+ARIAL_10 = Font(name="Arial", size=10)
+ARIAL_11 = Font(name="Arial", size=11)
+ARIAL_12 = Font(name="Arial", size=12)
+
+CENTER = Alignment(horizontal="center", vertical="center")
+CENTER_WRAP = Alignment(horizontal="center", vertical="center", wrap_text=True)
+MIDDLE = Alignment(vertical="center")
+MIDDLE_WRAP = Alignment(vertical="center", wrap_text=True)
+RIGHT_WRAP = Alignment(horizontal="right", vertical="center", wrap_text=True)
+
+# name -> (font, alignment, border); None keeps the workbook default for that part
+STYLES = {
+    "ot_title": (Font(name="Arial", size=20), CENTER, None),
+    "ot_title_bold": (Font(name="Arial", size=20, bold=True), CENTER, None),
+    "ot_dept_info": (ARIAL_11, MIDDLE_WRAP, None),
+    "ot_label_right": (None, RIGHT_WRAP, None),
+    "ot_text_wrap": (None, MIDDLE_WRAP, None),
+    "ot_text_center_wrap": (None, CENTER_WRAP, None),
+    "ot_header": (ARIAL_11, CENTER_WRAP, THIN_BORDER),
+    "ot_grid": (ARIAL_11, MIDDLE, THIN_BORDER),
+    "ot_grid_center": (ARIAL_11, CENTER, THIN_BORDER),
+    "ot_note_heading": (ARIAL_12, None, None),
+    "ot_note": (ARIAL_12, MIDDLE_WRAP, None),
+    "ot_form_number": (ARIAL_10, None, None),
+    "ot_cell": (ARIAL_11, MIDDLE, None),
+    "ot_cell_center": (ARIAL_11, CENTER, None),
+}
+
+
+def register_styles(wb, names=None):
+    """Add the named styles in ``names`` (default: all) to ``wb`` unless already present."""
+    existing = set(wb.named_styles)
+    for name in names or STYLES:
+        if name in existing:
+            continue
+        font, alignment, border = STYLES[name]
+        wb.add_named_style(
+            NamedStyle(
+                name=name,
+                font=copy(font or DEFAULT_FONT),
+                alignment=copy(alignment or Alignment()),
+                border=copy(border or DEFAULT_BORDER),
+            )
+        )
@@ -3,16 +3,23 @@
 from django.utils import timezone
 
 
+def get_period_start(date: _dt.date) -> _dt.date:
+    """Return the start (the 26th) of the OT period containing *date*.
+
+    This is the pay-period key stored on ``OvertimeRequest.pay_period``.
+    """
+    if date.day >= 26:
+        return date.replace(day=26)
+    return (date.replace(day=1) - _dt.timedelta(days=1)).replace(day=26)
+
+
 def get_period_boundaries(date: _dt.date) -> tuple[_dt.date, _dt.date]:
     """Return the (start, end) of the 26th-to-25th OT period containing *date*.
 
     The OT pay period runs from the 26th of one month to the 25th of the next.
     For example, a date of 2025-01-10 falls into the period 2024-12-26 -> 2025-01-25.
     """
-    if date.day >= 26:
-        period_start = date.replace(day=26)
-    else:
-        period_start = (date.replace(day=1) - _dt.timedelta(days=1)).replace(day=26)
+    period_start = get_period_start(date)
     period_end = (period_start + _dt.timedelta(days=32)).replace(day=25)
     return period_start, period_end
 
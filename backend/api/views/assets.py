@@ -27,6 +27,7 @@
     AssetSummarySerializer,
     PurchaseRequestSerializer,
 )
+from ..services.reference_data_service import get_enabled_departments
 from .helpers import get_employee_for_user, is_developer_user, is_ptb_admin, is_superadmin_user  # noqa: F401
 
 logger = logging.getLogger(__name__)
@@ -472,7 +473,7 @@ def get_serializer_class(self):
     @action(detail=False, methods=["get"])
     def by_department(self, request):
         """Get all assets grouped by department, with optional search"""
-        departments = Department.objects.filter(is_enabled=True).order_by("code")
+        departments = list(get_enabled_departments().values())
 
         # Fetch only the fields needed by AssetSummarySerializer to reduce memory
         all_assets_qs = Asset.objects.select_related("department").only(
@@ -219,7 +219,7 @@ def create_event_notification(event, notification_type="created"):
     For group tasks, also notifies group members who aren't directly assigned.
     """
     from ..models import ExternalUser, Notification
-    from ..signals import notify_leave_event_participants, send_websocket_notification
+    from ..signals import notify_leave_event_participants, send_websocket_notifications
 
     notifications = []
 
@@ -368,10 +368,10 @@ def create_event_notification(event, notification_type="created"):
         try:
             created = Notification.objects.bulk_create(notifs_to_create)
             notifications.extend(created)
-            for notif, (uid, payload) in zip(created, ws_payloads, strict=True):
+            for notif, (_uid, payload) in zip(created, ws_payloads, strict=True):
                 payload["id"] = notif.id
                 payload["created_at"] = notif.created_at.isoformat()
-                send_websocket_notification(uid, payload)
+            send_websocket_notifications(ws_payloads)
         except Exception as e:
             logger.error("Error bulk creating notifications for event %s: %s", event.id, e)
 
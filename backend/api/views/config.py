@@ -3,6 +3,7 @@
 
 from django.contrib.auth import get_user_model
 from django.utils.dateparse import parse_date
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -21,9 +22,11 @@
     UserActivityLog,
     UserReport,
 )
-from ..pagination import StandardPageNumberPagination
+from ..pagination import UserActivityLogPagination
 from ..permissions import IsSuperAdmin
 from ..services.activity_log_service import purge_user_activity_logs_older_than
+from ..services.cache_metrics import cache_metrics, overall_hit_ratio
+from ..services.cache_service import CacheService
 from ..serializers import (
     ReleaseNoteSerializer,
     SMBConfigurationSerializer,
@@ -213,6 +216,39 @@ def delete(self, request):
         return Response(serializer.data)
 
 
+class CacheStatsView(APIView):
+    """
+    Cache hit/miss counters and latency histograms per view and operation.
+
+    GET ?scope=all (default) reads the aggregate of every process;
+    ?scope=process only this worker's unflushed counters.
+    DELETE resets the aggregate. Developer and Super Admin only.
+    """
+
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Cache metrics",
+        manual_parameters=[
+            openapi.Parameter(name="scope", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["all", "process"], required=False, description="all (default): every process; process: this worker only"),
+        ],
+    )
+    def get(self, request):
+        scope = request.query_params.get("scope", "all")
+        if scope not in ("all", "process"):
+            return Response({"detail": "scope must be 'all' or 'process'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            views = cache_metrics.snapshot(scope)
+        except Exception:
+            logger.exception("Failed to read cache metrics")
+            return Response({"detail": "Cache metrics unavailable"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"scope": scope, "totals": overall_hit_ratio(views), "ttls": CacheService.DEFAULT_TTLS, "views": views})
+
+    def delete(self, request):
+        cache_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class UserActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only view for user activity logs.
@@ -223,7 +259,7 @@ class UserActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = UserActivityLog.objects.none()  # Overridden by get_queryset
     serializer_class = UserActivityLogSerializer
-    pagination_class = StandardPageNumberPagination
+    pagination_class = UserActivityLogPagination
 
     def _resolve_external_user(self, user):
         ext_user = None
@@ -546,7 +582,7 @@ def perform_create(self, serializer):
         )
 
         # Notify superadmin(s) about the new report
-        from ..consumers import send_notification_to_user
+        from ..consumers import send_notifications_to_users
 
         report = serializer.instance
         reporter_name = self.request.user.username
@@ -568,8 +604,8 @@ def perform_create(self, serializer):
                 for admin in superadmin_users
             ]
             created_notifs = Notification.objects.bulk_create(admin_notifs)
-            for notif, admin in zip(created_notifs, superadmin_users, strict=True):
-                send_notification_to_user(
+            send_notifications_to_users(
+                (
                     admin.id,
                     {
                         "id": notif.id,
@@ -582,6 +618,8 @@ def perform_create(self, serializer):
                         "created_at": notif.created_at.isoformat(),
                     },
                 )
+                for notif, admin in zip(created_notifs, superadmin_users, strict=True)
+            )
 
     def perform_update(self, serializer):
         instance = serializer.instance
@@ -21,7 +21,7 @@
     EmployeeSerializer,
 )
 from ..services.bulk_service import BulkImportExportService
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, cached_list
 from ..services.employee_service import get_employee_queryset
 from .helpers import get_employee_for_user, is_developer_user, is_ptb_admin, is_superadmin_user  # noqa: F401
 
@@ -53,6 +53,7 @@ def get_queryset(self):
             openapi.Parameter(name="ordering", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Order by field (use - for descending): -name, emp_id, etc."),
         ],
     )
+    @cached_list("employees")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -97,7 +98,7 @@ def bulk_import(self, request):
             results = BulkImportExportService.import_from_csv(file_obj=file_obj, serializer_class=EmployeeSerializer, max_rows=1000, update_existing=update_existing, lookup_field="emp_id")
 
             # Invalidate cache after bulk import
-            CacheService.invalidate_cache(["employees"])
+            CacheService.invalidate_all_for_view("employees")
 
             logger.info("Bulk import completed: %s created, %s updated, %s errors", results["created"], results["updated"], len(results["errors"]))
 
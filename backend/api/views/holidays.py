@@ -219,37 +219,19 @@ def _broadcast_leave_batch_changes(self, *, created_ids=None, updated_ids=None,
         deleted_ids = deleted_ids or []
 
         def _broadcast():
-            from ..consumers import broadcast_calendar_update
+            from ..consumers import broadcast_calendar_updates
 
-            if created_ids:
-                for leave_obj in (
-                    EmployeeLeave.objects.filter(pk__in=created_ids)
-                    .select_related("employee", "employee__department", "created_by")
-                    .prefetch_related(models.Prefetch("agents", queryset=Employee.objects.select_related("department")))
-                    .order_by("date", "employee__name")
-                ):
-                    try:
-                        broadcast_calendar_update("created", "leave", EmployeeLeaveSerializer(leave_obj).data)
-                    except Exception as exc:
-                        logger.debug("Calendar broadcast failed (non-critical): %s", exc)
-
-            if updated_ids:
-                for leave_obj in (
-                    EmployeeLeave.objects.filter(pk__in=updated_ids)
-                    .select_related("employee", "employee__department", "created_by")
-                    .prefetch_related(models.Prefetch("agents", queryset=Employee.objects.select_related("department")))
-                    .order_by("date", "employee__name")
-                ):
-                    try:
-                        broadcast_calendar_update("updated", "leave", EmployeeLeaveSerializer(leave_obj).data)
-                    except Exception as exc:
-                        logger.debug("Calendar broadcast failed (non-critical): %s", exc)
-
-            for leave_id in deleted_ids:
-                try:
-                    broadcast_calendar_update("deleted", "leave", {"id": leave_id})
-                except Exception as exc:
-                    logger.debug("Calendar broadcast failed (non-critical): %s", exc)
+            leaves = EmployeeLeave.objects.select_related("employee", "employee__department", "created_by").prefetch_related(models.Prefetch("agents", queryset=Employee.objects.select_related("department"))).order_by("date", "employee__name")
+            try:
+                updates = []
+                if created_ids:
+                    updates.extend(("created", "leave", EmployeeLeaveSerializer(leave_obj).data) for leave_obj in leaves.filter(pk__in=created_ids))
+                if updated_ids:
+                    updates.extend(("updated", "leave", EmployeeLeaveSerializer(leave_obj).data) for leave_obj in leaves.filter(pk__in=updated_ids))
+                updates.extend(("deleted", "leave", {"id": leave_id}) for leave_id in deleted_ids)
+                broadcast_calendar_updates(updates)
+            except Exception as exc:
+                logger.debug("Calendar broadcast failed (non-critical): %s", exc)
 
         transaction.on_commit(_broadcast)
 
@@ -266,7 +248,7 @@ def _rotate_leave_preview_tokens_on_commit(self, batch_keys):
             self._rotate_leave_preview_token_on_commit(batch_key)
 
     def _schedule_leave_created_side_effects(self, leave, request_user, send_email=True):
-        from ..consumers import send_notification_to_user
+        from ..consumers import send_notifications_to_users
 
         leave_id = leave.id
         actor_username = getattr(request_user, "username", None) or "Unknown"
@@ -288,6 +270,7 @@ def _send_leave_notifications():
             title = "New Leave Request"
             message = f"{employee_name} has taken leave on {leave_date}.\nAgent(s): {agent_names_str}\nSubmitted by {actor_username}."
 
+            ws_notifications = []
             ptb_admins = list(ExternalUser.objects.filter(is_ptb_admin=True, is_active=True))
             admin_notifs = [
                 Notification(
@@ -301,8 +284,8 @@ def _send_leave_notifications():
             ]
             if admin_notifs:
                 created_admin = Notification.objects.bulk_create(admin_notifs)
-                for notif, admin in zip(created_admin, ptb_admins, strict=True):
-                    send_notification_to_user(
+                ws_notifications.extend(
+                    (
                         admin.id,
                         {
                             "id": notif.id,
@@ -315,6 +298,8 @@ def _send_leave_notifications():
                             "created_at": notif.created_at.isoformat(),
                         },
                     )
+                    for notif, admin in zip(created_admin, ptb_admins, strict=True)
+                )
 
             if agent_employees:
                 agent_emp_ids = [agent.emp_id for agent in agent_employees if agent.emp_id]
@@ -342,8 +327,8 @@ def _send_leave_notifications():
 
                 if agent_notifs:
                     created_agents = Notification.objects.bulk_create(agent_notifs)
-                    for notif, (uid, atitle, amsg) in zip(created_agents, agent_ws, strict=True):
-                        send_notification_to_user(
+                    ws_notifications.extend(
+                        (
                             uid,
                             {
                                 "id": notif.id,
@@ -356,6 +341,11 @@ def _send_leave_notifications():
                                 "created_at": notif.created_at.isoformat(),
                             },
                         )
+                        for notif, (uid, atitle, amsg) in zip(created_agents, agent_ws, strict=True)
+                    )
+
+            # Admin and agent notifications go out as one batch
+            send_notifications_to_users(ws_notifications)
 
             try:
                 broadcast_calendar_update("created", "leave", EmployeeLeaveSerializer(leave_obj).data)
@@ -10,6 +10,7 @@
 from ..models import (
     Notification,
 )
+from ..pagination import KeysetPaginationMixin
 from ..serializers import (
     NotificationSerializer,
 )
@@ -19,17 +20,21 @@
 User = get_user_model()
 
 
-class NotificationPagination(PageNumberPagination):
+class NotificationPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination for notifications.
-    Supports 'limit' query param for different page sizes.
+    Supports 'limit' query param for different page sizes, and keyset mode
+    (?pagination=cursor / ?cursor=...) for scrolling long histories.
     """
 
     page_size = 20
     page_size_query_param = "limit"
     max_page_size = 100
+    keyset_ordering = ("-created_at", "-id")
 
     def get_paginated_response(self, data):
+        if self.keyset_mode:
+            return super().get_paginated_response(data)
         return Response({"count": self.page.paginator.count, "next": self.get_next_link(), "previous": self.get_previous_link(), "total_pages": self.page.paginator.num_pages, "current_page": self.page.number, "results": data})
 
 
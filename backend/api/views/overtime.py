@@ -1,11 +1,16 @@
 import logging
+import tempfile
+import time
 import traceback
 from datetime import datetime
+from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -17,23 +22,29 @@
 from rest_framework.response import Response
 
 from ..models import (
-    ExternalUser,
-    Notification,
+    Employee,
+    OvertimeDailyRollup,
     OvertimeLimitConfig,
     OvertimeRegulation,
     OvertimeRegulationDocument,
     OvertimeRequest,
+    OvertimeStatusJob,
 )
 from ..pagination import OvertimeRequestPagination
 from ..permissions import ResourcePermission
 from ..serializers import (
     OvertimeLimitConfigSerializer,
+    OvertimeListRowSerializer,
     OvertimeRegulationDocumentSerializer,
     OvertimeRegulationSerializer,
     OvertimeSerializer,
 )
+from ..services.bulk_service import BulkImportExportService
 from ..services.cache_service import cache_invalidate_on_change, cached_list
-from ..services.overtime_service import get_overtime_queryset
+from ..services.overtime_limit_service import get_headroom
+from ..services.overtime_service import STATS_CACHE_TTL, get_overtime_queryset, stats_cache_key
+from ..services.overtime_status_service import SELECTION_FILTERS, STATUS_CHUNK_SIZE, STATUS_VALUES, apply_status_chunk, queue_status_notifications, resolve_status_selection
+from ..services.reference_data_service import get_overtime_limit_config
 from ..utils.excel_generator import ExcelGenerator
 from .helpers import get_employee_for_user, is_developer_user, is_ptb_admin, is_superadmin_user  # noqa: F401
 
@@ -41,11 +52,143 @@
 User = get_user_model()
 
 
+def _hours_breakdown():
+    """Weekday/weekend/holiday and approved/pending hour sums over a ``total_hours`` column."""
+    from django.db.models import Case, DecimalField, Q, Sum, Value, When
+
+    _decimal = DecimalField(max_digits=10, decimal_places=2)
+    return {
+        "weekday_hours": Sum(Case(When(Q(is_weekend=False) & Q(is_holiday=False), then="total_hours"), default=Value(0), output_field=_decimal)),
+        "weekend_hours": Sum(Case(When(is_weekend=True, then="total_hours"), default=Value(0), output_field=_decimal)),
+        "holiday_hours": Sum(Case(When(is_holiday=True, then="total_hours"), default=Value(0), output_field=_decimal)),
+        "approved_hours": Sum(Case(When(status="approved", then="total_hours"), default=Value(0), output_field=_decimal)),
+        "pending_hours": Sum(Case(When(status="pending", then="total_hours"), default=Value(0), output_field=_decimal)),
+    }
+
+
+# Rollup columns the dashboard groups by. Days collapse, so one read stays small for any date range.
+DASHBOARD_GROUP_FIELDS = ("employee", "employee_name", "project", "project_name", "status", "is_weekend", "is_holiday")
+
+
+def _stats_filter(rows, status_filter):
+    """Rows of ``status_filter``, or every non-rejected row (the stats default)."""
+    if status_filter:
+        return [row for row in rows if row["status"] == status_filter]
+    return [row for row in rows if row["status"] != "rejected"]
+
+
+def _hours_totals(rows):
+    """Hour and request totals of grouped rollup rows, matching the SQL aggregates of the stats actions."""
+    if not rows:
+        return {"total_hours": None, "total_requests": 0, "weekday_hours": None, "weekend_hours": None, "holiday_hours": None, "approved_hours": None, "pending_hours": None}
+    totals = dict.fromkeys(("total_hours", "weekday_hours", "weekend_hours", "holiday_hours", "approved_hours", "pending_hours"), Decimal("0.00"))
+    totals["total_requests"] = 0
+    for row in rows:
+        hours = row["hours"]
+        totals["total_hours"] += hours
+        totals["total_requests"] += row["requests"]
+        if not row["is_weekend"] and not row["is_holiday"]:
+            totals["weekday_hours"] += hours
+        if row["is_weekend"]:
+            totals["weekend_hours"] += hours
+        if row["is_holiday"]:
+            totals["holiday_hours"] += hours
+        if row["status"] == "approved":
+            totals["approved_hours"] += hours
+        elif row["status"] == "pending":
+            totals["pending_hours"] += hours
+    return totals
+
+
+def _group_rows(rows, fields):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[field] for field in fields), []).append(row)
+    return groups
+
+
+def _summary_from_rows(rows):
+    rows = _stats_filter(rows, None)
+    data = _hours_totals(rows)
+    data["unique_employees"] = len({row["employee"] for row in rows})
+    data["unique_projects"] = len({row["project"] for row in rows})
+    return data
+
+
+# (header, column) of the overtime history export, read with values_list()
+EXPORT_COLUMNS = (
+    ("Request ID", "id"),
+    ("Date", "request_date"),
+    ("Employee ID", "employee__emp_id"),
+    ("Employee", "employee_name"),
+    ("Department", "department_code"),
+    ("Project", "project_name"),
+    ("Start", "time_start"),
+    ("End", "time_end"),
+    ("Break Hours", "break_hours"),
+    ("Total Hours", "total_hours"),
+    ("Weekend", "is_weekend"),
+    ("Holiday", "is_holiday"),
+    ("Status", "status"),
+    ("Approver", "approved_by__name"),
+    ("Approved At", "approved_at"),
+    ("Reason", "reason"),
+    ("Detail", "detail"),
+)
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_rows(queryset):
+    """Yield export rows from a server-side cursor, with timestamps in local time (XLSX rejects tz-aware values)."""
+    approved_at = [column for _, column in EXPORT_COLUMNS].index("approved_at")
+    rows = queryset.select_related(None).prefetch_related(None).values_list(*(column for _, column in EXPORT_COLUMNS))
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = list(row)
+        if row[approved_at] is not None:
+            row[approved_at] = timezone.localtime(row[approved_at]).replace(tzinfo=None)
+        yield row
+
+
+def _scope_to_own_employee(queryset, user, field="employee"):
+    """Limit ``queryset`` to ``user``'s own employee: by ``worker_id`` (employee number), else ``employee_id``.
+
+    ``field`` is the path to the employee (empty when ``queryset`` is the employees themselves).
+    Users linked to no employee see nothing.
+    """
+    prefix = f"{field}__" if field else ""
+    worker_id = getattr(user, "worker_id", None)
+    if worker_id:
+        return queryset.filter(**{f"{prefix}emp_id": worker_id})
+    employee_id = getattr(user, "employee_id", None)
+    if employee_id:
+        return queryset.filter(**{f"{prefix}id": employee_id})
+    return queryset.none()
+
+
+def _status_job_payload(job):
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "target_status": job.target_status,
+        "total": job.total,
+        "processed": job.processed,
+        "updated_count": job.updated_count,
+        "notified_count": job.notified_count,
+        "progress": round(job.processed / job.total * 100, 1) if job.total else 100.0,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
 class OvertimeRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = OvertimeRequest.objects.all()
     serializer_class = OvertimeSerializer
     pagination_class = OvertimeRequestPagination
+    # Set per action (e.g. "export"); ScopedRateThrottle ignores views without a scope
+    throttle_scope = None
 
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = [
@@ -88,6 +231,9 @@ class OvertimeRequestViewSet(viewsets.ModelViewSet):
             openapi.Parameter(name="start_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, description="Filter by date range start (YYYY-MM-DD)"),
             openapi.Parameter(name="end_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, description="Filter by date range end (YYYY-MM-DD)"),
             openapi.Parameter(name="ordering", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Order by field (use - for descending): -request_date, employee, etc."),
+            openapi.Parameter(name="pagination", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["cursor"], required=False, description="Set to 'cursor' for keyset pagination (newest first, no count; ignores ordering)"),
+            openapi.Parameter(name="cursor", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Keyset cursor from the previous page's next_cursor"),
+            openapi.Parameter(name="lean", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, required=False, description="Serialize straight from database rows (same fields, faster for large pages)"),
         ],
         responses={
             200: OvertimeSerializer(many=True),
@@ -98,15 +244,28 @@ class OvertimeRequestViewSet(viewsets.ModelViewSet):
         },
     )
     def list(self, request, *args, **kwargs):
+        if request.query_params.get("lean", "").lower() == "true":
+            return self._lean_list()
         # Return fresh data to avoid stale entries
         return super().list(request, *args, **kwargs)
 
-    def _get_permission_queryset(self):
+    def _lean_list(self):
+        """List from ``.values()`` rows via OvertimeListRowSerializer instead of model instances."""
+        queryset = OvertimeListRowSerializer.values_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(OvertimeListRowSerializer(page).data)
+        return Response(OvertimeListRowSerializer(queryset).data)
+
+    def _get_permission_queryset(self, queryset=None):
         """Return queryset with only permission checks applied (no query param filters).
 
         Used by stats endpoints that apply their own filters to avoid double-filtering.
+        ``queryset`` defaults to the overtime requests; any queryset with an ``employee``
+        foreign key (e.g. the daily rollup) can be scoped the same way.
         """
-        queryset = get_overtime_queryset()
+        if queryset is None:
+            queryset = get_overtime_queryset()
 
         # Skip filtering during schema generation
         if getattr(self, "swagger_fake_view", False):
@@ -123,18 +282,26 @@ def _get_permission_queryset(self):
             pass  # Admin sees all
         else:
             # Regular user sees only their own requests
-            worker_id = getattr(user, "worker_id", None)
-            employee_id = getattr(user, "employee_id", None)
-
-            if worker_id:
-                queryset = queryset.filter(employee__emp_id=worker_id)
-            elif employee_id:
-                queryset = queryset.filter(employee__id=employee_id)
-            else:
-                return queryset.none()
+            queryset = _scope_to_own_employee(queryset, user)
 
         return queryset
 
+    def _stats_scope(self):
+        """Permission scope for stats cache keys: "all" for admins, otherwise the caller's own employee.
+
+        Mirrors ``_get_permission_queryset`` so every user with the same visibility shares an entry.
+        """
+        user = self.request.user
+        if getattr(user, "is_ptb_admin", False) or is_superadmin_user(user):
+            return "all"
+        worker_id = getattr(user, "worker_id", None)
+        if worker_id:
+            return f"worker:{worker_id}"
+        employee_id = getattr(user, "employee_id", None)
+        if employee_id:
+            return f"employee:{employee_id}"
+        return "none"
+
     def get_queryset(self):
         queryset = self._get_permission_queryset()
 
@@ -336,102 +503,19 @@ def bulk_update_status(self, request):
         if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
             return Response({"detail": "IDs must be a list of integers"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if len(ids) > 500:
-            return Response({"detail": "Cannot update more than 500 requests at once"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > STATUS_CHUNK_SIZE:
+            return Response({"detail": f"Cannot update more than {STATUS_CHUNK_SIZE} requests at once; use bulk-status-jobs for larger selections"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if new_status not in ["approved", "rejected", "pending"]:
+        if new_status not in STATUS_VALUES:
             return Response({"detail": "Invalid status. Must be 'approved', 'rejected', or 'pending'"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             with transaction.atomic():
-                # Collect affected dates BEFORE updating (for Excel regeneration)
-                affected_requests = list(OvertimeRequest.objects.filter(id__in=ids).values("id", "request_date", "employee__emp_id", "employee_name"))
-                affected_dates = list({r["request_date"] for r in affected_requests})
-
-                # Build update kwargs with status_changed_by and timestamps
-                update_kwargs = {
-                    "status": new_status,
-                    "status_changed_by": getattr(user, "username", ""),
-                }
-                if new_status == "approved":
-                    update_kwargs["approved_at"] = timezone.now()
-                    update_kwargs["rejected_at"] = None
-                elif new_status == "rejected":
-                    update_kwargs["rejected_at"] = timezone.now()
-                    update_kwargs["approved_at"] = None
-                else:
-                    # pending — clear both timestamps
-                    update_kwargs["approved_at"] = None
-                    update_kwargs["rejected_at"] = None
-
-                # Lock and update all records in a single query
-                updated_count = OvertimeRequest.objects.filter(id__in=ids).update(**update_kwargs)
+                updated_count = apply_status_chunk(ids, new_status, getattr(user, "username", ""))
                 logger.info("Bulk status update: %s requests updated to '%s' by user %s", updated_count, new_status, user.username)
-
-            # After commit: send notifications to affected employees
-            if updated_count > 0 and new_status in ("approved", "rejected"):
-                try:
-                    from ..consumers import send_notification_to_user
-
-                    status_label = "approved" if new_status == "approved" else "rejected"
-                    admin_name = getattr(user, "username", "Admin")
-
-                    # Collect unique emp_ids to look up ExternalUser records
-                    emp_ids = list({r["employee__emp_id"] for r in affected_requests if r["employee__emp_id"]})
-                    ext_users_map = {}
-                    if emp_ids:
-                        ext_users_map = {u.worker_id.lower(): u for u in ExternalUser.objects.filter(worker_id__in=emp_ids, is_active=True)}
-
-                    notifs_to_create = []
-                    ws_send_list = []
-                    for req_info in affected_requests:
-                        emp_id = (req_info["employee__emp_id"] or "").lower()
-                        ext_user = ext_users_map.get(emp_id)
-                        if not ext_user:
-                            continue
-                        date_str = req_info["request_date"].strftime("%B %d, %Y") if hasattr(req_info["request_date"], "strftime") else str(req_info["request_date"])
-                        title = f"Overtime Request {status_label.title()}"
-                        message = f"Your overtime request for {date_str} has been {status_label} by {admin_name}."
-                        target_data = {"route": "/ot/history", "query": {"requestId": req_info["id"]}}
-                        notifs_to_create.append(Notification(recipient=ext_user, title=title, message=message, event_type=f"overtime_{status_label}", target_data=target_data))
-                        ws_send_list.append((ext_user.id, title, message, target_data))
-
-                    if notifs_to_create:
-                        created_notifs = Notification.objects.bulk_create(notifs_to_create)
-                        for notif, (uid, ntitle, nmsg, target_data) in zip(created_notifs, ws_send_list, strict=True):
-                            send_notification_to_user(
-                                uid,
-                                {
-                                    "id": notif.id,
-                                    "title": ntitle,
-                                    "message": nmsg,
-                                    "event_type": notif.event_type,
-                                    "event_id": None,
-                                    "target_data": target_data,
-                                    "is_read": False,
-                                    "created_at": notif.created_at.isoformat(),
-                                },
-                            )
-                        logger.info("Sent %s notifications for %s overtime requests", len(created_notifs), status_label)
-                except Exception as notif_err:
-                    logger.warning("Failed to send notifications after bulk status update: %s", notif_err)
-
-            # After commit: regenerate Excel files for affected dates
-            # This ensures rejected requests are excluded from reports
-            if updated_count > 0 and affected_dates:
-
-                def _queue_bulk_regen():
-                    try:
-                        from api.tasks import regenerate_excel_after_delete
-
-                        for d in affected_dates:
-                            d_str = d.isoformat() if hasattr(d, "isoformat") else str(d)
-                            regenerate_excel_after_delete.delay(d_str)
-                        logger.info("Queued Excel regeneration for %s affected dates after bulk status update", len(affected_dates))
-                    except Exception as regen_err:
-                        logger.warning("Failed to queue Excel regeneration after bulk status update: %s", regen_err)
-
-                transaction.on_commit(_queue_bulk_regen)
+                # Notification fan-out runs in a background task after commit
+                if updated_count:
+                    queue_status_notifications(ids, new_status, getattr(user, "username", "Admin"))
 
             return Response({"message": f"{updated_count} requests updated successfully", "updated_count": updated_count, "status": new_status})
         except APIException:
@@ -440,6 +524,72 @@ def _queue_bulk_regen():
             logger.error("Bulk update error: %s", e)
             return Response({"detail": "An unexpected error occurred. Please try again or contact support."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @swagger_auto_schema(
+        operation_summary="Start a bulk overtime status job",
+        operation_description="Change the status of any number of overtime requests in the background. Select requests by `ids` and/or `filters` (pay_period, start_date, end_date, status, department_code). Admin only; poll the returned job for progress.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["status"],
+            properties={
+                "ids": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER), description="Overtime request IDs"),
+                "filters": openapi.Schema(type=openapi.TYPE_OBJECT, description='Selection filters, e.g. {"pay_period": "2026-01-10", "status": "pending"}'),
+                "status": openapi.Schema(type=openapi.TYPE_STRING, enum=["approved", "rejected", "pending"], description="New status to set"),
+            },
+        ),
+        responses={202: "Job queued", 400: "Invalid selection", 403: "Admin only"},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-status-jobs")
+    def bulk_status_jobs(self, request):
+        """Queue a background status change of an arbitrarily large selection."""
+        user = request.user
+        if not (getattr(user, "is_ptb_admin", False) or is_superadmin_user(user)):
+            return Response({"detail": "Permission denied. Admin only."}, status=status.HTTP_403_FORBIDDEN)
+
+        ids = request.data.get("ids") or []
+        filters = request.data.get("filters") or {}
+        new_status = request.data.get("status")
+
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return Response({"detail": "IDs must be a list of integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(filters, dict) or set(filters) - set(SELECTION_FILTERS):
+            return Response({"detail": f"filters may only contain: {', '.join(SELECTION_FILTERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids and not any(filters.values()):
+            return Response({"detail": "Provide ids or filters to select requests"}, status=status.HTTP_400_BAD_REQUEST)
+        if new_status not in STATUS_VALUES:
+            return Response({"detail": "Invalid status. Must be 'approved', 'rejected', or 'pending'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            filters = dict(filters)
+            if filters.get("pay_period"):
+                filters["pay_period"] = datetime.strptime(filters["pay_period"], "%Y-%m-%d").date()
+            request_ids = resolve_status_selection(ids, filters)
+        except (TypeError, ValueError, DjangoValidationError):
+            return Response({"detail": "Invalid filter value"}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = OvertimeStatusJob.objects.create(target_status=new_status, requested_by=user, requested_by_username=getattr(user, "username", ""), request_ids=request_ids, total=len(request_ids))
+        if request_ids:
+            from ..tasks import run_overtime_status_job
+
+            transaction.on_commit(lambda: run_overtime_status_job.delay(job.pk))
+        else:
+            job.status = "completed"
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "finished_at", "updated_at"])
+        logger.info("Queued overtime status job %s: %s requests to '%s' by %s", job.pk, job.total, new_status, user.username)
+        return Response(_status_job_payload(job), status=status.HTTP_202_ACCEPTED)
+
+    @swagger_auto_schema(operation_summary="Bulk overtime status job progress", responses={200: "Job progress", 404: "Not found"})
+    @action(detail=False, methods=["get"], url_path=r"bulk-status-jobs/(?P<job_id>\d+)", url_name="bulk-status-job-detail")
+    def bulk_status_job_detail(self, request, job_id=None):
+        """Progress of a bulk status job."""
+        user = request.user
+        if not (getattr(user, "is_ptb_admin", False) or is_superadmin_user(user)):
+            return Response({"detail": "Permission denied. Admin only."}, status=status.HTTP_403_FORBIDDEN)
+        job = OvertimeStatusJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response({"detail": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_status_job_payload(job))
+
     @action(detail=False, methods=["post"])
     def export_files(self, request):
         # Only PTB admins and superadmins can export files
@@ -451,11 +601,11 @@ def export_files(self, request):
             date = datetime.strptime(request.data["date"], "%Y-%m-%d").date()
 
             # Use grouped (by-department) variants for consistency with model save()
-            daily_data = OvertimeRequest.export_daily_data_by_department(date)
-            monthly_data = OvertimeRequest.export_monthly_data_by_department(date)
+            daily_by_date, monthly_data = OvertimeRequest.export_period_data_by_department(date)
+            daily_data = daily_by_date[date]
 
-            # Generate Excel files
-            ExcelGenerator.generate_all_excel_files(daily_data, monthly_data, date)
+            # Generate Excel files (a manual export always re-uploads, even if unchanged)
+            ExcelGenerator.generate_all_excel_files(daily_data, monthly_data, date, force=True)
 
             return Response({"status": "success", "message": "Excel files exported successfully"})
 
@@ -463,6 +613,46 @@ def export_files(self, request):
             logger.error("Export files error: %s", e)
             return Response({"detail": "An error occurred while exporting files."}, status=status.HTTP_400_BAD_REQUEST)
 
+    @swagger_auto_schema(
+        operation_summary="Export overtime history",
+        operation_description="Stream the filtered overtime history as CSV or XLSX. Accepts the same filters as the list endpoint; users only export their own requests.",
+        manual_parameters=[
+            openapi.Parameter(name="file_format", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["csv", "xlsx"], required=False, description="Output format (default: csv)"),
+            openapi.Parameter(name="start_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, description="Date range start (YYYY-MM-DD)"),
+            openapi.Parameter(name="end_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, description="Date range end (YYYY-MM-DD)"),
+            openapi.Parameter(name="employee", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Comma-separated employee IDs"),
+            openapi.Parameter(name="project", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Comma-separated project IDs"),
+            openapi.Parameter(name="status", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Comma-separated statuses"),
+            openapi.Parameter(name="department_code", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Comma-separated department codes"),
+        ],
+        responses={200: "CSV or XLSX file", 400: "Invalid format"},
+    )
+    @action(detail=False, methods=["get"], throttle_scope="export")
+    def export(self, request):
+        """Stream the overtime history matching the list filters as CSV or XLSX."""
+        file_format = request.query_params.get("file_format", "csv").lower()
+        if file_format not in ("csv", "xlsx"):
+            return Response({"detail": "file_format must be 'csv' or 'xlsx'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        headers = [header for header, _ in EXPORT_COLUMNS]
+        filename = f"overtime_history_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{file_format}"
+
+        if file_format == "csv":
+            response = StreamingHttpResponse(BulkImportExportService.stream_csv(headers, _export_rows(queryset)), content_type="text/csv")
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+
+        # XLSX is a zip archive, so it is assembled in a temporary file and streamed from there
+        workbook_file = tempfile.TemporaryFile()
+        try:
+            BulkImportExportService.write_xlsx(headers, _export_rows(queryset), workbook_file, title="Overtime")
+        except Exception:
+            workbook_file.close()
+            raise
+        workbook_file.seek(0)
+        return FileResponse(workbook_file, as_attachment=True, filename=filename, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
     @action(detail=False, methods=["get"])
     def employee_stats(self, request):
         """Get overtime statistics grouped by employee"""
@@ -472,14 +662,14 @@ def employee_stats(self, request):
             status_filter = request.query_params.get("status")
             employee_id = request.query_params.get("employee")
 
-            # Cache key based on user + query params (stats change infrequently)
-            user_id = getattr(request.user, "id", "anon")
-            cache_key = f"ot_employee_stats:{user_id}:{start_date}:{end_date}:{status_filter}:{employee_id}"
+            # Keyed on permission scope + the generations of the periods in range
+            cache_key = stats_cache_key("employee", self._stats_scope(), [start_date, end_date, status_filter, employee_id], [(start_date, end_date)])
             cached = cache.get(cache_key)
             if cached is not None:
                 return Response(cached)
 
-            queryset = self._get_permission_queryset()
+            # Aggregated from the daily rollup rather than the raw requests
+            queryset = self._get_permission_queryset(OvertimeDailyRollup.objects.all())
             if start_date:
                 queryset = queryset.filter(request_date__gte=start_date)
             if end_date:
@@ -492,26 +682,13 @@ def employee_stats(self, request):
             if employee_id:
                 queryset = queryset.filter(employee=employee_id)
 
-            from django.db.models import Case, Count, DecimalField, Q, Sum, Value, When
+            from django.db.models import Sum
 
-            _decimal = DecimalField(max_digits=10, decimal_places=2)
             # NOTE: The annotation name must NOT be 'total_hours' because it would
             # shadow the model field of the same name, causing FieldError when
             # Case/When expressions reference "total_hours" (Django resolves it to
             # the aggregate instead of the DB column).
-            stats = (
-                queryset.values("employee", "employee_name")
-                .annotate(
-                    sum_total_hours=Sum("total_hours"),
-                    total_requests=Count("id"),
-                    weekday_hours=Sum(Case(When(Q(is_weekend=False) & Q(is_holiday=False), then="total_hours"), default=Value(0), output_field=_decimal)),
-                    weekend_hours=Sum(Case(When(is_weekend=True, then="total_hours"), default=Value(0), output_field=_decimal)),
-                    holiday_hours=Sum(Case(When(is_holiday=True, then="total_hours"), default=Value(0), output_field=_decimal)),
-                    approved_hours=Sum(Case(When(status="approved", then="total_hours"), default=Value(0), output_field=_decimal)),
-                    pending_hours=Sum(Case(When(status="pending", then="total_hours"), default=Value(0), output_field=_decimal)),
-                )
-                .order_by("-sum_total_hours")
-            )
+            stats = queryset.values("employee", "employee_name").annotate(sum_total_hours=Sum("total_hours"), total_requests=Sum("request_count"), **_hours_breakdown()).order_by("-sum_total_hours")
 
             # Map 'sum_total_hours' back to 'total_hours' for frontend compatibility
             result = []
@@ -519,7 +696,7 @@ def employee_stats(self, request):
                 row["total_hours"] = row.pop("sum_total_hours", 0)
                 result.append(row)
 
-            cache.set(cache_key, result, 120)  # Cache for 2 minutes
+            cache.set(cache_key, result, STATS_CACHE_TTL)
             return Response(result)
         except Exception as e:
             logger.error("employee_stats error: %s", e, exc_info=True)
@@ -534,14 +711,13 @@ def project_stats(self, request):
             status_filter = request.query_params.get("status")
             project_id = request.query_params.get("project")
 
-            # Cache key based on user + query params
-            user_id = getattr(request.user, "id", "anon")
-            cache_key = f"ot_project_stats:{user_id}:{start_date}:{end_date}:{status_filter}:{project_id}"
+            # Keyed on permission scope + the generations of the periods in range
+            cache_key = stats_cache_key("project", self._stats_scope(), [start_date, end_date, status_filter, project_id], [(start_date, end_date)])
             cached = cache.get(cache_key)
             if cached is not None:
                 return Response(cached)
 
-            queryset = self._get_permission_queryset()
+            queryset = self._get_permission_queryset(OvertimeDailyRollup.objects.all())
             if start_date:
                 queryset = queryset.filter(request_date__gte=start_date)
             if end_date:
@@ -555,10 +731,10 @@ def project_stats(self, request):
 
             from django.db.models import Count, Sum
 
-            stats = queryset.values("project", "project_name").annotate(total_hours=Sum("total_hours"), total_requests=Count("id"), unique_employees=Count("employee", distinct=True)).order_by("-total_hours")
+            stats = queryset.values("project", "project_name").annotate(total_hours=Sum("total_hours"), total_requests=Sum("request_count"), unique_employees=Count("employee", distinct=True)).order_by("-total_hours")
 
             result = list(stats)
-            cache.set(cache_key, result, 120)  # Cache for 2 minutes
+            cache.set(cache_key, result, STATS_CACHE_TTL)
             return Response(result)
         except Exception as e:
             logger.error("project_stats error: %s", e, exc_info=True)
@@ -577,33 +753,31 @@ def summary_stats(self, request):
             prev_start_date = request.query_params.get("prev_start_date")
             prev_end_date = request.query_params.get("prev_end_date")
 
-            # Cache key based on user + query params
-            user_id = getattr(request.user, "id", "anon")
-            cache_key = f"ot_summary_stats:{user_id}:{start_date}:{end_date}:{prev_start_date}:{prev_end_date}"
+            # Keyed on permission scope + the generations of the periods in both ranges
+            date_ranges = [(start_date, end_date)]
+            if prev_start_date and prev_end_date:
+                date_ranges.append((prev_start_date, prev_end_date))
+            cache_key = stats_cache_key("summary", self._stats_scope(), [start_date, end_date, prev_start_date, prev_end_date], date_ranges)
             cached = cache.get(cache_key)
             if cached is not None:
                 return Response(cached)
 
-            base_queryset = self._get_permission_queryset().exclude(status="rejected")
+            base_queryset = self._get_permission_queryset(OvertimeDailyRollup.objects.all()).exclude(status="rejected")
 
             def _aggregate(qs):
-                from django.db.models import Case, Count, DecimalField, Q, Sum, Value, When
+                from django.db.models import Count, Sum
+                from django.db.models.functions import Coalesce
 
-                _decimal = DecimalField(max_digits=10, decimal_places=2)
                 # Use 'sum_total_hours' to avoid shadowing the 'total_hours' model field.
                 # Case/When expressions reference the DB column "total_hours" by name;
                 # if an aggregate annotation has the same name, Django resolves to the
                 # aggregate -> FieldError: "'total_hours' is an aggregate".
                 data = qs.aggregate(
                     sum_total_hours=Sum("total_hours"),
-                    total_requests=Count("id"),
+                    total_requests=Coalesce(Sum("request_count"), 0),
                     unique_employees=Count("employee", distinct=True),
                     unique_projects=Count("project", distinct=True),
-                    weekday_hours=Sum(Case(When(Q(is_weekend=False) & Q(is_holiday=False), then="total_hours"), default=Value(0), output_field=_decimal)),
-                    weekend_hours=Sum(Case(When(is_weekend=True, then="total_hours"), default=Value(0), output_field=_decimal)),
-                    holiday_hours=Sum(Case(When(is_holiday=True, then="total_hours"), default=Value(0), output_field=_decimal)),
-                    approved_hours=Sum(Case(When(status="approved", then="total_hours"), default=Value(0), output_field=_decimal)),
-                    pending_hours=Sum(Case(When(status="pending", then="total_hours"), default=Value(0), output_field=_decimal)),
+                    **_hours_breakdown(),
                 )
                 # Map back to 'total_hours' for frontend compatibility
                 data["total_hours"] = data.pop("sum_total_hours", 0)
@@ -625,22 +799,121 @@ def _aggregate(qs):
                 )
                 result["previous"] = _aggregate(prev_qs)
 
-            cache.set(cache_key, result, 120)  # Cache for 2 minutes
+            cache.set(cache_key, result, STATS_CACHE_TTL)
             return Response(result)
         except Exception as e:
             logger.error("summary_stats error: %s", e, exc_info=True)
             return Response({"detail": "Failed to compute summary stats. Please try again."}, status=500)
 
+    def _dashboard_rows(self, start_date, end_date):
+        """One grouped read of the rollup for a date range (all statuses, days collapsed)."""
+        from django.db.models import Sum
+
+        queryset = self._get_permission_queryset(OvertimeDailyRollup.objects.all())
+        if start_date:
+            queryset = queryset.filter(request_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(request_date__lte=end_date)
+        return list(queryset.values(*DASHBOARD_GROUP_FIELDS).annotate(hours=Sum("total_hours"), requests=Sum("request_count")).order_by())
+
+    @swagger_auto_schema(
+        operation_summary="Overtime dashboard stats",
+        operation_description=(
+            "Employee, project and summary stats plus available years in one call. Accepts the filters of "
+            "employee_stats, project_stats and summary_stats; `status` applies to the employee and project "
+            "sections, `employee` and `project` to their own section. `timings` reports milliseconds per section."
+        ),
+        manual_parameters=[
+            openapi.Parameter(name="start_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+            openapi.Parameter(name="end_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+            openapi.Parameter(name="prev_start_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+            openapi.Parameter(name="prev_end_date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+            openapi.Parameter(name="status", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter(name="employee", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter(name="project", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        """Employee, project and summary stats plus available years from one rollup read per date range."""
+        try:
+            params = {name: request.query_params.get(name) for name in ("start_date", "end_date", "prev_start_date", "prev_end_date", "status", "employee", "project")}
+            started = time.perf_counter()
+            timings = {}
+
+            date_ranges = [(params["start_date"], params["end_date"])]
+            has_previous = bool(params["prev_start_date"] and params["prev_end_date"])
+            if has_previous:
+                date_ranges.append((params["prev_start_date"], params["prev_end_date"]))
+
+            def _timed(section, compute):
+                section_started = time.perf_counter()
+                value = compute()
+                timings[section] = round((time.perf_counter() - section_started) * 1000, 2)
+                return value
+
+            def _available_years():
+                queryset = self._get_permission_queryset(OvertimeDailyRollup.objects.all())
+                return sorted(queryset.values_list("request_date__year", flat=True).distinct().order_by("request_date__year"))
+
+            # Years span every period, so they are read fresh rather than cached under this range's generations
+            available_years = _timed("available_years", _available_years)
+
+            cache_key = stats_cache_key("dashboard", self._stats_scope(), params, date_ranges)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+                return Response({**cached, "available_years": available_years, "cached": True, "timings": timings})
+
+            rows = _timed("scan", lambda: self._dashboard_rows(params["start_date"], params["end_date"]))
+
+            def _employee_stats():
+                selected = _stats_filter(rows, params["status"])
+                if params["employee"]:
+                    selected = [row for row in selected if str(row["employee"]) == params["employee"]]
+                result = [{"employee": employee, "employee_name": employee_name, **_hours_totals(group)} for (employee, employee_name), group in _group_rows(selected, ("employee", "employee_name")).items()]
+                return sorted(result, key=lambda row: row["total_hours"], reverse=True)
+
+            def _project_stats():
+                selected = _stats_filter(rows, params["status"])
+                if params["project"]:
+                    selected = [row for row in selected if str(row["project"]) == params["project"]]
+                result = [
+                    {
+                        "project": project,
+                        "project_name": project_name,
+                        "total_hours": sum((row["hours"] for row in group), Decimal("0.00")),
+                        "total_requests": sum(row["requests"] for row in group),
+                        "unique_employees": len({row["employee"] for row in group}),
+                    }
+                    for (project, project_name), group in _group_rows(selected, ("project", "project_name")).items()
+                ]
+                return sorted(result, key=lambda row: row["total_hours"], reverse=True)
+
+            def _summary_stats():
+                summary = _summary_from_rows(rows)
+                if has_previous:
+                    summary["previous"] = _summary_from_rows(self._dashboard_rows(params["prev_start_date"], params["prev_end_date"]))
+                return summary
+
+            result = {
+                "employee_stats": _timed("employee_stats", _employee_stats),
+                "project_stats": _timed("project_stats", _project_stats),
+                "summary_stats": _timed("summary_stats", _summary_stats),
+            }
+            cache.set(cache_key, result, STATS_CACHE_TTL)
+            timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+            return Response({**result, "available_years": available_years, "cached": False, "timings": timings})
+        except Exception as e:
+            logger.error("dashboard stats error: %s", e, exc_info=True)
+            return Response({"detail": "Failed to compute dashboard stats. Please try again."}, status=500)
+
     @action(detail=False, methods=["get"])
     def available_years(self, request):
         """Return sorted list of distinct years that have overtime request data."""
         try:
             queryset = self._get_permission_queryset()
-            years = sorted(
-                queryset.values_list("request_date__year", flat=True)
-                .distinct()
-                .order_by("request_date__year")
-            )
+            years = sorted(queryset.values_list("request_date__year", flat=True).distinct().order_by("request_date__year"))
             return Response(years)
         except Exception as e:
             logger.error("available_years error: %s", e, exc_info=True)
@@ -814,23 +1087,57 @@ class OvertimeLimitConfigViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """Allow all authenticated users to read limits (used on OT Form).
         Only admin/authorized users can update."""
-        if self.action in ("list", "retrieve", "active"):
+        if self.action in ("list", "retrieve", "active", "headroom"):
             return [IsAuthenticated()]
         return [IsAuthenticated(), ResourcePermission()]
 
     def list(self, request, *args, **kwargs):
         """Return the active config (singleton pattern)."""
-        config = OvertimeLimitConfig.get_active()
+        config = get_overtime_limit_config()
         serializer = self.get_serializer(config)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def active(self, request):
         """Return the active overtime limit configuration."""
-        config = OvertimeLimitConfig.get_active()
+        config = get_overtime_limit_config()
         serializer = self.get_serializer(config)
         return Response(serializer.data)
 
+    @swagger_auto_schema(
+        operation_summary="Overtime limit headroom",
+        operation_description="Weekly (Mon-Sun) and monthly (26th-25th) used and remaining hours for many employees at once. Non-admins only get their own employee.",
+        manual_parameters=[
+            openapi.Parameter(name="employees", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True, description="Comma-separated employee IDs (max 500)"),
+            openapi.Parameter(name="date", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, description="Date whose week and pay period are evaluated (default: today)"),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def headroom(self, request):
+        """Return limit usage and remaining hours per employee from the precomputed totals."""
+        try:
+            ids = [int(v.strip()) for v in request.query_params.get("employees", "").split(",") if v.strip()]
+        except ValueError:
+            return Response({"detail": "employees must be a comma-separated list of IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids:
+            return Response({"detail": "No employee IDs provided"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > 500:
+            return Response({"detail": "Cannot query more than 500 employees at once"}, status=status.HTTP_400_BAD_REQUEST)
+
+        date_param = request.query_params.get("date")
+        try:
+            on_date = datetime.strptime(date_param, "%Y-%m-%d").date() if date_param else timezone.localdate()
+        except ValueError:
+            return Response({"detail": "date must be in YYYY-MM-DD format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        if not (getattr(user, "is_ptb_admin", False) or is_superadmin_user(user)):
+            # Regular users may only see their own headroom
+            ids = list(_scope_to_own_employee(Employee.objects.filter(id__in=ids), user, field="").values_list("id", flat=True))
+
+        headroom = get_headroom(ids, on_date)
+        return Response({"date": on_date, "results": [{"employee": employee_id, **windows} for employee_id, windows in headroom.items()]})
+
     @action(detail=False, methods=["put", "patch"])
     def update_limits(self, request):
         """Update the active overtime limit configuration."""
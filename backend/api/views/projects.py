@@ -21,6 +21,7 @@
     EmployeeSerializer,
     ProjectSerializer,
 )
+from ..services.cache_service import cached_list
 from ..services.project_service import get_project_queryset
 from .helpers import get_employee_for_user, is_developer_user, is_ptb_admin, is_superadmin_user  # noqa: F401
 
@@ -52,6 +53,7 @@ def get_queryset(self):
             openapi.Parameter(name="ordering", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Order by field (use - for descending): -name, id, etc."),
         ],
     )
+    @cached_list("projects")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -78,6 +80,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             openapi.Parameter(name="ordering", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description="Order by field (use - for descending): -code, name, etc."),
         ],
     )
+    @cached_list("departments")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
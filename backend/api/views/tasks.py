@@ -128,7 +128,7 @@ def perform_create(self, serializer):
             else:
                 valid_employee_ids = set(task.assigned_to.values_list("id", flat=True))
 
-            from ..consumers import send_notification_to_user
+            from ..consumers import send_notifications_to_users
 
             eligible_mentions = [mentioned_emp for mentioned_emp in mentioned_employees if mentioned_emp.id in valid_employee_ids and mentioned_emp.id != employee.id]
 
@@ -160,8 +160,8 @@ def perform_create(self, serializer):
 
             if notification_data:
                 created_notifications = Notification.objects.bulk_create([n for _, n in notification_data])
-                for (ext_user, _), notif in zip(notification_data, created_notifications, strict=True):
-                    send_notification_to_user(
+                send_notifications_to_users(
+                    (
                         ext_user.id,
                         {
                             "id": notif.id,
@@ -174,6 +174,8 @@ def perform_create(self, serializer):
                             "created_at": notif.created_at.isoformat(),
                         },
                     )
+                    for (ext_user, _), notif in zip(notification_data, created_notifications, strict=True)
+                )
 
         from ..consumers import broadcast_task_comment_created
 
@@ -599,7 +601,7 @@ def perform_destroy(self, instance):
 
     def _notify_group_members(self, group, members):
         """Notify employees that they were added to a task group."""
-        from ..signals import send_websocket_notification
+        from ..signals import send_websocket_notifications
 
         emp_ids = [e.emp_id for e in members if e.emp_id]
         if not emp_ids:
@@ -652,10 +654,10 @@ def _notify_group_members(self, group, members):
         if notifs_to_create:
             try:
                 created = Notification.objects.bulk_create(notifs_to_create)
-                for notif, (uid, payload) in zip(created, ws_payloads, strict=True):
+                for notif, (_uid, payload) in zip(created, ws_payloads, strict=True):
                     payload["id"] = notif.id
                     payload["created_at"] = notif.created_at.isoformat()
-                    send_websocket_notification(uid, payload)
+                send_websocket_notifications(ws_payloads)
             except Exception as e:
                 logger.error("Error creating group member notifications: %s", e)
 
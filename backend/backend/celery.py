@@ -29,6 +29,10 @@
         "task": "api.tasks.cleanup_user_activity_logs",
         "schedule": crontab(),
     },
+    "retry-overdue-smb-uploads": {
+        "task": "api.tasks.retry_overdue_smb_uploads",
+        "schedule": crontab(minute="*/10"),
+    },
 }
 
 
@@ -374,6 +374,14 @@
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 
+# Excel regeneration coalescing: saves for the same pay period are collected until no
+# new change arrives for EXCEL_REGEN_QUIET_SECONDS, capped at EXCEL_REGEN_MAX_DELAY_SECONDS
+EXCEL_REGEN_QUIET_SECONDS = int(os.environ.get("EXCEL_REGEN_QUIET_SECONDS", "10"))
+EXCEL_REGEN_MAX_DELAY_SECONDS = int(os.environ.get("EXCEL_REGEN_MAX_DELAY_SECONDS", "60"))
+# Flushes of one period never overlap; the run lock expires after this many seconds in
+# case a worker dies mid-render (keep it at least CELERY_TASK_TIME_LIMIT)
+EXCEL_REGEN_RUN_LOCK_SECONDS = int(os.environ.get("EXCEL_REGEN_RUN_LOCK_SECONDS", str(CELERY_TASK_TIME_LIMIT)))
+
 # ============================================================================
 # Logging Configuration
 # ============================================================================
@@ -503,6 +511,23 @@ def get_log_level(default_level="INFO"):
     }
 }
 
+# Hot reference data (CacheService.get_reference): a per-process LRU in front of Redis.
+# Local entries are evicted through Redis pub/sub on change; the local TTL bounds
+# staleness if an invalidation message is missed.
+REFERENCE_CACHE_LOCAL_TTL = int(os.environ.get("REFERENCE_CACHE_LOCAL_TTL", "30"))
+REFERENCE_CACHE_SHARED_TTL = int(os.environ.get("REFERENCE_CACHE_SHARED_TTL", "600"))
+REFERENCE_CACHE_MAX_ENTRIES = int(os.environ.get("REFERENCE_CACHE_MAX_ENTRIES", "256"))
+
+# CacheService hit/miss and latency metrics (api.services.cache_metrics): each process
+# adds its counters to the shared aggregate in Redis every CACHE_METRICS_FLUSH_SECONDS
+CACHE_METRICS_ENABLED = os.environ.get("CACHE_METRICS_ENABLED", "true").lower() == "true"
+CACHE_METRICS_FLUSH_SECONDS = int(os.environ.get("CACHE_METRICS_FLUSH_SECONDS", "10"))
+
+# Codec for cached list payloads (api.services.cache_codec); blobs above the threshold
+# (bytes) are zlib-compressed
+CACHE_PAYLOAD_CODEC = os.environ.get("CACHE_PAYLOAD_CODEC", "api.services.cache_codec.MsgpackCodec")
+CACHE_CODEC_COMPRESS_THRESHOLD = int(os.environ.get("CACHE_CODEC_COMPRESS_THRESHOLD", "1024"))
+
 
 # ============================================================================
 # SMB File Storage Configuration
@@ -529,6 +554,14 @@ def get_bool_env(key, default=False):
     "min": int(os.getenv("SMB_POOL_MIN_SIZE", "2")),
     "max": int(os.getenv("SMB_POOL_MAX_SIZE", "5")),
 }
+# Idle pooled SMB connections are closed after this many seconds and probed (SMB echo)
+# before reuse once idle longer than the keepalive interval
+SMB_POOL_IDLE_TIMEOUT = int(os.getenv("SMB_POOL_IDLE_TIMEOUT", "300"))
+SMB_POOL_KEEPALIVE_INTERVAL = int(os.getenv("SMB_POOL_KEEPALIVE_INTERVAL", "60"))
+# Failed SMB uploads are retried by delayed Celery tasks (30s/60s doubling backoff for
+# sharing violations/other errors, capped at SMB_UPLOAD_RETRY_MAX_DELAY) before being marked failed
+SMB_UPLOAD_RETRY_MAX_ATTEMPTS = int(os.getenv("SMB_UPLOAD_RETRY_MAX_ATTEMPTS", "12"))
+SMB_UPLOAD_RETRY_MAX_DELAY = int(os.getenv("SMB_UPLOAD_RETRY_MAX_DELAY", "1800"))
 
 # ============================================================================
 # Django Channels (WebSocket Support for Task Board)
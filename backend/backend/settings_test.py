@@ -18,6 +18,10 @@
     }
 }
 
+# Tests roll the database back without firing signals, so process-local reference
+# entries would leak between tests; tests that exercise the cache enable it explicitly.
+REFERENCE_CACHE_LOCAL_TTL = 0
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels.layers.InMemoryChannelLayer",